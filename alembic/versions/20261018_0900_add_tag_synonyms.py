@@ -0,0 +1,46 @@
+"""add tag synonyms table
+
+Revision ID: 20261018_0900
+Revises: 65d82db06bc3
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_0900'
+down_revision: Union[str, None] = '65d82db06bc3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add tag synonyms table."""
+    op.create_table(
+        'tag_synonyms',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('alias_key', sa.String(length=100), nullable=False),
+        sa.Column('target_key', sa.String(length=100), nullable=False),
+        sa.Column('relation', sa.String(length=20), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('score', sa.Float(), nullable=True),
+        sa.Column('created_date', sa.Integer(), nullable=False),
+        sa.CheckConstraint(
+            "relation IN ('same', 'different')", name='ck_tag_synonyms_relation'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('alias_key', 'target_key', name='uq_tag_synonyms_pair'),
+    )
+    op.create_index('idx_tag_synonyms_alias', 'tag_synonyms', ['alias_key'], unique=False)
+    op.create_index('idx_tag_synonyms_target', 'tag_synonyms', ['target_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Remove tag synonyms table."""
+    op.drop_index('idx_tag_synonyms_target', table_name='tag_synonyms')
+    op.drop_index('idx_tag_synonyms_alias', table_name='tag_synonyms')
+    op.drop_table('tag_synonyms')
@@ -0,0 +1,92 @@
+"""add asset closure table
+
+Revision ID: 20261018_0930
+Revises: 20261018_0900
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from collections import defaultdict
+from typing import Dict, Set, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from services.asset_closure import reach_from
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_0930'
+down_revision: Union[str, None] = '20261018_0900'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def _backfill(bind) -> None:
+    """Fill the closure from the live edges in asset_dependencies."""
+    items = sa.table('asset_catalog_items', sa.column('id'), sa.column('deleted'))
+    dependencies = sa.table(
+        'asset_dependencies', sa.column('source_id'), sa.column('target_id')
+    )
+    source = items.alias('source')
+    target = items.alias('target')
+    adjacency: Dict[int, Set[int]] = defaultdict(set)
+    for source_id, target_id in bind.execute(
+        sa.select(dependencies.c.source_id, dependencies.c.target_id)
+        .join(source, source.c.id == dependencies.c.source_id)
+        .join(target, target.c.id == dependencies.c.target_id)
+        .where(source.c.deleted == sa.false(), target.c.deleted == sa.false())
+    ):
+        adjacency[source_id].add(target_id)
+
+    closure = sa.table(
+        'asset_closure',
+        sa.column('ancestor_id'),
+        sa.column('descendant_id'),
+        sa.column('min_depth'),
+        sa.column('path_count'),
+    )
+    rows = []
+    for ancestor in sorted(adjacency):
+        for descendant, (depth, count) in reach_from(adjacency, ancestor).items():
+            rows.append(
+                {
+                    'ancestor_id': ancestor,
+                    'descendant_id': descendant,
+                    'min_depth': depth,
+                    'path_count': count,
+                }
+            )
+            if len(rows) == BATCH_SIZE:
+                bind.execute(sa.insert(closure), rows)
+                rows = []
+    if rows:
+        bind.execute(sa.insert(closure), rows)
+
+
+def upgrade() -> None:
+    """Add asset dependency closure table and fill it from existing edges."""
+    op.create_table(
+        'asset_closure',
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('min_depth', sa.Integer(), nullable=False),
+        sa.Column('path_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['asset_catalog_items.id']),
+        sa.ForeignKeyConstraint(['descendant_id'], ['asset_catalog_items.id']),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index(
+        'idx_asset_closure_descendant',
+        'asset_closure',
+        ['descendant_id', 'ancestor_id'],
+        unique=False,
+    )
+    _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    """Remove asset dependency closure table."""
+    op.drop_index('idx_asset_closure_descendant', table_name='asset_closure')
+    op.drop_table('asset_closure')
@@ -0,0 +1,53 @@
+"""add asset file columns and scan manifest
+
+Revision ID: 20261018_1000
+Revises: 20261018_0930
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1000'
+down_revision: Union[str, None] = '20261018_0930'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add file columns to assets and the scan manifest table."""
+    op.add_column('asset_catalog_items', sa.Column('file_path', sa.String(length=1024), nullable=True))
+    op.add_column('asset_catalog_items', sa.Column('asset_type', sa.String(length=50), nullable=True))
+    op.add_column('asset_catalog_items', sa.Column('language', sa.String(length=50), nullable=True))
+    op.add_column('asset_catalog_items', sa.Column('asset_metadata', sa.JSON(), nullable=True))
+    op.create_index(
+        'idx_asset_catalog_items_file_path', 'asset_catalog_items', ['file_path'], unique=False
+    )
+    op.create_table(
+        'asset_scan_manifest',
+        sa.Column('file_path', sa.String(length=1024), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('mtime_ns', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('asset_id', sa.Integer(), nullable=True),
+        sa.Column('imports', sa.JSON(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('scanned_date', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['asset_id'], ['asset_catalog_items.id']),
+        sa.PrimaryKeyConstraint('file_path'),
+    )
+
+
+def downgrade() -> None:
+    """Remove the scan manifest and asset file columns."""
+    op.drop_table('asset_scan_manifest')
+    op.drop_index('idx_asset_catalog_items_file_path', table_name='asset_catalog_items')
+    with op.batch_alter_table('asset_catalog_items') as batch_op:
+        batch_op.drop_column('asset_metadata')
+        batch_op.drop_column('language')
+        batch_op.drop_column('asset_type')
+        batch_op.drop_column('file_path')
@@ -0,0 +1,40 @@
+"""add asset search indexes
+
+Revision ID: 20261018_1030
+Revises: 20261018_1000
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1030'
+down_revision: Union[str, None] = '20261018_1000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the asset filter index.
+
+    The asset_search full-text table is created and filled by
+    services.asset_search on first use, since indexing needs Python-side
+    path tokenization.
+    """
+    op.create_index(
+        'idx_asset_catalog_items_deleted_type_status',
+        'asset_catalog_items',
+        ['deleted', 'asset_type', 'status'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Remove the asset filter index and full-text table."""
+    op.execute('DROP TABLE IF EXISTS asset_search')
+    op.drop_index(
+        'idx_asset_catalog_items_deleted_type_status', table_name='asset_catalog_items'
+    )
@@ -0,0 +1,53 @@
+"""add report rollups
+
+Revision ID: 20261018_1100
+Revises: 20261018_1030
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1100'
+down_revision: Union[str, None] = '20261018_1030'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the report rollup and watermark tables.
+
+    They start empty; services.report_rollups fills them on first read.
+    """
+    op.create_table(
+        'report_rollups',
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('dimension', sa.String(length=50), nullable=False),
+        sa.Column('day', sa.String(length=10), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('source', 'dimension', 'day', 'value'),
+    )
+    op.create_table(
+        'report_rollup_watermarks',
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('last_rowid', sa.Integer(), nullable=False),
+        sa.Column('stale', sa.Boolean(), nullable=False),
+        sa.Column(
+            'rebuilt_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('(CURRENT_TIMESTAMP)'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('source'),
+    )
+
+
+def downgrade() -> None:
+    """Remove the report rollup and watermark tables."""
+    op.drop_table('report_rollup_watermarks')
+    op.drop_table('report_rollups')
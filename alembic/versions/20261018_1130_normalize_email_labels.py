@@ -0,0 +1,103 @@
+"""normalize email labels
+
+Revision ID: 20261018_1130
+Revises: 20261018_1100
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+import json
+from typing import Dict, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1130'
+down_revision: Union[str, None] = '20261018_1100'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns older schemas used for comma-separated (or JSON) label lists
+LEGACY_LABEL_COLUMNS = ('labelIds', 'labels')
+BATCH_SIZE = 500
+
+
+def _split(value) -> List[str]:
+    """Parse a stored label list: JSON or comma-separated."""
+    if not value:
+        return []
+    if value.startswith('['):
+        try:
+            items = json.loads(value)
+        except json.JSONDecodeError:
+            items = value.strip('[]').split(',')
+    else:
+        items = value.split(',')
+    labels = (str(item).strip().strip('"\'') for item in items)
+    return list(dict.fromkeys(label for label in labels if label))
+
+
+def _backfill(bind, column: str) -> None:
+    """Link every email to the labels in its legacy label column."""
+    emails = sa.table('emails', sa.column('id'), sa.column(column))
+    gmail_labels = sa.table('gmail_labels', sa.column('id'), sa.column('name'))
+    label_columns = {c['name'] for c in sa.inspect(bind).get_columns('gmail_labels')}
+
+    # Labels may be stored by id or by name
+    label_ids: Dict[str, str] = {}
+    for label_id, name in bind.execute(sa.select(gmail_labels.c.id, gmail_labels.c.name)):
+        label_ids.setdefault(name, label_id)
+        label_ids[label_id] = label_id
+
+    links = []
+    for email_id, value in bind.execute(
+        sa.select(emails.c.id, emails.c[column]).where(emails.c[column].isnot(None))
+    ):
+        for label in _split(value):
+            if label not in label_ids:
+                row = {'id': label, 'name': label, 'type': 'user'}
+                if 'is_active' in label_columns:
+                    row['is_active'] = True
+                bind.execute(
+                    sa.insert(sa.table('gmail_labels', *map(sa.column, row)))
+                    .prefix_with('OR IGNORE'),
+                    row,
+                )
+                label_ids[label] = label
+            links.append({'email_id': email_id, 'label_id': label_ids[label]})
+
+    email_labels = sa.table('email_labels', sa.column('email_id'), sa.column('label_id'))
+    for start in range(0, len(links), BATCH_SIZE):
+        bind.execute(
+            sa.insert(email_labels).prefix_with('OR IGNORE'),
+            links[start : start + BATCH_SIZE],
+        )
+
+
+def upgrade() -> None:
+    """Index email_labels by label and backfill it from legacy label columns."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'email_labels' not in inspector.get_table_names():
+        op.create_table(
+            'email_labels',
+            sa.Column('email_id', sa.String(length=100), nullable=False),
+            sa.Column('label_id', sa.String(length=100), nullable=False),
+            sa.ForeignKeyConstraint(['email_id'], ['emails.id']),
+            sa.ForeignKeyConstraint(['label_id'], ['gmail_labels.id']),
+            sa.PrimaryKeyConstraint('email_id', 'label_id'),
+        )
+    op.create_index(
+        'idx_email_labels_label', 'email_labels', ['label_id', 'email_id'], unique=False
+    )
+
+    email_columns = {column['name'] for column in inspector.get_columns('emails')}
+    for column in LEGACY_LABEL_COLUMNS:
+        if column in email_columns:
+            _backfill(bind, column)
+
+
+def downgrade() -> None:
+    """Remove the label index; the backfilled links are kept."""
+    op.drop_index('idx_email_labels_label', table_name='email_labels')
@@ -0,0 +1,35 @@
+"""add analysis created index
+
+Revision ID: 20261018_1200
+Revises: 20261018_1130
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1200'
+down_revision: Union[str, None] = '20261018_1130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index analyses by (created_at, email_id) for keyset pagination."""
+    if 'email_analysis' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_index(
+        'idx_email_analysis_created',
+        'email_analysis',
+        ['created_at', 'email_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the analysis created index."""
+    op.drop_index('idx_email_analysis_created', table_name='email_analysis')
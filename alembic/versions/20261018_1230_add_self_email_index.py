@@ -0,0 +1,35 @@
+"""add self email index
+
+Revision ID: 20261018_1230
+Revises: 20261018_1200
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1230'
+down_revision: Union[str, None] = '20261018_1200'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index emails by (from_address, to_address, received_at) for the self-log."""
+    if 'emails' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_index(
+        'idx_emails_self',
+        'emails',
+        ['from_address', 'to_address', 'received_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the self email index."""
+    op.drop_index('idx_emails_self', table_name='emails')
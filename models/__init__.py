@@ -3,9 +3,21 @@
 This module imports and exposes the main models used in the application.
 """
 
-from models.asset_catalog import AssetCatalogItem, AssetCatalogTag, AssetDependency
+from models.asset_catalog import (
+    AssetCatalogItem,
+    AssetCatalogTag,
+    AssetClosure,
+    AssetDependency,
+    AssetScanManifest,
+)
 from models.base import Base
-from models.catalog import CatalogItem, CatalogTag, ItemRelationship, Tag
+from models.catalog import (
+    CatalogItem,
+    CatalogTag,
+    ItemRelationship,
+    Tag,
+    TagSynonym,
+)
 from models.domain_constants import (
     CONSTRAINTS,
     DEFAULTS,
@@ -18,6 +30,7 @@ from models.domain_constants import (
 from models.email import Email
 from models.email_analysis import EmailAnalysis
 from models.gmail_label import GmailLabel
+from models.report_rollup import ReportRollup, ReportRollupWatermark
 from models.mixins import TimestampMixin
 
 __all__ = [
@@ -29,10 +42,15 @@ __all__ = [
     "Tag",
     "CatalogTag",
     "ItemRelationship",
+    "TagSynonym",
     "AssetCatalogItem",
     "AssetCatalogTag",
     "AssetDependency",
+    "AssetClosure",
+    "AssetScanManifest",
     "GmailLabel",
+    "ReportRollup",
+    "ReportRollupWatermark",
     "TimestampMixin",
     # Domain Constants
     "AssetType",
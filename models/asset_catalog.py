@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
     DateTime,
@@ -49,6 +50,22 @@ class AssetCatalogItem(Base):
     created_date: Mapped[int] = mapped_column(Integer, nullable=False)
     modified_date: Mapped[int] = mapped_column(Integer, nullable=False)
     item_info: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    file_path: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
+    asset_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    language: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    asset_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON, nullable=True
+    )
+
+    __table_args__ = (
+        Index("idx_asset_catalog_items_file_path", "file_path"),
+        Index(
+            "idx_asset_catalog_items_deleted_type_status",
+            "deleted",
+            "asset_type",
+            "status",
+        ),
+    )
 
     # Relationships
     tags: Mapped[List["Tag"]] = relationship(
@@ -124,6 +141,86 @@ class AssetDependency(Base):
         return f"<AssetDependency(source={self.source_id}, target={self.target_id}, type='{self.dependency_type}')>"
 
 
+class AssetClosure(Base):
+    """Transitive closure of the live asset dependency graph.
+
+    One row per (ancestor, descendant) pair connected by a path of at least
+    one edge, where ancestor depends on descendant directly or indirectly.
+    Edges count once per (source, target) pair regardless of dependency type,
+    and deleted assets are left out. ``min_depth`` is the shortest path
+    length and ``path_count`` the number of shortest paths. An asset on a
+    cycle has a row with itself as both ancestor and descendant.
+    """
+
+    __tablename__ = "asset_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("asset_catalog_items.id"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("asset_catalog_items.id"), primary_key=True
+    )
+    min_depth: Mapped[int] = mapped_column(Integer, nullable=False)
+    path_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        Index("idx_asset_closure_descendant", "descendant_id", "ancestor_id"),
+    )
+
+    def __repr__(self):
+        """Return string representation."""
+        return (
+            f"<AssetClosure(ancestor={self.ancestor_id}, descendant={self.descendant_id}, "
+            f"min_depth={self.min_depth}, path_count={self.path_count})>"
+        )
+
+
+class AssetScanManifest(Base):
+    """What the asset scanner saw for each file on its last run.
+
+    Files whose size and modification time (or, failing that, content hash)
+    match their manifest entry are skipped. Files that disappear are kept
+    as tombstones (``deleted``) so a later run can tell removed files from
+    files it never saw.
+    """
+
+    __tablename__ = "asset_scan_manifest"
+
+    file_path: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    asset_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("asset_catalog_items.id"), nullable=True
+    )
+    imports: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
+    deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    scanned_date: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self):
+        """Return string representation."""
+        return f"<AssetScanManifest(file_path='{self.file_path}', deleted={self.deleted})>"
+
+
+# Full-text index over asset text, kept in sync by services.asset_search.
+# The rowid is the asset id; path_tokens holds the file path split into words.
+ASSET_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS asset_search USING fts5("
+    "title, description, docstring, path_tokens, tokenize='unicode61')"
+)
+
+event.listen(
+    AssetCatalogItem.__table__,
+    "after_create",
+    DDL(ASSET_SEARCH_DDL).execute_if(dialect="sqlite"),
+)
+event.listen(
+    AssetCatalogItem.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS asset_search").execute_if(dialect="sqlite"),
+)
+
+
 # Add Tag relationship to asset items
 Tag.asset_items = relationship(
     "AssetCatalogItem", secondary="asset_catalog_tags", back_populates="tags"
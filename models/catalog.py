@@ -12,11 +12,13 @@ from sqlalchemy import (
     JSON,
     Boolean,
     CheckConstraint,
+    Float,
     ForeignKey,
     Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
     event,
     text,
 )
@@ -38,6 +40,7 @@ from models.domain_constants import (
     ItemStatus,
     RelationType,
 )
+from shared_lib.text_digest_util import build_digest, digest_source_hash
 
 
 class CatalogItem(Base):
@@ -192,6 +195,41 @@ class ItemRelationship(Base):
         return f"<ItemRelationship(id={self.id}, type='{self.relationship_type}')>"
 
 
+class TagSynonym(Base):
+    """A recorded decision about whether two tag keys mean the same thing.
+
+    Keys are canonical tag keys (see shared_lib.tag_util.canonical_key) and
+    ``relation`` is "same" or "different". ``source`` records who decided
+    ("llm" or "user").
+    """
+
+    __tablename__ = "tag_synonyms"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    alias_key: Mapped[str] = mapped_column(String(100), nullable=False)
+    target_key: Mapped[str] = mapped_column(String(100), nullable=False)
+    relation: Mapped[str] = mapped_column(String(20), nullable=False)
+    source: Mapped[str] = mapped_column(String(20), nullable=False)
+    score: Mapped[Optional[float]] = mapped_column(Float)
+    created_date: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("alias_key", "target_key", name="uq_tag_synonyms_pair"),
+        CheckConstraint(
+            "relation IN ('same', 'different')", name="ck_tag_synonyms_relation"
+        ),
+        Index("idx_tag_synonyms_alias", "alias_key"),
+        Index("idx_tag_synonyms_target", "target_key"),
+    )
+
+    def __repr__(self):
+        """Return string representation."""
+        return (
+            f"<TagSynonym(alias='{self.alias_key}', target='{self.target_key}', "
+            f"relation='{self.relation}')>"
+        )
+
+
 # Event listeners for case-insensitive uniqueness
 @event.listens_for(CatalogItem, "before_insert")
 @event.listens_for(CatalogItem, "before_update")
@@ -212,6 +250,24 @@ def catalog_item_before_save(mapper, connection, target):
         raise ValueError(f"Title '{target.title}' already exists (case-insensitive)")
 
 
+@event.listens_for(CatalogItem, "before_insert")
+@event.listens_for(CatalogItem, "before_update")
+def catalog_item_refresh_digest(mapper, connection, target):
+    """Store a compact digest in item_info when title or text changes."""
+    if target.title is None:
+        return
+
+    item_info = target.item_info or {}
+    source_hash = digest_source_hash(target.title, target.description, target.content)
+    if item_info.get("digest", {}).get("source_hash") == source_hash:
+        return
+
+    target.item_info = {
+        **item_info,
+        "digest": build_digest(target.title, target.description, target.content),
+    }
+
+
 @event.listens_for(Tag, "before_insert")
 @event.listens_for(Tag, "before_update")
 def tag_before_save(mapper, connection, target):
@@ -8,6 +8,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     String,
     Text,
     func,
@@ -16,6 +17,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped, relationship
 
 from models.base import Base
+from models.gmail_label import email_labels
 from shared_lib.schema_constants import COLUMN_SIZES, EmailDefaults
 
 # Default values for email fields
@@ -25,6 +27,10 @@ class Email(Base):
     """SQLAlchemy model for email storage."""
 
     __tablename__ = "emails"
+    __table_args__ = (
+        # Self-emails (from and to the user) by date, for the self-log
+        Index("idx_emails_self", "from_address", "to_address", "received_at"),
+    )
 
     # Primary key and identifiers
     id: Mapped[str] = Column(
@@ -109,7 +115,7 @@ class Email(Base):
 
     # Relationships
     analysis = relationship("EmailAnalysis", back_populates="email", uselist=False)
-    labels = relationship("EmailLabel", back_populates="email")
+    labels = relationship("GmailLabel", secondary=email_labels, back_populates="emails")
 
     def __repr__(self) -> str:
         """Return string representation."""
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, relationship
 
 from models.base import Base
@@ -17,6 +17,10 @@ class EmailAnalysis(Base):
     """SQLAlchemy model for email analysis storage."""
 
     __tablename__ = "email_analysis"
+    __table_args__ = (
+        # Keyset pagination and polling over analyses by time
+        Index("idx_email_analysis_created", "created_at", "email_id"),
+    )
 
     # Primary key is the email ID this analysis belongs to
     email_id: Mapped[str] = Column(
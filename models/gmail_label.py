@@ -8,6 +8,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     String,
     Table,
     func
@@ -23,6 +24,8 @@ email_labels = Table(
     Base.metadata,
     Column("email_id", String(COLUMN_SIZES["EMAIL_ID"]), ForeignKey("emails.id"), primary_key=True),
     Column("label_id", String(COLUMN_SIZES["LABEL_ID"]), ForeignKey("gmail_labels.id"), primary_key=True),
+    # The primary key serves per-email lookups; this serves per-label ones
+    Index("idx_email_labels_label", "label_id", "email_id"),
 )
 
 # Default values for label fields
@@ -0,0 +1,60 @@
+"""Materialized rollups behind the email and analysis reports.
+
+Each ReportRollup row counts the source rows (emails or analyses) that fall
+on one day and have one value for one report dimension, e.g. ("email_analysis",
+"2024-01-05", "sentiment", "positive", 12). Reports sum these rows instead of
+grouping the source tables, so their cost grows with the number of days
+rather than the number of rows. Rollups live in the same database as the
+table they summarize and are maintained by services.report_rollups.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class ReportRollup(Base):
+    """Row count for one (source table, day, dimension, value)."""
+
+    __tablename__ = "report_rollups"
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    dimension: Mapped[str] = mapped_column(String(50), primary_key=True)
+    day: Mapped[str] = mapped_column(String(10), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        """Return string representation."""
+        return (
+            f"<ReportRollup(source='{self.source}', dimension='{self.dimension}', "
+            f"day='{self.day}', value='{self.value}', count={self.count})>"
+        )
+
+
+class ReportRollupWatermark(Base):
+    """How far the rollups of one source table are up to date.
+
+    Rows with a rowid up to ``last_rowid`` are counted. ``stale`` is set when
+    a bulk UPDATE or DELETE bypasses the incremental path, so the next read
+    rebuilds the rollups from scratch.
+    """
+
+    __tablename__ = "report_rollup_watermarks"
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    last_rowid: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stale: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    rebuilt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self):
+        """Return string representation."""
+        return (
+            f"<ReportRollupWatermark(source='{self.source}', "
+            f"last_rowid={self.last_rowid}, stale={self.stale})>"
+        )
@@ -1,18 +1,61 @@
 #!/usr/bin/env python3
-"""Utility for viewing and validating email analyses with configurable options."""
+"""Utility for viewing and validating email analyses with configurable options.
+
+Analyses are read a page at a time with keyset pagination on
+(created_at, email_id), newest first, and the emails shown in detailed mode
+are fetched with one query per page. With --follow the viewer then keeps
+polling for analyses inserted after the last one shown, by rowid: created_at
+has one-second resolution and is set before the row is committed, so it
+does not give the order rows arrive in.
+
+Usage:
+    python scripts/analysis_viewer.py [--timeframe week] [--detail detailed]
+        [--page-size 50] [--follow] [--interval 5]
+"""
 
 import argparse
-import json
+import os
+import sys
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pytz
-from sqlalchemy import select
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import (
+    String,
+    func,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.orm import Session
 
 from models.email import Email
 from models.email_analysis import EmailAnalysis
+from services.analytics_snapshot import split_category
 from shared_lib.database_session_util import get_analysis_session, get_email_session
 
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_INTERVAL = 5.0
+REQUIRED_FIELDS = ["summary", "priority", "sentiment", "category"]
+
+# created_at as stored. Cursors are compared as stored text, so a cursor
+# always matches its own row exactly, whatever format the row was written in.
+STORED_CREATED_AT = type_coerce(EmailAnalysis.created_at, String)
+
+# (stored created_at, email_id) of an analysis
+Cursor = Tuple[str, str]
+
+# Grows with every insert, so follow mode polls on it
+ROWID = literal_column("email_analysis.rowid")
+
 
 def get_time_filter(timeframe: str) -> datetime:
     """Get datetime filter based on timeframe."""
@@ -25,37 +68,206 @@ def get_time_filter(timeframe: str) -> datetime:
         return now.replace(hour=0, minute=0, second=0, microsecond=0)
 
 
-def format_action_info(analysis: EmailAnalysis) -> List[str]:
-    """Format action information from analysis."""
-    lines = []
-    if analysis.action_needed:
-        lines.append(f"Action Needed: Yes")
-        action_types = (
-            analysis.action_type
-            if isinstance(analysis.action_type, list)
-            else json.loads(analysis.action_type) if analysis.action_type else []
-        )
-        if action_types:
-            lines.append(f"Action Type: {', '.join(action_types)}")
-        if analysis.action_deadline:
-            lines.append(f"Deadline: {analysis.action_deadline}")
-    else:
-        lines.append("Action Needed: No")
-    return lines
-
-
 def format_categories(analysis: EmailAnalysis) -> str:
     """Format categories from analysis."""
-    categories = (
-        analysis.category
-        if isinstance(analysis.category, list)
-        else json.loads(analysis.category) if analysis.category else []
-    )
+    categories = split_category(analysis.category)
     return ", ".join(categories) if categories else "None"
 
 
+def _key() -> tuple:
+    return tuple_(STORED_CREATED_AT, EmailAnalysis.email_id)
+
+
+def _cursor_value(cursor: Cursor):
+    return tuple_(literal(cursor[0], String), literal(cursor[1], String))
+
+
+def fetch_page(
+    session: Session,
+    since: Optional[str] = None,
+    before: Optional[Cursor] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> List[Tuple[EmailAnalysis, Cursor]]:
+    """Fetch one page of analyses with their cursors, newest first.
+
+    Args:
+        session: Session on the analysis database
+        since: Only analyses created at or after this stored timestamp
+        before: Only analyses before this cursor
+        page_size: Maximum rows
+    """
+    statement = select(EmailAnalysis, STORED_CREATED_AT.label("cursor_created_at"))
+    if since is not None:
+        statement = statement.where(STORED_CREATED_AT >= since)
+    if before is not None:
+        statement = statement.where(_key() < _cursor_value(before))
+    statement = statement.order_by(
+        EmailAnalysis.created_at.desc(), EmailAnalysis.email_id.desc()
+    )
+    rows = session.execute(statement.limit(page_size)).all()
+    return [(analysis, (created, analysis.email_id)) for analysis, created in rows]
+
+
+def fetch_new(
+    session: Session, after: Optional[int], page_size: int = DEFAULT_PAGE_SIZE
+) -> List[Tuple[EmailAnalysis, int]]:
+    """Fetch analyses inserted after a rowid, oldest first, with their rowids.
+
+    Args:
+        session: Session on the analysis database
+        after: Rowid of the last analysis shown; None for the newest page
+        page_size: Maximum rows
+    """
+    statement = select(EmailAnalysis, ROWID)
+    if after is None:
+        rows = session.execute(statement.order_by(ROWID.desc()).limit(page_size))
+        return [tuple(row) for row in rows][::-1]
+    statement = statement.where(ROWID > after).order_by(ROWID).limit(page_size)
+    return [tuple(row) for row in session.execute(statement)]
+
+
+def iter_pages(
+    session: Session, since: str, page_size: int = DEFAULT_PAGE_SIZE
+) -> Iterator[List[Tuple[EmailAnalysis, Cursor]]]:
+    """Yield pages of analyses created since a timestamp, newest first."""
+    before = None
+    while True:
+        page = fetch_page(session, since=since, before=before, page_size=page_size)
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        before = page[-1][1]
+
+
+def latest_rowid(session: Session) -> int:
+    """Return the rowid of the last analysis inserted, or 0 if there are none."""
+    return session.scalar(
+        select(func.coalesce(func.max(ROWID), 0)).select_from(EmailAnalysis)
+    )
+
+
+def load_emails(session: Session, email_ids: List[str]) -> Dict[str, Email]:
+    """Fetch the emails of one page with a single query."""
+    if not email_ids:
+        return {}
+    return {
+        email.id: email
+        for email in session.scalars(select(Email).where(Email.id.in_(email_ids)))
+    }
+
+
+def print_analysis(
+    analysis: EmailAnalysis,
+    email: Optional[Email],
+    detail_level: str,
+    validate: bool,
+) -> None:
+    """Print one analysis at the given detail level."""
+    print("\n-------------------")
+
+    # Basic information (always shown)
+    print(f"Email ID: {analysis.email_id}")
+    print(f"Time: {analysis.created_at}")
+    print(f"Summary: {analysis.summary}")
+
+    # Normal detail level
+    if detail_level in ["normal", "detailed"]:
+        print(f"Priority: {analysis.priority}")
+        print(f"Categories: {format_categories(analysis)}")
+        print(f"Sentiment: {analysis.sentiment}")
+
+    # Detailed information
+    if detail_level == "detailed" and email is not None:
+        print(f"\nEmail Details:")
+        print(f"From: {email.from_address}")
+        print(f"Subject: {email.subject}")
+        print(f"Received: {email.received_at}")
+        print(f"Thread ID: {email.thread_id}")
+
+    # Validation checks
+    if validate:
+        print("\nValidation:")
+        if email is not None:
+            print("✓ Email stored")
+        else:
+            print("⚠ WARNING: Email not found")
+
+        missing = [field for field in REQUIRED_FIELDS if not getattr(analysis, field)]
+        if missing:
+            print(f"⚠ WARNING: Missing required fields: {', '.join(missing)}")
+        else:
+            print("✓ All required fields present")
+
+
+def print_page(
+    page: List[Tuple[EmailAnalysis, Any]],
+    email_session: Session,
+    detail_level: str,
+    validate: bool,
+) -> None:
+    """Print a page of analyses, fetching their emails in one query if needed."""
+    emails = {}
+    if detail_level == "detailed" or validate:
+        emails = load_emails(email_session, [analysis.email_id for analysis, _ in page])
+    for analysis, _ in page:
+        print_analysis(analysis, emails.get(analysis.email_id), detail_level, validate)
+
+
+def follow_analyses(
+    analysis_session: Session,
+    email_session: Session,
+    cursor: Optional[int],
+    detail_level: str = "normal",
+    validate: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    interval: float = DEFAULT_INTERVAL,
+    polls: Optional[int] = None,
+) -> Optional[int]:
+    """Print analyses inserted after a rowid as they arrive.
+
+    Each poll is one rowid range query past the last analysis shown. A
+    rowid freed by deleting the newest analysis can be handed out again,
+    so a replacement written that way is not shown.
+
+    Args:
+        analysis_session: Session on the analysis database
+        email_session: Session on the email database
+        cursor: Rowid of the last analysis already shown, None to start
+            with the newest page
+        detail_level: 'basic', 'normal', or 'detailed'
+        validate: Whether to perform validation checks
+        page_size: Maximum rows per query
+        interval: Seconds between polls that found nothing new
+        polls: Stop after this many polls (forever if None)
+
+    Returns:
+        Rowid of the last analysis shown
+    """
+    done = 0
+    while polls is None or done < polls:
+        # End the read transactions so the next queries see new commits
+        analysis_session.commit()
+        email_session.commit()
+        page = fetch_new(analysis_session, cursor, page_size)
+        done += 1
+        if page:
+            print_page(page, email_session, detail_level, validate)
+            cursor = page[-1][1]
+        if len(page) < page_size and (polls is None or done < polls):
+            time.sleep(interval)
+    return cursor
+
+
 def view_analyses(
-    timeframe: str = "today", detail_level: str = "normal", validate: bool = False
+    timeframe: str = "today",
+    detail_level: str = "normal",
+    validate: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    follow: bool = False,
+    interval: float = DEFAULT_INTERVAL,
+    interactive: bool = False,
 ):
     """View analyses with configurable timeframe and detail level.
 
@@ -63,117 +275,56 @@ def view_analyses(
         timeframe: 'hour', 'today', or 'week'
         detail_level: 'basic', 'normal', or 'detailed'
         validate: Whether to perform validation checks
+        page_size: Analyses per page
+        follow: Keep polling for new analyses afterwards
+        interval: Seconds between polls in follow mode
+        interactive: Wait for Enter between pages
+
+    Raises:
+        ValueError: If page_size is less than 1
     """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
     with get_analysis_session() as analysis_session:
         with get_email_session() as email_session:
-            # Get analyses based on timeframe
-            time_filter = get_time_filter(timeframe)
-            analyses = (
-                analysis_session.query(EmailAnalysis)
-                .filter(EmailAnalysis.analysis_date >= time_filter)
-                .order_by(EmailAnalysis.analysis_date.desc())
-                .all()
+            since = get_time_filter(timeframe).strftime("%Y-%m-%d %H:%M:%S")
+            total = analysis_session.scalar(
+                select(func.count())
+                .select_from(EmailAnalysis)
+                .where(STORED_CREATED_AT >= since)
             )
+            # Taken before paging, so follow mode starts where paging began
+            cursor = latest_rowid(analysis_session)
 
-            if not analyses:
+            if not total:
                 print(f"No analyses found for the last {timeframe}")
-                return
-
-            print(f"\nFound {len(analyses)} analyses from the last {timeframe}:")
-            for analysis in analyses:
-                print("\n-------------------")
-
-                # Basic information (always shown)
-                print(f"Email ID: {analysis.email_id}")
-                print(f"Time: {analysis.analysis_date}")
-                print(f"Summary: {analysis.summary}")
-
-                # Normal detail level
-                if detail_level in ["normal", "detailed"]:
-                    print(
-                        f"Priority: {analysis.priority_score} - {analysis.priority_reason}"
-                    )
-                    for line in format_action_info(analysis):
-                        print(line)
-                    print(f"Categories: {format_categories(analysis)}")
-                    print(f"Project: {analysis.project or 'None'}")
-                    print(f"Topic: {analysis.topic or 'None'}")
-                    print(f"Sentiment: {analysis.sentiment}")
-                    print(f"Confidence: {analysis.confidence_score:.2f}")
-
-                # Detailed information
-                if detail_level == "detailed":
-                    email = (
-                        email_session.query(Email)
-                        .filter(Email.id == analysis.email_id)
-                        .first()
-                    )
-                    if email:
-                        print(f"\nEmail Details:")
-                        print(f"From: {email.sender}")
-                        print(f"Subject: {email.subject}")
-                        print(f"Thread ID: {analysis.thread_id}")
-
-                    key_points = (
-                        analysis.key_points
-                        if isinstance(analysis.key_points, list)
-                        else (
-                            json.loads(analysis.key_points)
-                            if analysis.key_points
-                            else []
-                        )
-                    )
-                    if key_points:
-                        print("\nKey Points:")
-                        for point in key_points:
-                            print(f"- {point}")
-
-                    people = (
-                        analysis.people_mentioned
-                        if isinstance(analysis.people_mentioned, list)
-                        else (
-                            json.loads(analysis.people_mentioned)
-                            if analysis.people_mentioned
-                            else []
+            else:
+                print(f"\nFound {total} analyses from the last {timeframe}:")
+                shown = 0
+                for page in iter_pages(analysis_session, since, page_size):
+                    print_page(page, email_session, detail_level, validate)
+                    shown += len(page)
+                    if interactive and shown < total:
+                        answer = input(
+                            f"\n-- {shown}/{total} shown; Enter for more, q to stop -- "
                         )
+                        if answer.strip().lower() == "q":
+                            break
+
+            if follow:
+                print(f"\nFollowing new analyses (every {interval}s, Ctrl+C to stop)")
+                try:
+                    follow_analyses(
+                        analysis_session,
+                        email_session,
+                        cursor,
+                        detail_level,
+                        validate,
+                        page_size,
+                        interval,
                     )
-                    if people:
-                        print("\nPeople Mentioned:")
-                        for person in people:
-                            print(f"- {person}")
-
-                    print(f"Topic: {analysis.topic}")
-                    print(f"Sentiment: {analysis.sentiment}")
-                    print(f"Confidence: {analysis.confidence_score}")
-                    if analysis.full_api_response:
-                        print("\nFull API Response:")
-                        print(json.dumps(analysis.full_api_response, indent=2))
-
-                # Validation checks
-                if validate:
-                    print("\nValidation:")
-                    if analysis.raw_analysis:
-                        print("✓ Raw analysis stored")
-                    else:
-                        print("⚠ WARNING: No raw analysis stored")
-
-                    required_fields = [
-                        "summary",
-                        "priority_score",
-                        "priority_reason",
-                        "sentiment",
-                    ]
-                    missing = [
-                        field
-                        for field in required_fields
-                        if not getattr(analysis, field)
-                    ]
-                    if missing:
-                        print(
-                            f"⚠ WARNING: Missing required fields: {', '.join(missing)}"
-                        )
-                    else:
-                        print("✓ All required fields present")
+                except KeyboardInterrupt:
+                    pass
 
 
 def main():
@@ -193,9 +344,34 @@ def main():
     parser.add_argument(
         "--validate", action="store_true", help="Perform validation checks"
     )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help="Analyses per page",
+    )
+    parser.add_argument(
+        "--follow", action="store_true", help="Keep polling for new analyses"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Seconds between polls in follow mode",
+    )
 
     args = parser.parse_args()
-    view_analyses(args.timeframe, args.detail, args.validate)
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    view_analyses(
+        args.timeframe,
+        args.detail,
+        args.validate,
+        args.page_size,
+        args.follow,
+        args.interval,
+        interactive=sys.stdin.isatty() and sys.stdout.isatty(),
+    )
 
 
 if __name__ == "__main__":
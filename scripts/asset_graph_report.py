@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Report on the structure of the asset dependency graph.
+
+Prints import cycles, topological layers, fan-in/fan-out rankings and
+betweenness hot spots. With --changed, also prints the blast radius of the
+given files.
+
+Usage:
+    python scripts/asset_graph_report.py [--limit 10] [--changed a.py b.py]
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from models.asset_catalog import AssetCatalogItem
+from services.asset_catalog_service import AssetCatalogService
+
+
+def load_paths(service: AssetCatalogService) -> Dict[int, str]:
+    """Map asset ids to file paths (or titles) with one column query."""
+    with service.session_scope() as session:
+        return {
+            asset_id: file_path or title
+            for asset_id, file_path, title in session.query(
+                AssetCatalogItem.id, AssetCatalogItem.file_path, AssetCatalogItem.title
+            )
+        }
+
+
+def build_report(
+    service: AssetCatalogService, limit: int = 10, changed: List[str] = None
+) -> str:
+    """Render the graph report as text."""
+    graph = service.get_dependency_graph()
+    paths = load_paths(service)
+
+    lines = [f"Dependency graph: {len(graph)} assets, {graph.edge_count} edges", ""]
+
+    cycles = graph.cycles()
+    lines.append(f"Import cycles ({len(cycles)})")
+    for component, cycle in zip(graph.strongly_connected_components()[:limit], cycles):
+        lines.append(
+            f"  {len(component)} assets: " + " -> ".join(paths[i] for i in cycle)
+        )
+
+    lines.extend(["", f"Topological layers ({len(graph.layers)})"])
+    for depth, layer in enumerate(graph.layers):
+        lines.append(f"  {depth}: {len(layer)} assets")
+
+    for title, ranking in (
+        ("Most depended on (fan-in)", graph.fan_in(limit)),
+        ("Most dependencies (fan-out)", graph.fan_out(limit)),
+    ):
+        lines.extend(["", title])
+        lines.extend(f"  {count:>5}  {paths[asset_id]}" for asset_id, count in ranking)
+
+    lines.extend(["", "Betweenness hot spots"])
+    lines.extend(
+        f"  {score:>7.4f}  {paths[asset_id]}"
+        for asset_id, score in graph.betweenness(limit)
+    )
+
+    if changed:
+        ids_by_path = {path: asset_id for asset_id, path in paths.items()}
+        missing = [path for path in changed if path not in ids_by_path]
+        radius = graph.blast_radius(
+            [ids_by_path[path] for path in changed if path in ids_by_path]
+        )
+        lines.extend(["", f"Blast radius of {len(changed)} changed files: {len(radius)} assets"])
+        lines.extend(f"  not catalogued: {path}" for path in missing)
+        for asset_id, depth in sorted(radius.items(), key=lambda item: (item[1], paths[item[0]])):
+            lines.append(f"  {depth:>3}  {paths[asset_id]}")
+
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Print the dependency graph report."""
+    parser = argparse.ArgumentParser(description="Report on the asset dependency graph")
+    parser.add_argument("--limit", type=int, default=10, help="Entries per ranking")
+    parser.add_argument(
+        "--changed", nargs="*", default=[], help="Changed file paths for blast radius"
+    )
+    args = parser.parse_args()
+
+    print(build_report(AssetCatalogService(), args.limit, args.changed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark chat log appends against the previous temp-file implementation.
+
+The previous ChatLogger wrote each entry to a temp file, fsynced it,
+appended the temp file to the log and fsynced again. This times that
+against AppendLog at each durability level, with one writer thread and
+with several writing at once (where "record" durability shares syncs).
+
+Usage:
+    python scripts/benchmark_chat_log.py [--entries 2000] [--threads 4]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from shared_lib.append_log_util import DURABILITY_LEVELS, AppendLog
+
+ENTRY = {
+    "timestamp": "2024-01-01T00:00:00+00:00",
+    "session_id": "00000000-0000-0000-0000-000000000000",
+    "role": "user",
+    "user_input": "What changed in the catalog this week? " * 4,
+    "system_response": "Three assets were added and one was retired. " * 8,
+    "model": "benchmark",
+    "status": "success",
+    "error_details": None,
+    "metadata": {},
+}
+
+
+def make_legacy_append(path: Path) -> Callable[[str], None]:
+    """Return the previous ChatLogger write path: temp file, fsync, append, fsync."""
+    lock = threading.Lock()
+    temp_path = path.with_suffix(".tmp")
+
+    def append(line: str) -> None:
+        # The old code shared one temp file between calls, so it needs a lock
+        with lock:
+            with temp_path.open("w", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            with path.open("a", encoding="utf-8") as f:
+                with temp_path.open("r", encoding="utf-8") as t:
+                    f.write(t.read())
+                f.flush()
+                os.fsync(f.fileno())
+            temp_path.unlink()
+
+    return append
+
+
+def run(append: Callable[[str], None], entries: int, threads: int) -> float:
+    """Append entries split across threads; return entries per second."""
+    line = json.dumps(ENTRY)
+    per_thread = entries // threads
+
+    def write() -> None:
+        for _ in range(per_thread):
+            append(line)
+
+    workers = [threading.Thread(target=write) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def benchmark(entries: int, threads: int) -> Dict[str, float]:
+    """Return entries per second for each implementation."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "legacy.jsonl"
+        results["legacy"] = run(make_legacy_append(path), entries, threads)
+        for durability in DURABILITY_LEVELS:
+            with AppendLog(Path(tmp_dir) / f"{durability}.jsonl", durability) as log:
+                results[durability] = run(log.append, entries, threads)
+    return results
+
+
+def main() -> int:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark chat log appends")
+    parser.add_argument("--entries", type=int, default=2000, help="Entries per run")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent writers")
+    args = parser.parse_args()
+
+    rows = {
+        "1 thread": benchmark(args.entries, 1),
+        f"{args.threads} threads": benchmark(args.entries, args.threads),
+    }
+    names = ["legacy", *DURABILITY_LEVELS]
+    print(f"{'entries/s':<12}" + "".join(f"{name:>12}" for name in names))
+    for label, results in rows.items():
+        print(f"{label:<12}" + "".join(f"{results[name]:>12.0f}" for name in names))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark the single-pass report engine against per-section queries.
+
+Seeds temporary email and analysis databases, then times computing every
+section of the analysis report two ways: calling one EmailAnalytics method
+per section, and one ReportEngine pass. The first run of each is reported
+separately because the per-section methods catch up their rollups on first
+use. Other numbers are medians over the given number of runs.
+
+Usage:
+    python scripts/benchmark_reports.py [--emails 20000] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services import email_labels
+from services.analysis_join import AnalysisEmailJoin
+from services.report_engine import ReportEngine
+from src.app_email_reports import EmailAnalytics
+
+SENTIMENTS = ["positive", "neutral", "negative"]
+PRIORITIES = ["low", "medium", "high"]
+CATEGORIES = ["Work", "Personal", "Finance", "Travel", '["Work", "Finance"]']
+LABELS = ["INBOX", "UNREAD", "IMPORTANT", "Label_1", "Label_2"]
+
+
+def seed(email_session, analysis_session, count: int) -> None:
+    """Insert emails, their labels and analyses for most of them."""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    emails, analyses, labels = [], [], {}
+    for i in range(count):
+        email_id = f"m{i:08d}"
+        received = start + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        emails.append(
+            {
+                "id": email_id,
+                "message_id": f"<{email_id}>",
+                "subject": f"Subject {i}",
+                "from_address": f"sender{rng.randrange(200)}@example.com",
+                "received_at": received,
+            }
+        )
+        labels[email_id] = rng.sample(LABELS, rng.randrange(1, 3))
+        if rng.random() < 0.8:
+            analyses.append(
+                {
+                    "email_id": email_id,
+                    "sentiment": rng.choice(SENTIMENTS),
+                    "priority": rng.choice(PRIORITIES),
+                    "category": rng.choice(CATEGORIES),
+                    "summary": f"Summary {i}",
+                    "created_at": received + timedelta(hours=1),
+                }
+            )
+    email_session.execute(insert(Email), emails)
+    email_labels.set_labels_bulk(email_session, labels)
+    analysis_session.execute(insert(EmailAnalysis), analyses)
+    email_session.commit()
+    analysis_session.commit()
+
+
+def per_section(email_session, analysis_session) -> None:
+    """Compute the report the way the per-section methods do."""
+    analytics = EmailAnalytics(email_session, analysis_session)
+    analytics.get_total_emails()
+    analytics.get_top_senders()
+    analytics.get_email_by_date()
+    analytics.get_label_distribution()
+    analytics.get_priority_distribution()
+    analytics.get_sentiment_distribution()
+    analytics.get_category_distribution()
+    analytics.get_analysis_by_date()
+    # The old recent-analysis section loaded every joined analysis
+    join = AnalysisEmailJoin(analysis_session, email_session)
+    list(join.iter_rows(order_by=(EmailAnalysis.created_at.desc(),)))[:10]
+
+
+def single_pass(email_session, analysis_session) -> None:
+    """Compute the report with one ReportEngine pass."""
+    ReportEngine(email_session, analysis_session).run()
+
+
+def time_runs(method: Callable, sessions: tuple, runs: int) -> Dict[str, float]:
+    """Time a first run and the median of the following runs, in ms."""
+    timings = []
+    for _ in range(runs + 1):
+        started = time.perf_counter()
+        method(*sessions)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"first_ms": timings[0], "median_ms": statistics.median(timings[1:])}
+
+
+def main() -> int:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark report generation")
+    parser.add_argument("--emails", type=int, default=20000, help="Emails to seed")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per approach")
+    args = parser.parse_args()
+
+    results = {}
+    for name, method in (("per_section", per_section), ("single_pass", single_pass)):
+        # Fresh databases per approach so neither benefits from the other's work
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sessions = []
+            for db_name in ("email.db", "analysis.db"):
+                engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, db_name)}")
+                Base.metadata.create_all(engine)
+                sessions.append(sessionmaker(bind=engine)())
+            seed(*sessions, args.emails)
+            results[name] = time_runs(method, tuple(sessions), args.runs)
+            for session in sessions:
+                session.close()
+                session.get_bind().dispose()
+            email_labels.forget()
+
+    print(f"{'':<12}{'per_section':>14}{'single_pass':>14}")
+    for key in ("first_ms", "median_ms"):
+        print(
+            f"{key:<12}{results['per_section'][key]:>14.1f}"
+            f"{results['single_pass'][key]:>14.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
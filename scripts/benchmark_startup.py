@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark import time and startup time of the catalog chat interface.
+
+Each measurement runs in a fresh interpreter so module caches do not hide
+import costs. Reported numbers are medians over the given number of runs.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["anthropic", "dotenv", "pytest", "pandas"]
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from src.app_catalog import CatalogChat
+imported = time.perf_counter()
+chat = CatalogChat(db_path=sys.argv[1], mode="benchmark", lazy=sys.argv[2] == "lazy")
+ready = time.perf_counter()
+chat.registry.items()
+first_query = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "construct": ready - imported,
+    "first_query": first_query - ready,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_child(db_path: str, mode: str) -> Dict:
+    """Run one startup in a fresh interpreter and return its timings."""
+    env = dict(os.environ, ANTHROPIC_API_KEY=os.environ.get("ANTHROPIC_API_KEY", "benchmark"))
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, db_path, mode],
+        cwd=project_root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} startup failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(mode: str, runs: int) -> Dict:
+    """Benchmark startup against a new database and an existing one."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "catalog.db")
+        cold = run_child(db_path, mode)
+        warm: List[Dict] = [run_child(db_path, mode) for _ in range(runs)]
+
+    def median(key: str) -> float:
+        return statistics.median(result[key] for result in warm) * 1000
+
+    return {
+        "cold_total_ms": (cold["import"] + cold["construct"] + cold["first_query"]) * 1000,
+        "import_ms": median("import"),
+        "construct_ms": median("construct"),
+        "first_query_ms": median("first_query"),
+        "loaded": warm[-1]["loaded"],
+    }
+
+
+def main() -> int:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark catalog startup")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode")
+    args = parser.parse_args()
+
+    results = {mode: benchmark(mode, args.runs) for mode in ("eager", "lazy")}
+
+    print(f"{'':<18}{'eager':>12}{'lazy':>12}")
+    for key in ("import_ms", "construct_ms", "first_query_ms", "cold_total_ms"):
+        print(f"{key:<18}{results['eager'][key]:>12.1f}{results['lazy'][key]:>12.1f}")
+    for mode, result in results.items():
+        print(f"{mode} heavy modules loaded: {', '.join(result['loaded']) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
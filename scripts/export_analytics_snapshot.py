@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Export emails and their analyses to the columnar reporting snapshot.
+
+Each run appends what changed since the previous one. Schedule it after
+ingestion and analysis, then run reports with --snapshot.
+
+Usage:
+    python scripts/export_analytics_snapshot.py [--rebuild] [--compact] [--dir PATH]
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from services import analytics_snapshot
+from shared_lib.database_session_util import get_analysis_session, get_email_session
+
+
+def main() -> int:
+    """Export, and optionally compact, the snapshot."""
+    parser = argparse.ArgumentParser(description="Export the reporting snapshot")
+    parser.add_argument("--dir", help="Snapshot directory")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Discard the snapshot and export everything"
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="Rewrite each month as a single file"
+    )
+    args = parser.parse_args()
+
+    with get_email_session() as email_session, get_analysis_session() as analysis_session:
+        written = analytics_snapshot.export(
+            email_session, analysis_session, args.dir, rebuild=args.rebuild
+        )
+    print(f"Exported {written} rows")
+    if args.compact:
+        print(f"Compacted {analytics_snapshot.compact(args.dir)} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
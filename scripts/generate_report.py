@@ -1,240 +1,353 @@
 #!/usr/bin/env python3
+"""Generate HTML reports of analysed and sent emails.
+
+Rows are streamed from the databases in chunks and rendered with Jinja's
+stream(), so each page is written to disk while it is rendered and peak
+memory does not grow with the mailbox. A report with more rows than the
+page size is split into numbered page files next to the output file, and
+the output file becomes an index page linking them.
+
+Usage:
+    python scripts/generate_report.py [--sent] [--output PATH] [--page-size N]
+"""
+
+import argparse
+import glob
 import os
 import sys
 from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
 
-import pandas as pd
-from constants import DATABASE_CONFIG
-from jinja2 import BaseLoader, Environment
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from jinja2 import DictLoader, Environment
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from models.email import Email
 from models.email_analysis import EmailAnalysis
-
-
-def generate_html_report():
-    # Create SQLAlchemy engine and session
-    analysis_db_path = "data/db_email_analysis.db"
-    email_db_path = "data/db_email_store.db"
-
-    if not os.path.exists(analysis_db_path) or not os.path.exists(email_db_path):
-        print(f"Database files not found!")
-        return
-
-    # Create SQLAlchemy engine
-    engine = create_engine(f"sqlite:///{analysis_db_path}?check_same_thread=False")
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    try:
-        # Query the data using SQLAlchemy
-        query = text(
-            """
-        SELECT
-            e.subject,
-            e.from_ as from_address,
-            a.priority_score,
-            a.priority_reason,
-            a.analysis_date,
-            a.sentiment
-        FROM emails e
-        JOIN email_analysis a ON e.id = a.email_id
-        ORDER BY a.analysis_date DESC, a.priority_score DESC
-        """
-        )
-
-        # Execute query
-        result = session.execute(query)
-        rows = result.fetchall()
-
-        if not rows:
-            print("No analyzed emails found in the database!")
-            return
-
-        print(f"Found {len(rows)} analyzed emails")
-
-        # Convert rows to dictionaries for template rendering
-        emails = []
-        for row in rows:
-            email_dict = dict(row)
-            # Format dates
-            if email_dict["analysis_date"]:
-                email_dict["analysis_date"] = email_dict["analysis_date"].strftime(
-                    "%Y-%m-%d %H:%M:%S"
-                )
-            emails.append(email_dict)
-
-        # Generate HTML report using template
-        template = Environment(loader=BaseLoader()).from_string(
-            """
-        <html>
-        <head>
-            <title>Email Analysis Report</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                table { border-collapse: collapse; width: 100%; }
-                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                th { background-color: #f2f2f2; }
-                tr:nth-child(even) { background-color: #f9f9f9; }
-                .high { color: red; }
-                .medium { color: orange; }
-                .low { color: green; }
-            </style>
-        </head>
-        <body>
-            <h1>Email Analysis Report</h1>
-            <p>Generated on: {{ generation_date }}</p>
-            <table>
-                <tr>
-                    <th>Subject</th>
-                    <th>From</th>
-                    <th>Priority</th>
-                    <th>Reason</th>
-                    <th>Sentiment</th>
-                    <th>Analysis Date</th>
-                </tr>
-                {% for email in emails %}
-                <tr>
-                    <td>{{ email.subject }}</td>
-                    <td>{{ email.from_address }}</td>
-                    <td class="{{ 'high' if email.priority_score > 0.7 else 'medium' if email.priority_score > 0.4 else 'low' }}">
-                        {{ "%.2f"|format(email.priority_score) }}
-                    </td>
-                    <td>{{ email.priority_reason }}</td>
-                    <td>{{ email.sentiment }}</td>
-                    <td>{{ email.analysis_date }}</td>
-                </tr>
-                {% endfor %}
-            </table>
-        </body>
-        </html>
-        """
+from services.analysis_join import AnalysisEmailJoin
+from shared_lib.database_session_util import get_analysis_session, get_email_session
+
+DEFAULT_PAGE_SIZE = 5000
+DEFAULT_CHUNK_SIZE = 1000
+ANALYSIS_REPORT = "reports/email_analysis_report.html"
+SENT_REPORT = "reports/sent_emails_report.html"
+# Emails from these addresses count as sent
+SENT_FROM_PATTERN = "%@gmail.com"
+PREVIEW_LENGTH = 200
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+TEMPLATES = {
+    "base.html": """<html>
+<head>
+    <title>{{ title }}{% if page %} (page {{ page }}){% endif %}</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        .high { color: red; }
+        .medium { color: orange; }
+        .low { color: green; }
+    </style>
+</head>
+<body>
+    <h1>{{ title }}</h1>
+    <p>Generated on: {{ generation_date }}</p>
+    {% block content %}{% endblock %}
+    {% if page and (page > 1 or pager.has_more()) %}
+    <p>
+        <a href="{{ index }}">Index</a>
+        {% if page > 1 %}| <a href="{{ page_name(page - 1) }}">Previous</a>{% endif %}
+        {% if pager.has_more() %}| <a href="{{ page_name(page + 1) }}">Next</a>{% endif %}
+    </p>
+    {% endif %}
+</body>
+</html>
+""",
+    "analysis.html": """{% extends "base.html" %}
+{% block content %}
+    <table>
+        <tr>
+            <th>Subject</th>
+            <th>From</th>
+            <th>Priority</th>
+            <th>Category</th>
+            <th>Summary</th>
+            <th>Sentiment</th>
+            <th>Analysis Date</th>
+        </tr>
+        {% for email in rows %}
+        <tr>
+            <td>{{ email.subject }}</td>
+            <td>{{ email.from_address }}</td>
+            <td class="{{ email.priority }}">{{ email.priority }}</td>
+            <td>{{ email.category }}</td>
+            <td>{{ email.summary }}</td>
+            <td>{{ email.sentiment }}</td>
+            <td>{{ email.analysis_date }}</td>
+        </tr>
+        {% endfor %}
+    </table>
+{% endblock %}
+""",
+    "sent.html": """{% extends "base.html" %}
+{% block content %}
+    <table>
+        <tr>
+            <th>Subject</th>
+            <th>To</th>
+            <th>Date</th>
+            <th>Content Preview</th>
+        </tr>
+        {% for email in rows %}
+        <tr>
+            <td>{{ email.subject }}</td>
+            <td>{{ email.to }}</td>
+            <td>{{ email.date }}</td>
+            <td>{{ email.body }}</td>
+        </tr>
+        {% endfor %}
+    </table>
+{% endblock %}
+""",
+    "index.html": """{% extends "base.html" %}
+{% block content %}
+    <p>{{ total }} rows in {{ pages|length }} pages</p>
+    <ul>
+        {% for page in pages %}
+        <li><a href="{{ page.name }}">Page {{ page.number }}</a>
+            (rows {{ page.first }}-{{ page.last }})</li>
+        {% endfor %}
+    </ul>
+{% endblock %}
+""",
+}
+
+environment = Environment(loader=DictLoader(TEMPLATES), autoescape=True)
+
+_END = object()
+
+
+class Pager:
+    """Splits a row iterator into pages without reading ahead more than a row."""
+
+    def __init__(self, rows: Iterable[Dict], page_size: int):
+        self._rows = iter(rows)
+        self.page_size = page_size
+        self._next = next(self._rows, _END)
+
+    def has_more(self) -> bool:
+        """Whether rows remain after the ones handed out so far."""
+        return self._next is not _END
+
+    def page(self) -> Iterator[Dict]:
+        """Yield the rows of the next page."""
+        for _ in range(self.page_size):
+            if self._next is _END:
+                return
+            row, self._next = self._next, next(self._rows, _END)
+            yield row
+
+
+def _page_prefix(output_file: str) -> str:
+    return os.path.splitext(output_file)[0] + "-page-"
+
+
+def _page_path(output_file: str, number: int) -> str:
+    extension = os.path.splitext(output_file)[1] or ".html"
+    return f"{_page_prefix(output_file)}{number:04d}{extension}"
+
+
+def write_report(
+    template_name: str,
+    rows: Iterable[Dict],
+    output_file: str,
+    title: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> int:
+    """Stream rows through a template into one or more HTML files.
+
+    Args:
+        template_name: Template that renders a page of rows
+        rows: Rows to render, consumed once
+        output_file: Report path; the index page if there are several pages
+        title: Report title
+        page_size: Rows per page file
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If page_size is less than 1
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    for stale in glob.glob(glob.escape(_page_prefix(output_file)) + "*"):
+        os.remove(stale)
+
+    template = environment.get_template(template_name)
+    generation_date = datetime.now().strftime(DATE_FORMAT)
+    pager = Pager(rows, page_size)
+    pages: List[Dict[str, Any]] = []
+    total = 0
+    while not pages or pager.has_more():
+        number = len(pages) + 1
+        counted = 0
+
+        def page_rows() -> Iterator[Dict]:
+            nonlocal counted
+            for row in pager.page():
+                counted += 1
+                yield row
+
+        path = _page_path(output_file, number)
+        template.stream(
+            rows=page_rows(),
+            title=title,
+            generation_date=generation_date,
+            page=number,
+            pager=pager,
+            index=os.path.basename(output_file),
+            page_name=lambda n: os.path.basename(_page_path(output_file, n)),
+        ).dump(path)
+        pages.append(
+            {
+                "number": number,
+                "name": os.path.basename(path),
+                "first": total + 1,
+                "last": total + counted,
+            }
         )
+        total += counted
 
-        html = template.render(
-            emails=emails, generation_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
-
-        # Write HTML report to file
-        with open("reports/email_analysis_report.html", "w") as f:
-            f.write(html)
-
-        print("Report generated successfully!")
-
-    except Exception as e:
-        print(f"Error generating report: {str(e)}")
-
-    finally:
-        session.close()
-
-
-def generate_sent_emails_report(output_file="reports/sent_emails_report.html"):
-    """Generate a report of sent emails."""
-    # Create SQLAlchemy engine and session
-    email_db_path = "data/db_email_store.db"
-
-    if not os.path.exists(email_db_path):
-        print(f"Email database not found!")
-        return
-
-    # Create SQLAlchemy engine
-    engine = create_engine(f"sqlite:///{email_db_path}?check_same_thread=False")
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    try:
-        # Query sent emails using SQLAlchemy
-        sent_emails = (
-            session.query(Email)
-            .filter(Email.from_.like("%@gmail.com"))
-            .order_by(Email.received_date.desc())
-            .all()
+    if len(pages) == 1:
+        os.replace(_page_path(output_file, 1), output_file)
+    else:
+        environment.get_template("index.html").stream(
+            title=title, generation_date=generation_date, pages=pages, total=total
+        ).dump(output_file)
+    return total
+
+
+def _format_date(value: Optional[datetime]) -> str:
+    return value.strftime(DATE_FORMAT) if value else ""
+
+
+def iter_analysis_rows(
+    analysis_session: Session,
+    email_session: Session,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict]:
+    """Stream analysed emails, newest analysis first."""
+    join = AnalysisEmailJoin(analysis_session, email_session, batch_size=chunk_size)
+    for analysis, email in join.iter_rows(
+        order_by=(EmailAnalysis.created_at.desc(), EmailAnalysis.email_id)
+    ):
+        yield {
+            "subject": email.subject,
+            "from_address": email.from_address,
+            "priority": analysis.priority,
+            "category": analysis.category,
+            "summary": analysis.summary,
+            "sentiment": analysis.sentiment,
+            "analysis_date": _format_date(analysis.created_at),
+        }
+        # Rows are not kept, so don't let the identity map keep them either
+        analysis_session.expunge(analysis)
+
+
+def iter_sent_rows(
+    email_session: Session, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Dict]:
+    """Stream sent emails, newest first, with the start of their bodies."""
+    result = email_session.execute(
+        select(
+            Email.subject,
+            Email.to_address,
+            Email.received_at,
+            # One character more than the preview shows tells if it was cut
+            func.substr(Email.body, 1, PREVIEW_LENGTH + 1),
         )
-
-        if not sent_emails:
-            print("No sent emails found!")
-            return
-
-        print(f"Found {len(sent_emails)} sent emails")
-
-        # Convert to list of dictionaries for template
-        emails = []
-        for email in sent_emails:
-            emails.append(
-                {
-                    "subject": email.subject,
-                    "to": email.to,
-                    "date": (
-                        email.received_date.strftime("%Y-%m-%d %H:%M:%S")
-                        if email.received_date
-                        else ""
-                    ),
-                    "body": (
-                        email.body[:200] + "..."
-                        if len(email.body or "") > 200
-                        else email.body
-                    ),
-                }
-            )
-
-        # Generate HTML report
-        template = Environment(loader=BaseLoader()).from_string(
-            """
-        <html>
-        <head>
-            <title>Sent Emails Report</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                table { border-collapse: collapse; width: 100%; }
-                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                th { background-color: #f2f2f2; }
-                tr:nth-child(even) { background-color: #f9f9f9; }
-            </style>
-        </head>
-        <body>
-            <h1>Sent Emails Report</h1>
-            <p>Generated on: {{ generation_date }}</p>
-            <table>
-                <tr>
-                    <th>Subject</th>
-                    <th>To</th>
-                    <th>Date</th>
-                    <th>Content Preview</th>
-                </tr>
-                {% for email in emails %}
-                <tr>
-                    <td>{{ email.subject }}</td>
-                    <td>{{ email.to }}</td>
-                    <td>{{ email.date }}</td>
-                    <td>{{ email.body }}</td>
-                </tr>
-                {% endfor %}
-            </table>
-        </body>
-        </html>
-        """
+        .where(Email.from_address.like(SENT_FROM_PATTERN))
+        .order_by(Email.received_at.desc(), Email.id),
+        execution_options={"yield_per": chunk_size},
+    )
+    for subject, to_address, received_at, body in result:
+        if body and len(body) > PREVIEW_LENGTH:
+            body = body[:PREVIEW_LENGTH] + "..."
+        yield {
+            "subject": subject,
+            "to": to_address,
+            "date": _format_date(received_at),
+            "body": body,
+        }
+
+
+def generate_html_report(
+    output_file: str = ANALYSIS_REPORT, page_size: int = DEFAULT_PAGE_SIZE
+) -> int:
+    """Generate the report of analysed emails. Returns the number of rows."""
+    with get_analysis_session() as analysis_session, get_email_session() as email_session:
+        total = write_report(
+            "analysis.html",
+            iter_analysis_rows(analysis_session, email_session),
+            output_file,
+            "Email Analysis Report",
+            page_size,
         )
-
-        html = template.render(
-            emails=emails, generation_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if total:
+        print(f"Wrote {total} analyzed emails to {output_file}")
+    else:
+        print("No analyzed emails found in the database!")
+    return total
+
+
+def generate_sent_emails_report(
+    output_file: str = SENT_REPORT, page_size: int = DEFAULT_PAGE_SIZE
+) -> int:
+    """Generate the report of sent emails. Returns the number of rows."""
+    with get_email_session() as email_session:
+        total = write_report(
+            "sent.html",
+            iter_sent_rows(email_session),
+            output_file,
+            "Sent Emails Report",
+            page_size,
         )
-
-        # Write report to file
-        with open(output_file, "w") as f:
-            f.write(html)
-
-        print(f"Report generated successfully at {output_file}")
-
-    except Exception as e:
-        print(f"Error generating report: {str(e)}")
-
-    finally:
-        session.close()
+    if total:
+        print(f"Wrote {total} sent emails to {output_file}")
+    else:
+        print("No sent emails found!")
+    return total
+
+
+def main() -> int:
+    """Generate the requested report."""
+    parser = argparse.ArgumentParser(description="Generate an HTML email report")
+    parser.add_argument("--sent", action="store_true", help="Report sent emails")
+    parser.add_argument("--output", help="Report path (the index page if paginated)")
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help="Rows per page before the report is split into several files",
+    )
+    args = parser.parse_args()
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+
+    if args.sent:
+        generate_sent_emails_report(args.output or SENT_REPORT, args.page_size)
+    else:
+        generate_html_report(args.output or ANALYSIS_REPORT, args.page_size)
+    return 0
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == "--sent":
-        generate_sent_emails_report()
-    else:
-        generate_html_report()
+    sys.exit(main())
@@ -2,23 +2,28 @@
 
 import argparse
 import ast
+import hashlib
 import os
 import sys
-from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, delete, insert, tuple_, update
+from sqlalchemy.orm import sessionmaker
 
+from models.asset_catalog import AssetCatalogItem, AssetDependency, AssetScanManifest
 from models.base import Base
+from services import asset_closure
 from services.asset_catalog_service import AssetCatalogService, AssetType
-from shared_lib.database_session_util import get_analysis_session
+from shared_lib.module_index_util import ModuleIndex
+
+IMPORT_DEPENDENCY = "imports"
 
 
 def get_file_language(file_path: str) -> str:
@@ -41,48 +46,120 @@ def get_file_language(file_path: str) -> str:
     return language_map.get(ext, "unknown")
 
 
-def get_python_imports(file_path: str) -> Set[str]:
-    """Extract Python imports from a file."""
+class FileAnalysis(NamedTuple):
+    """Everything the catalog records about one file."""
+
+    language: str
+    asset_type: str
+    docstring: str
+    imports: List[str]
+    metadata: Dict
+    warnings: List[str]
+
+
+def parse_python_source(source: str) -> Tuple[Set[str], Optional[str]]:
+    """Extract imports and the module docstring with a single parse.
+
+    Relative imports keep one leading dot per level ("from ..pkg import mod"
+    is recorded as "..pkg.mod") so they can be resolved against the file.
+
+    Raises:
+        SyntaxError, ValueError: If the source cannot be parsed
+    """
     imports = set()
-    try:
-        with open(file_path, "r") as f:
-            tree = ast.parse(f.read())
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    imports.add(name.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for name in node.names:
-                    if module:
-                        imports.add(f"{module}.{name.name}")
-                    else:
-                        imports.add(name.name)
-    except Exception as e:
-        print(f"Warning: Could not parse imports from {file_path}: {e}")
+    tree = ast.parse(source)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for name in node.names:
+                imports.add(name.name)
+        elif isinstance(node, ast.ImportFrom):
+            prefix = "." * node.level + (f"{node.module}." if node.module else "")
+            for name in node.names:
+                if name.name == "*":
+                    imports.add(prefix.rstrip(".") if node.module else prefix)
+                else:
+                    imports.add(prefix + name.name)
 
-    return imports
+    return imports, ast.get_docstring(tree)
 
 
-def get_file_metadata(file_path: str) -> Dict:
-    """Get metadata for a file."""
-    metadata = {
-        "size": os.path.getsize(file_path),
-        "last_modified": int(os.path.getmtime(file_path)),
-    }
+def analyze_file(rel_path: str, content: bytes, stat: os.stat_result) -> FileAnalysis:
+    """Analyze a file's content: language, type, docstring and imports."""
+    language = get_file_language(rel_path)
+    metadata = {"size": stat.st_size, "last_modified": int(stat.st_mtime)}
 
-    # For Python files, extract docstring
-    if file_path.endswith(".py"):
+    imports: Set[str] = set()
+    docstring = None
+    warnings = []
+    if language == "python":
         try:
-            with open(file_path, "r") as f:
-                tree = ast.parse(f.read())
-            if ast.get_docstring(tree):
-                metadata["docstring"] = ast.get_docstring(tree)
-        except Exception as e:
-            print(f"Warning: Could not extract docstring from {file_path}: {e}")
+            imports, docstring = parse_python_source(
+                content.decode("utf-8", errors="replace")
+            )
+        except (SyntaxError, ValueError) as e:
+            warnings.append(f"Warning: Could not parse {rel_path}: {e}")
+        if docstring:
+            metadata["docstring"] = docstring
+
+    return FileAnalysis(
+        language=language,
+        asset_type=determine_asset_type(rel_path).value,
+        docstring=docstring or "",
+        imports=sorted(imports),
+        metadata=metadata,
+        warnings=warnings,
+    )
+
+
+class FileTask(NamedTuple):
+    """A file that needs to be read and possibly analyzed."""
+
+    file_path: str
+    rel_path: str
+    known_hash: Optional[str]  # Content hash from a current manifest entry
 
-    return metadata
+
+class FileResult(NamedTuple):
+    """Outcome of processing one FileTask."""
+
+    rel_path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    analysis: Optional[FileAnalysis]  # None when the content is unchanged
+    error: Optional[str]
+
+
+def process_file(task: FileTask) -> FileResult:
+    """Read, hash and analyze one file.
+
+    Runs in worker processes, so it only returns data and never prints.
+    """
+    try:
+        stat = os.stat(task.file_path)
+        with open(task.file_path, "rb") as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        analysis = None
+        if content_hash != task.known_hash:
+            analysis = analyze_file(task.rel_path, content, stat)
+        return FileResult(
+            task.rel_path, stat.st_size, stat.st_mtime_ns, content_hash, analysis, None
+        )
+    except Exception as e:
+        return FileResult(task.rel_path, 0, 0, "", None, str(e))
+
+
+def process_files(tasks: List[FileTask], jobs: int = 1) -> Iterator[FileResult]:
+    """Process files in order, fanning out to worker processes if jobs > 1."""
+    if jobs <= 1 or len(tasks) < 2:
+        yield from map(process_file, tasks)
+        return
+
+    chunksize = max(1, min(64, len(tasks) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # map() yields in submission order, so output matches the serial run
+        yield from executor.map(process_file, tasks, chunksize=chunksize)
 
 
 def determine_asset_type(file_path: str) -> str:
@@ -106,91 +183,259 @@ def determine_asset_type(file_path: str) -> str:
         return AssetType.CODE
 
 
+@dataclass
+class ScanSummary:
+    """What changed during a scan."""
+
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    relinked: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        """Render the summary for the console."""
+        lines = [
+            f"Scan complete: {len(self.added)} added, {len(self.updated)} updated, "
+            f"{len(self.deleted)} deleted, {self.unchanged} unchanged, "
+            f"{self.relinked} dependency sets changed, {len(self.errors)} errors"
+        ]
+        for label, paths in (
+            ("Added", self.added),
+            ("Updated", self.updated),
+            ("Deleted", self.deleted),
+            ("Errors", self.errors),
+        ):
+            lines.extend(f"  {label}: {path}" for path in paths)
+        return "\n".join(lines)
+
+
+def walk_files(
+    directory: str, exclude_dirs: Set[str], exclude_files: Set[str]
+) -> Iterator[Tuple[str, str]]:
+    """Yield (absolute path, relative path) for every file, in sorted order."""
+    for root, dirs, files in os.walk(directory):
+        # Skip excluded directories
+        dirs[:] = sorted(d for d in dirs if d not in exclude_dirs)
+
+        for file in sorted(files):
+            if file in exclude_files:
+                continue
+            file_path = os.path.join(root, file)
+            yield file_path, os.path.normpath(os.path.relpath(file_path, directory))
+
+
 def scan_directory(
     directory: str,
     service: AssetCatalogService,
     exclude_dirs: List[str] = None,
     exclude_files: List[str] = None,
-):
-    """Scan a directory and add its contents to the asset catalog."""
+    full: bool = False,
+    jobs: int = 1,
+) -> ScanSummary:
+    """Scan a directory and sync the asset catalog with its contents.
+
+    Files whose size and mtime, or content hash, match the scan manifest are
+    skipped. Changed files are parsed once, in ``jobs`` worker processes,
+    and a single writer applies the results in bulk. Files missing since the
+    last scan are tombstoned in the manifest and their assets deleted.
+
+    Args:
+        directory: Directory to scan
+        service: Asset catalog service whose session is written to
+        exclude_dirs: Directory names to skip
+        exclude_files: File names to skip
+        full: Reprocess every file regardless of the manifest
+        jobs: Number of worker processes for file analysis
+
+    Returns:
+        Summary of the changes made
+    """
     exclude_dirs = set(exclude_dirs or [])
     exclude_files = set(exclude_files or [])
+    summary = ScanSummary()
+    now = int(datetime.utcnow().timestamp())
+
+    with service.session_scope() as session:
+        manifest = {
+            entry.file_path: entry for entry in session.query(AssetScanManifest).all()
+        }
+        asset_ids = {
+            file_path: asset_id
+            for asset_id, file_path in session.query(
+                AssetCatalogItem.id, AssetCatalogItem.file_path
+            ).filter(
+                AssetCatalogItem.deleted == False,  # noqa: E712
+                AssetCatalogItem.file_path.isnot(None),
+            )
+        }
+
+        # Decide what needs reading from the manifest alone
+        seen = set()
+        tasks = []
+        for file_path, rel_path in walk_files(directory, exclude_dirs, exclude_files):
+            seen.add(rel_path)
+            entry = manifest.get(rel_path)
+            current = (
+                not full
+                and entry is not None
+                and not entry.deleted
+                and entry.asset_id == asset_ids.get(rel_path)
+            )
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                summary.errors.append(f"{rel_path}: {e}")
+                print(f"Error processing {file_path}: {e}")
+                continue
+            if (
+                current
+                and entry.size == stat.st_size
+                and entry.mtime_ns == stat.st_mtime_ns
+            ):
+                summary.unchanged += 1
+                continue
+            tasks.append(
+                FileTask(file_path, rel_path, entry.content_hash if current else None)
+            )
+
+        # Single writer: apply results in walk order
+        updated_ids = [
+            asset_ids[task.rel_path] for task in tasks if task.rel_path in asset_ids
+        ]
+        assets = {
+            asset.id: asset
+            for asset in session.query(AssetCatalogItem)
+            .filter(AssetCatalogItem.id.in_(updated_ids))
+            .all()
+        }
+        new_assets = []
+        for result in process_files(tasks, jobs):
+            rel_path = result.rel_path
+            if result.error is not None:
+                summary.errors.append(f"{rel_path}: {result.error}")
+                print(f"Error processing {os.path.join(directory, rel_path)}: {result.error}")
+                continue
 
-    # Walk through all files in the directory
-    for root, dirs, files in os.walk(directory):
-        # Skip excluded directories
-        dirs[:] = [d for d in dirs if d not in exclude_dirs]
+            entry = manifest.get(rel_path)
+            if entry is None:
+                entry = manifest[rel_path] = AssetScanManifest(file_path=rel_path)
+                session.add(entry)
+            entry.size, entry.mtime_ns = result.size, result.mtime_ns
+            entry.scanned_date = now
+
+            analysis = result.analysis
+            if analysis is None:
+                # Touched but not modified
+                summary.unchanged += 1
+                continue
 
-        for file in files:
-            if file in exclude_files:
+            for warning in analysis.warnings:
+                print(warning)
+            entry.content_hash = result.content_hash
+            entry.imports = analysis.imports
+            entry.deleted = False
+
+            fields = dict(
+                title=os.path.basename(rel_path),
+                asset_type=analysis.asset_type,
+                description=analysis.docstring,
+                language=analysis.language,
+                asset_metadata=analysis.metadata,
+                modified_date=now,
+            )
+            asset_id = asset_ids.get(rel_path)
+            if asset_id is not None:
+                asset = assets[asset_id]
+                for name, value in fields.items():
+                    setattr(asset, name, value)
+                summary.updated.append(rel_path)
+                print(f"Updated asset: {rel_path} ({analysis.asset_type})")
+            else:
+                asset = AssetCatalogItem(file_path=rel_path, created_date=now, **fields)
+                new_assets.append((entry, asset))
+                summary.added.append(rel_path)
+                print(f"Added asset: {rel_path} ({analysis.asset_type})")
+
+        # One batched INSERT for all new assets
+        session.add_all(asset for _, asset in new_assets)
+        session.flush()
+        for entry, asset in new_assets:
+            entry.asset_id = asset_ids[asset.file_path] = asset.id
+
+        # Tombstone files that disappeared since the last scan
+        removed_ids = []
+        for rel_path, entry in sorted(manifest.items()):
+            if rel_path in seen or entry.deleted:
+                continue
+            entry.deleted = True
+            entry.scanned_date = now
+            asset_id = asset_ids.pop(rel_path, None)
+            if asset_id is not None:
+                removed_ids.append(asset_id)
+            summary.deleted.append(rel_path)
+            print(f"Deleted asset: {rel_path}")
+        if removed_ids:
+            session.execute(
+                update(AssetCatalogItem)
+                .where(AssetCatalogItem.id.in_(removed_ids))
+                .values(deleted=True, status="deleted", modified_date=now)
+            )
+
+        # Imports are stored in the manifest, so unchanged files are relinked
+        # against added or removed assets without being parsed again
+        current_targets: Dict[int, Set[int]] = {}
+        for source_id, target_id in session.query(
+            AssetDependency.source_id, AssetDependency.target_id
+        ).filter(AssetDependency.dependency_type == IMPORT_DEPENDENCY):
+            current_targets.setdefault(source_id, set()).add(target_id)
+
+        index = ModuleIndex(asset_ids)
+        changed_sources = []
+        stale = []
+        edges = []
+        for rel_path, entry in sorted(manifest.items()):
+            if entry.deleted or entry.asset_id is None:
+                continue
+            targets = set(index.resolve(rel_path, entry.imports or []))
+            current = current_targets.get(entry.asset_id, set())
+            if targets == current:
                 continue
+            changed_sources.append(entry.asset_id)
+            stale.extend((entry.asset_id, target_id) for target_id in current - targets)
+            edges.extend(
+                {
+                    "source_id": entry.asset_id,
+                    "target_id": target_id,
+                    "dependency_type": IMPORT_DEPENDENCY,
+                }
+                for target_id in sorted(targets - current)
+            )
+        summary.relinked = len(changed_sources)
+
+        # Only import edges are managed here; edges of other types stay put
+        if stale:
+            session.execute(
+                delete(AssetDependency).where(
+                    AssetDependency.dependency_type == IMPORT_DEPENDENCY,
+                    tuple_(AssetDependency.source_id, AssetDependency.target_id).in_(
+                        stale
+                    ),
+                )
+            )
+        if edges:
+            session.execute(
+                insert(AssetDependency).prefix_with("OR IGNORE", dialect="sqlite"),
+                edges,
+            )
+        session.flush()
+        if changed_sources or removed_ids:
+            asset_closure.refresh(session, changed_sources, removed_ids)
 
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, directory)
+        session.commit()
 
-            try:
-                # Get file metadata
-                metadata = get_file_metadata(file_path)
-
-                # Get file language
-                language = get_file_language(file_path)
-
-                # Get dependencies for Python files
-                dependencies = []
-                if language == "python":
-                    try:
-                        dependencies = list(get_python_imports(file_path))
-                    except Exception as e:
-                        print(f"Warning: Could not parse imports from {file_path}: {e}")
-
-                # Determine asset type
-                asset_type = determine_asset_type(rel_path)
-
-                # Check if asset already exists
-                existing_assets = service.search_assets(file_path=rel_path)
-                if existing_assets:
-                    # Update existing asset
-                    asset = existing_assets[0]
-                    asset.title = os.path.basename(file_path)
-                    asset.description = metadata.get("docstring", "")
-                    asset.language = language
-                    asset.dependencies = dependencies
-                    asset.asset_metadata = metadata
-                    asset.asset_type = asset_type
-                    asset.modified_date = int(datetime.utcnow().timestamp())
-                    print(f"Updated asset: {rel_path} ({asset_type})")
-                else:
-                    # Create new asset
-                    asset = service.add_asset(
-                        title=os.path.basename(file_path),
-                        file_path=rel_path,
-                        asset_type=asset_type,
-                        description=metadata.get("docstring", ""),
-                        language=language,
-                        dependencies=dependencies,
-                        metadata=metadata,
-                    )
-                    print(f"Added asset: {rel_path} ({asset_type})")
-
-                # Add dependencies
-                if dependencies:
-                    for dep in dependencies:
-                        try:
-                            # Find the dependency in the catalog
-                            dep_assets = service.search_assets(file_path=f"{dep}.py")
-                            if dep_assets:
-                                service.add_dependency(
-                                    source_id=asset.id,
-                                    target_id=dep_assets[0].id,
-                                    dependency_type="import",
-                                )
-                        except Exception as e:
-                            print(
-                                f"Warning: Could not add dependency {rel_path} -> {dep}.py: {e}"
-                            )
-
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
+    return summary
 
 
 def main():
@@ -212,12 +457,24 @@ def main():
     parser.add_argument(
         "--exclude-files", "-F", nargs="*", default=[], help="Files to exclude"
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Reprocess every file, ignoring the scan manifest",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes for file analysis (default: 1)",
+    )
     args = parser.parse_args()
 
     # Initialize database
     engine = create_engine("sqlite:///data/asset_catalog.db")
     Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
     session = Session()
 
     try:
@@ -225,12 +482,15 @@ def main():
         service = AssetCatalogService(session)
 
         # Scan directory
-        scan_directory(
+        summary = scan_directory(
             args.directory,
             service,
             exclude_dirs=args.exclude_dirs,
             exclude_files=args.exclude_files,
+            full=args.full,
+            jobs=args.jobs,
         )
+        print(summary.format())
 
         # Commit changes
         session.commit()
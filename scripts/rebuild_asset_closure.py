@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""Rebuild the asset dependency closure table from asset_dependencies.
+
+The closure table is maintained incrementally by AssetCatalogService; run
+this after bulk imports or direct edits to asset_dependencies.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from services.asset_catalog_service import AssetCatalogService
+
+
+def main() -> int:
+    """Rebuild the closure table and report its size."""
+    rows = AssetCatalogService().rebuild_dependency_closure()
+    print(f"Rebuilt asset closure: {rows} reachable pairs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Rebuild the report rollups from scratch.
+
+Rollups are normally kept current as emails and analyses are written; a
+rebuild is only needed after editing the databases by hand or to verify
+them.
+
+Usage:
+    python scripts/rebuild_report_rollups.py [--source emails|email_analysis]
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from services import report_rollups
+from shared_lib.database_session_util import get_analysis_session, get_email_session
+
+SESSIONS = {
+    "emails": get_email_session,
+    "email_analysis": get_analysis_session,
+}
+
+
+def main() -> int:
+    """Rebuild the rollups of one or all sources."""
+    parser = argparse.ArgumentParser(description="Rebuild the report rollups")
+    parser.add_argument(
+        "--source",
+        choices=sorted(report_rollups.SOURCES),
+        help="Rebuild only this source table",
+    )
+    args = parser.parse_args()
+
+    for name in [args.source] if args.source else list(report_rollups.SOURCES):
+        with SESSIONS[name]() as session:
+            count = report_rollups.rebuild(session.connection(), name)
+        print(f"{name}: {count} rows rolled up")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Joined reads over the email and analysis databases.
+
+Emails and their analyses live in separate SQLite files, so pairing each
+analysis with its email used to cost one email query per analysis.
+AnalysisEmailJoin reads them together using the cheapest available strategy:
+
+1. join: both sessions use the same database, so a plain join works
+2. attach: the email database is a SQLite file, so it is ATTACHed to the
+   analysis connection and joined in one statement
+3. batched: anything else (in-memory or server databases); analyses are
+   streamed and their emails fetched with one IN query per batch
+
+Rows are streamed with yield_per, so memory use stays flat on large stores.
+"""
+
+from datetime import datetime
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import MetaData, Table, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+
+EMAIL_SCHEMA = "email_store"
+DEFAULT_BATCH_SIZE = 1000
+
+# The emails table as seen through ATTACH ... AS email_store
+ATTACHED_EMAILS: Table = Email.__table__.to_metadata(MetaData(), schema=EMAIL_SCHEMA)
+
+
+class EmailFields(NamedTuple):
+    """The email columns reports show next to an analysis."""
+
+    subject: Optional[str]
+    from_address: Optional[str]
+    received_at: Optional[datetime]
+
+
+JoinedRow = Tuple[EmailAnalysis, Optional[EmailFields]]
+
+
+def _database_path(session: Session) -> Optional[str]:
+    """Return the SQLite file behind a session, or None if there is none."""
+    url = session.get_bind().engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database
+
+
+class AnalysisEmailJoin:
+    """Streams analyses together with their emails."""
+
+    def __init__(
+        self,
+        analysis_session: Session,
+        email_session: Session,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """Initialize the join.
+
+        Args:
+            analysis_session: Session on the analysis database
+            email_session: Session on the email database
+            batch_size: Rows per streamed batch and ids per IN lookup
+        """
+        self.analysis_session = analysis_session
+        self.email_session = email_session
+        self.batch_size = batch_size
+
+    @property
+    def strategy(self) -> str:
+        """Which strategy iter_rows uses: "join", "attach" or "batched"."""
+        analysis_engine = self.analysis_session.get_bind().engine
+        email_engine = self.email_session.get_bind().engine
+        if analysis_engine is email_engine:
+            return "join"
+        email_path = _database_path(self.email_session)
+        if email_path is not None and email_path == _database_path(self.analysis_session):
+            return "join"
+        if email_path is not None and analysis_engine.dialect.name == "sqlite":
+            return "attach"
+        return "batched"
+
+    def iter_rows(
+        self,
+        *criteria,
+        order_by: Sequence = (),
+        email_ids: Optional[Iterable[str]] = None,
+        require_email: bool = True,
+    ) -> Iterator[JoinedRow]:
+        """Yield (analysis, email fields) pairs.
+
+        Args:
+            criteria: Filters on EmailAnalysis columns
+            order_by: Ordering on EmailAnalysis columns
+            email_ids: Restrict to these email ids (looked up in batches)
+            require_email: Skip analyses whose email is missing; otherwise
+                they are yielded with None for the email fields
+        """
+        if email_ids is not None:
+            email_ids = list(dict.fromkeys(email_ids))
+            for start in range(0, len(email_ids), self.batch_size):
+                chunk = email_ids[start : start + self.batch_size]
+                yield from self.iter_rows(
+                    EmailAnalysis.email_id.in_(chunk),
+                    *criteria,
+                    order_by=order_by,
+                    require_email=require_email,
+                )
+            return
+
+        strategy = self.strategy
+        if strategy == "attach":
+            try:
+                self._attach()
+            except OperationalError:
+                # ATTACH is refused inside an open write transaction
+                strategy = "batched"
+
+        if strategy == "batched":
+            yield from self._iter_batched(criteria, order_by, require_email)
+            return
+
+        emails = Email.__table__ if strategy == "join" else ATTACHED_EMAILS
+        statement = (
+            select(
+                EmailAnalysis,
+                emails.c.id,
+                emails.c.subject,
+                emails.c.from_address,
+                emails.c.received_at,
+            )
+            .join(
+                emails,
+                emails.c.id == EmailAnalysis.email_id,
+                isouter=not require_email,
+            )
+            .where(*criteria)
+            .order_by(*order_by)
+        )
+        result = self.analysis_session.execute(
+            statement, execution_options={"yield_per": self.batch_size}
+        )
+        try:
+            for analysis, email_id, *fields in result:
+                yield analysis, EmailFields(*fields) if email_id is not None else None
+        finally:
+            result.close()
+            if strategy == "attach":
+                self._detach()
+
+    def _attach(self) -> None:
+        """ATTACH the email database to the analysis connection."""
+        connection = self.analysis_session.connection()
+        attached = {row[1] for row in connection.exec_driver_sql("PRAGMA database_list")}
+        if EMAIL_SCHEMA not in attached:
+            connection.exec_driver_sql(
+                f"ATTACH DATABASE ? AS {EMAIL_SCHEMA}",
+                (_database_path(self.email_session),),
+            )
+
+    def _detach(self) -> None:
+        """DETACH the email database, leaving the connection as it was."""
+        try:
+            self.analysis_session.connection().exec_driver_sql(
+                f"DETACH DATABASE {EMAIL_SCHEMA}"
+            )
+        except OperationalError:
+            # Still in use by another open result; the next call reuses it
+            pass
+
+    def _iter_batched(
+        self, criteria: Sequence, order_by: Sequence, require_email: bool
+    ) -> Iterator[JoinedRow]:
+        """Stream analyses and fetch their emails one IN query per batch."""
+        result = self.analysis_session.execute(
+            select(EmailAnalysis).where(*criteria).order_by(*order_by),
+            execution_options={"yield_per": self.batch_size},
+        )
+        for batch in result.scalars().partitions():
+            emails = self._load_emails([analysis.email_id for analysis in batch])
+            for analysis in batch:
+                email = emails.get(analysis.email_id)
+                if email is not None or not require_email:
+                    yield analysis, email
+
+    def _load_emails(self, email_ids: List[str]) -> dict:
+        rows = self.email_session.execute(
+            select(Email.id, Email.subject, Email.from_address, Email.received_at).where(
+                Email.id.in_(email_ids)
+            )
+        )
+        return {row[0]: EmailFields(*row[1:]) for row in rows}
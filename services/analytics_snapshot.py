@@ -0,0 +1,275 @@
+"""Columnar snapshot of emails joined with their analyses.
+
+Reports read this snapshot instead of querying the SQLite stores, so they
+never contend with ingestion. The snapshot is a directory of Parquet files
+partitioned by the month an email was received:
+
+    <snapshot dir>/
+        _state.json                  # export watermark and sequence number
+        month=2024-01/part-000001.parquet
+        month=2024-01/part-000002.parquet
+        month=unknown/part-000001.parquet
+
+export() appends: it reads only emails and analyses whose updated_at is at
+or after the previous export's watermark and writes them as new part files.
+A re-exported email therefore has several rows; load() keeps the one from
+the latest export. compact() rewrites each month as a single file. Deleted
+emails are only dropped by a full export (rebuild=True).
+
+sender, sentiment, category and priority are stored and loaded as
+categoricals, so distributions over them are counts over integer codes.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from shared_lib.constants import DATABASE_CONFIG
+
+STATE_FILE = "_state.json"
+UNKNOWN_MONTH = "unknown"
+BATCH_SIZE = 1000
+# updated_at has one-second resolution, so exports overlap by a second;
+# the duplicate rows this produces are dropped on load
+WATERMARK_SLACK = timedelta(seconds=1)
+
+EMAIL_COLUMNS = {
+    "email_id": Email.id,
+    "thread_id": Email.thread_id,
+    "subject": Email.subject,
+    "sender": Email.from_address,
+    "received_at": Email.received_at,
+    "email_updated_at": Email.updated_at,
+}
+ANALYSIS_COLUMNS = {
+    "email_id": EmailAnalysis.email_id,
+    "sentiment": EmailAnalysis.sentiment,
+    "category": EmailAnalysis.category,
+    "priority": EmailAnalysis.priority,
+    "summary": EmailAnalysis.summary,
+    "analyzed_at": EmailAnalysis.created_at,
+    "analysis_updated_at": EmailAnalysis.updated_at,
+}
+CATEGORICAL_COLUMNS = ("sender", "sentiment", "category", "priority")
+DATETIME_COLUMNS = (
+    "received_at",
+    "email_updated_at",
+    "analyzed_at",
+    "analysis_updated_at",
+)
+SNAPSHOT_COLUMNS = (
+    list(EMAIL_COLUMNS)
+    + [name for name in ANALYSIS_COLUMNS if name != "email_id"]
+    + ["export_seq"]
+)
+
+
+def split_category(value) -> List[str]:
+    """Return the categories in a category value (plain or a JSON list)."""
+    if isinstance(value, str) and value.startswith("["):
+        try:
+            return [str(item) for item in json.loads(value) if item]
+        except json.JSONDecodeError:
+            pass
+    return [value] if value else []
+
+
+def default_directory() -> str:
+    """Return the configured snapshot directory."""
+    return DATABASE_CONFIG["ANALYTICS_SNAPSHOT_DIR"]
+
+
+def state(directory: Optional[str] = None) -> Dict:
+    """Return the snapshot's export watermark and sequence number."""
+    return _read_state(directory or default_directory())
+
+
+def _read_state(directory: str) -> Dict:
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return {"updated_through": None, "export_seq": 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_state(directory: str, state: Dict) -> None:
+    path = os.path.join(directory, STATE_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def _changed_ids(
+    session: Session, key_column, updated_column, since: Optional[datetime]
+) -> Set[str]:
+    """Ids of rows updated at or after a watermark (all rows if there is none)."""
+    statement = select(key_column)
+    if since is not None:
+        statement = statement.where(
+            or_(updated_column >= since, updated_column.is_(None))
+        )
+    return set(session.scalars(statement))
+
+
+def _frame(session: Session, columns: Dict, key_column, ids: List[str]) -> pd.DataFrame:
+    rows = session.execute(select(*columns.values()).where(key_column.in_(ids))).all()
+    return pd.DataFrame(rows, columns=list(columns))
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Give a snapshot frame its column set and dtypes."""
+    frame = frame.reindex(columns=SNAPSHOT_COLUMNS)
+    for name in DATETIME_COLUMNS:
+        frame[name] = pd.to_datetime(frame[name], utc=True)
+    for name in CATEGORICAL_COLUMNS:
+        frame[name] = frame[name].astype("category")
+    frame["export_seq"] = frame["export_seq"].astype("int64")
+    return frame
+
+
+def _month_keys(received_at: pd.Series) -> pd.Series:
+    return received_at.dt.strftime("%Y-%m").fillna(UNKNOWN_MONTH)
+
+
+def _write_parts(directory: str, frame: pd.DataFrame, seq: int) -> int:
+    """Write one part file per month. Returns the number of rows written."""
+    for month, part in frame.groupby(_month_keys(frame["received_at"]), sort=True):
+        month_dir = os.path.join(directory, f"month={month}")
+        os.makedirs(month_dir, exist_ok=True)
+        part.to_parquet(
+            os.path.join(month_dir, f"part-{seq:06d}.parquet"), index=False
+        )
+    return len(frame)
+
+
+def export(
+    email_session: Session,
+    analysis_session: Session,
+    directory: Optional[str] = None,
+    rebuild: bool = False,
+) -> int:
+    """Append changed emails and analyses to the snapshot.
+
+    Args:
+        email_session: Session on the email database
+        analysis_session: Session on the analysis database
+        directory: Snapshot directory, defaults to ANALYTICS_SNAPSHOT_DIR
+        rebuild: Discard the snapshot and export everything
+
+    Returns:
+        Number of rows written
+    """
+    directory = directory or default_directory()
+    if rebuild and os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory, exist_ok=True)
+    state = _read_state(directory)
+    since = state["updated_through"]
+    since = datetime.fromisoformat(since) - WATERMARK_SLACK if since else None
+
+    # Read the clock before the data, so rows written during the export
+    # are picked up again by the next one
+    started = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    ids = _changed_ids(email_session, Email.id, Email.updated_at, since)
+    ids |= _changed_ids(
+        analysis_session, EmailAnalysis.email_id, EmailAnalysis.updated_at, since
+    )
+
+    seq = state["export_seq"] + 1
+    ids = sorted(ids)
+    frames = []
+    for start in range(0, len(ids), BATCH_SIZE):
+        chunk = ids[start : start + BATCH_SIZE]
+        emails = _frame(email_session, EMAIL_COLUMNS, Email.id, chunk)
+        analyses = _frame(
+            analysis_session, ANALYSIS_COLUMNS, EmailAnalysis.email_id, chunk
+        )
+        frames.append(emails.merge(analyses, on="email_id", how="left"))
+
+    written = 0
+    if frames:
+        frame = pd.concat(frames, ignore_index=True)
+        frame["export_seq"] = seq
+        written = _write_parts(directory, _normalize(frame), seq)
+    _write_state(directory, {"updated_through": started.isoformat(), "export_seq": seq})
+    return written
+
+
+def _part_files(directory: str, months: Optional[Iterable[str]]) -> List[str]:
+    wanted = set(months) if months is not None else None
+    files = []
+    for entry in sorted(os.listdir(directory)):
+        if not entry.startswith("month="):
+            continue
+        if wanted is not None and entry.split("=", 1)[1] not in wanted:
+            continue
+        month_dir = os.path.join(directory, entry)
+        files.extend(
+            os.path.join(month_dir, name)
+            for name in sorted(os.listdir(month_dir))
+            if name.endswith(".parquet")
+        )
+    return files
+
+
+def load(
+    directory: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    months: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Load the latest row of every email in the snapshot.
+
+    Args:
+        directory: Snapshot directory, defaults to ANALYTICS_SNAPSHOT_DIR
+        columns: Columns to read; email_id and export_seq are always read
+        months: Only read these "YYYY-MM" partitions
+    """
+    directory = directory or default_directory()
+    files = _part_files(directory, months) if os.path.isdir(directory) else []
+    wanted = None
+    if columns is not None:
+        wanted = list(dict.fromkeys(["email_id", "export_seq", *columns]))
+    if not files:
+        frame = _normalize(pd.DataFrame(columns=SNAPSHOT_COLUMNS))
+        return frame if wanted is None else frame[wanted]
+
+    frame = pd.concat(
+        (pd.read_parquet(path, columns=wanted) for path in files), ignore_index=True
+    )
+    # Parts disagree on category sets, which concat turns into object columns
+    for name in CATEGORICAL_COLUMNS:
+        if name in frame:
+            frame[name] = frame[name].astype("category")
+    frame = frame.sort_values("export_seq", kind="stable")
+    return frame.drop_duplicates("email_id", keep="last").reset_index(drop=True)
+
+
+def compact(directory: Optional[str] = None) -> int:
+    """Rewrite each month partition as one file. Returns the number of rows."""
+    directory = directory or default_directory()
+    if not os.path.isdir(directory):
+        return 0
+    seq = _read_state(directory)["export_seq"]
+    total = 0
+    for entry in sorted(os.listdir(directory)):
+        if not entry.startswith("month="):
+            continue
+        month = entry.split("=", 1)[1]
+        frame = load(directory, months=[month])
+        month_dir = os.path.join(directory, entry)
+        stale = _part_files(directory, [month])
+        target = os.path.join(month_dir, f"part-{seq:06d}.parquet")
+        frame.to_parquet(f"{target}.tmp", index=False)
+        for path in stale:
+            os.remove(path)
+        os.replace(f"{target}.tmp", target)
+        total += len(frame)
+    return total
@@ -1,10 +1,12 @@
 """Service for managing code and document assets in the catalog."""
 
+import json
 import os
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from sqlalchemy import and_, or_
+from sqlalchemy import Select, and_, bindparam, func, literal, or_, select, text
 from sqlalchemy.orm import Session
 
 from models.asset_catalog import (
@@ -14,15 +16,101 @@ from models.asset_catalog import (
     AssetType,
 )
 from models.catalog import Tag
+from services import asset_closure, asset_graph, asset_search
 from shared_lib.database_session_util import get_catalog_session
 
 
+# Enumerates paths through asset_dependencies from a start asset in one
+# recursive query. Each row carries the depth and the "/"-delimited id path
+# from the start asset; an edge back onto the path is emitted once with
+# is_cycle set and is not followed further, so cyclic graphs terminate.
+# Paths can grow exponentially with the graph (every diamond doubles them),
+# so rows are produced shallowest first and capped by :path_limit.
+TRAVERSAL_SQL = """
+WITH RECURSIVE walk(asset_id, dependency_type, depth, path, is_cycle) AS (
+    SELECT d.{next}, d.dependency_type, 1,
+           '/' || d.{start} || '/' || d.{next} || '/',
+           d.{next} = d.{start}
+    FROM asset_dependencies d
+    JOIN asset_catalog_items a ON a.id = d.{next} AND a.deleted = 0
+    WHERE d.{start} = :asset_id {type_filter}
+    UNION ALL
+    SELECT d.{next}, d.dependency_type, w.depth + 1,
+           w.path || d.{next} || '/',
+           instr(w.path, '/' || d.{next} || '/') > 0
+    FROM walk w
+    JOIN asset_dependencies d ON d.{start} = w.asset_id
+    JOIN asset_catalog_items a ON a.id = d.{next} AND a.deleted = 0
+    WHERE NOT w.is_cycle
+      AND (:max_depth IS NULL OR w.depth < :max_depth) {type_filter}
+    ORDER BY 3
+    LIMIT :path_limit
+)
+SELECT asset_id, dependency_type, depth, path, is_cycle FROM walk
+ORDER BY depth, asset_id, dependency_type
+"""
+
+# Paths returned by get_dependency_paths unless the caller asks otherwise
+DEFAULT_PATH_LIMIT = 10000
+
+# Frontier assets per query when walking the graph level by level
+TRAVERSAL_BATCH_SIZE = 500
+
+# Column followed from / to for each traversal direction
+TRAVERSAL_DIRECTIONS = {
+    "dependencies": ("source_id", "target_id"),
+    "dependents": ("target_id", "source_id"),
+}
+
+
+class DependencyPath(NamedTuple):
+    """One edge reached while walking the dependency graph."""
+
+    asset_id: int
+    dependency_type: str
+    depth: int
+    path: Tuple[int, ...]  # Asset ids from the start asset to asset_id
+    is_cycle: bool  # asset_id already appears earlier on the path
+
+
+class AssetSearchPage(NamedTuple):
+    """One page of asset search results."""
+
+    assets: List[AssetCatalogItem]
+    next_cursor: Optional[Tuple[float, int]]  # None on the last page
+
+
 class AssetCatalogService:
     """Service for managing code and document assets."""
 
-    def __init__(self):
-        """Initialize the asset catalog service."""
-        pass
+    def __init__(self, session: Optional[Session] = None):
+        """Initialize the asset catalog service.
+
+        Args:
+            session: Optional caller-managed session; by default each
+                operation uses its own catalog session
+        """
+        self.session = session
+
+    @staticmethod
+    def _track(session: Session) -> None:
+        asset_graph.track(session)
+        asset_search.track(session)
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Yield the caller's session, or a managed catalog session.
+
+        Either way the session keeps the search index and the cached
+        dependency graph in step with its writes.
+        """
+        if self.session is not None:
+            self._track(self.session)
+            yield self.session
+        else:
+            with get_catalog_session() as session:
+                self._track(session)
+                yield session
 
     def add_asset(
         self,
@@ -36,7 +124,7 @@ class AssetCatalogService:
         tags: List[str] = None,
     ) -> AssetCatalogItem:
         """Add a new asset to the catalog."""
-        with get_catalog_session() as session:
+        with self.session_scope() as session:
             # Normalize file path
             file_path = os.path.normpath(file_path)
 
@@ -50,15 +138,16 @@ class AssetCatalogService:
                 raise ValueError(f"Asset with file path '{file_path}' already exists")
 
             # Create the asset
+            now = int(datetime.utcnow().timestamp())
             asset = AssetCatalogItem(
                 title=title,
                 file_path=file_path,
                 asset_type=asset_type,
                 description=description,
                 language=language,
-                metadata=metadata or {},
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
+                asset_metadata=metadata or {},
+                created_date=now,
+                modified_date=now,
             )
 
             session.add(asset)
@@ -71,6 +160,8 @@ class AssetCatalogService:
                         source_id=asset.id, target_id=dep, dependency_type="imports"
                     )
                     session.add(dependency)
+                session.flush()
+                asset_closure.refresh_from(session, asset.id)
 
             # Add tags if provided
             if tags:
@@ -100,7 +191,7 @@ class AssetCatalogService:
         tags: Optional[List[str]] = None,
     ) -> Optional[AssetCatalogItem]:
         """Update an existing asset."""
-        with get_catalog_session() as session:
+        with self.session_scope() as session:
             asset = (
                 session.query(AssetCatalogItem)
                 .filter_by(id=asset_id, deleted=False)
@@ -117,9 +208,10 @@ class AssetCatalogService:
             if language:
                 asset.language = language
             if metadata:
-                asset.metadata.update(metadata)
+                # Reassign so the JSON column is marked as changed
+                asset.asset_metadata = {**(asset.asset_metadata or {}), **metadata}
 
-            asset.updated_at = datetime.utcnow()
+            asset.modified_date = int(datetime.utcnow().timestamp())
 
             # Update dependencies if provided
             if dependencies is not None:
@@ -134,6 +226,8 @@ class AssetCatalogService:
                         source_id=asset_id, target_id=dep, dependency_type="imports"
                     )
                     session.add(dependency)
+                session.flush()
+                asset_closure.refresh_from(session, asset_id)
 
             # Update tags if provided
             if tags is not None:
@@ -158,7 +252,7 @@ class AssetCatalogService:
 
     def delete_asset(self, asset_id: int):
         """Soft delete an asset."""
-        with get_catalog_session() as session:
+        with self.session_scope() as session:
             asset = (
                 session.query(AssetCatalogItem)
                 .filter_by(id=asset_id, deleted=False)
@@ -169,6 +263,8 @@ class AssetCatalogService:
 
             asset.deleted = True
             asset.status = "deleted"
+            session.flush()
+            asset_closure.remove_asset(session, asset_id)
             session.commit()
 
     def add_dependency(
@@ -179,7 +275,7 @@ class AssetCatalogService:
         metadata: Dict[str, Any] = None,
     ) -> AssetDependency:
         """Add a dependency between two assets."""
-        with get_catalog_session() as session:
+        with self.session_scope() as session:
             # Verify assets exist
             source = (
                 session.query(AssetCatalogItem)
@@ -195,17 +291,80 @@ class AssetCatalogService:
             if not source or not target:
                 raise ValueError("Source or target asset not found")
 
+            # Only the first edge between a pair changes reachability
+            edge_exists = (
+                session.query(AssetDependency)
+                .filter_by(source_id=source_id, target_id=target_id)
+                .first()
+                is not None
+            )
+
             # Create dependency
             dependency = AssetDependency(
                 source_id=source_id,
                 target_id=target_id,
                 dependency_type=dependency_type,
-                metadata=metadata or {},
+                dependency_metadata=json.dumps(metadata) if metadata else None,
             )
             session.add(dependency)
+            if not edge_exists:
+                asset_closure.add_edge(session, source_id, target_id)
             session.commit()
             return dependency
 
+    def _search_statement(
+        self,
+        session: Session,
+        query: Optional[str],
+        asset_type: Optional[str],
+        language: Optional[str],
+        file_path: Optional[str],
+        tags: Optional[List[str]],
+        status: Optional[str],
+        include_deleted: bool,
+    ) -> Tuple[Select, Any]:
+        """Build the search statement and the rank expression it orders by."""
+        statement = select(AssetCatalogItem)
+        rank = literal(0.0)
+
+        expression = asset_search.match_expression(query)
+        if expression:
+            asset_search.ensure_index(session.connection())
+            matches = asset_search.ranked_matches(expression)
+            statement = statement.join(
+                matches, matches.c.asset_id == AssetCatalogItem.id
+            )
+            rank = matches.c.rank
+
+        # Equality filters are covered by idx_asset_catalog_items_deleted_type_status
+        if not include_deleted:
+            statement = statement.where(AssetCatalogItem.deleted == False)  # noqa: E712
+        if asset_type:
+            statement = statement.where(AssetCatalogItem.asset_type == asset_type)
+        if status:
+            statement = statement.where(AssetCatalogItem.status == status)
+        if language:
+            statement = statement.where(AssetCatalogItem.language == language)
+        if file_path:
+            statement = statement.where(
+                AssetCatalogItem.file_path == os.path.normpath(file_path)
+            )
+
+        if tags:
+            # Assets carrying every requested tag, in one grouped join
+            names = sorted(set(tags))
+            tagged = (
+                select(AssetCatalogTag.asset_id)
+                .join(Tag, Tag.id == AssetCatalogTag.tag_id)
+                .where(Tag.name.in_(names))
+                .group_by(AssetCatalogTag.asset_id)
+                .having(func.count(func.distinct(Tag.name)) == len(names))
+                .subquery("tagged")
+            )
+            statement = statement.join(tagged, tagged.c.asset_id == AssetCatalogItem.id)
+
+        return statement.add_columns(rank), rank
+
     def search_assets(
         self,
         query: str = None,
@@ -213,128 +372,384 @@ class AssetCatalogService:
         language: str = None,
         file_path: str = None,
         tags: List[str] = None,
+        status: str = None,
+        include_deleted: bool = False,
     ) -> List[AssetCatalogItem]:
-        """Search for assets in the catalog."""
-        with get_catalog_session() as session:
-            filters = []
+        """Search for assets in the catalog.
+
+        ``query`` is matched as word prefixes against the full-text index of
+        titles, descriptions, docstrings and file paths, best matches first.
+        Without a query, assets are returned in id order.
+        """
+        with self.session_scope() as session:
+            statement, rank = self._search_statement(
+                session,
+                query,
+                asset_type,
+                language,
+                file_path,
+                tags,
+                status,
+                include_deleted,
+            )
+            rows = session.execute(statement.order_by(rank, AssetCatalogItem.id))
+            return [asset for asset, _ in rows]
 
-            if query:
-                filters.append(
+    def search_assets_page(
+        self,
+        query: str = None,
+        asset_type: str = None,
+        language: str = None,
+        file_path: str = None,
+        tags: List[str] = None,
+        status: str = None,
+        include_deleted: bool = False,
+        limit: int = 50,
+        cursor: Optional[Tuple[float, int]] = None,
+    ) -> AssetSearchPage:
+        """Search for assets one page at a time.
+
+        Pages are cut by keyset on (rank, id) rather than OFFSET, so no
+        skipped rows are fetched or hydrated. bm25() is still evaluated for
+        every match on every page, since the cut is on the computed rank. A
+        cursor is only valid while the search index is unchanged: adding or
+        editing assets changes bm25 ranks, so later pages may then skip or
+        repeat assets.
+
+        Args:
+            limit: Maximum assets per page
+            cursor: ``next_cursor`` of the previous page, or None for the first
+
+        Returns:
+            The page of assets and the cursor of the next page
+        """
+        with self.session_scope() as session:
+            statement, rank = self._search_statement(
+                session,
+                query,
+                asset_type,
+                language,
+                file_path,
+                tags,
+                status,
+                include_deleted,
+            )
+            if cursor is not None:
+                last_rank, last_id = cursor
+                statement = statement.where(
                     or_(
-                        AssetCatalogItem.title.ilike(f"%{query}%"),
-                        AssetCatalogItem.description.ilike(f"%{query}%"),
+                        rank > last_rank,
+                        and_(rank == last_rank, AssetCatalogItem.id > last_id),
                     )
                 )
+            rows = session.execute(
+                statement.order_by(rank, AssetCatalogItem.id).limit(limit + 1)
+            ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][1], rows[-1][0].id)
+        return AssetSearchPage([asset for asset, _ in rows], next_cursor)
+
+    def rebuild_search_index(self) -> int:
+        """Rebuild the asset full-text index from scratch.
+
+        Returns:
+            Number of indexed assets
+        """
+        with self.session_scope() as session:
+            count = asset_search.rebuild(session)
+            session.commit()
+            return count
 
-            if asset_type:
-                filters.append(AssetCatalogItem.asset_type == asset_type)
-
-            if language:
-                filters.append(AssetCatalogItem.language == language)
+    def get_dependency_paths(
+        self,
+        asset_id: int,
+        direction: str = "dependencies",
+        max_depth: Optional[int] = None,
+        dependency_types: Optional[List[str]] = None,
+        limit: Optional[int] = DEFAULT_PATH_LIMIT,
+    ) -> List[DependencyPath]:
+        """Enumerate the paths from an asset with a single query.
+
+        Every path is followed until it ends, reaches max_depth or closes a
+        cycle. Deleted assets are neither returned nor walked through. A
+        graph can hold exponentially many paths, so only the shallowest
+        limit paths are returned; use get_asset_dependencies or
+        get_asset_dependents to find every reachable asset.
+
+        Args:
+            asset_id: Asset to start from
+            direction: "dependencies" (what the asset uses) or "dependents"
+                (what uses the asset)
+            max_depth: Maximum number of edges to follow (None for no limit)
+            dependency_types: Only follow edges of these types
+            limit: Maximum number of paths (None for no limit)
+
+        Returns:
+            Reached edges ordered by depth; cycle-closing edges have is_cycle set
+        """
+        if direction not in TRAVERSAL_DIRECTIONS:
+            raise ValueError(f"Invalid traversal direction: {direction}")
+        start, next_ = TRAVERSAL_DIRECTIONS[direction]
+
+        params = {
+            "asset_id": asset_id,
+            "max_depth": max_depth,
+            "path_limit": -1 if limit is None else limit,
+        }
+        type_filter = ""
+        if dependency_types is not None:
+            type_filter = "AND d.dependency_type IN :dependency_types"
+            params["dependency_types"] = list(dependency_types)
+
+        statement = text(
+            TRAVERSAL_SQL.format(start=start, next=next_, type_filter=type_filter)
+        )
+        if dependency_types is not None:
+            statement = statement.bindparams(
+                bindparam("dependency_types", expanding=True)
+            )
 
-            if file_path:
-                filters.append(
-                    AssetCatalogItem.file_path == os.path.normpath(file_path)
-                )
+        with self.session_scope() as session:
+            rows = session.execute(statement, params).all()
 
-            if tags:
-                for tag in tags:
-                    filters.append(
-                        AssetCatalogItem.tags.any(AssetCatalogTag.name == tag)
-                    )
+        return [
+            DependencyPath(
+                asset_id=row.asset_id,
+                dependency_type=row.dependency_type,
+                depth=row.depth,
+                path=tuple(int(part) for part in row.path.strip("/").split("/")),
+                is_cycle=bool(row.is_cycle),
+            )
+            for row in rows
+        ]
 
-            query = session.query(AssetCatalogItem)
-            if filters:
-                query = query.filter(and_(*filters))
+    def _walk_related(
+        self,
+        session: Session,
+        asset_id: int,
+        direction: str,
+        max_depth: Optional[int],
+        dependency_types: Optional[List[str]],
+    ) -> Dict[Tuple[int, str], int]:
+        """Breadth-first walk returning the minimum depth of each (asset, type).
+
+        Each reached asset is expanded once, with one query per depth level,
+        so the work is bounded by the size of the graph rather than by the
+        number of paths through it.
+        """
+        start, next_ = TRAVERSAL_DIRECTIONS[direction]
+        start_column = getattr(AssetDependency, start)
+        next_column = getattr(AssetDependency, next_)
+        statement = select(next_column, AssetDependency.dependency_type).join(
+            AssetCatalogItem,
+            and_(
+                AssetCatalogItem.id == next_column,
+                AssetCatalogItem.deleted == False,  # noqa: E712
+            ),
+        )
+        if dependency_types is not None:
+            statement = statement.where(
+                AssetDependency.dependency_type.in_(list(dependency_types))
+            )
 
-            return query.all()
+        reached: Dict[Tuple[int, str], int] = {}
+        visited = {asset_id}
+        frontier = [asset_id]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            edges = []
+            for offset in range(0, len(frontier), TRAVERSAL_BATCH_SIZE):
+                batch = frontier[offset : offset + TRAVERSAL_BATCH_SIZE]
+                edges.extend(session.execute(statement.where(start_column.in_(batch))))
+            frontier = []
+            for related_id, dependency_type in sorted(set(edges)):
+                if related_id != asset_id:
+                    reached.setdefault((related_id, dependency_type), depth)
+                if related_id not in visited:
+                    visited.add(related_id)
+                    frontier.append(related_id)
+        return reached
+
+    def _get_related_assets(
+        self,
+        asset_id: int,
+        direction: str,
+        include_indirect: bool,
+        max_depth: Optional[int],
+        dependency_types: Optional[List[str]],
+    ) -> List[Tuple[AssetCatalogItem, str]]:
+        """Return (asset, dependency_type) pairs reached from an asset."""
+        if direction not in TRAVERSAL_DIRECTIONS:
+            raise ValueError(f"Invalid traversal direction: {direction}")
+        if not include_indirect:
+            max_depth = 1
+
+        with self.session_scope() as session:
+            reached = self._walk_related(
+                session, asset_id, direction, max_depth, dependency_types
+            )
+            if not reached:
+                return []
+            asset_ids = {related_id for related_id, _ in reached}
+            assets = {
+                asset.id: asset
+                for asset in session.query(AssetCatalogItem)
+                .filter(AssetCatalogItem.id.in_(asset_ids))
+                .all()
+            }
+            # Nearest first; dicts keep the walk's (asset_id, type) order per level
+            return [
+                (assets[related_id], dependency_type)
+                for (related_id, dependency_type), _ in sorted(
+                    reached.items(), key=lambda item: item[1]
+                )
+            ]
 
     def get_asset_dependencies(
-        self, asset_id: int, include_indirect: bool = False
+        self,
+        asset_id: int,
+        include_indirect: bool = False,
+        max_depth: Optional[int] = None,
+        dependency_types: Optional[List[str]] = None,
     ) -> List[Tuple[AssetCatalogItem, str]]:
-        """Get dependencies of an asset."""
-        with get_catalog_session() as session:
-            deps = (
-                session.query(AssetCatalogItem, AssetDependency.dependency_type)
-                .join(
-                    AssetDependency,
-                    and_(
-                        AssetDependency.target_id == AssetCatalogItem.id,
-                        AssetDependency.source_id == asset_id,
-                    ),
-                )
-                .filter(AssetCatalogItem.deleted == False)
-                .all()
-            )
+        """Get dependencies of an asset.
 
-            if include_indirect:
-                seen = {asset_id}
-                to_check = [d[0].id for d in deps]
-
-                while to_check:
-                    current_id = to_check.pop(0)
-                    if current_id not in seen:
-                        seen.add(current_id)
-                        indirect_deps = (
-                            session.query(
-                                AssetCatalogItem, AssetDependency.dependency_type
-                            )
-                            .join(
-                                AssetDependency,
-                                and_(
-                                    AssetDependency.target_id == AssetCatalogItem.id,
-                                    AssetDependency.source_id == current_id,
-                                ),
-                            )
-                            .filter(AssetCatalogItem.deleted == False)
-                            .all()
-                        )
-                        deps.extend(indirect_deps)
-                        to_check.extend(d[0].id for d in indirect_deps)
-
-            return deps
+        Args:
+            asset_id: Asset whose dependencies are returned
+            include_indirect: Whether to include transitive dependencies
+            max_depth: Maximum depth when include_indirect is set
+            dependency_types: Only follow edges of these types
+
+        Returns:
+            (asset, dependency_type) pairs, nearest first
+        """
+        return self._get_related_assets(
+            asset_id, "dependencies", include_indirect, max_depth, dependency_types
+        )
 
     def get_asset_dependents(
-        self, asset_id: int, include_indirect: bool = False
+        self,
+        asset_id: int,
+        include_indirect: bool = False,
+        max_depth: Optional[int] = None,
+        dependency_types: Optional[List[str]] = None,
     ) -> List[Tuple[AssetCatalogItem, str]]:
-        """Get dependents of an asset."""
-        with get_catalog_session() as session:
-            deps = (
-                session.query(AssetCatalogItem, AssetDependency.dependency_type)
-                .join(
-                    AssetDependency,
-                    and_(
-                        AssetDependency.source_id == AssetCatalogItem.id,
-                        AssetDependency.target_id == asset_id,
-                    ),
-                )
-                .filter(AssetCatalogItem.deleted == False)
+        """Get dependents of an asset.
+
+        Args:
+            asset_id: Asset whose dependents are returned
+            include_indirect: Whether to include transitive dependents
+            max_depth: Maximum depth when include_indirect is set
+            dependency_types: Only follow edges of these types
+
+        Returns:
+            (asset, dependency_type) pairs, nearest first
+        """
+        return self._get_related_assets(
+            asset_id, "dependents", include_indirect, max_depth, dependency_types
+        )
+
+    def _get_closure_assets(
+        self, asset_id: int, direction: str
+    ) -> List[Tuple[AssetCatalogItem, int, int]]:
+        """Return (asset, min_depth, path_count) from the closure table."""
+        with self.session_scope() as session:
+            rows = asset_closure.related(session, asset_id, direction)
+            other_ids = [
+                row.descendant_id if direction == "dependencies" else row.ancestor_id
+                for row in rows
+            ]
+            assets = {
+                asset.id: asset
+                for asset in session.query(AssetCatalogItem)
+                .filter(AssetCatalogItem.id.in_(other_ids))
                 .all()
-            )
-
-            if include_indirect:
-                seen = {asset_id}
-                to_check = [d[0].id for d in deps]
-
-                while to_check:
-                    current_id = to_check.pop(0)
-                    if current_id not in seen:
-                        seen.add(current_id)
-                        indirect_deps = (
-                            session.query(
-                                AssetCatalogItem, AssetDependency.dependency_type
-                            )
-                            .join(
-                                AssetDependency,
-                                and_(
-                                    AssetDependency.source_id == AssetCatalogItem.id,
-                                    AssetDependency.target_id == current_id,
-                                ),
-                            )
-                            .filter(AssetCatalogItem.deleted == False)
-                            .all()
-                        )
-                        deps.extend(indirect_deps)
-                        to_check.extend(d[0].id for d in indirect_deps)
-
-            return deps
+            }
+            return [
+                (assets[other_id], row.min_depth, row.path_count)
+                for other_id, row in zip(other_ids, rows)
+            ]
+
+    def get_transitive_dependencies(
+        self, asset_id: int
+    ) -> List[Tuple[AssetCatalogItem, int, int]]:
+        """Get everything an asset depends on, using the closure table.
+
+        Returns:
+            (asset, min_depth, path_count) tuples, nearest first
+        """
+        return self._get_closure_assets(asset_id, "dependencies")
+
+    def get_impacted_assets(
+        self, asset_id: int
+    ) -> List[Tuple[AssetCatalogItem, int, int]]:
+        """Get everything that depends on an asset, using the closure table.
+
+        Returns:
+            (asset, min_depth, path_count) tuples, nearest first
+        """
+        return self._get_closure_assets(asset_id, "dependents")
+
+    def rebuild_dependency_closure(self) -> int:
+        """Recompute the dependency closure table from scratch.
+
+        Returns:
+            Number of closure rows written
+        """
+        with self.session_scope() as session:
+            count = asset_closure.rebuild(session)
+            session.commit()
+            return count
+
+    def get_dependency_graph(self, refresh: bool = False) -> asset_graph.AssetGraph:
+        """Get the cached analytics graph of live dependencies.
+
+        Args:
+            refresh: Reload the graph even if a cached copy exists
+        """
+        with self.session_scope() as session:
+            if refresh:
+                asset_graph.invalidate(session)
+            return asset_graph.get_graph(session)
+
+    def find_dependency_cycles(self) -> List[List[int]]:
+        """Get one shortest import cycle per strongly connected component.
+
+        Returns:
+            Lists of asset ids that start and end with the same asset
+        """
+        return self.get_dependency_graph().cycles()
+
+    def get_dependency_layers(self) -> List[List[int]]:
+        """Get assets grouped into topological layers, dependencies first."""
+        return self.get_dependency_graph().layers
+
+    def get_fan_rankings(
+        self, limit: int = 10
+    ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Get the assets with the most dependents and the most dependencies.
+
+        Returns:
+            (fan_in, fan_out) lists of (asset_id, count) pairs
+        """
+        graph = self.get_dependency_graph()
+        return graph.fan_in(limit), graph.fan_out(limit)
+
+    def get_dependency_hotspots(self, limit: int = 10) -> List[Tuple[int, float]]:
+        """Get the assets with the highest betweenness centrality."""
+        return self.get_dependency_graph().betweenness(limit)
+
+    def get_blast_radius(
+        self, asset_ids: List[int], max_depth: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Get everything affected by a change to a set of assets.
+
+        Returns:
+            Dependency distance from the nearest changed asset, keyed by
+            asset id
+        """
+        return self.get_dependency_graph().blast_radius(asset_ids, max_depth)
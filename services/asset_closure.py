@@ -0,0 +1,224 @@
+"""Incremental maintenance of the asset dependency closure table.
+
+The asset_closure table answers "what does X depend on" and "what breaks if
+X changes" with one indexed lookup instead of a graph walk. It stores, for
+every connected (ancestor, descendant) pair, the shortest path length and
+the number of shortest paths.
+
+Maintenance strategy:
+1. Adding an edge s -> t only creates paths through the new edge. They are
+   combined from the existing rows ending at s and starting at t.
+2. Removing edges can lengthen or disconnect paths, so the rows of every
+   affected ancestor are recomputed with a breadth-first search over the
+   live edges.
+3. rebuild() recomputes the whole table from asset_dependencies.
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from models.asset_catalog import AssetCatalogItem, AssetClosure, AssetDependency
+
+# (min_depth, path_count) keyed by the other end of the path
+Reach = Dict[int, Tuple[int, int]]
+
+
+def load_adjacency(session: Session) -> Dict[int, Set[int]]:
+    """Load live edges as source -> targets, one edge per (source, target)."""
+    source = aliased(AssetCatalogItem)
+    target = aliased(AssetCatalogItem)
+    rows = session.execute(
+        select(AssetDependency.source_id, AssetDependency.target_id)
+        .join(source, source.id == AssetDependency.source_id)
+        .join(target, target.id == AssetDependency.target_id)
+        .where(source.deleted == False, target.deleted == False)  # noqa: E712
+        .distinct()
+    )
+    adjacency: Dict[int, Set[int]] = defaultdict(set)
+    for source_id, target_id in rows:
+        adjacency[source_id].add(target_id)
+    return adjacency
+
+
+def reach_from(adjacency: Dict[int, Set[int]], start: int) -> Reach:
+    """Breadth-first shortest path lengths and counts from one asset.
+
+    Only paths of at least one edge count, so ``start`` appears in the result
+    only if it lies on a cycle.
+    """
+    reach: Reach = {}
+    frontier = deque()
+    for target in sorted(adjacency.get(start, ())):
+        reach[target] = (1, 1)
+        frontier.append(target)
+
+    while frontier:
+        node = frontier.popleft()
+        depth, count = reach[node]
+        for target in adjacency.get(node, ()):
+            known = reach.get(target)
+            if known is None:
+                reach[target] = (depth + 1, count)
+                frontier.append(target)
+            elif known[0] == depth + 1:
+                reach[target] = (known[0], known[1] + count)
+    return reach
+
+
+def _replace_rows(session: Session, ancestors: Iterable[int], adjacency) -> int:
+    """Recompute and store the closure rows of the given ancestors."""
+    ancestors = sorted(set(ancestors))
+    if not ancestors:
+        return 0
+    session.execute(delete(AssetClosure).where(AssetClosure.ancestor_id.in_(ancestors)))
+    rows = [
+        {
+            "ancestor_id": ancestor,
+            "descendant_id": descendant,
+            "min_depth": depth,
+            "path_count": count,
+        }
+        for ancestor in ancestors
+        for descendant, (depth, count) in reach_from(adjacency, ancestor).items()
+    ]
+    if rows:
+        session.execute(insert(AssetClosure), rows)
+    return len(rows)
+
+
+def ancestors_of(session: Session, asset_id: int) -> Reach:
+    """Rows ending at an asset, keyed by ancestor."""
+    rows = session.execute(
+        select(
+            AssetClosure.ancestor_id, AssetClosure.min_depth, AssetClosure.path_count
+        ).where(AssetClosure.descendant_id == asset_id)
+    )
+    return {ancestor: (depth, count) for ancestor, depth, count in rows}
+
+
+def descendants_of(session: Session, asset_id: int) -> Reach:
+    """Rows starting at an asset, keyed by descendant."""
+    rows = session.execute(
+        select(
+            AssetClosure.descendant_id, AssetClosure.min_depth, AssetClosure.path_count
+        ).where(AssetClosure.ancestor_id == asset_id)
+    )
+    return {descendant: (depth, count) for descendant, depth, count in rows}
+
+
+def add_edge(session: Session, source_id: int, target_id: int) -> None:
+    """Update the closure for a new live edge source -> target.
+
+    Must be called once per new (source, target) pair, before or after the
+    edge row itself is added.
+    """
+    # Every new shortest path is (a ->* source) + edge + (target ->* d), where
+    # the empty path counts for a == source and d == target. Neither half can
+    # use the new edge and still be shortest, so the stored rows are valid.
+    ancestors = ancestors_of(session, source_id)
+    ancestors[source_id] = (0, 1)
+    descendants = descendants_of(session, target_id)
+    descendants[target_id] = (0, 1)
+
+    existing = {
+        (row.ancestor_id, row.descendant_id): row
+        for row in session.scalars(
+            select(AssetClosure).where(
+                AssetClosure.ancestor_id.in_(ancestors),
+                AssetClosure.descendant_id.in_(descendants),
+            )
+        )
+    }
+
+    for ancestor, (up_depth, up_count) in ancestors.items():
+        for descendant, (down_depth, down_count) in descendants.items():
+            depth = up_depth + 1 + down_depth
+            count = up_count * down_count
+            row = existing.get((ancestor, descendant))
+            if row is None:
+                session.add(
+                    AssetClosure(
+                        ancestor_id=ancestor,
+                        descendant_id=descendant,
+                        min_depth=depth,
+                        path_count=count,
+                    )
+                )
+            elif depth < row.min_depth:
+                row.min_depth, row.path_count = depth, count
+            elif depth == row.min_depth:
+                row.path_count += count
+    session.flush()
+
+
+def refresh(
+    session: Session,
+    changed_sources: Iterable[int] = (),
+    removed: Iterable[int] = (),
+) -> None:
+    """Repair the closure after edges changed or assets were deleted.
+
+    Only paths leaving a changed source or passing through a removed asset
+    can change, so just those assets' ancestors are recomputed. Call after
+    the edge and asset changes are flushed.
+
+    Args:
+        session: Session with the changes flushed
+        changed_sources: Assets whose outgoing edges were replaced
+        removed: Assets that were deleted
+    """
+    removed = set(removed)
+    affected = set(changed_sources)
+    for asset_id in affected | removed:
+        affected.update(ancestors_of(session, asset_id))
+    affected -= removed
+
+    if removed:
+        session.execute(
+            delete(AssetClosure).where(
+                AssetClosure.ancestor_id.in_(removed)
+                | AssetClosure.descendant_id.in_(removed)
+            )
+        )
+    _replace_rows(session, affected, load_adjacency(session))
+
+
+def refresh_from(session: Session, asset_id: int) -> None:
+    """Recompute rows after an asset's outgoing edges changed."""
+    refresh(session, changed_sources=[asset_id])
+
+
+def remove_asset(session: Session, asset_id: int) -> None:
+    """Drop a deleted asset from the closure and repair paths through it."""
+    refresh(session, removed=[asset_id])
+
+
+def rebuild(session: Session) -> int:
+    """Recompute the whole closure table. Returns the number of rows."""
+    session.execute(delete(AssetClosure))
+    adjacency = load_adjacency(session)
+    return _replace_rows(session, list(adjacency), adjacency)
+
+
+def related(session: Session, asset_id: int, direction: str) -> List[AssetClosure]:
+    """Return closure rows for an asset's transitive dependencies or dependents."""
+    if direction == "dependencies":
+        condition = AssetClosure.ancestor_id == asset_id
+    elif direction == "dependents":
+        condition = AssetClosure.descendant_id == asset_id
+    else:
+        raise ValueError(f"Invalid closure direction: {direction}")
+    return list(
+        session.scalars(
+            select(AssetClosure)
+            .where(condition)
+            .order_by(
+                AssetClosure.min_depth,
+                AssetClosure.ancestor_id,
+                AssetClosure.descendant_id,
+            )
+        )
+    )
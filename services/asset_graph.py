@@ -0,0 +1,383 @@
+"""Analytics over the live asset dependency graph.
+
+The graph is loaded once per database into an AssetGraph: assets are
+renumbered 0..n-1 and edges are stored as compressed sparse rows (an offsets
+array plus a flat targets array) in both directions. Loaded graphs are cached
+per engine and dropped when a tracked session (see track()) commits changes
+to assets or dependencies, whether flushed or bulk-executed.
+
+Edges point from an asset to what it depends on, so:
+- fan-out is how many assets a file depends on, fan-in how many depend on it
+- topological layer 0 holds assets that depend on nothing
+- the blast radius of a change is everything that transitively depends on it
+"""
+
+import heapq
+import random
+from array import array
+from collections import deque
+from functools import cached_property
+from itertools import chain
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+import networkx as nx
+from sqlalchemy import event
+from sqlalchemy.exc import UnboundExecutionError
+from sqlalchemy.orm import Session
+
+from models.asset_catalog import AssetCatalogItem, AssetDependency
+from services import asset_closure
+from shared_lib.constants import CATALOG_CONFIG
+
+GRAPH_MODELS = (AssetCatalogItem, AssetDependency)
+DIRTY_KEY = "asset_graph_dirty"  # session.info flag until commit or rollback
+
+
+def _csr(count: int, pairs: List[Tuple[int, int]]) -> Tuple[array, array]:
+    """Build (offsets, targets) arrays from (row, column) pairs sorted by row."""
+    offsets = array("q", bytes(8 * (count + 1)))
+    for row, _ in pairs:
+        offsets[row + 1] += 1
+    for row in range(count):
+        offsets[row + 1] += offsets[row]
+    return offsets, array("q", (column for _, column in pairs))
+
+
+class AssetGraph:
+    """Immutable snapshot of the live dependency graph.
+
+    Only assets with at least one live edge are included. Results are
+    reported in asset ids; derived structures are computed on first use.
+    """
+
+    def __init__(self, adjacency: Dict[int, Set[int]]):
+        """Build the graph.
+
+        Args:
+            adjacency: Target asset ids keyed by source asset id
+        """
+        nodes = set(adjacency)
+        for targets in adjacency.values():
+            nodes.update(targets)
+        self.asset_ids: Tuple[int, ...] = tuple(sorted(nodes))
+        self._index = {asset_id: node for node, asset_id in enumerate(self.asset_ids)}
+
+        edges = sorted(
+            (self._index[source], self._index[target])
+            for source, targets in adjacency.items()
+            for target in targets
+        )
+        self.edge_count = len(edges)
+        self._out = _csr(len(nodes), edges)
+        self._in = _csr(len(nodes), sorted((target, source) for source, target in edges))
+        self._betweenness: Dict[Optional[int], List[float]] = {}
+
+    @classmethod
+    def load(cls, session: Session) -> "AssetGraph":
+        """Load the live graph from the database."""
+        return cls(asset_closure.load_adjacency(session))
+
+    def __len__(self) -> int:
+        return len(self.asset_ids)
+
+    def _neighbors(self, node: int, reverse: bool = False) -> array:
+        offsets, targets = self._in if reverse else self._out
+        return targets[offsets[node] : offsets[node + 1]]
+
+    def _degree(self, node: int, reverse: bool = False) -> int:
+        offsets = (self._in if reverse else self._out)[0]
+        return offsets[node + 1] - offsets[node]
+
+    @cached_property
+    def digraph(self) -> nx.DiGraph:
+        """networkx view of the graph over node positions."""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(len(self)))
+        graph.add_edges_from(
+            (node, target) for node in range(len(self)) for target in self._neighbors(node)
+        )
+        return graph
+
+    # Cycles
+
+    @cached_property
+    def _cyclic_components(self) -> List[List[int]]:
+        """Strongly connected components that contain a cycle, as positions."""
+        components = []
+        for component in nx.strongly_connected_components(self.digraph):
+            node = next(iter(component))
+            if len(component) > 1 or node in self._neighbors(node):
+                components.append(sorted(component))
+        components.sort(key=lambda component: (-len(component), component[0]))
+        return components
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Return asset ids of each import cycle group, largest first."""
+        return [
+            [self.asset_ids[node] for node in component]
+            for component in self._cyclic_components
+        ]
+
+    def cycles(self) -> List[List[int]]:
+        """Return one shortest cycle per component, through its lowest asset id.
+
+        Each cycle is a list of asset ids that starts and ends with the same
+        asset.
+        """
+        cycles = []
+        for component in self._cyclic_components:
+            members = set(component)
+            start = component[0]
+            parents = {}
+            frontier = deque([start])
+            while frontier:
+                node = frontier.popleft()
+                if start in self._neighbors(node):
+                    break
+                for target in self._neighbors(node):
+                    if target in members and target not in parents and target != start:
+                        parents[target] = node
+                        frontier.append(target)
+            path = [start]
+            while node != start:
+                path.append(node)
+                node = parents[node]
+            path.append(start)
+            cycles.append([self.asset_ids[node] for node in reversed(path)])
+        return cycles
+
+    # Structure
+
+    @cached_property
+    def layers(self) -> List[List[int]]:
+        """Topological layers of asset ids; each cycle shares one layer."""
+        condensation = nx.condensation(self.digraph, scc=self._all_components)
+        layers = []
+        for generation in nx.topological_generations(condensation.reverse(copy=False)):
+            layers.append(
+                sorted(
+                    self.asset_ids[node]
+                    for component in generation
+                    for node in condensation.nodes[component]["members"]
+                )
+            )
+        return layers
+
+    @property
+    def _all_components(self) -> List[Set[int]]:
+        cyclic = self._cyclic_components
+        covered = set(chain.from_iterable(cyclic))
+        return [set(component) for component in cyclic] + [
+            {node} for node in range(len(self)) if node not in covered
+        ]
+
+    def fan_in(self, limit: int = 10) -> List[Tuple[int, int]]:
+        """Return (asset_id, dependent count) pairs, most depended-on first."""
+        return self._rank_degrees(limit, reverse=True)
+
+    def fan_out(self, limit: int = 10) -> List[Tuple[int, int]]:
+        """Return (asset_id, dependency count) pairs, most dependencies first."""
+        return self._rank_degrees(limit, reverse=False)
+
+    def _rank_degrees(self, limit: int, reverse: bool) -> List[Tuple[int, int]]:
+        ranked = heapq.nsmallest(
+            limit,
+            range(len(self)),
+            key=lambda node: (-self._degree(node, reverse), self.asset_ids[node]),
+        )
+        return [(self.asset_ids[node], self._degree(node, reverse)) for node in ranked]
+
+    def betweenness(
+        self, limit: int = 10, samples: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Return (asset_id, score) pairs for the assets most paths run through.
+
+        Scores are normalized like networkx.betweenness_centrality. Graphs
+        larger than ``samples`` nodes use that many sampled sources, with a
+        fixed seed so repeated reports agree.
+
+        Args:
+            limit: Number of assets to return
+            samples: Source sample size, defaults to GRAPH_BETWEENNESS_SAMPLES
+        """
+        samples = samples or CATALOG_CONFIG["GRAPH_BETWEENNESS_SAMPLES"]
+        k = samples if len(self) > samples else None
+        if k not in self._betweenness:
+            self._betweenness[k] = self._brandes(k)
+        scores = self._betweenness[k]
+        ranked = heapq.nsmallest(
+            limit,
+            (node for node, score in enumerate(scores) if score > 0),
+            key=lambda node: (-scores[node], self.asset_ids[node]),
+        )
+        return [(self.asset_ids[node], scores[node]) for node in ranked]
+
+    @cached_property
+    def _successor_lists(self) -> List[List[int]]:
+        return [self._neighbors(node).tolist() for node in range(len(self))]
+
+    def _brandes(self, k: Optional[int]) -> List[float]:
+        """Brandes' betweenness over all sources, or k sampled sources."""
+        count = len(self)
+        sources = range(count) if k is None else random.Random(0).sample(range(count), k)
+        successors = self._successor_lists
+        scores = [0.0] * count
+        for source in sources:
+            # Shortest path counts in BFS order
+            sigma = [0] * count
+            dist = [-1] * count
+            sigma[source], dist[source] = 1, 0
+            order = [source]
+            frontier = deque([source])
+            while frontier:
+                node = frontier.popleft()
+                next_depth = dist[node] + 1
+                for target in successors[node]:
+                    if dist[target] < 0:
+                        dist[target] = next_depth
+                        order.append(target)
+                        frontier.append(target)
+                    if dist[target] == next_depth:
+                        sigma[target] += sigma[node]
+
+            # Dependency accumulation in reverse BFS order
+            delta = [0.0] * count
+            for node in reversed(order):
+                next_depth = dist[node] + 1
+                share = sum(
+                    (1.0 + delta[target]) / sigma[target]
+                    for target in successors[node]
+                    if dist[target] == next_depth
+                )
+                delta[node] = sigma[node] * share
+                if node != source:
+                    scores[node] += delta[node]
+
+        if count > 2:
+            scale = 1 / ((count - 1) * (count - 2))
+            if k is not None:
+                scale *= count / k
+            scores = [score * scale for score in scores]
+        return scores
+
+    def blast_radius(
+        self, asset_ids: Iterable[int], max_depth: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Return assets that transitively depend on a changed set.
+
+        Args:
+            asset_ids: Changed assets; ids without live edges are ignored
+            max_depth: Optional limit on dependency distance
+
+        Returns:
+            Distance from the nearest changed asset, keyed by asset id. The
+            changed assets themselves are not included.
+        """
+        starts = {self._index[asset_id] for asset_id in asset_ids if asset_id in self._index}
+        depths = dict.fromkeys(starts, 0)
+        frontier = deque(starts)
+        while frontier:
+            node = frontier.popleft()
+            depth = depths[node]
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for dependent in self._neighbors(node, reverse=True):
+                if dependent not in depths:
+                    depths[dependent] = depth + 1
+                    frontier.append(dependent)
+        return {
+            self.asset_ids[node]: depth
+            for node, depth in depths.items()
+            if node not in starts
+        }
+
+
+# Per-engine cache
+
+_graphs: "WeakKeyDictionary[object, AssetGraph]" = WeakKeyDictionary()
+_lock = RLock()
+
+
+def _engine(session: Session):
+    return session.get_bind().engine
+
+
+def get_graph(session: Session) -> AssetGraph:
+    """Return the cached graph for the session's database, loading it if needed.
+
+    A session with uncommitted graph changes gets a graph of its own view of
+    the database, which is not cached.
+    """
+    if session.info.get(DIRTY_KEY):
+        return AssetGraph.load(session)
+    engine = _engine(session)
+    with _lock:
+        graph = _graphs.get(engine)
+    if graph is None:
+        graph = AssetGraph.load(session)
+        # Loading may have autoflushed pending changes
+        if session.info.get(DIRTY_KEY):
+            return graph
+        with _lock:
+            _graphs[engine] = graph
+    return graph
+
+
+def invalidate(session: Optional[Session] = None) -> None:
+    """Drop the cached graph for a session's database, or all cached graphs."""
+    try:
+        engine = _engine(session) if session is not None else None
+    except UnboundExecutionError:
+        engine = None
+    with _lock:
+        if engine is None:
+            _graphs.clear()
+        else:
+            _graphs.pop(engine, None)
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    """Note that assets or dependencies were written in this transaction."""
+    changed = chain(session.new, session.dirty, session.deleted)
+    if any(isinstance(obj, GRAPH_MODELS) for obj in changed):
+        session.info[DIRTY_KEY] = True
+
+
+def _on_orm_execute(orm_execute_state) -> None:
+    """Bulk INSERT/UPDATE/DELETE bypasses the flush."""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        if any(mapper.class_ in GRAPH_MODELS for mapper in state.all_mappers):
+            state.session.info[DIRTY_KEY] = True
+
+
+def _after_commit(session: Session) -> None:
+    """Drop the cached graph once written changes are committed."""
+    # A released savepoint can still be rolled back with its transaction
+    if session.in_nested_transaction():
+        return
+    if session.info.pop(DIRTY_KEY, False):
+        invalidate(session)
+
+
+def _after_soft_rollback(session: Session, previous_transaction) -> None:
+    # Changes flushed before a rolled back savepoint are still pending
+    if not previous_transaction.nested:
+        session.info.pop(DIRTY_KEY, None)
+
+
+LISTENERS = (
+    ("after_flush", _after_flush),
+    ("do_orm_execute", _on_orm_execute),
+    ("after_commit", _after_commit),
+    ("after_soft_rollback", _after_soft_rollback),
+)
+
+
+def track(session: Session) -> None:
+    """Keep the cached graphs current with writes made through a session."""
+    for name, listener in LISTENERS:
+        if listener not in getattr(session.dispatch, name):
+            event.listen(session, name, listener)
@@ -0,0 +1,178 @@
+"""Full-text search index for catalog assets.
+
+asset_search is an FTS5 table whose rowid is the asset id. It has four
+columns: title, description, docstring (from asset_metadata) and path_tokens
+(the file path split into words, including camelCase parts). It is written
+from Python rather than by triggers because the docstring lives in JSON and
+camelCase splitting is not something SQLite can do.
+
+Rows are kept in sync by an after_flush hook on the sessions passed to
+track(); AssetCatalogService tracks the sessions it writes through.
+Soft-deleted assets keep their rows; searches filter on
+asset_catalog_items.deleted instead. Databases created before the index
+existed get it built on first use.
+"""
+
+import re
+from itertools import chain
+from typing import Any, Dict, Iterable, Optional
+from weakref import WeakSet
+
+from sqlalchemy import column, event, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery
+
+from models.asset_catalog import ASSET_SEARCH_DDL, AssetCatalogItem
+
+# bm25 weights for title, description, docstring and path_tokens
+COLUMN_WEIGHTS = (10.0, 4.0, 2.0, 3.0)
+
+PATH_SPLIT_PATTERN = re.compile(r"[\W_]+")
+CAMEL_CASE_PATTERN = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+QUERY_TERM_PATTERN = re.compile(r"\w+")
+
+asset_search = table(
+    "asset_search",
+    column("rowid"),
+    column("title"),
+    column("description"),
+    column("docstring"),
+    column("path_tokens"),
+)
+
+_ready: "WeakSet" = WeakSet()  # Engines whose search table is known to exist
+
+
+def path_tokens(file_path: Optional[str]) -> str:
+    """Split a path into words: "src/AppCatalog.py" -> "src App Catalog py"."""
+    if not file_path:
+        return ""
+    return " ".join(
+        CAMEL_CASE_PATTERN.sub(" ", word)
+        for word in PATH_SPLIT_PATTERN.split(file_path)
+        if word
+    )
+
+
+def match_expression(query: Optional[str]) -> Optional[str]:
+    """Turn free text into an FTS5 query where every word must prefix-match.
+
+    Returns None if the text has no searchable words.
+    """
+    terms = QUERY_TERM_PATTERN.findall(query or "")
+    return " ".join(f'"{term}"*' for term in terms) or None
+
+
+def _document(asset: Any) -> Dict[str, Any]:
+    """Build an index row from an asset or an equivalent column row."""
+    metadata = asset.asset_metadata or {}
+    return {
+        "rowid": asset.id,
+        "title": asset.title or "",
+        "description": asset.description or "",
+        "docstring": metadata.get("docstring") or "",
+        "path_tokens": path_tokens(asset.file_path),
+    }
+
+
+def _populate(connection: Connection) -> int:
+    """Fill the index from every asset. Returns the number of rows."""
+    rows = connection.execute(
+        select(
+            AssetCatalogItem.id,
+            AssetCatalogItem.title,
+            AssetCatalogItem.description,
+            AssetCatalogItem.asset_metadata,
+            AssetCatalogItem.file_path,
+        )
+    ).all()
+    documents = [_document(row) for row in rows]
+    if documents:
+        connection.execute(asset_search.insert(), documents)
+    return len(documents)
+
+
+def ensure_index(connection: Connection) -> None:
+    """Create and fill the search table if this database does not have it."""
+    if connection.engine in _ready:
+        return
+    exists = connection.execute(
+        text(
+            "SELECT 1 FROM sqlite_master"
+            " WHERE type = 'table' AND name = 'asset_search'"
+        )
+    ).first()
+    if not exists:
+        connection.execute(text(ASSET_SEARCH_DDL))
+        _populate(connection)
+    _ready.add(connection.engine)
+
+
+def index_assets(connection: Connection, assets: Iterable[AssetCatalogItem]) -> None:
+    """Insert or replace the index rows of the given assets."""
+    documents = [_document(asset) for asset in assets]
+    if not documents:
+        return
+    ensure_index(connection)
+    connection.execute(
+        asset_search.delete().where(
+            asset_search.c.rowid.in_([document["rowid"] for document in documents])
+        )
+    )
+    connection.execute(asset_search.insert(), documents)
+
+
+def remove_assets(connection: Connection, asset_ids: Iterable[int]) -> None:
+    """Drop the index rows of hard-deleted assets."""
+    asset_ids = list(asset_ids)
+    if asset_ids:
+        ensure_index(connection)
+        connection.execute(
+            asset_search.delete().where(asset_search.c.rowid.in_(asset_ids))
+        )
+
+
+def rebuild(session: Session) -> int:
+    """Rebuild the whole index. Returns the number of indexed assets."""
+    connection = session.connection()
+    ensure_index(connection)
+    connection.execute(asset_search.delete())
+    return _populate(connection)
+
+
+def ranked_matches(expression: str) -> Subquery:
+    """Subquery of (asset_id, rank) for an FTS5 expression; lower rank is better."""
+    search = literal_column("asset_search")
+    return (
+        select(
+            asset_search.c.rowid.label("asset_id"),
+            func.bm25(search, *COLUMN_WEIGHTS).label("rank"),
+        )
+        .select_from(asset_search)
+        .where(search.op("MATCH")(expression))
+        .subquery("matches")
+    )
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    """Reindex assets written by the flush."""
+    changed = [
+        obj
+        for obj in chain(session.new, session.dirty)
+        if isinstance(obj, AssetCatalogItem) and obj.id is not None
+    ]
+    removed = [obj.id for obj in session.deleted if isinstance(obj, AssetCatalogItem)]
+    if not changed and not removed:
+        return
+    connection = session.connection(bind_arguments={"mapper": AssetCatalogItem})
+    if connection.dialect.name != "sqlite":
+        return
+    remove_assets(connection, removed)
+    index_assets(connection, changed)
+
+
+def track(session: Session) -> None:
+    """Keep the index in sync with assets flushed through a session."""
+    if _after_flush not in session.dispatch.after_flush:
+        event.listen(session, "after_flush", _after_flush)
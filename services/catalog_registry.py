@@ -0,0 +1,229 @@
+"""In-memory registry of catalog item titles and tag names.
+
+The registry keeps compact (id, title, status, deleted) tuples for catalog
+items and (id, name, deleted) tuples for tags so that duplicate checks never
+need to materialize full ORM rows (including content blobs). It is loaded with
+column-only queries and kept coherent through session event hooks.
+"""
+
+from threading import RLock
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from models.catalog import CatalogItem, Tag
+
+PENDING_KEY = "catalog_registry_pending"
+
+
+class ItemEntry(NamedTuple):
+    """Compact view of a catalog item."""
+
+    id: int
+    title: str
+    status: str
+    deleted: bool
+
+
+class TagEntry(NamedTuple):
+    """Compact view of a tag."""
+
+    id: int
+    name: str
+    deleted: bool
+
+    @property
+    def title(self) -> str:
+        """Alias so tags can be passed to title-based matchers."""
+        return self.name
+
+
+class CatalogRegistry:
+    """Title/name index for catalog items and tags.
+
+    Features:
+    - Column-only loading (no content or description columns)
+    - Case-insensitive exact-match lookups
+    - Updates applied on commit, discarded on rollback
+    - Bulk query updates/deletes mark the registry stale for a reload
+    - A ``generation`` counter that changes whenever the entries change
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        """Initialize the registry and attach it to a session factory.
+
+        Args:
+            session_factory: Session factory whose sessions should keep the
+                registry coherent
+        """
+        self._session_factory = session_factory
+        self._lock = RLock()
+        self._items: Dict[int, ItemEntry] = {}
+        self._tags: Dict[int, TagEntry] = {}
+        self._item_titles: Dict[str, int] = {}
+        self._tag_names: Dict[str, int] = {}
+        self._loaded = False
+        self.generation = 0
+
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+        event.listen(session_factory, "do_orm_execute", self._on_orm_execute)
+
+    @staticmethod
+    def _key(text: str) -> str:
+        """Normalize a title or name for case-insensitive lookup."""
+        return text.strip().casefold()
+
+    def load(self) -> None:
+        """(Re)load the registry with column-only queries."""
+        session = self._session_factory()
+        try:
+            item_rows = session.query(
+                CatalogItem.id,
+                CatalogItem.title,
+                CatalogItem.status,
+                CatalogItem.deleted,
+            ).all()
+            tag_rows = session.query(Tag.id, Tag.name, Tag.deleted).all()
+        finally:
+            session.close()
+
+        with self._lock:
+            self._items = {}
+            self._tags = {}
+            self._item_titles = {}
+            self._tag_names = {}
+            for row in item_rows:
+                self._put_item(ItemEntry(row[0], row[1], row[2], bool(row[3])))
+            for row in tag_rows:
+                self._put_tag(TagEntry(row[0], row[1], bool(row[2])))
+            self._loaded = True
+            self.generation += 1
+
+    def invalidate(self) -> None:
+        """Mark the registry stale so the next read reloads it."""
+        with self._lock:
+            self._loaded = False
+
+    def ensure_loaded(self) -> None:
+        """Load the registry if it is stale, so ``generation`` is current."""
+        with self._lock:
+            self._ensure_loaded()
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _put_item(self, entry: ItemEntry) -> None:
+        old = self._items.get(entry.id)
+        if old is not None:
+            self._item_titles.pop(self._key(old.title), None)
+        self._items[entry.id] = entry
+        self._item_titles[self._key(entry.title)] = entry.id
+
+    def _drop_item(self, item_id: int) -> None:
+        old = self._items.pop(item_id, None)
+        if old is not None:
+            self._item_titles.pop(self._key(old.title), None)
+
+    def _put_tag(self, entry: TagEntry) -> None:
+        old = self._tags.get(entry.id)
+        if old is not None:
+            self._tag_names.pop(self._key(old.name), None)
+        self._tags[entry.id] = entry
+        self._tag_names[self._key(entry.name)] = entry.id
+
+    def _drop_tag(self, tag_id: int) -> None:
+        old = self._tags.pop(tag_id, None)
+        if old is not None:
+            self._tag_names.pop(self._key(old.name), None)
+
+    def items(self, include_deleted: bool = True) -> List[ItemEntry]:
+        """Return catalog item entries ordered by id.
+
+        Args:
+            include_deleted: Whether archived (deleted) items are included
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entries = sorted(self._items.values(), key=lambda entry: entry.id)
+        if include_deleted:
+            return entries
+        return [entry for entry in entries if not entry.deleted]
+
+    def tags(self, include_deleted: bool = True) -> List[TagEntry]:
+        """Return tag entries ordered by id.
+
+        Args:
+            include_deleted: Whether archived (deleted) tags are included
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entries = sorted(self._tags.values(), key=lambda entry: entry.id)
+        if include_deleted:
+            return entries
+        return [entry for entry in entries if not entry.deleted]
+
+    def find_item(self, title: str) -> Optional[ItemEntry]:
+        """Find a catalog item by exact (case-insensitive) title."""
+        with self._lock:
+            self._ensure_loaded()
+            item_id = self._item_titles.get(self._key(title))
+            return self._items.get(item_id) if item_id is not None else None
+
+    def find_tag(self, name: str) -> Optional[TagEntry]:
+        """Find a tag by exact (case-insensitive) name."""
+        with self._lock:
+            self._ensure_loaded()
+            tag_id = self._tag_names.get(self._key(name))
+            return self._tags.get(tag_id) if tag_id is not None else None
+
+    # Session event hooks
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        """Stage changed items and tags until the transaction commits."""
+        pending = session.info.setdefault(PENDING_KEY, [])
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, CatalogItem) and obj.id is not None:
+                pending.append(
+                    ("item", ItemEntry(obj.id, obj.title, obj.status, bool(obj.deleted)))
+                )
+            elif isinstance(obj, Tag) and obj.id is not None:
+                pending.append(("tag", TagEntry(obj.id, obj.name, bool(obj.deleted))))
+        for obj in session.deleted:
+            if isinstance(obj, CatalogItem):
+                pending.append(("item_removed", obj.id))
+            elif isinstance(obj, Tag):
+                pending.append(("tag_removed", obj.id))
+
+    def _after_commit(self, session: Session) -> None:
+        """Apply staged changes once they are durable."""
+        pending = session.info.pop(PENDING_KEY, None)
+        if not pending:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            for kind, value in pending:
+                if kind == "item":
+                    self._put_item(value)
+                elif kind == "tag":
+                    self._put_tag(value)
+                elif kind == "item_removed":
+                    self._drop_item(value)
+                elif kind == "tag_removed":
+                    self._drop_tag(value)
+            self.generation += 1
+
+    def _after_rollback(self, session: Session) -> None:
+        """Discard staged changes from a rolled back transaction."""
+        session.info.pop(PENDING_KEY, None)
+
+    def _on_orm_execute(self, orm_execute_state) -> None:
+        """Bulk UPDATE/DELETE bypasses the flush, so reload on next read."""
+        if orm_execute_state.is_update or orm_execute_state.is_delete:
+            mappers = orm_execute_state.all_mappers
+            if any(mapper.class_ in (CatalogItem, Tag) for mapper in mappers):
+                self.invalidate()
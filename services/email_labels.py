@@ -0,0 +1,208 @@
+"""Normalized email labels.
+
+Each label an email carries is one row in email_labels pointing at a
+gmail_labels row. Gmail label ids ("INBOX", "Label_12") are interned: the
+first time an id is seen it gets a gmail_labels row (named after the id
+until sync_labels fills in the real name), and ids known to exist are
+remembered per database so later emails skip the lookup. Ids are only
+remembered once the transaction that interned them commits; a rollback
+forgets them.
+
+email_labels is indexed both ways: its primary key (email_id, label_id)
+serves per-email lookups, and idx_email_labels_label (label_id, email_id)
+serves label filters, distributions and time series, which all run as SQL
+aggregates.
+"""
+
+import json
+from collections import defaultdict
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import delete, event, exists, func, or_, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.gmail_label import GmailLabel, email_labels
+
+BATCH_SIZE = 500
+PENDING_KEY = "email_labels_pending"  # session.info entry until commit
+
+_known: "WeakKeyDictionary[object, Set[str]]" = WeakKeyDictionary()
+_lock = RLock()
+
+
+def split_labels(value) -> List[str]:
+    """Parse legacy label storage: a JSON list or a comma-separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        if value.startswith("["):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                value = value.strip("[]").split(",")
+        else:
+            value = value.split(",")
+    labels = (str(label).strip().strip("\"'") for label in value)
+    return list(dict.fromkeys(label for label in labels if label))
+
+
+def _engine(session: Session):
+    return session.get_bind(mapper=GmailLabel).engine
+
+
+def _after_commit(session: Session) -> None:
+    # A released savepoint can still be rolled back with its transaction
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(PENDING_KEY, {})
+    with _lock:
+        for engine, label_ids in pending.items():
+            _known.setdefault(engine, set()).update(label_ids)
+
+
+def _after_soft_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(PENDING_KEY, None)
+
+
+def _remember_on_commit(session: Session, engine, label_ids: List[str]) -> None:
+    """Remember interned ids once the session's transaction commits."""
+    if not event.contains(session, "after_commit", _after_commit):
+        event.listen(session, "after_commit", _after_commit)
+        event.listen(session, "after_soft_rollback", _after_soft_rollback)
+    session.info.setdefault(PENDING_KEY, {}).setdefault(engine, set()).update(
+        label_ids
+    )
+
+
+def intern_labels(session: Session, label_ids: Iterable[str]) -> List[str]:
+    """Make sure every label id has a gmail_labels row. Returns the ids."""
+    label_ids = list(dict.fromkeys(label_ids))
+    engine = _engine(session)
+    with _lock:
+        known = _known.setdefault(engine, set())
+        missing = [label_id for label_id in label_ids if label_id not in known]
+    if missing:
+        for start in range(0, len(missing), BATCH_SIZE):
+            session.execute(
+                insert(GmailLabel).on_conflict_do_nothing(),
+                [
+                    {"id": label_id, "name": label_id}
+                    for label_id in missing[start : start + BATCH_SIZE]
+                ],
+            )
+        _remember_on_commit(session, engine, missing)
+    return label_ids
+
+
+def set_email_labels(session: Session, email_id: str, label_ids: Iterable[str]) -> None:
+    """Replace an email's label links with the given Gmail label ids."""
+    set_labels_bulk(session, {email_id: list(label_ids)})
+
+
+def set_labels_bulk(session: Session, labels_by_email: Dict[str, List[str]]) -> None:
+    """Replace the label links of many emails in a few statements."""
+    if not labels_by_email:
+        return
+    intern_labels(
+        session, (label for labels in labels_by_email.values() for label in labels)
+    )
+    email_ids = list(labels_by_email)
+    for start in range(0, len(email_ids), BATCH_SIZE):
+        session.execute(
+            delete(email_labels).where(
+                email_labels.c.email_id.in_(email_ids[start : start + BATCH_SIZE])
+            )
+        )
+    links = [
+        {"email_id": email_id, "label_id": label_id}
+        for email_id, labels in labels_by_email.items()
+        for label_id in dict.fromkeys(labels)
+    ]
+    if links:
+        session.execute(insert(email_labels).on_conflict_do_nothing(), links)
+
+
+def forget(session: Optional[Session] = None) -> None:
+    """Drop the remembered label ids, e.g. after labels were deleted."""
+    with _lock:
+        if session is None:
+            _known.clear()
+        else:
+            _known.pop(_engine(session), None)
+
+
+def resolve_labels(session: Session, labels: Iterable[str]) -> List[str]:
+    """Map label ids or names to label ids; unknown labels are dropped."""
+    labels = list(labels)
+    if not labels:
+        return []
+    rows = session.execute(
+        select(GmailLabel.id).where(
+            or_(GmailLabel.id.in_(labels), GmailLabel.name.in_(labels))
+        )
+    )
+    return [label_id for (label_id,) in rows]
+
+
+def has_label(label_id: str):
+    """Criterion on Email: the email carries the label."""
+    return exists().where(
+        email_labels.c.label_id == label_id, email_labels.c.email_id == Email.id
+    )
+
+
+def label_distribution(session: Session) -> List[Tuple[str, int]]:
+    """Return (label name, email count) pairs, most used first."""
+    count = func.count(email_labels.c.email_id).label("count")
+    counts = (
+        select(email_labels.c.label_id, count)
+        .group_by(email_labels.c.label_id)
+        .subquery()
+    )
+    rows = session.execute(
+        select(func.coalesce(GmailLabel.name, counts.c.label_id), counts.c.count)
+        .select_from(counts)
+        .outerjoin(GmailLabel, GmailLabel.id == counts.c.label_id)
+        .order_by(counts.c.count.desc(), GmailLabel.name)
+    )
+    return [(name, count) for name, count in rows]
+
+
+def label_time_series(
+    session: Session, label: str, limit: Optional[int] = None
+) -> List[Tuple[str, int]]:
+    """Return (day, email count) pairs for a label id or name, newest first."""
+    label_ids = resolve_labels(session, [label])
+    if not label_ids:
+        return []
+    day = func.date(Email.received_at).label("day")
+    rows = session.execute(
+        select(day, func.count(Email.id))
+        .select_from(email_labels)
+        .join(Email, Email.id == email_labels.c.email_id)
+        .where(email_labels.c.label_id.in_(label_ids))
+        .group_by(day)
+        .order_by(day.desc())
+        .limit(limit)
+    )
+    return [(day, count) for day, count in rows]
+
+
+def labels_for_emails(session: Session, email_ids: Iterable[str]) -> Dict[str, List[str]]:
+    """Return label names keyed by email id, with one query per batch."""
+    email_ids = list(email_ids)
+    labels: Dict[str, List[str]] = defaultdict(list)
+    for start in range(0, len(email_ids), BATCH_SIZE):
+        rows = session.execute(
+            select(email_labels.c.email_id, GmailLabel.name)
+            .join(GmailLabel, GmailLabel.id == email_labels.c.label_id)
+            .where(email_labels.c.email_id.in_(email_ids[start : start + BATCH_SIZE]))
+            .order_by(email_labels.c.email_id, GmailLabel.name)
+        )
+        for email_id, name in rows:
+            labels[email_id].append(name)
+    return dict(labels)
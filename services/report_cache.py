@@ -0,0 +1,145 @@
+"""Disk cache of computed reports, invalidated by data watermarks.
+
+Report data only changes when ingestion or analysis runs, so a computed
+report is stored on disk together with the watermark of the data it was
+computed from. The watermark is a few aggregate queries per database: row
+counts and the newest updated_at of the tables reports read, plus the
+newest rowid of email_labels and the sum of the label rowids it links to,
+since relabeling an email changes neither a count nor an updated_at. A cached
+report is returned while the watermark is unchanged, across processes and
+scheduled runs.
+
+Changes that touch neither a row count nor updated_at (raw SQL updates
+that leave updated_at alone) are not noticed; clear() the cache after
+running such changes by hand.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from models.gmail_label import GmailLabel, email_labels
+from shared_lib.constants import DATABASE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".pickle"
+
+
+def _stamp(value: Any) -> Any:
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def data_watermark(email_session: Session, analysis_session: Session) -> Dict[str, Any]:
+    """Return row counts and newest updates of the tables reports read.
+
+    Args:
+        email_session: Session on the email database
+        analysis_session: Session on the analysis database
+    """
+    emails = email_session.execute(
+        select(
+            select(func.count()).select_from(Email).scalar_subquery(),
+            select(func.max(Email.updated_at)).scalar_subquery(),
+            select(func.max(GmailLabel.updated_at)).scalar_subquery(),
+        )
+    ).one()
+    # A deleted link's rowid can be reused by its replacement, so the labels
+    # linked to are summed as well
+    links = email_session.execute(
+        select(
+            func.count(),
+            func.max(literal_column("email_labels.rowid")),
+            func.total(literal_column("gmail_labels.rowid")),
+        ).select_from(
+            email_labels.outerjoin(GmailLabel, GmailLabel.id == email_labels.c.label_id)
+        )
+    ).one()
+    analyses = analysis_session.execute(
+        select(func.count(), func.max(EmailAnalysis.updated_at)).select_from(
+            EmailAnalysis
+        )
+    ).one()
+    return {
+        "emails": [_stamp(value) for value in emails],
+        "email_labels": list(links),
+        "email_analysis": [_stamp(value) for value in analyses],
+    }
+
+
+def default_directory() -> str:
+    """Return the configured report cache directory."""
+    return DATABASE_CONFIG["REPORT_CACHE_DIR"]
+
+
+class ReportCache:
+    """Computed reports persisted on disk, keyed by report and parameters."""
+
+    def __init__(self, directory: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory, defaults to REPORT_CACHE_DIR
+        """
+        self.directory = directory or default_directory()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, report: str, params: Dict[str, Any]) -> str:
+        key = json.dumps([report, params], sort_keys=True, default=str)
+        digest = hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()
+        return os.path.join(self.directory, f"{report}-{digest}{CACHE_SUFFIX}")
+
+    def get_or_compute(
+        self,
+        report: str,
+        params: Dict[str, Any],
+        watermark: Any,
+        compute: Callable[[], Any],
+    ) -> Any:
+        """Return the cached report, computing and storing it if stale.
+
+        Args:
+            report: Report type
+            params: Parameters the report depends on; must be JSON-serializable
+            watermark: State of the data the report is computed from
+            compute: Computes the report
+        """
+        path = self._path(report, params)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            if entry["watermark"] == watermark:
+                self.hits += 1
+                return entry["value"]
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError, KeyError) as e:
+            logger.warning(f"Discarding unreadable report cache {path}: {e}")
+
+        self.misses += 1
+        value = compute()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{path}.tmp", "wb") as f:
+            pickle.dump({"watermark": watermark, "value": value}, f)
+        os.replace(f"{path}.tmp", path)
+        return value
+
+    def clear(self) -> int:
+        """Delete every cached report. Returns the number deleted."""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+        return removed
@@ -0,0 +1,205 @@
+"""Single-pass engine behind the full email analysis report.
+
+The report used to call one query method per section, each opening its own
+session, scanning the tables again and post-processing rows in Python.
+ReportEngine instead streams the columns the report needs once, in chunks
+with explicit dtypes, and folds every section into running counts with
+vectorized value_counts, str.split and explode. Memory stays proportional
+to the number of distinct values, not the number of rows. The result is a
+ReportResult that every printer reads from.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services import email_labels
+from services.analysis_join import AnalysisEmailJoin
+
+DEFAULT_CHUNK_SIZE = 10000
+
+EMAIL_DTYPES = {"email_id": "string", "sender": "category"}
+ANALYSIS_DTYPES = {
+    "email_id": "string",
+    "sentiment": "category",
+    "priority": "category",
+    "category": "string",
+}
+
+
+@dataclass
+class ReportResult:
+    """Everything the analysis report prints."""
+
+    total_emails: int = 0
+    total_analyzed: int = 0
+    top_senders: List[Tuple[str, int]] = field(default_factory=list)
+    emails_by_date: List[Tuple[str, int]] = field(default_factory=list)
+    labels: Dict[str, int] = field(default_factory=dict)
+    priorities: List[Tuple[str, int]] = field(default_factory=list)
+    sentiments: List[Tuple[str, int]] = field(default_factory=list)
+    categories: Dict[str, int] = field(default_factory=dict)
+    analyses_by_date: List[Tuple[str, int]] = field(default_factory=list)
+    recent: List[Dict] = field(default_factory=list)
+
+
+class _Tally:
+    """Running value counts over many chunks."""
+
+    def __init__(self):
+        self.counts = pd.Series(dtype="int64")
+
+    def add(self, values: pd.Series) -> None:
+        chunk = values.dropna().value_counts()
+        chunk = chunk[chunk > 0]
+        chunk.index = chunk.index.astype(str)
+        self.counts = self.counts.add(chunk, fill_value=0).astype("int64")
+
+    def ranked(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        counts = self.counts.sort_index().sort_values(ascending=False, kind="stable")
+        if limit is not None:
+            counts = counts.head(limit)
+        return [(value, int(count)) for value, count in counts.items()]
+
+    def newest_first(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        counts = self.counts.sort_index(ascending=False)
+        if limit is not None:
+            counts = counts.head(limit)
+        return [(day, int(count)) for day, count in counts.items()]
+
+
+def split_categories(categories: pd.Series) -> pd.Series:
+    """Explode category values into one row per category.
+
+    Values are either a plain category or a JSON list such as
+    '["Work", "Ops"]'; lists are split with string operations rather than
+    decoded row by row.
+    """
+    categories = categories.dropna().astype("string")
+    is_list = categories.str.startswith("[")
+    items = (
+        categories[is_list]
+        .str.strip("[]")
+        .str.split(",")
+        .explode()
+        .str.strip()
+        .str.strip("\"'")
+        .astype("string")
+    )
+    return pd.concat([categories[~is_list], items], ignore_index=True).replace("", pd.NA)
+
+
+def _days(timestamps: pd.Series) -> pd.Series:
+    return pd.to_datetime(timestamps, utc=True).dt.strftime("%Y-%m-%d")
+
+
+class ReportEngine:
+    """Computes every report section in one pass over each table."""
+
+    def __init__(
+        self,
+        email_session: Session,
+        analysis_session: Session,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        top_senders: int = 10,
+        email_days: int = 10,
+        recent: int = 10,
+    ):
+        """Initialize the engine.
+
+        Args:
+            email_session: Session on the email database
+            analysis_session: Session on the analysis database
+            chunk_size: Rows per streamed chunk
+            top_senders: Number of senders to rank
+            email_days: Number of most recent days of email counts
+            recent: Number of most recent analyses to include in full
+        """
+        self.email_session = email_session
+        self.analysis_session = analysis_session
+        self.chunk_size = chunk_size
+        self.top_senders = top_senders
+        self.email_days = email_days
+        self.recent = recent
+
+    def _chunks(self, session: Session, statement, dtypes: Dict[str, str]):
+        """Stream a statement as DataFrames with the given dtypes."""
+        columns = list(statement.selected_columns.keys())
+        result = session.execute(
+            statement, execution_options={"yield_per": self.chunk_size}
+        )
+        for rows in result.partitions():
+            yield pd.DataFrame(rows, columns=columns).astype(dtypes)
+
+    def run(self) -> ReportResult:
+        """Compute the whole report."""
+        result = ReportResult()
+
+        senders, email_days = _Tally(), _Tally()
+        emails = select(
+            Email.id.label("email_id"),
+            Email.from_address.label("sender"),
+            Email.received_at.label("received_at"),
+        )
+        for chunk in self._chunks(self.email_session, emails, EMAIL_DTYPES):
+            result.total_emails += len(chunk)
+            senders.add(chunk["sender"])
+            email_days.add(_days(chunk["received_at"]))
+
+        sentiments, priorities, categories, analysis_days = (
+            _Tally(),
+            _Tally(),
+            _Tally(),
+            _Tally(),
+        )
+        newest = pd.DataFrame(columns=["email_id", "analyzed_at"])
+        analyses = select(
+            EmailAnalysis.email_id.label("email_id"),
+            EmailAnalysis.sentiment.label("sentiment"),
+            EmailAnalysis.priority.label("priority"),
+            EmailAnalysis.category.label("category"),
+            EmailAnalysis.created_at.label("analyzed_at"),
+        )
+        for chunk in self._chunks(self.analysis_session, analyses, ANALYSIS_DTYPES):
+            result.total_analyzed += len(chunk)
+            sentiments.add(chunk["sentiment"])
+            priorities.add(chunk["priority"])
+            categories.add(split_categories(chunk["category"]))
+            analysis_days.add(_days(chunk["analyzed_at"]))
+            candidates = [newest, chunk[["email_id", "analyzed_at"]]]
+            newest = pd.concat([frame for frame in candidates if len(frame)])
+            newest = newest.sort_values(
+                ["analyzed_at", "email_id"], ascending=False, na_position="last"
+            ).head(self.recent)
+
+        result.top_senders = senders.ranked(self.top_senders)
+        result.emails_by_date = email_days.newest_first(self.email_days)
+        result.sentiments = sentiments.ranked()
+        result.priorities = priorities.ranked()
+        result.categories = dict(categories.ranked())
+        result.analyses_by_date = analysis_days.newest_first()
+        result.labels = dict(email_labels.label_distribution(self.email_session))
+        result.recent = self._recent(list(newest["email_id"]))
+        return result
+
+    def _recent(self, email_ids: List[str]) -> List[Dict]:
+        """Load the newest analyses with their emails, newest first."""
+        join = AnalysisEmailJoin(self.analysis_session, self.email_session)
+        rows = {
+            analysis.email_id: {
+                "email_id": analysis.email_id,
+                "subject": email.subject if email else None,
+                "from": email.from_address if email else None,
+                "summary": analysis.summary,
+                "sentiment": analysis.sentiment,
+                "priority": analysis.priority,
+                "category": analysis.category,
+            }
+            for analysis, email in join.iter_rows(email_ids=email_ids, require_email=False)
+        }
+        return [rows[email_id] for email_id in email_ids if email_id in rows]
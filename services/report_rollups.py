@@ -0,0 +1,441 @@
+"""Incrementally maintained rollups for the email and analysis reports.
+
+Every report distribution used to be a full-table GROUP BY. Instead, each
+source table (emails, email_analysis) has rows in report_rollups counting
+how many of its rows fall on each day with each dimension value, and reports
+sum those rows.
+
+Rollups are kept current through the writer path of tracked sessions (see
+track()):
+
+1. Inserts: every source row has a SQLite rowid, and the watermark records
+   the highest rowid counted. After each flush, and before each read, rows
+   above the watermark are folded in. This also picks up rows written with
+   bulk inserts or by other processes.
+2. Updates and deletes through the ORM: before the flush, the old values of
+   the touched rows are subtracted; after it, the new values of updated rows
+   are added back.
+3. Bulk UPDATE or DELETE statements: the watermark is marked stale and the
+   next read rebuilds that source from scratch.
+
+rebuild() recounts a source from scratch; scripts/rebuild_report_rollups.py
+runs it from the command line.
+"""
+
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from weakref import WeakSet
+
+from sqlalchemy import (
+    Integer,
+    delete,
+    desc,
+    event,
+    func,
+    inspect,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from models.report_rollup import ReportRollup, ReportRollupWatermark
+from shared_lib.database_session_util import AnalysisSession, EmailSession
+
+TOTAL = "total"  # Dimension counting every row of a day, with value ""
+UNKNOWN_DAY = ""  # Day of rows without a date
+BATCH_SIZE = 1000
+PENDING_KEY = "report_rollups_pending"  # session.info entry between flush hooks
+
+
+def _single(value: Any) -> List[str]:
+    """A column holding one value per row."""
+    return [] if value is None or value == "" else [str(value)]
+
+
+def _json_list(value: Any) -> List[str]:
+    """A column holding one value or a JSON list of values."""
+    if isinstance(value, str) and value.startswith("["):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return [value]
+    if isinstance(value, list):
+        return [str(item) for item in value if item not in (None, "")]
+    return _single(value)
+
+
+class RollupSource(NamedTuple):
+    """A table summarized by the rollups."""
+
+    name: str
+    model: type
+    day_column: Any
+    dimensions: Dict[str, Tuple[Any, Callable[[Any], List[str]]]]
+
+
+SOURCES: Dict[str, RollupSource] = {
+    "emails": RollupSource(
+        "emails",
+        Email,
+        Email.received_at,
+        {"sender": (Email.from_address, _single)},
+    ),
+    "email_analysis": RollupSource(
+        "email_analysis",
+        EmailAnalysis,
+        EmailAnalysis.created_at,
+        {
+            "sentiment": (EmailAnalysis.sentiment, _single),
+            "priority": (EmailAnalysis.priority, _single),
+            "category": (EmailAnalysis.category, _json_list),
+        },
+    ),
+}
+SOURCES_BY_MODEL = {source.model: source for source in SOURCES.values()}
+
+_ready: "WeakSet" = WeakSet()  # Engines whose rollup tables are known to exist
+
+
+def _rowid(source: RollupSource):
+    return literal_column(f"{source.model.__tablename__}.rowid", Integer)
+
+
+def _primary_key(source: RollupSource):
+    return source.model.__mapper__.primary_key[0]
+
+
+def _day(value: Any) -> str:
+    """Return the YYYY-MM-DD day of a datetime or ISO string."""
+    if value is None:
+        return UNKNOWN_DAY
+    if hasattr(value, "date"):
+        return value.date().isoformat()
+    return str(value)[:10]
+
+
+def _select_rows(source: RollupSource, *criteria):
+    """Select (rowid, day, dimension columns...) from a source table."""
+    columns = [column for column, _ in source.dimensions.values()]
+    return select(_rowid(source), source.day_column, *columns).where(*criteria)
+
+
+def _count(source: RollupSource, rows: Iterable[tuple]) -> Tuple[Counter, int]:
+    """Count rows per (dimension, day, value). Also returns the highest rowid."""
+    counts: Counter = Counter()
+    last_rowid = 0
+    for rowid, day_value, *values in rows:
+        last_rowid = max(last_rowid, rowid)
+        day = _day(day_value)
+        counts[(TOTAL, day, "")] += 1
+        for (dimension, (_, split)), value in zip(source.dimensions.items(), values):
+            for item in split(value):
+                counts[(dimension, day, item)] += 1
+    return counts, last_rowid
+
+
+def _apply(
+    connection: Connection, source: RollupSource, counts: Counter, sign: int = 1
+) -> None:
+    """Add (or with sign=-1, subtract) counts to the rollup rows."""
+    if not counts:
+        return
+    statement = insert(ReportRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            ReportRollup.source,
+            ReportRollup.dimension,
+            ReportRollup.day,
+            ReportRollup.value,
+        ],
+        set_={"count": ReportRollup.count + statement.excluded["count"]},
+    )
+    connection.execute(
+        statement,
+        [
+            {
+                "source": source.name,
+                "dimension": dimension,
+                "day": day,
+                "value": value,
+                "count": sign * count,
+            }
+            for (dimension, day, value), count in counts.items()
+        ],
+    )
+    if sign < 0:
+        connection.execute(
+            delete(ReportRollup).where(
+                ReportRollup.source == source.name, ReportRollup.count <= 0
+            )
+        )
+
+
+def _ensure_tables(connection: Connection) -> None:
+    if connection.engine in _ready:
+        return
+    ReportRollup.__table__.create(connection, checkfirst=True)
+    ReportRollupWatermark.__table__.create(connection, checkfirst=True)
+    _ready.add(connection.engine)
+
+
+def _watermark(connection: Connection, source: RollupSource) -> Optional[tuple]:
+    return connection.execute(
+        select(ReportRollupWatermark.last_rowid, ReportRollupWatermark.stale).where(
+            ReportRollupWatermark.source == source.name
+        )
+    ).first()
+
+
+def _set_watermark(
+    connection: Connection, source: RollupSource, last_rowid: int, rebuilt: bool = False
+) -> None:
+    values = {"last_rowid": last_rowid, "stale": False}
+    if rebuilt:
+        values["rebuilt_at"] = func.now()
+    statement = insert(ReportRollupWatermark).values(source=source.name, **values)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ReportRollupWatermark.source], set_=values
+        )
+    )
+
+
+def rebuild(connection: Connection, source_name: str) -> int:
+    """Recount one source from scratch. Returns the number of source rows."""
+    source = SOURCES[source_name]
+    _ensure_tables(connection)
+    connection.execute(delete(ReportRollup).where(ReportRollup.source == source.name))
+    counts: Counter = Counter()
+    last_rowid = 0
+    result = connection.execution_options(yield_per=BATCH_SIZE).execute(
+        _select_rows(source)
+    )
+    for batch in result.partitions():
+        batch_counts, batch_last = _count(source, batch)
+        counts.update(batch_counts)
+        last_rowid = max(last_rowid, batch_last)
+    _apply(connection, source, counts)
+    _set_watermark(connection, source, last_rowid, rebuilt=True)
+    return sum(count for (dimension, _, _), count in counts.items() if dimension == TOTAL)
+
+
+def catch_up(connection: Connection, source_name: str) -> int:
+    """Bring one source's rollups up to date. Returns the rows folded in.
+
+    Missing or stale rollups are rebuilt; otherwise only rows above the
+    watermark are read.
+    """
+    source = SOURCES[source_name]
+    _ensure_tables(connection)
+    watermark = _watermark(connection, source)
+    if watermark is None or watermark.stale:
+        return rebuild(connection, source_name)
+    rows = connection.execute(
+        _select_rows(source, _rowid(source) > watermark.last_rowid)
+    ).all()
+    if rows:
+        counts, last_rowid = _count(source, rows)
+        _apply(connection, source, counts)
+        _set_watermark(connection, source, last_rowid)
+    return len(rows)
+
+
+def _connection(session: Session, source: RollupSource) -> Connection:
+    track(session)
+    return session.connection(bind_arguments={"mapper": source.model})
+
+
+def distribution(
+    session: Session, source_name: str, dimension: str, limit: Optional[int] = None
+) -> List[Tuple[str, int]]:
+    """Return (value, count) pairs over all days, most common first."""
+    source = SOURCES[source_name]
+    connection = _connection(session, source)
+    catch_up(connection, source_name)
+    total = func.sum(ReportRollup.count).label("count")
+    statement = (
+        select(ReportRollup.value, total)
+        .where(ReportRollup.source == source.name, ReportRollup.dimension == dimension)
+        .group_by(ReportRollup.value)
+        .order_by(desc(total), ReportRollup.value)
+        .limit(limit)
+    )
+    return [(value, count) for value, count in connection.execute(statement)]
+
+
+def daily_counts(
+    session: Session, source_name: str, limit: Optional[int] = None
+) -> List[Tuple[str, int]]:
+    """Return (day, row count) pairs, newest day first; undated rows are left out."""
+    source = SOURCES[source_name]
+    connection = _connection(session, source)
+    catch_up(connection, source_name)
+    statement = (
+        select(ReportRollup.day, ReportRollup.count)
+        .where(
+            ReportRollup.source == source.name,
+            ReportRollup.dimension == TOTAL,
+            ReportRollup.day != UNKNOWN_DAY,
+        )
+        .order_by(ReportRollup.day.desc())
+        .limit(limit)
+    )
+    return [(day, count) for day, count in connection.execute(statement)]
+
+
+def rebuild_all(session: Session) -> Dict[str, int]:
+    """Rebuild every source reachable from a session. Returns row counts."""
+    return {
+        name: rebuild(_connection(session, source), name)
+        for name, source in SOURCES.items()
+    }
+
+
+# Writer path
+
+
+def _touched(objects: Iterable[Any]) -> Dict[str, list]:
+    """Group the primary keys of persistent source objects by source name."""
+    touched: Dict[str, list] = {}
+    for obj in objects:
+        source = SOURCES_BY_MODEL.get(type(obj))
+        identity = inspect(obj).identity if source is not None else None
+        if identity is not None:
+            touched.setdefault(source.name, []).append(identity[0])
+    return touched
+
+
+def _counted_rows(connection: Connection, source: RollupSource, keys: list) -> list:
+    """Current rows with the given keys that the watermark has counted."""
+    watermark = _watermark(connection, source)
+    if watermark is None or watermark.stale:
+        return []
+    rows = []
+    for start in range(0, len(keys), BATCH_SIZE):
+        rows.extend(
+            connection.execute(
+                _select_rows(
+                    source,
+                    _primary_key(source).in_(keys[start : start + BATCH_SIZE]),
+                    _rowid(source) <= watermark.last_rowid,
+                )
+            )
+        )
+    return rows
+
+
+def _lower_watermark(connection: Connection, source: RollupSource) -> None:
+    """Keep the watermark below rowids that SQLite may hand out again.
+
+    Without AUTOINCREMENT, deleting the highest rowid lets the next insert
+    reuse it, and a reused rowid under the watermark would never be counted.
+    """
+    highest = (
+        select(func.coalesce(func.max(_rowid(source)), 0))
+        .select_from(source.model.__table__)
+        .scalar_subquery()
+    )
+    connection.execute(
+        update(ReportRollupWatermark)
+        .where(
+            ReportRollupWatermark.source == source.name,
+            ReportRollupWatermark.last_rowid > highest,
+        )
+        .values(last_rowid=highest)
+    )
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    """Subtract the old values of rows about to be updated or deleted."""
+    updated = _touched(obj for obj in session.dirty if session.is_modified(obj))
+    deleted = _touched(session.deleted)
+    pending = session.info.setdefault(PENDING_KEY, {})
+    for name in updated.keys() | deleted.keys():
+        source = SOURCES[name]
+        connection = _connection(session, source)
+        if connection.dialect.name != "sqlite":
+            continue
+        catch_up(connection, name)
+        keys = updated.get(name, []) + deleted.get(name, [])
+        counts, _ = _count(source, _counted_rows(connection, source, keys))
+        _apply(connection, source, counts, sign=-1)
+        added_back, had_deletes = pending.get(name, ([], False))
+        pending[name] = (added_back + updated.get(name, []), had_deletes or name in deleted)
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    """Add back updated rows and fold in inserted ones."""
+    pending = session.info.pop(PENDING_KEY, {})
+    inserted = {
+        SOURCES_BY_MODEL[type(obj)].name
+        for obj in session.new
+        if type(obj) in SOURCES_BY_MODEL
+    }
+    for name in inserted | pending.keys():
+        source = SOURCES[name]
+        connection = _connection(session, source)
+        if connection.dialect.name != "sqlite":
+            continue
+        updated, had_deletes = pending.get(name, ([], False))
+        if updated:
+            counts, _ = _count(source, _counted_rows(connection, source, updated))
+            _apply(connection, source, counts)
+        catch_up(connection, name)
+        if had_deletes:
+            _lower_watermark(connection, source)
+
+
+def _after_rollback(session: Session) -> None:
+    """Forget pending work; rolled back DDL may have dropped the tables again."""
+    session.info.pop(PENDING_KEY, None)
+    _ready.clear()
+
+
+def _on_orm_execute(orm_execute_state) -> None:
+    """Bulk UPDATE/DELETE bypasses the flush; mark the rollups stale."""
+    state = orm_execute_state
+    if not (state.is_update or state.is_delete):
+        return
+    for mapper in state.all_mappers:
+        source = SOURCES_BY_MODEL.get(mapper.class_)
+        if source is None:
+            continue
+        connection = _connection(state.session, source)
+        if connection.dialect.name == "sqlite":
+            _ensure_tables(connection)
+            connection.execute(
+                update(ReportRollupWatermark)
+                .where(ReportRollupWatermark.source == source.name)
+                .values(stale=True)
+            )
+
+
+LISTENERS = (
+    ("before_flush", _before_flush),
+    ("after_flush", _after_flush),
+    ("after_rollback", _after_rollback),
+    ("do_orm_execute", _on_orm_execute),
+)
+
+
+def track(session: Session) -> None:
+    """Keep the rollups current with writes made through a session.
+
+    Sessions read through this module are tracked automatically, as are
+    sessions from the application's email and analysis sessionmakers.
+    """
+    for name, listener in LISTENERS:
+        # A session also runs the listeners of its sessionmaker
+        if listener not in getattr(session.dispatch, name):
+            event.listen(session, name, listener)
+
+
+for factory in (EmailSession, AnalysisSession):
+    for name, listener in LISTENERS:
+        event.listen(factory, name, listener)
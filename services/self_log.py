@@ -0,0 +1,358 @@
+"""Streaming reads and time clustering of self-sent emails.
+
+Self-emails (from and to the same address) are read through the
+idx_emails_self index, selecting only the columns the self-log uses, in
+chunks. Each chunk is bucketed into time periods
+and its topics counted with vectorized pandas operations. TimeClusters
+keeps only counts and the newest few emails of each period, so a
+multi-year mailbox is clustered in constant memory.
+
+Emails that already have a row in email_analysis reuse it. Only the rest
+are sent to the analyzer, a few at a time in parallel, and their results
+are stored, so repeated runs over the same period make no API calls.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services.analytics_snapshot import split_category
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ("today", "this_week", "this_month", "older")
+SUMMARY_LIMIT = 5
+DEFAULT_CHUNK_SIZE = 1000
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_WORKERS = 4
+ANALYSIS_FIELDS = ("summary", "sentiment", "category", "priority")
+
+SELF_EMAIL_COLUMNS = {
+    "id": Email.id,
+    "thread_id": Email.thread_id,
+    "subject": Email.subject,
+    "body": Email.body,
+    "received_at": Email.received_at,
+}
+SELF_EMAIL_DTYPES = {"id": "string", "thread_id": "string"}
+
+
+def _self_criteria(address: str, since: Optional[datetime]) -> list:
+    criteria = [Email.from_address == address, Email.to_address == address]
+    if since is not None:
+        criteria.append(Email.received_at >= since)
+    return criteria
+
+
+def count_self_emails(
+    session: Session, address: str, since: Optional[datetime] = None
+) -> int:
+    """Count self-emails; answered from the index alone."""
+    return session.scalar(
+        select(func.count()).select_from(Email).where(*_self_criteria(address, since))
+    )
+
+
+def iter_self_emails(
+    session: Session,
+    address: str,
+    since: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Stream self-emails, newest first, as DataFrames of chunk_size rows.
+
+    Args:
+        session: Session on the email database
+        address: The user's address
+        since: Only emails received at or after this time
+        chunk_size: Rows per DataFrame
+    """
+    result = session.execute(
+        select(*SELF_EMAIL_COLUMNS.values())
+        .where(*_self_criteria(address, since))
+        .order_by(Email.received_at.desc()),
+        execution_options={"yield_per": chunk_size},
+    )
+    for rows in result.partitions():
+        frame = pd.DataFrame(rows, columns=list(SELF_EMAIL_COLUMNS))
+        frame = frame.astype(SELF_EMAIL_DTYPES)
+        # The analyzer expects strings
+        frame["subject"] = frame["subject"].fillna("").astype(str)
+        frame["body"] = frame["body"].fillna("").astype(str)
+        frame["received_at"] = pd.to_datetime(frame["received_at"], utc=True)
+        yield frame
+
+
+def priority_label(score: Any) -> str:
+    """Map an analyzer priority score (1-5) to the stored priority."""
+    try:
+        score = int(score)
+    except (TypeError, ValueError):
+        return "low"
+    if score >= 4:
+        return "high"
+    return "medium" if score == 3 else "low"
+
+
+def analysis_fields(email_id: str, response: Any) -> Dict[str, Any]:
+    """Convert an analyzer response (object or dict) to stored analysis fields."""
+    if not isinstance(response, dict):
+        response = vars(response)
+    categories = response.get("category") or []
+    if isinstance(categories, str):
+        categories = [categories]
+    fields = {
+        "email_id": email_id,
+        "summary": response.get("summary") or None,
+        "sentiment": response.get("sentiment") or "neutral",
+        "priority": response.get("priority") or priority_label(
+            response.get("priority_score")
+        ),
+    }
+    if len(categories) == 1:
+        fields["category"] = categories[0]
+    elif categories:
+        fields["category"] = json.dumps(categories)
+    return fields
+
+
+def stored_analyses(session: Session, email_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch the stored analyses of some emails with one query.
+
+    Returns:
+        Analysis fields by email id, for the emails that have an analysis
+    """
+    if not email_ids:
+        return {}
+    columns = [getattr(EmailAnalysis, name) for name in ANALYSIS_FIELDS]
+    rows = session.execute(
+        select(EmailAnalysis.email_id, *columns).where(
+            EmailAnalysis.email_id.in_(email_ids)
+        )
+    )
+    return {
+        row[0]: {"email_id": row[0], **dict(zip(ANALYSIS_FIELDS, row[1:]))}
+        for row in rows
+    }
+
+
+def analyze_missing(
+    emails: List[Dict[str, Any]],
+    analyze: Callable[[Dict[str, Any]], Any],
+    workers: int = DEFAULT_WORKERS,
+) -> Dict[str, Dict[str, Any]]:
+    """Analyze emails in parallel. Failed analyses are logged and skipped.
+
+    Returns:
+        Analysis fields by email id
+    """
+
+    def run(email: Dict[str, Any]):
+        try:
+            return email["id"], analyze(email)
+        except Exception as e:
+            logger.error(f"Analysis failed for email {email['id']}: {e}")
+            return email["id"], None
+
+    if not emails:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(emails)))) as executor:
+        results = list(executor.map(run, emails))
+    return {
+        email_id: analysis_fields(email_id, response)
+        for email_id, response in results
+        if response
+    }
+
+
+def store_analyses(session: Session, analyses: Dict[str, Dict[str, Any]]) -> None:
+    """Store new analyses, replacing any written meanwhile by another process."""
+    for fields in analyses.values():
+        session.merge(EmailAnalysis.from_api_response(fields))
+    session.flush()
+
+
+def reuse_or_analyze(
+    session: Session,
+    emails: List[Dict[str, Any]],
+    analyze: Callable[[Dict[str, Any]], Any],
+    workers: int = DEFAULT_WORKERS,
+) -> List[Dict[str, Any]]:
+    """Return analyses for emails, calling the analyzer only for new ones.
+
+    Args:
+        session: Session on the analysis database; new analyses are flushed
+            to it and committed by the caller
+        emails: Emails with id, subject, body and received_at
+        analyze: Analyzes one email, e.g. EmailAnalyzer.analyze_email
+        workers: Parallel analyzer calls
+
+    Returns:
+        One record per analysed email, in email order: the analysis fields
+        plus the email's subject and received_at, and its categories as
+        topics
+    """
+    analyses = stored_analyses(session, [email["id"] for email in emails])
+    missing = [email for email in emails if email["id"] not in analyses]
+    fresh = analyze_missing(missing, analyze, workers)
+    store_analyses(session, fresh)
+    analyses.update(fresh)
+    logger.info(
+        f"Reused {len(emails) - len(missing)} stored analyses, "
+        f"analyzed {len(fresh)} of {len(missing)} new emails"
+    )
+
+    records = []
+    for email in emails:
+        analysis = analyses.get(email["id"])
+        if analysis is not None:
+            records.append(
+                {
+                    **analysis,
+                    "subject": email.get("subject"),
+                    "received_at": email.get("received_at"),
+                    "topics": split_category(analysis.get("category")),
+                }
+            )
+    return records
+
+
+def assign_periods(dates: pd.Series, now: pd.Timestamp) -> pd.Series:
+    """Label each date with its time period relative to now.
+
+    Args:
+        dates: Datetimes, or strings in DATE_FORMAT; naive values are UTC
+        now: Current time (timezone-aware)
+    """
+    dates = pd.to_datetime(dates, utc=True, format="mixed")
+    periods = np.select(
+        [
+            dates.dt.normalize() == now.normalize(),
+            dates > now - pd.Timedelta(days=7),
+            dates > now - pd.Timedelta(days=30),
+        ],
+        list(PERIODS[:3]),
+        default=PERIODS[3],
+    )
+    return pd.Series(
+        pd.Categorical(periods, categories=PERIODS), index=dates.index, name="period"
+    )
+
+
+def _topics(frame: pd.DataFrame) -> Optional[pd.Series]:
+    """Return one row per (email, topic), or None if there are no topics."""
+    if "topics" in frame:
+        topics = frame["topics"].explode()
+    elif "topic" in frame:
+        topics = frame["topic"]
+    else:
+        return None
+    topics = topics.dropna()
+    return topics[topics.astype(str) != ""].astype(str)
+
+
+class TimeClusters:
+    """Running per-period counts, topic counts and newest emails."""
+
+    def __init__(
+        self, now: Optional[pd.Timestamp] = None, summary_limit: int = SUMMARY_LIMIT
+    ):
+        """Initialize the clusters.
+
+        Args:
+            now: Time periods are relative to, defaults to the current time
+            summary_limit: Newest emails kept per period
+        """
+        self.now = now if now is not None else pd.Timestamp.now(tz="UTC")
+        self.summary_limit = summary_limit
+        self.counts = pd.Series(0, index=list(PERIODS), dtype="int64")
+        self.topic_counts = pd.DataFrame(
+            {"period": pd.Series(dtype="string"), "topic": pd.Series(dtype="string")}
+        ).assign(count=pd.Series(dtype="int64"))
+        self.recent: Optional[pd.DataFrame] = None
+
+    def add(self, frame: pd.DataFrame, date_column: str = "received_at") -> None:
+        """Add a chunk of emails (or analysed emails) to the clusters."""
+        if frame.empty:
+            return
+        frame = frame.assign(
+            _date=pd.to_datetime(frame[date_column], utc=True, format="mixed")
+        )
+        frame["period"] = assign_periods(frame["_date"], self.now)
+        self.counts = self.counts.add(
+            frame["period"].value_counts(), fill_value=0
+        ).astype("int64")
+
+        topics = _topics(frame)
+        if topics is not None and not topics.empty:
+            chunk = (
+                pd.DataFrame(
+                    {"period": frame["period"].loc[topics.index].astype(str), "topic": topics}
+                )
+                .groupby(["period", "topic"], observed=True)
+                .size()
+                .rename("count")
+                .reset_index()
+            )
+            self.topic_counts = (
+                pd.concat([self.topic_counts, chunk], ignore_index=True)
+                .groupby(["period", "topic"], as_index=False)["count"]
+                .sum()
+            )
+
+        newest = frame.sort_values("_date", ascending=False).groupby(
+            "period", observed=True
+        ).head(self.summary_limit)
+        candidates = [newest] if self.recent is None else [self.recent, newest]
+        self.recent = (
+            pd.concat(candidates, ignore_index=True)
+            .sort_values("_date", ascending=False)
+            .groupby("period", observed=True)
+            .head(self.summary_limit)
+        )
+
+    def _summaries(self, period: str) -> List[Dict[str, Any]]:
+        if self.recent is None:
+            return []
+        rows = self.recent[self.recent["period"] == period]
+        summaries = []
+        for row in rows.to_dict("records"):
+            topics = row.get("topics")
+            if not isinstance(topics, list):
+                topic = row.get("topic")
+                topics = [topic] if isinstance(topic, str) and topic else []
+            summaries.append(
+                {
+                    **{key: value for key, value in row.items() if key != "_date"},
+                    "subject": row.get("subject") or "",
+                    "date": row["_date"].strftime(DATE_FORMAT)
+                    if not pd.isna(row["_date"])
+                    else "",
+                    "topics": topics,
+                }
+            )
+        return summaries
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Return {period: {"count", "emails" (newest first), "topics"}}."""
+        clusters = {}
+        for period in PERIODS:
+            topics = self.topic_counts[self.topic_counts["period"] == period]
+            clusters[period] = {
+                "count": int(self.counts[period]),
+                "emails": self._summaries(period),
+                "topics": {
+                    topic: int(count)
+                    for topic, count in zip(topics["topic"], topics["count"])
+                },
+            }
+        return clusters
@@ -0,0 +1,223 @@
+"""Tag canonicalization backed by a learned synonym graph.
+
+Resolving whether a new tag duplicates an existing one goes through these
+layers in order; Claude is only consulted when none of them has an answer:
+
+1. Canonical keys - case, separator and plural folding plus abbreviation
+   expansion (shared_lib.tag_util)
+2. Synonym graph - "same"/"different" decisions previously made by Claude or
+   the user, persisted in the tag_synonyms table
+3. Edit distance - near-miss spellings found with a BK-tree, reported as
+   potential matches
+"""
+
+from datetime import datetime
+from threading import RLock
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+from models.catalog import TagSynonym
+from services.catalog_registry import TagEntry
+from shared_lib.constants import CATALOG_CONFIG
+from shared_lib.tag_util import BKTree, canonical_key, fold_tag
+
+SAME = "same"
+DIFFERENT = "different"
+
+
+class TagResolution(NamedTuple):
+    """Outcome of resolving a tag name against the existing tags.
+
+    ``tag`` is set when the tag is known to duplicate an existing one.
+    ``candidates`` holds (tag, similarity) pairs for near-miss spellings.
+    """
+
+    tag: Optional[TagEntry]
+    source: Optional[str]
+    candidates: List[Tuple[TagEntry, float]]
+
+    @property
+    def answered(self) -> bool:
+        """Whether the local layers decided without needing Claude."""
+        return self.tag is not None or bool(self.candidates)
+
+
+class TagCanonicalizer:
+    """Resolves tag names to existing tags and records synonym decisions."""
+
+    def __init__(self, session_factory: sessionmaker):
+        """Initialize the canonicalizer.
+
+        Args:
+            session_factory: Factory for catalog database sessions
+        """
+        self._session_factory = session_factory
+        self._lock = RLock()
+        self._parent: Dict[str, str] = {}
+        self._different: Dict[str, Set[str]] = {}
+        self._tree = BKTree()
+        self._loaded = False
+
+    # Synonym graph
+
+    def _find(self, key: str) -> str:
+        """Return the representative key of a synonym group."""
+        root = key
+        while self._parent.get(root, root) != root:
+            root = self._parent[root]
+        # Path compression
+        while key != root:
+            self._parent[key], key = root, self._parent.get(key, key)
+        return root
+
+    def _union(self, first: str, second: str) -> None:
+        first_root, second_root = self._find(first), self._find(second)
+        if first_root != second_root:
+            self._parent[max(first_root, second_root)] = min(first_root, second_root)
+
+    def load(self) -> None:
+        """(Re)load the synonym graph from the database."""
+        session = self._session_factory()
+        try:
+            rows = session.query(
+                TagSynonym.alias_key, TagSynonym.target_key, TagSynonym.relation
+            ).all()
+        finally:
+            session.close()
+
+        with self._lock:
+            self._parent = {}
+            self._different = {}
+            for alias_key, target_key, relation in rows:
+                self._apply(alias_key, target_key, relation)
+            self._loaded = True
+
+    def _apply(self, alias_key: str, target_key: str, relation: str) -> None:
+        if relation == SAME:
+            self._union(alias_key, target_key)
+        else:
+            self._different.setdefault(alias_key, set()).add(target_key)
+            self._different.setdefault(target_key, set()).add(alias_key)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def is_different(self, first_key: str, second_key: str) -> bool:
+        """Whether the two keys were recorded as different tags."""
+        with self._lock:
+            self._ensure_loaded()
+            return second_key in self._different.get(first_key, set())
+
+    # Resolution
+
+    def resolve(self, name: str, tags: List[TagEntry]) -> TagResolution:
+        """Resolve a tag name against existing tags without calling Claude.
+
+        Args:
+            name: Tag name to resolve
+            tags: Existing tags to compare against
+
+        Returns:
+            TagResolution describing the local decision, if any
+        """
+        key = canonical_key(name)
+        by_key: Dict[str, TagEntry] = {}
+        for tag in tags:
+            by_key.setdefault(canonical_key(tag.name), tag)
+
+        with self._lock:
+            self._ensure_loaded()
+
+            # 1. Same canonical key
+            if key in by_key:
+                tag = by_key[key]
+                source = "fold" if fold_tag(tag.name) == fold_tag(name) else "abbreviation"
+                return TagResolution(tag, source, [])
+
+            # 2. Learned synonyms
+            root = self._find(key)
+            for tag_key, tag in by_key.items():
+                if self._find(tag_key) == root and tag_key != key:
+                    return TagResolution(tag, "synonym", [])
+
+            # 3. Near-miss spellings
+            for tag_key in by_key:
+                self._tree.add(tag_key)
+            different = self._different.get(key, set())
+            candidates = [
+                (by_key[tag_key], 1 - distance / max(len(key), len(tag_key)))
+                for distance, tag_key in self._tree.search(key, self._max_distance(key))
+                if tag_key in by_key and tag_key not in different
+            ]
+            return TagResolution(None, None, candidates)
+
+    @staticmethod
+    def _max_distance(key: str) -> int:
+        """Allowed edit distance, tighter for short keys."""
+        if len(key) <= 2:
+            return 0
+        if len(key) <= 4:
+            return 1
+        return CATALOG_CONFIG["TAG_EDIT_DISTANCE"]
+
+    # Recording decisions
+
+    def record(
+        self,
+        name: str,
+        other_name: str,
+        same: bool,
+        source: str,
+        score: Optional[float] = None,
+    ) -> None:
+        """Record a decision about two tag names.
+
+        A later decision about the same pair replaces the earlier one, so a
+        user can overrule Claude.
+
+        Args:
+            name: Tag name that was checked
+            other_name: Existing tag it was compared with
+            same: Whether the two names mean the same tag
+            source: Who decided ("llm" or "user")
+            score: Optional similarity score
+        """
+        alias_key = canonical_key(name)
+        target_key = canonical_key(other_name)
+        if alias_key == target_key:
+            return
+        relation = SAME if same else DIFFERENT
+
+        session = self._session_factory()
+        try:
+            existing = (
+                session.query(TagSynonym)
+                .filter(
+                    TagSynonym.alias_key.in_([alias_key, target_key]),
+                    TagSynonym.target_key.in_([alias_key, target_key]),
+                )
+                .first()
+            )
+            overruled = existing is not None and existing.relation != relation
+            if existing is None:
+                existing = TagSynonym(
+                    alias_key=alias_key,
+                    target_key=target_key,
+                    created_date=int(datetime.utcnow().timestamp()),
+                )
+                session.add(existing)
+            existing.relation = relation
+            existing.source = source
+            existing.score = score
+            session.commit()
+        finally:
+            session.close()
+
+        with self._lock:
+            if overruled:
+                # Union-find cannot split groups, so rebuild from the table
+                self._loaded = False
+            elif self._loaded:
+                self._apply(alias_key, target_key, relation)
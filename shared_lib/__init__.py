@@ -1,29 +1,32 @@
 """
 Shared library for Marian project containing common utilities and integrations.
-"""
-
-# External API integrations
-from .anthropic_lib import parse_claude_response
 
-# Database utilities
-from .database_session_util import (
-    get_analysis_session,
-    get_catalog_session,
-    get_email_session,
-)
-from .gmail_lib import GmailAPI
+Exports are imported on first access, so importing a single submodule (for
+example shared_lib.constants) stays cheap.
+"""
 
-# Core utilities
-from .logging_util import setup_logging
+import importlib
 
-__all__ = [
+_EXPORTS = {
     # External APIs
-    "parse_claude_response",
-    "GmailAPI",
+    "parse_claude_response": ".anthropic_lib",
+    "GmailAPI": ".gmail_lib",
     # Database
-    "get_email_session",
-    "get_analysis_session",
-    "get_catalog_session",
+    "get_email_session": ".database_session_util",
+    "get_analysis_session": ".database_session_util",
+    "get_catalog_session": ".database_session_util",
     # Core
-    "setup_logging",
-]
+    "setup_logging": ".logging_util",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import an exported name on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
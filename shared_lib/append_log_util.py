@@ -0,0 +1,248 @@
+"""Durable append-only writer for line-oriented logs.
+
+Each record is written with a single write() call on a file descriptor
+opened with O_APPEND. Concurrent writers, in this process or in others,
+therefore never interleave within a line. How often the file is synced to
+disk is set by the durability level:
+
+- "none": never synced by the writer; the OS flushes it eventually
+- "batch": a background thread syncs at most every flush interval, so a
+  crash loses at most that much of the log (the default)
+- "record": every append returns only once it is on disk. Threads that
+  append at the same time share one sync (group commit)
+
+A crash can leave a partial last line. Opening the writer truncates it, so
+the file always ends with a complete record.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+DURABILITY_NONE = "none"
+DURABILITY_BATCH = "batch"
+DURABILITY_RECORD = "record"
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_BATCH, DURABILITY_RECORD)
+DEFAULT_FLUSH_INTERVAL = 0.2  # seconds
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# fdatasync skips metadata updates that are not needed to read the data
+_sync = getattr(os, "fdatasync", os.fsync)
+
+
+def recover_tail(path: Union[str, Path]) -> int:
+    """Truncate a partial last line left by a crash.
+
+    Must not run while another process is appending to the file.
+
+    Args:
+        path: Log file
+
+    Returns:
+        Number of bytes removed
+    """
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        end = size
+        while end > 0:
+            start = max(0, end - TAIL_BLOCK_SIZE)
+            f.seek(start)
+            block = f.read(end - start)
+            if end == size and block.endswith(b"\n"):
+                return 0
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        f.truncate(end)
+        f.flush()
+        _sync(f.fileno())
+    removed = size - end
+    logger.warning(f"Truncated {removed} bytes of partial record from {path}")
+    return removed
+
+
+class AppendLog:
+    """Appends complete lines to a file with a configurable durability level."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        durability: str = DURABILITY_BATCH,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        permissions: Optional[int] = None,
+    ) -> None:
+        """Open the log for appending, recovering a partial last line.
+
+        Args:
+            path: Log file, created if missing
+            durability: "none", "batch" or "record"
+            flush_interval: Seconds between syncs at "batch" durability
+            permissions: Mode for a newly created file
+
+        Raises:
+            ValueError: If durability or flush_interval is invalid
+            OSError: If the file cannot be opened
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"durability must be one of: {DURABILITY_LEVELS}")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+
+        self.path = Path(path)
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.permissions = permissions
+        self.appends = 0
+        self.syncs = 0
+
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._written = 0  # sequence number of the last record written
+        self._synced = 0  # sequence number of the last record on disk
+        self._closed = threading.Event()
+        self._fd = self._open()
+
+        self._flusher = None
+        if durability == DURABILITY_BATCH:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                name=f"append-log-flusher:{self.path.name}",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _open(self) -> int:
+        if self.path.exists():
+            recover_tail(self.path)
+        mode = self.permissions if self.permissions is not None else 0o644
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, mode)
+
+    def append(self, line: Union[str, bytes]) -> int:
+        """Append one record, returning once it is as durable as configured.
+
+        Args:
+            line: The record; a trailing newline is added if missing
+
+        Returns:
+            Byte offset of the record in the file
+
+        Raises:
+            ValueError: If the log is closed or the record contains a newline
+            OSError: If the write or sync fails
+        """
+        offset, _, sequence = self.write(line)
+        self.commit(sequence)
+        return offset
+
+    def write(self, line: Union[str, bytes]) -> Tuple[int, int, int]:
+        """Write one record without waiting for it to reach the disk.
+
+        Callers that must do more work in file order (e.g. index the
+        record) under their own lock write first, release the lock, then
+        commit, so concurrent commits can still share a sync.
+
+        Returns:
+            (offset, length, sequence); pass sequence to commit()
+        """
+        data = line.encode("utf-8") if isinstance(line, str) else line
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        if b"\n" in data[:-1]:
+            raise ValueError("A record must be a single line")
+
+        with self._write_lock:
+            if self._closed.is_set():
+                raise ValueError("Append log is closed")
+            view = memoryview(data)
+            # O_APPEND moves to the end before each write; regular files only
+            # write partially when the disk is full, which then raises
+            end = 0
+            while view:
+                view = view[os.write(self._fd, view) :]
+                end = os.lseek(self._fd, 0, os.SEEK_CUR)
+            self._written += 1
+            self.appends += 1
+            return end - len(data), len(data), self._written
+
+    def commit(self, sequence: int) -> None:
+        """Wait until a written record is as durable as configured."""
+        if self.durability == DURABILITY_RECORD:
+            self._sync_through(sequence)
+
+    def _sync_through(self, sequence: int) -> None:
+        """Sync until the given record is on disk, sharing syncs between threads.
+
+        A thread that waited for the lock while another synced often finds
+        its record already covered and returns without a sync of its own.
+        """
+        with self._sync_lock:
+            if self._synced >= sequence:
+                return
+            target = self._written
+            _sync(self._fd)
+            self._synced = target
+            self.syncs += 1
+
+    def sync(self) -> None:
+        """Force everything appended so far to disk."""
+        with self._write_lock:
+            sequence = self._written
+            if self._closed.is_set():
+                return
+        self._sync_through(sequence)
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.sync()
+            except OSError as e:
+                logger.error(f"Failed to sync {self.path}: {str(e)}")
+
+    def reopen(self) -> None:
+        """Reopen the path, e.g. after the file was renamed away."""
+        with self._write_lock:
+            if self._closed.is_set():
+                raise ValueError("Append log is closed")
+            with self._sync_lock:
+                if self.durability != DURABILITY_NONE and self._synced < self._written:
+                    _sync(self._fd)
+                    self.syncs += 1
+                self._synced = self._written
+                old_fd = self._fd
+                self._fd = self._open()
+            os.close(old_fd)
+
+    def close(self) -> None:
+        """Sync (unless durability is "none") and close the file."""
+        with self._write_lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._sync_lock:
+            if self.durability != DURABILITY_NONE and self._synced < self._written:
+                _sync(self._fd)
+                self.syncs += 1
+                self._synced = self._written
+            os.close(self._fd)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the log has been closed."""
+        return self._closed.is_set()
+
+    def __enter__(self) -> "AppendLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
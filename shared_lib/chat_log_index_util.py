@@ -0,0 +1,451 @@
+"""Sidecar indexes and indexed queries for JSONL chat logs.
+
+Every log file, active or rotated, has an index next to it,
+``<file>.idx``: one tab-separated line per entry with its byte offset and
+length in the (uncompressed) file, timestamp, session_id, role and whether
+it is a test entry. Splitting these lines is several times cheaper than
+decoding the JSON entries they point at. ChatLogger appends to the index as
+it logs, and rotation renames the index with its segment (keyed by the
+uncompressed name).
+
+ChatLogReader answers queries by session, time range and role from the
+indexes alone, then decodes only the matching lines: it memory-maps
+uncompressed files and reads compressed segments into memory once. Index
+lines can be missing (after a crash) or out of log order (when two loggers
+append to the same log), so readers sort them by offset and index the log
+lines no record covers; rebuild_index recreates an index from scratch. A
+reader caches each index until its files change, so repeated queries skip
+even the index reads.
+"""
+
+import json
+import logging
+import mmap
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from shared_lib.file_constants import TEMP_SUFFIX
+from shared_lib.log_rotation_util import (
+    COMPRESSION_SUFFIXES,
+    open_segment,
+    read_manifest,
+)
+from shared_lib.logging_util import is_test_entry
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+
+
+class IndexRecord(NamedTuple):
+    """Where one log entry is, and what queries filter it on."""
+
+    offset: int
+    length: int
+    timestamp: Optional[str]
+    session_id: Optional[str]
+    role: Optional[str]
+    test: bool
+
+
+def index_path(data_path: Union[str, Path]) -> Path:
+    """Return the index path of a log file, using its uncompressed name."""
+    data_path = Path(data_path)
+    name = data_path.name
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    return data_path.with_name(name + INDEX_SUFFIX)
+
+
+def index_record(
+    offset: int, data: bytes, entry: Optional[Dict[str, Any]] = None
+) -> IndexRecord:
+    """Build the index record of one log line.
+
+    Args:
+        offset: Byte offset of the line in its file
+        data: The line, including its newline
+        entry: The decoded line, if the caller already has it
+
+    Returns:
+        Index record; fields the entry lacks (or an unparseable line) are None
+    """
+    if entry is None:
+        try:
+            entry = json.loads(data)
+        except ValueError:
+            entry = {}
+    if not isinstance(entry, dict):
+        entry = {}
+
+    def field(name: str) -> Optional[str]:
+        value = entry.get(name)
+        # Tabs and newlines would break the index line
+        return None if value is None else " ".join(str(value).split())
+
+    return IndexRecord(
+        offset,
+        len(data),
+        field("timestamp"),
+        field("session_id"),
+        field("role"),
+        is_test_entry(data.decode("utf-8", errors="replace")),
+    )
+
+
+def format_index_record(record: IndexRecord) -> str:
+    """Return the index line of a record."""
+    return "\t".join(
+        [
+            str(record.offset),
+            str(record.length),
+            record.timestamp or "",
+            record.session_id or "",
+            record.role or "",
+            "1" if record.test else "0",
+        ]
+    ) + "\n"
+
+
+def _parse_index_line(line: str) -> IndexRecord:
+    offset, length, timestamp, session_id, role, test = line.split("\t")
+    return IndexRecord(
+        int(offset),
+        int(length),
+        timestamp or None,
+        session_id or None,
+        role or None,
+        test == "1",
+    )
+
+
+def _index_lines(
+    buffer, start: int = 0, end: Optional[int] = None
+) -> List[IndexRecord]:
+    """Index the complete lines of buffer between start and end."""
+    records = []
+    offset = start
+    end = len(buffer) if end is None else end
+    while offset < end:
+        newline = buffer.find(b"\n", offset, end)
+        if newline < 0:
+            break
+        line = buffer[offset : newline + 1]
+        if line.strip():
+            records.append(index_record(offset, line))
+        offset = newline + 1
+    return records
+
+
+def _read_index(path: Path) -> List[IndexRecord]:
+    """Read an index, skipping a partial last line."""
+    try:
+        lines = path.read_text(encoding="utf-8").split("\n")
+    except FileNotFoundError:
+        return []
+    # The last element is empty, or a partial line
+    return [_parse_index_line(line) for line in lines[:-1]]
+
+
+def _in_log_order(records: List[IndexRecord]) -> List[IndexRecord]:
+    """Sort records by offset, keeping the last one written for each offset."""
+    by_offset = {record.offset: record for record in records}
+    return [by_offset[offset] for offset in sorted(by_offset)]
+
+
+def _gaps(
+    records: List[IndexRecord], size: Optional[int]
+) -> List[Tuple[int, Optional[int]]]:
+    """Return the (start, end) byte ranges of the log no record covers.
+
+    Args:
+        records: Records in log order
+        size: Size of the log; None if unknown, making the tail a gap
+    """
+    gaps = []
+    position = 0
+    for record in records:
+        if record.offset > position:
+            gaps.append((position, record.offset))
+        position = max(position, record.offset + record.length)
+    if size is None or position < size:
+        gaps.append((position, size))
+    return gaps
+
+
+def _indexed_end(records: List[IndexRecord]) -> int:
+    return records[-1].offset + records[-1].length if records else 0
+
+
+def _drop_past(records: List[IndexRecord], size: int) -> None:
+    while records and _indexed_end(records) > size:
+        records.pop()
+
+
+def repair_index(data_path: Union[str, Path]) -> bool:
+    """Bring an index in line with its log file after a crash.
+
+    Only the log's unindexed tail is scanned. Must not run on the active log
+    while ChatLogger is writing to it.
+
+    Returns:
+        Whether the index had to be rewritten
+    """
+    path = index_path(data_path)
+    try:
+        stored = _read_index(path)
+        records = ChatLogReader(data_path).load_index(Segment(Path(data_path)))
+    except ValueError:
+        logger.warning(f"Unreadable index for {data_path}, rebuilding it")
+        rebuild_index(data_path)
+        return True
+    if records == stored and (not path.exists() or _index_is_complete(path)):
+        return False
+    _write_index(path, records)
+    logger.info(f"Repaired index of {data_path}: {len(records)} entries")
+    return True
+
+
+def _index_is_complete(path: Path) -> bool:
+    """Whether an index file ends with a complete line."""
+    with path.open("rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _write_index(path: Path, records: List[IndexRecord]) -> None:
+    temp_path = path.with_name(path.name + TEMP_SUFFIX)
+    with temp_path.open("w", encoding="utf-8") as f:
+        f.writelines(format_index_record(record) for record in records)
+    os.replace(temp_path, path)
+
+
+def rebuild_index(data_path: Union[str, Path]) -> int:
+    """Recreate the index of a log file by scanning it.
+
+    Must not run on the active log while ChatLogger is writing to it.
+
+    Returns:
+        Number of entries indexed
+    """
+    with _LogFile(Path(data_path)) as log_file:
+        records = _index_lines(log_file.buffer)
+    _write_index(index_path(data_path), records)
+    logger.info(f"Rebuilt index of {data_path}: {len(records)} entries")
+    return len(records)
+
+
+def _to_timestamp(value: Union[str, datetime, None]) -> Optional[str]:
+    """Convert a query bound to the ISO format entries are stamped with."""
+    if value is None or isinstance(value, str):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+class _LogFile:
+    """A log file's bytes: memory-mapped if uncompressed, else read once."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = None
+        self.buffer = b""
+        if path.suffix in COMPRESSION_SUFFIXES.values():
+            with open_segment(path) as f:
+                self.buffer = f.read()
+        else:
+            self._file = path.open("rb")
+            if os.fstat(self._file.fileno()).st_size:
+                self.buffer = mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+
+    def __enter__(self) -> "_LogFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+@dataclass
+class Segment:
+    """A log file and its index."""
+
+    data_path: Path
+    size: Optional[int] = None  # Uncompressed size, if known without reading
+
+    @property
+    def index_path(self) -> Path:
+        return index_path(self.data_path)
+
+
+class ChatLogReader:
+    """Queries a chat log and its rotated segments through their indexes."""
+
+    def __init__(self, log_path: Union[str, Path]) -> None:
+        """Initialize the reader.
+
+        Args:
+            log_path: The active JSONL log; rotated segments are found
+                through its manifest
+        """
+        self.log_path = Path(log_path)
+        self.lines_decoded = 0
+        self._indexes: Dict[Path, Tuple[tuple, List[IndexRecord]]] = {}
+
+    def segments(self) -> List[Segment]:
+        """Return the log's files, oldest first, ending with the active one."""
+        segments = [
+            Segment(self.log_path.with_name(segment["name"]), segment.get("size"))
+            for segment in read_manifest(self.log_path)
+        ]
+        segments.append(Segment(self.log_path))
+        return segments
+
+    def _refresh(self, segment: Segment) -> Optional[Segment]:
+        """Find a segment again after its file went missing.
+
+        Returns:
+            The segment under its compressed name, or None if it is no
+            longer in the manifest (deleted by retention)
+        """
+        for entry in read_manifest(self.log_path):
+            data_path = self.log_path.with_name(entry["name"])
+            if (
+                data_path != segment.data_path
+                and index_path(data_path) == segment.index_path
+            ):
+                return Segment(data_path, entry.get("size"))
+        return None
+
+    def load_index(self, segment: Segment) -> List[IndexRecord]:
+        """Return a segment's index records, completed from the log if needed.
+
+        Records are put in log order, records past the end of the file (the
+        log lost them in a crash) are dropped, and lines no record covers
+        (the index lost them) are indexed from the file, without rewriting
+        the index.
+        """
+        size = segment.size
+        if size is None and segment.data_path.suffix not in COMPRESSION_SUFFIXES.values():
+            size = segment.data_path.stat().st_size
+        try:
+            stat = segment.index_path.stat()
+            key = (size, stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            key = (size, None, None)
+        cached = self._indexes.get(segment.data_path)
+        if size is not None and cached is not None and cached[0] == key:
+            return cached[1]
+
+        records = _in_log_order(_read_index(segment.index_path))
+        if size is not None:
+            _drop_past(records, size)
+        if _gaps(records, size):
+            # Only the unindexed lines are decoded, but the file has to be opened
+            with _LogFile(segment.data_path) as log_file:
+                _drop_past(records, len(log_file.buffer))
+                found = [
+                    record
+                    for start, end in _gaps(records, len(log_file.buffer))
+                    for record in _index_lines(log_file.buffer, start, end)
+                ]
+            if found:
+                records = _in_log_order(records + found)
+        self._indexes[segment.data_path] = (key, records)
+        return records
+
+    def query(
+        self,
+        session_id: Optional[str] = None,
+        start: Union[str, datetime, None] = None,
+        end: Union[str, datetime, None] = None,
+        role: Optional[str] = None,
+        include_tests: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield matching entries, oldest first, decoding only those lines.
+
+        Args:
+            session_id: Only this session
+            start: Only entries at or after this time
+            end: Only entries before this time
+            role: Only this role
+            include_tests: Whether to include test entries
+        """
+        start, end = _to_timestamp(start), _to_timestamp(end)
+
+        def matches(record: IndexRecord) -> bool:
+            timestamp = record.timestamp or ""
+            return (
+                (session_id is None or record.session_id == session_id)
+                and (start is None or timestamp >= start)
+                and (end is None or timestamp < end)
+                and (role is None or record.role == role)
+                and (include_tests or not record.test)
+            )
+
+        for segment in self.segments():
+            while segment is not None:
+                try:
+                    records = [
+                        record
+                        for record in self.load_index(segment)
+                        if matches(record)
+                    ]
+                    if not records:
+                        break
+                    log_file = _LogFile(segment.data_path)
+                except FileNotFoundError:
+                    # Compressed, or deleted by retention, since the manifest was read
+                    segment = self._refresh(segment)
+                    continue
+                with log_file:
+                    for record in records:
+                        line = log_file.buffer[
+                            record.offset : record.offset + record.length
+                        ]
+                        self.lines_decoded += 1
+                        yield json.loads(line)
+                break
+
+    def rebuild_indexes(self, active: bool = False) -> int:
+        """Recreate the indexes of every segment by scanning them.
+
+        Args:
+            active: Whether to include the active log, which must not be
+                written to meanwhile
+
+        Returns:
+            Number of entries indexed
+        """
+        segments = self.segments()
+        if not active:
+            segments = segments[:-1]
+        return sum(rebuild_index(segment.data_path) for segment in segments)
+
+    def session_ids(self) -> List[str]:
+        """Return the sessions in the log, in order of first appearance."""
+        seen = {}
+        for segment in self.segments():
+            while segment is not None:
+                try:
+                    records = self.load_index(segment)
+                except FileNotFoundError:
+                    segment = self._refresh(segment)
+                    continue
+                for record in records:
+                    if record.session_id is not None:
+                        seen.setdefault(record.session_id, None)
+                break
+        return list(seen)
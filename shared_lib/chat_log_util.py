@@ -8,8 +8,18 @@ The module uses a dual logging approach:
 1. System events and errors are logged via standard logging
 2. Chat interactions are stored in JSONL format for easy processing
 
+Entries are appended with a single O_APPEND write each (see append_log_util),
+and synced to disk according to CHAT_LOG_DURABILITY: "batch" (default) syncs
+from a background thread every CHAT_LOG_FLUSH_INTERVAL_MS, "record" before
+log_interaction returns, "none" never. Rotation renames the log to a
+timestamped segment and compresses it in the background (see
+log_rotation_util); CHAT_LOG_RETAIN_SEGMENTS and CHAT_LOG_RETAIN_DAYS limit
+how many segments are kept. Each log file has a sidecar index of its
+entries' offsets by session, timestamp and role (see chat_log_index_util),
+which ChatLogReader uses to query the log without scanning it.
+
 Security considerations:
-1. File operations are atomic to prevent data corruption
+1. Each entry is written whole, so the log never holds interleaved or partial lines
 2. Proper permissions are checked before operations
 3. Input is validated to prevent injection
 4. Sensitive data is handled appropriately
@@ -17,15 +27,24 @@ Security considerations:
 6. Permissions are enforced for all file operations
 """
 
+import atexit
 import json
 import logging
 import os
-import shutil
+import threading
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
+from shared_lib.append_log_util import DURABILITY_LEVELS, AppendLog
+from shared_lib.chat_log_index_util import (
+    INDEX_SUFFIX,
+    format_index_record,
+    index_path,
+    index_record,
+)
+from shared_lib.log_rotation_util import LogRotator
 from shared_lib.file_constants import ALLOWED_ROLES
 from shared_lib.file_constants import DEFAULT_DIR_PERMISSIONS as DIR_PERMISSIONS_DEFAULT
 from shared_lib.file_constants import (
@@ -39,8 +58,6 @@ from shared_lib.file_constants import (
     MAX_INPUT_LENGTH,
     PROJECT_ROOT,
     REQUIRED_METADATA_KEYS,
-    ROTATION_TIMESTAMP_FORMAT,
-    TEMP_SUFFIX,
 )
 from shared_lib.file_permission_util import FilePermissionManager
 from shared_lib.logging_util import log_security_event, setup_logging
@@ -63,6 +80,11 @@ LOG_ROTATION_SIZE_MB = int(
 ENFORCE_PERMISSIONS = (
     os.getenv("CHAT_ENFORCE_PERMISSIONS", "1") == "1"
 )  # Enable by default
+LOG_DURABILITY = os.getenv("CHAT_LOG_DURABILITY", "batch")
+LOG_FLUSH_INTERVAL_MS = int(os.getenv("CHAT_LOG_FLUSH_INTERVAL_MS", "200"))
+LOG_COMPRESSION = os.getenv("CHAT_LOG_COMPRESSION", "gzip")
+LOG_RETAIN_SEGMENTS = int(os.getenv("CHAT_LOG_RETAIN_SEGMENTS", "0"))  # 0 keeps all
+LOG_RETAIN_DAYS = float(os.getenv("CHAT_LOG_RETAIN_DAYS", "0"))  # 0 keeps all
 
 # Create logs directory if it doesn't exist
 try:
@@ -95,13 +117,20 @@ class ChatLogger:
     - CHAT_DIR_PERMISSIONS: Directory permissions (default: 0o755)
     - CHAT_LOG_ROTATION_SIZE_MB: Log rotation size in MB (default: 100)
     - CHAT_ENFORCE_PERMISSIONS: Whether to enforce permissions (default: 1)
+    - CHAT_LOG_DURABILITY: "none", "batch" or "record" (default: batch)
+    - CHAT_LOG_FLUSH_INTERVAL_MS: Sync interval at batch durability (default: 200)
+    - CHAT_LOG_COMPRESSION: "none", "gzip" or "zstd" for rotated logs (default: gzip)
+    - CHAT_LOG_RETAIN_SEGMENTS: Rotated logs to keep (default: 0, all)
+    - CHAT_LOG_RETAIN_DAYS: Delete rotated logs older than this (default: 0, never)
     """
 
-    def __init__(self, log_file: str) -> None:
+    def __init__(self, log_file: str, durability: Optional[str] = None) -> None:
         """Initialize the chat logger with security checks.
 
         Args:
             log_file: Path to the JSONL log file
+            durability: "none", "batch" or "record"; defaults to
+                CHAT_LOG_DURABILITY
 
         Raises:
             ValueError: If log_file path is invalid or empty
@@ -118,6 +147,10 @@ class ChatLogger:
         if not log_file or not isinstance(log_file, str):
             logger.error("Invalid log file path provided")
             raise ValueError("Log file path must be a non-empty string")
+        durability = durability or LOG_DURABILITY
+        if durability not in DURABILITY_LEVELS:
+            logger.error("Invalid chat log durability")
+            raise ValueError(f"durability must be one of: {DURABILITY_LEVELS}")
 
         # Initialize security managers
         self.session_id = str(uuid.uuid4())
@@ -152,8 +185,30 @@ class ChatLogger:
                 self.perm_manager.create_file(self.log_path)
             else:
                 self.perm_manager.check_file_permissions(self.log_path)
-                with self.log_path.open("a", encoding=ENCODING) as f:
-                    f.write("")
+            self._lock = threading.Lock()
+            self.writer = AppendLog(
+                self.log_path,
+                durability=durability,
+                flush_interval=LOG_FLUSH_INTERVAL_MS / 1000,
+                permissions=LOG_PERMISSIONS if ENFORCE_PERMISSIONS else None,
+            )
+            # Other loggers may be appending to the same index, so it is never
+            # rewritten here; readers index the lines it lacks after a crash
+            self.index_writer = AppendLog(
+                index_path(self.log_path),
+                durability="none",  # Rebuildable from the log
+                permissions=LOG_PERMISSIONS if ENFORCE_PERMISSIONS else None,
+            )
+            self.rotator = LogRotator(
+                self.log_path,
+                compression=LOG_COMPRESSION,
+                max_segments=LOG_RETAIN_SEGMENTS or None,
+                max_age_days=LOG_RETAIN_DAYS or None,
+                permissions=LOG_PERMISSIONS if ENFORCE_PERMISSIONS else None,
+                sidecar_suffixes=(INDEX_SUFFIX,),
+            )
+            # Sync the last batch and finish compressing when the process exits
+            atexit.register(self.close)
         except PermissionError as e:
             logger.error(f"Permission denied accessing log file: {str(e)}")
             raise PermissionError(f"Cannot access log file: {str(e)}")
@@ -241,7 +296,7 @@ class ChatLogger:
 
         Security:
             - Validates all inputs
-            - Uses atomic file operations
+            - Writes each entry with a single append
             - Handles sensitive data
             - Proper error handling
             - Secure file permissions
@@ -264,49 +319,25 @@ class ChatLogger:
             "metadata": metadata or {},
         }
 
-        # Create temp file path using pathlib
-        temp_path = self.log_path.with_suffix(TEMP_SUFFIX)
-
         try:
-            # Atomic write by first writing to temp file
             try:
-                mode = LOG_PERMISSIONS if ENFORCE_PERMISSIONS else None
-                with temp_path.open("w", encoding=ENCODING) as f:
-                    if mode is not None:
-                        os.chmod(temp_path, mode)
-                    json.dump(log_entry, f)
-                    f.write("\n")
-                    f.flush()
-                    os.fsync(f.fileno())
+                data = (json.dumps(log_entry) + "\n").encode(ENCODING)
             except (TypeError, ValueError) as e:
                 logger.error(f"Failed to serialize log entry: {str(e)}")
                 raise TypeError(f"Failed to serialize log entry: {str(e)}")
-            except (OSError, IOError) as e:
-                logger.error(f"Failed to write temporary log file: {str(e)}")
-                raise OSError(f"Failed to write temporary log file: {str(e)}")
 
-            # Atomic move of temp file to append to log file
             try:
-                with self.log_path.open("a", encoding=ENCODING) as f:
-                    with temp_path.open("r", encoding=ENCODING) as t:
-                        f.write(t.read())
-                    f.flush()
-                    os.fsync(f.fileno())
+                # Index in log order; wait for durability outside the lock
+                # so concurrent entries can share a sync
+                with self._lock:
+                    offset, _, sequence = self.writer.write(data)
+                    self.index_writer.write(
+                        format_index_record(index_record(offset, data, log_entry))
+                    )
+                self.writer.commit(sequence)
             except (OSError, IOError) as e:
                 logger.error(f"Failed to append to log file: {str(e)}")
-                # Try to restore original file
-                if temp_path.exists():
-                    shutil.copy2(temp_path, self.log_path)
-                    if ENFORCE_PERMISSIONS:
-                        os.chmod(self.log_path, LOG_PERMISSIONS)
                 raise OSError(f"Failed to append to log file: {str(e)}")
-            finally:
-                # Clean up temp file
-                try:
-                    if temp_path.exists():
-                        temp_path.unlink()
-                except OSError:
-                    logger.warning(f"Failed to remove temporary file: {temp_path}")
 
             logger.info(
                 "Chat interaction logged",
@@ -325,9 +356,24 @@ class ChatLogger:
             logger.error(f"Unexpected error during logging: {str(e)}")
             raise RuntimeError(f"Failed to log interaction: {str(e)}")
 
+    def flush(self) -> None:
+        """Force every logged interaction to disk, whatever the durability."""
+        self.writer.sync()
+
+    def close(self) -> None:
+        """Sync and close the log file, then finish background compression."""
+        with self._lock:
+            self.writer.close()
+            self.index_writer.close()
+        self.rotator.close()
+
     def rotate_logs(self, max_size_mb: Optional[int] = None) -> bool:
         """Rotate log file if it exceeds max_size_mb with security measures.
 
+        The log is renamed to a timestamped segment and a new file opened in
+        its place, so rotation takes constant time. The segment is
+        compressed, and old segments deleted, on a background thread.
+
         Args:
             max_size_mb: Maximum size in MB before rotation. If None, uses
                         CHAT_LOG_ROTATION_SIZE_MB environment setting.
@@ -343,10 +389,9 @@ class ChatLogger:
 
         Security:
             - Validates input size
-            - Atomic file operations
+            - Atomic rename; the log is restored if reopening fails
             - Preserves file permissions
             - Proper error handling
-            - Secure cleanup
         """
         max_size = max_size_mb if max_size_mb is not None else LOG_ROTATION_SIZE_MB
 
@@ -367,70 +412,40 @@ class ChatLogger:
             if size_mb < max_size:
                 return True
 
-            # Create rotated file path
-            timestamp = datetime.now().strftime(ROTATION_TIMESTAMP_FORMAT)
-            rotated_path = self.log_path.with_name(f"{self.log_path.name}.{timestamp}")
-
             # Check permissions before rotation
             self.perm_manager.check_file_permissions(self.log_path)
             self.perm_manager.check_directory_permissions(self.log_path.parent)
 
             try:
-                # Use shutil.copy2 to preserve metadata
-                self.perm_manager.copy_file(self.log_path, rotated_path)
-                log_security_event(
-                    logger,
-                    "log_rotation_started",
-                    {
-                        "original_file": str(self.log_path),
-                        "rotated_file": str(rotated_path),
-                        "size_mb": size_mb,
-                        "session_id": self.session_id,
-                    },
-                )
-            except (OSError, IOError) as e:
-                logger.error(f"Failed to copy log file: {str(e)}")
-                log_security_event(
-                    logger,
-                    "log_rotation_copy_failed",
-                    {
-                        "error": str(e),
-                        "original_file": str(self.log_path),
-                        "rotated_file": str(rotated_path),
-                        "session_id": self.session_id,
-                    },
-                )
-                raise OSError(f"Failed to copy log file: {str(e)}")
-
-            try:
-                # Truncate original file
-                self.perm_manager.truncate_file(self.log_path)
-                log_security_event(
-                    logger,
-                    "log_rotation_completed",
-                    {
-                        "original_file": str(self.log_path),
-                        "rotated_file": str(rotated_path),
-                        "session_id": self.session_id,
-                    },
-                )
+                with self._lock:
+                    rotated_path = self.rotator.rotate(
+                        self.writer, sidecars=[self.index_writer]
+                    )
+                if ENFORCE_PERMISSIONS:
+                    os.chmod(self.log_path, LOG_PERMISSIONS)
             except (OSError, IOError) as e:
-                logger.error(f"Failed to truncate log file: {str(e)}")
+                logger.error(f"Failed to rotate log file: {str(e)}")
                 log_security_event(
                     logger,
-                    "log_rotation_truncate_failed",
+                    "log_rotation_rename_failed",
                     {
                         "error": str(e),
                         "original_file": str(self.log_path),
-                        "rotated_file": str(rotated_path),
                         "session_id": self.session_id,
                     },
                 )
-                # Try to restore original file
-                if rotated_path.exists():
-                    self.perm_manager.copy_file(rotated_path, self.log_path)
-                raise OSError(f"Failed to truncate log file: {str(e)}")
+                raise OSError(f"Failed to rotate log file: {str(e)}")
 
+            log_security_event(
+                logger,
+                "log_rotation_completed",
+                {
+                    "original_file": str(self.log_path),
+                    "rotated_file": str(rotated_path),
+                    "size_mb": size_mb,
+                    "session_id": self.session_id,
+                },
+            )
             logger.info(
                 f"Rotated chat log file",
                 extra={
@@ -63,6 +63,8 @@ class DatabaseConfig(TypedDict):
     ANALYSIS_DB_URL: str
     EMAIL_TABLE: str
     ANALYSIS_TABLE: str
+    ANALYTICS_SNAPSHOT_DIR: str
+    REPORT_CACHE_DIR: str
     email: Dict[str, str]
     analysis: Dict[str, str]
     catalog: Dict[str, str]
@@ -86,6 +88,7 @@ class EmailConfig(TypedDict):
     BATCH_SIZE: int
     MAX_RETRIES: int
     RETRY_DELAY: int
+    ANALYSIS_WORKERS: int
     LABELS: List[str]
     EXCLUDED_LABELS: List[str]
     DAYS_TO_FETCH: int
@@ -106,6 +109,16 @@ class CatalogConfig(TypedDict):
     RELATIONSHIP_TYPES: List[str]
     TABLES: Dict[str, str]
     ENABLE_SEMANTIC: bool  # Toggle for semantic matching
+    ANALYSIS_CACHE_SIZE: int  # Max cached query analyses
+    ANALYSIS_CACHE_TTL: int  # Query analysis lifetime in seconds
+    DIGEST_KEY_TERMS: int  # Key terms kept per item digest
+    DIGEST_SUMMARY_CHARS: int  # Max digest summary length
+    RERANK_TOP_K: int  # Max candidates sent for relevance ranking
+    RERANK_CHUNK_SIZE: int  # Candidates per ranking request
+    RERANK_WORKERS: int  # Parallel ranking requests
+    TAG_EDIT_DISTANCE: int  # Max edit distance for near-miss tag spellings
+    GRAPH_BETWEENNESS_SAMPLES: int  # Source samples for betweenness on large graphs
+    PROMPTS: Dict[str, str]
     ERROR_MESSAGES: Dict[str, str]
 
 
@@ -263,6 +276,7 @@ EMAIL_CONFIG: EmailConfig = {
     "BATCH_SIZE": 50,  # Number of emails to process in one batch
     "MAX_RETRIES": 3,  # Maximum number of retries for failed operations
     "RETRY_DELAY": 1,  # Delay between retries in seconds
+    "ANALYSIS_WORKERS": 4,  # Parallel analysis requests for unanalyzed emails
     "LABELS": ["INBOX", "SENT", "IMPORTANT"],  # Default labels to fetch
     "EXCLUDED_LABELS": ["SPAM", "TRASH"],  # Labels to exclude
     "DAYS_TO_FETCH": 30,  # Default number of days to fetch
@@ -279,6 +293,10 @@ DATABASE_CONFIG: DatabaseConfig = {
     "ANALYSIS_DB_URL": f"sqlite:///{os.path.join(ROOT_DIR, 'db_email_analysis.db')}",
     "EMAIL_TABLE": "emails",
     "ANALYSIS_TABLE": "email_analysis",
+    # Parquet snapshot of emails joined with analyses, read by reports
+    "ANALYTICS_SNAPSHOT_DIR": os.path.join(DATA_DIR, "analytics_snapshot"),
+    # Computed reports, reused until the data they were computed from changes
+    "REPORT_CACHE_DIR": os.path.join(CACHE_DIR, "reports"),
     "email": {
         "path": os.path.join(ROOT_DIR, "db_email_store.db"),
         "url": f"sqlite:///{os.path.join(ROOT_DIR, 'db_email_store.db')}",
@@ -391,6 +409,29 @@ CATALOG_CONFIG: CatalogConfig = {
         "TAGS": "catalog_tags",
     },
     "ENABLE_SEMANTIC": True,
+    "ANALYSIS_CACHE_SIZE": 256,  # Query analyses kept in memory
+    "ANALYSIS_CACHE_TTL": 900,  # Seconds before a query is re-analyzed
+    "DIGEST_KEY_TERMS": 8,
+    "DIGEST_SUMMARY_CHARS": 280,
+    "RERANK_TOP_K": 20,
+    "RERANK_CHUNK_SIZE": 10,
+    "RERANK_WORKERS": 4,
+    "TAG_EDIT_DISTANCE": 2,
+    "GRAPH_BETWEENNESS_SAMPLES": 64,
+    "PROMPTS": {
+        "QUERY_ANALYSIS": """You analyze natural language queries against a catalog.
+
+Return ONLY a JSON object with these fields and no other text:
+- intent: the primary intent (search, add, update, delete or list)
+- entities: an object of named entities mentioned in the query
+- filters: an object of filters such as date ranges or tags
+- search_terms: a list of key terms to search for""",
+        "RELEVANCE_RANKING": """You rank catalog items by relevance to a search query.
+
+Each item is given as a digest with a title, key terms and a short summary.
+Return ONLY a JSON array of relevance scores between 0.0 and 1.0, one per item,
+in the same order as the items. Do not add any other text.""",
+    },
     "ERROR_MESSAGES": {
         "API_ERROR": "Failed to get API response: {}",
         "DATABASE_ERROR": "Database error: {}",
@@ -460,6 +501,7 @@ DEV_DEPENDENCIES = {
     "plotly",  # Data visualization
     "pre-commit",  # Pre-commit hooks
     "prompt-toolkit",  # Interactive prompts
+    "pyarrow",  # Parquet engine for pandas
     "pydantic",  # Data validation
     "pytest",  # Testing framework
     "pytest-asyncio",  # Async test support
@@ -96,7 +96,7 @@ class FilePermissionManager:
             if not path.is_dir():
                 raise NotADirectoryError(f"Path is not a directory: {path}")
 
-            if not os.access(path, REQUIRED_DIR_MODES):
+            if not os.access(path, os.R_OK | os.W_OK | os.X_OK):
                 log_security_event(
                     logger,
                     "insufficient_directory_permissions",
@@ -138,7 +138,7 @@ class FilePermissionManager:
             if not path.is_file():
                 raise IsADirectoryError(f"Path is not a file: {path}")
 
-            if not os.access(path, REQUIRED_FILE_MODES):
+            if not os.access(path, os.R_OK | os.W_OK):
                 log_security_event(
                     logger,
                     "insufficient_file_permissions",
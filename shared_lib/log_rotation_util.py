@@ -0,0 +1,369 @@
+"""Rename-based rotation, background compression and retention for append logs.
+
+Rotating renames the active file to a timestamped segment and reopens the
+writer on a fresh file, so the caller never waits for a copy. The segment
+is then compressed (gzip, or zstd when the zstandard package is installed)
+on a background thread, and segments beyond the retention limits are
+deleted there too.
+
+Each log has a manifest, ``<log>.manifest.json``, listing its segments
+oldest first. Readers use it to find entries across rotations; a segment
+is in the manifest from the moment it is renamed, compressed or not. A
+reader that finds a segment missing looks it up in the manifest again: it
+was either compressed under a new name or deleted by retention.
+Sidecar files (``<log><suffix>``, e.g. an index) are renamed along with
+the log to ``<segment><suffix>``, keyed by the uncompressed segment name,
+and deleted with their segment.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from shared_lib.append_log_util import AppendLog
+from shared_lib.file_constants import ROTATION_TIMESTAMP_FORMAT, TEMP_SUFFIX
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for zstd compression
+    zstandard = None
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSION_SUFFIXES = {COMPRESSION_GZIP: ".gz", COMPRESSION_ZSTD: ".zst"}
+COMPRESSION_LEVELS = (COMPRESSION_NONE, *COMPRESSION_SUFFIXES)
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path(log_path: Union[str, Path]) -> Path:
+    """Return the manifest path of a log."""
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + MANIFEST_SUFFIX)
+
+
+def read_manifest(log_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Return the segments of a log, oldest first.
+
+    Each segment has its file name (in the log's directory), rotated_at
+    (ISO 8601, UTC), size (uncompressed bytes) and compression (None while
+    uncompressed).
+    """
+    try:
+        with manifest_path(log_path).open(encoding="utf-8") as f:
+            return json.load(f)["segments"]
+    except FileNotFoundError:
+        return []
+
+
+def segment_base(segment: Dict[str, Any]) -> str:
+    """Return a segment's file name before compression."""
+    suffix = COMPRESSION_SUFFIXES.get(segment["compression"])
+    name = segment["name"]
+    return name[: -len(suffix)] if suffix and name.endswith(suffix) else name
+
+
+def segment_paths(log_path: Union[str, Path], active: bool = True) -> List[Path]:
+    """Return the files holding a log's entries, oldest first.
+
+    Args:
+        log_path: The active log file
+        active: Whether to include the active file
+    """
+    log_path = Path(log_path)
+    paths = [log_path.with_name(segment["name"]) for segment in read_manifest(log_path)]
+    if active:
+        paths.append(log_path)
+    return paths
+
+
+def open_segment(path: Union[str, Path]) -> IO[bytes]:
+    """Open a segment for binary reading, decompressing it if needed."""
+    path = Path(path)
+    if path.suffix == COMPRESSION_SUFFIXES[COMPRESSION_GZIP]:
+        return gzip.open(path, "rb")
+    if path.suffix == COMPRESSION_SUFFIXES[COMPRESSION_ZSTD]:
+        if zstandard is None:
+            raise RuntimeError("Reading zstd segments requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+    return path.open("rb")
+
+
+def refresh_segment(
+    log_path: Union[str, Path], segment: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Find a segment in the current manifest after its file went missing.
+
+    Returns:
+        The segment under its new name if it was compressed since it was
+        read, or None if it is no longer in the manifest (deleted by
+        retention) or was not renamed
+    """
+    base = segment_base(segment)
+    for current in read_manifest(log_path):
+        if segment_base(current) == base:
+            return current if current["name"] != segment["name"] else None
+    return None
+
+
+def iter_lines(log_path: Union[str, Path]) -> Iterator[bytes]:
+    """Yield every line of a log across its segments, oldest first."""
+    log_path = Path(log_path)
+    for segment in read_manifest(log_path):
+        while segment is not None:
+            try:
+                f = open_segment(log_path.with_name(segment["name"]))
+            except FileNotFoundError:
+                segment = refresh_segment(log_path, segment)
+                continue
+            with f:
+                yield from f
+            break
+    try:
+        with open_segment(log_path) as f:
+            yield from f
+    except FileNotFoundError:
+        return
+
+
+class LogRotator:
+    """Rotates an AppendLog by rename and compresses segments in the background."""
+
+    def __init__(
+        self,
+        log_path: Union[str, Path],
+        compression: str = COMPRESSION_GZIP,
+        max_segments: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        permissions: Optional[int] = None,
+        sidecar_suffixes: Sequence[str] = (),
+    ) -> None:
+        """Initialize the rotator and resume work interrupted by a crash.
+
+        Args:
+            log_path: The active log file
+            compression: "none", "gzip" or "zstd"
+            max_segments: Segments to keep; None keeps all
+            max_age_days: Delete segments rotated longer ago; None keeps all
+            permissions: Mode for compressed segments
+            sidecar_suffixes: Suffixes of files that rotate with the log
+
+        Raises:
+            ValueError: If compression or a retention limit is invalid
+        """
+        if compression not in COMPRESSION_LEVELS:
+            raise ValueError(f"compression must be one of: {COMPRESSION_LEVELS}")
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        if max_segments is not None and max_segments < 0:
+            raise ValueError("max_segments must not be negative")
+        if max_age_days is not None and max_age_days < 0:
+            raise ValueError("max_age_days must not be negative")
+
+        self.log_path = Path(log_path)
+        self.compression = compression
+        self.max_segments = max_segments
+        self.max_age_days = max_age_days
+        self.permissions = permissions
+        self.sidecar_suffixes = tuple(sidecar_suffixes)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"log-rotator:{self.log_path.name}"
+        )
+
+        # Compress segments a crash left uncompressed, and forget missing ones
+        with self._lock:
+            recorded = read_manifest(self.log_path)
+            segments = [
+                segment
+                for segment in recorded
+                if self.log_path.with_name(segment["name"]).exists()
+            ]
+            # A log that never rotated gets no manifest
+            if segments != recorded:
+                self._write_manifest(segments)
+        for segment in segments:
+            if segment["compression"] is None:
+                self._submit(self._compress, segment["name"])
+        self._submit(self.apply_retention)
+
+    def _write_manifest(self, segments: List[Dict[str, Any]]) -> None:
+        """Replace the manifest atomically. Call with the lock held."""
+        path = manifest_path(self.log_path)
+        temp_path = path.with_name(path.name + TEMP_SUFFIX)
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump({"segments": segments}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _submit(self, function, *args) -> Future:
+        def run():
+            try:
+                function(*args)
+            except Exception as e:
+                logger.error(f"Background log maintenance failed: {str(e)}")
+
+        return self._executor.submit(run)
+
+    def _segment_name(self, rotated_at: datetime) -> str:
+        base = f"{self.log_path.name}.{rotated_at.strftime(ROTATION_TIMESTAMP_FORMAT)}"
+        taken = {segment["name"] for segment in read_manifest(self.log_path)}
+        name, counter = base, 1
+        while (
+            name in taken
+            or self.log_path.with_name(name).exists()
+            or any(
+                self.log_path.with_name(name + suffix).exists()
+                for suffix in COMPRESSION_SUFFIXES.values()
+            )
+        ):
+            name = f"{base}.{counter}"
+            counter += 1
+        return name
+
+    def rotate(self, writer: AppendLog, sidecars: Sequence[AppendLog] = ()) -> Path:
+        """Rename the active file to a new segment and reopen the writer.
+
+        Appends that reach the old file between the rename and the reopen
+        land in the new segment, which is only compressed after the reopen.
+        Callers that keep sidecars in step with the log must stop appending
+        to both for the duration.
+
+        Args:
+            writer: The AppendLog writing to the active file
+            sidecars: AppendLogs writing to sidecar files, reopened as well
+
+        Returns:
+            Path of the new (not yet compressed) segment
+
+        Raises:
+            OSError: If the file cannot be renamed or reopened
+        """
+        rotated_at = datetime.now(timezone.utc)
+        with self._lock:
+            name = self._segment_name(rotated_at)
+            segment_path = self.log_path.with_name(name)
+            renamed = []
+            try:
+                for suffix in ("", *self.sidecar_suffixes):
+                    source = self.log_path.with_name(self.log_path.name + suffix)
+                    if suffix and not source.exists():
+                        continue
+                    os.rename(source, segment_path.with_name(name + suffix))
+                    renamed.append(suffix)
+                writer.reopen()
+            except Exception:
+                for suffix in reversed(renamed):
+                    os.rename(
+                        segment_path.with_name(name + suffix),
+                        self.log_path.with_name(self.log_path.name + suffix),
+                    )
+                raise
+            for sidecar in sidecars:
+                try:
+                    sidecar.reopen()
+                except (OSError, ValueError) as e:
+                    logger.error(f"Failed to reopen {sidecar.path}: {str(e)}")
+            segments = read_manifest(self.log_path)
+            segments.append(
+                {
+                    "name": name,
+                    "rotated_at": rotated_at.isoformat(),
+                    "size": segment_path.stat().st_size,
+                    "compression": None,
+                }
+            )
+            self._write_manifest(segments)
+
+        if self.compression != COMPRESSION_NONE:
+            self._submit(self._compress, name)
+        self._submit(self.apply_retention)
+        return segment_path
+
+    def _compress(self, name: str) -> None:
+        """Compress one segment and point the manifest at the result."""
+        source = self.log_path.with_name(name)
+        target = source.with_name(name + COMPRESSION_SUFFIXES[self.compression])
+        temp_path = target.with_name(target.name + TEMP_SUFFIX)
+        with source.open("rb") as src, temp_path.open("wb") as dst:
+            if self.compression == COMPRESSION_ZSTD:
+                with zstandard.ZstdCompressor().stream_writer(
+                    dst, closefd=False
+                ) as compressor:
+                    shutil.copyfileobj(src, compressor)
+            else:
+                with gzip.GzipFile(filename=name, mode="wb", fileobj=dst) as compressor:
+                    shutil.copyfileobj(src, compressor)
+            dst.flush()
+            os.fsync(dst.fileno())
+        if self.permissions is not None:
+            os.chmod(temp_path, self.permissions)
+        os.replace(temp_path, target)
+
+        with self._lock:
+            segments = read_manifest(self.log_path)
+            for segment in segments:
+                if segment["name"] == name:
+                    segment["name"] = target.name
+                    segment["compression"] = self.compression
+            self._write_manifest(segments)
+        source.unlink()
+        logger.info(f"Compressed log segment {target.name}")
+
+    def apply_retention(self) -> List[str]:
+        """Delete segments beyond max_segments or older than max_age_days.
+
+        Returns:
+            Names of the deleted segments
+        """
+        with self._lock:
+            segments = read_manifest(self.log_path)
+            keep = segments
+            if self.max_age_days is not None:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=self.max_age_days)
+                keep = [
+                    segment
+                    for segment in keep
+                    if datetime.fromisoformat(segment["rotated_at"]) >= cutoff
+                ]
+            if self.max_segments is not None:
+                keep = keep[len(keep) - min(len(keep), self.max_segments) :]
+            expired = [segment for segment in segments if segment not in keep]
+            if not expired:
+                return []
+            # Drop them from the manifest first, so readers stop looking
+            self._write_manifest(keep)
+
+        for segment in expired:
+            base = segment_base(segment)
+            paths = [self.log_path.with_name(segment["name"])] + [
+                self.log_path.with_name(base + suffix)
+                for suffix in self.sidecar_suffixes
+            ]
+            for path in paths:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+        names = [segment["name"] for segment in expired]
+        logger.info(f"Deleted expired log segments: {', '.join(names)}")
+        return names
+
+    def wait(self) -> None:
+        """Block until queued compression and retention work is done."""
+        self._executor.submit(lambda: None).result()
+
+    def close(self) -> None:
+        """Finish queued work and stop the background thread."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,116 @@
+"""Resolve Python import names to catalogued files.
+
+A ModuleIndex is built once from the relative paths of catalogued files and
+then answers every import of a scan from memory:
+
+1. Modules and packages: "pkg/mod.py" is "pkg.mod", "pkg/__init__.py" is "pkg"
+2. Source roots: files under src/ or lib/ are also importable without the
+   root prefix, unless that name is taken by a file outside the root
+3. Relative imports: ".mod" and "..pkg" are resolved against the importer
+4. Imported names: "pkg.mod.func" falls back to the longest catalogued prefix
+"""
+
+from pathlib import PurePath
+from typing import Dict, Iterable, List, Mapping, Optional
+
+SOURCE_ROOTS = ("src", "lib")
+
+
+def module_name(rel_path: str) -> Optional[str]:
+    """Return the dotted module name of a Python file, or None."""
+    path = PurePath(rel_path)
+    if path.suffix != ".py":
+        return None
+    parts = list(path.with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    if not parts or not all(part.isidentifier() for part in parts):
+        return None
+    return ".".join(parts)
+
+
+def is_package(rel_path: str) -> bool:
+    """Whether a file is a package's __init__ module."""
+    return PurePath(rel_path).name == "__init__.py"
+
+
+class ModuleIndex:
+    """In-memory mapping from module names to asset ids."""
+
+    def __init__(self, paths: Mapping[str, int]):
+        """Build the index.
+
+        Args:
+            paths: Asset ids keyed by file path relative to the scan root
+        """
+        self._modules: Dict[str, int] = {}
+        aliases = []
+        for rel_path, asset_id in sorted(paths.items()):
+            name = module_name(rel_path)
+            if name is None:
+                continue
+            self._modules[name] = asset_id
+            root, _, rest = name.partition(".")
+            if root in SOURCE_ROOTS and rest:
+                aliases.append((rest, asset_id))
+        for alias, asset_id in aliases:
+            self._modules.setdefault(alias, asset_id)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    @staticmethod
+    def absolute_name(importer_path: str, imported: str) -> Optional[str]:
+        """Turn a possibly relative import into an absolute module name.
+
+        Args:
+            importer_path: Relative path of the importing file
+            imported: Imported name, with one leading dot per relative level
+
+        Returns:
+            Absolute dotted name, or None if it escapes the top-level package
+        """
+        name = imported.lstrip(".")
+        level = len(imported) - len(name)
+        if not level:
+            return imported
+
+        importer = module_name(importer_path)
+        if importer is None:
+            return None
+        package = importer.split(".")
+        if not is_package(importer_path):
+            package.pop()
+        if level - 1 > len(package):
+            return None
+        package = package[: len(package) - (level - 1)]
+        return ".".join(package + [name] if name else package) or None
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Return the asset id of the longest catalogued prefix of a name."""
+        parts = name.split(".")
+        while parts:
+            asset_id = self._modules.get(".".join(parts))
+            if asset_id is not None:
+                return asset_id
+            parts.pop()
+        return None
+
+    def resolve(self, importer_path: str, imports: Iterable[str]) -> List[int]:
+        """Return the sorted asset ids a file imports, excluding itself.
+
+        Args:
+            importer_path: Relative path of the importing file
+            imports: Import names as recorded by the scanner
+
+        Returns:
+            Sorted, de-duplicated asset ids
+        """
+        own_id = self._modules.get(module_name(importer_path) or "")
+        targets = set()
+        for imported in imports:
+            name = self.absolute_name(importer_path, imported)
+            asset_id = self.lookup(name) if name else None
+            if asset_id is not None and asset_id != own_id:
+                targets.add(asset_id)
+        return sorted(targets)
@@ -0,0 +1,80 @@
+"""Cached schema checks for SQLite databases.
+
+``Base.metadata.create_all`` inspects every table on each call. For a
+database that already matches the models this work is wasted, so the
+schema is hashed and the hash is stamped into the database file
+(``PRAGMA user_version``). Later checks compare the stamp and skip
+create_all when it matches; within a process each database is checked once.
+
+The stamp only records that create_all ran for this schema. Tables dropped
+by hand afterwards are not noticed until the models change.
+"""
+
+import hashlib
+import logging
+from threading import Lock
+from typing import Set, Tuple
+
+from sqlalchemy import MetaData
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+logger = logging.getLogger(__name__)
+
+# (database URL, schema hash) pairs already checked by this process
+_checked: Set[Tuple[str, str]] = set()
+_lock = Lock()
+
+
+def schema_hash(metadata: MetaData, engine: Engine) -> str:
+    """Hash the DDL that create_all would emit for the metadata."""
+    digest = hashlib.sha1(usedforsecurity=False)
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode())
+    return digest.hexdigest()
+
+
+def schema_stamp(digest: str) -> int:
+    """Fold a schema hash into a positive 32-bit user_version value."""
+    return int(digest[:7], 16)
+
+
+def ensure_schema(engine: Engine, metadata: MetaData) -> bool:
+    """Create missing tables unless the database is stamped with this schema.
+
+    Args:
+        engine: Engine of the database to check
+        metadata: Metadata describing the expected tables
+
+    Returns:
+        True if create_all ran, False if the cached check was enough
+    """
+    digest = schema_hash(metadata, engine)
+    key = (str(engine.url), digest)
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    with _lock:
+        if key in _checked:
+            return False
+
+        stamp = schema_stamp(digest)
+        is_sqlite = engine.dialect.name == "sqlite"
+        with engine.begin() as connection:
+            if is_sqlite:
+                current = connection.exec_driver_sql("PRAGMA user_version").scalar()
+                if current == stamp:
+                    if not in_memory:
+                        _checked.add(key)
+                    return False
+
+            metadata.create_all(connection)
+            if is_sqlite:
+                connection.exec_driver_sql(f"PRAGMA user_version = {stamp}")
+
+        # In-memory databases are new for every engine, so never cache them
+        if not in_memory:
+            _checked.add(key)
+        logger.debug(f"Schema created or verified for {engine.url}")
+        return True
@@ -0,0 +1,143 @@
+"""Deterministic tag normalization and fuzzy lookup.
+
+Tags are short and repeat often, so most "is this the same tag?" decisions
+can be made locally:
+
+1. Folding: case, separators and simple English plurals
+2. Abbreviations: a fixed dictionary of common short forms
+3. Edit distance: a BK-tree returns near-miss spellings as candidates
+
+Anything these rules cannot decide is left to the caller (typically a
+learned synonym graph and, as a last resort, Claude).
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SEPARATOR_PATTERN = re.compile(r"[\s_\-./]+")
+
+# Short forms mapped to their folded long form
+ABBREVIATIONS: Dict[str, str] = {
+    "ai": "artificial intelligence",
+    "api": "application programming interface",
+    "auth": "authentication",
+    "ci": "continuous integration",
+    "config": "configuration",
+    "db": "database",
+    "dev": "development",
+    "doc": "documentation",
+    "js": "javascript",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "nlp": "natural language processing",
+    "oop": "object oriented programming",
+    "py": "python",
+    "regex": "regular expression",
+    "repo": "repository",
+    "ts": "typescript",
+    "ui": "user interface",
+    "ux": "user experience",
+}
+
+# Words that end in "s" but are not plurals
+NON_PLURALS = {"analysis", "bias", "kubernetes", "news", "series", "status", "ios"}
+
+
+def singularize(word: str) -> str:
+    """Fold a simple English plural to its singular form."""
+    if len(word) <= 3 or word in NON_PLURALS:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def fold_tag(name: str) -> str:
+    """Fold case, separators and plurals: "Design-Patterns" -> "design pattern"."""
+    words = [word for word in SEPARATOR_PATTERN.split(name.casefold()) if word]
+    return " ".join(singularize(word) for word in words)
+
+
+def canonical_key(name: str) -> str:
+    """Return the folded key of a tag with abbreviations expanded."""
+    folded = fold_tag(name)
+    return ABBREVIATIONS.get(folded, folded)
+
+
+def levenshtein(source: str, target: str) -> int:
+    """Return the edit distance between two strings."""
+    if len(source) < len(target):
+        source, target = target, source
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (source_char != target_char),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree for edit-distance lookups.
+
+    Searching for words within distance d only visits subtrees whose edge
+    distance lies in [dist - d, dist + d], so lookups touch a small fraction
+    of the stored words.
+    """
+
+    def __init__(self, words: Optional[Iterable[str]] = None):
+        """Initialize the tree, optionally with an initial set of words."""
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self._size = 0
+        for word in words or []:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        """Add a word (duplicates are ignored)."""
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+
+        node_word, children = self._root
+        while True:
+            distance = levenshtein(word, node_word)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self._size += 1
+                return
+            node_word, children = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """Return (distance, word) pairs within max_distance, closest first."""
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= max_distance:
+                results.append((distance, node_word))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(
+                child for edge, child in children.items() if low <= edge <= high
+            )
+        return sorted(results)
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,119 @@
+"""Compact text digests for catalog items.
+
+A digest is a small, prompt-friendly stand-in for a document: its title, the
+most frequent key terms and a short summary. Digests are cheap to compute
+locally and are used instead of full content when asking Claude to rank
+search results.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from shared_lib.constants import CATALOG_CONFIG
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+TITLE_WEIGHT = 3
+MIN_TERM_LENGTH = 3
+
+STOPWORDS = {
+    "about", "after", "all", "also", "and", "any", "are", "because", "been",
+    "before", "being", "between", "both", "but", "can", "could", "did", "does",
+    "doing", "down", "each", "few", "for", "from", "further", "had", "has",
+    "have", "having", "her", "here", "hers", "him", "his", "how", "into", "its",
+    "just", "more", "most", "not", "now", "off", "once", "only", "other", "our",
+    "out", "over", "own", "same", "she", "should", "some", "such", "than",
+    "that", "the", "their", "them", "then", "there", "these", "they", "this",
+    "those", "through", "too", "under", "until", "use", "used", "using", "very",
+    "was", "way", "were", "what", "when", "where", "which", "while", "who",
+    "why", "will", "with", "would", "you", "your",
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase terms, dropping stopwords and short words."""
+    if not text:
+        return []
+    return [
+        word
+        for word in WORD_PATTERN.findall(text.lower())
+        if len(word) >= MIN_TERM_LENGTH and word not in STOPWORDS
+    ]
+
+
+def digest_source_hash(
+    title: Optional[str], description: Optional[str], content: Optional[str]
+) -> str:
+    """Hash the fields a digest is built from, to detect stale digests."""
+    source = "\x1f".join(part or "" for part in (title, description, content))
+    return hashlib.sha1(source.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def summarize(text: Optional[str], max_chars: int) -> str:
+    """Return the leading sentences of text, capped at max_chars."""
+    if not text:
+        return ""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+
+    summary = ""
+    for sentence in SENTENCE_PATTERN.split(text):
+        candidate = f"{summary} {sentence}".strip()
+        if len(candidate) > max_chars:
+            break
+        summary = candidate
+    if not summary:
+        summary = text[: max_chars - 3].rstrip() + "..."
+    return summary
+
+
+def build_digest(
+    title: Optional[str],
+    description: Optional[str] = None,
+    content: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a compact digest of a catalog item.
+
+    Args:
+        title: Item title
+        description: Item description
+        content: Full item content
+
+    Returns:
+        Dict with title, key_terms, summary and source_hash
+    """
+    counts = Counter(tokenize(description)) + Counter(tokenize(content))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+
+    # most_common keeps first-seen order for ties, so digests are stable
+    key_terms = [
+        term for term, _ in counts.most_common(CATALOG_CONFIG["DIGEST_KEY_TERMS"])
+    ]
+
+    return {
+        "title": title or "",
+        "key_terms": key_terms,
+        "summary": summarize(
+            description or content, CATALOG_CONFIG["DIGEST_SUMMARY_CHARS"]
+        ),
+        "source_hash": digest_source_hash(title, description, content),
+    }
+
+
+def format_digest(digest: Dict[str, Any]) -> str:
+    """Render a digest as prompt text."""
+    return (
+        f"Title: {digest.get('title', '')}\n"
+        f"Key terms: {', '.join(digest.get('key_terms', []))}\n"
+        f"Summary: {digest.get('summary', '')}"
+    )
+
+
+def local_relevance(digest: Dict[str, Any], query: str) -> int:
+    """Score how many query terms appear in a digest's title and key terms."""
+    terms = set(tokenize(digest.get("title"))) | set(digest.get("key_terms", []))
+    return sum(1 for term in set(tokenize(query)) if term in terms)
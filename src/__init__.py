@@ -1,20 +1,31 @@
-"""Marian package initialization."""
+"""Marian package initialization.
 
-from .app_api_client import APIClient
-from .app_catalog import CatalogChat
-from .app_email_analyzer import EmailAnalyzer
-from .app_email_reports import EmailAnalytics
-from .app_email_self_log import EmailSelfAnalyzer
-from .app_get_mail import GmailAPI, fetch_emails, list_labels, process_email
+Exports are imported on first access, so importing one application module
+does not pull in the dependencies of all the others.
+"""
 
-__all__ = [
-    "CatalogChat",
-    "EmailAnalyzer",
-    "EmailAnalytics",
-    "EmailSelfAnalyzer",
-    "GmailAPI",
-    "fetch_emails",
-    "process_email",
-    "list_labels",
-    "APIClient",
-]
+import importlib
+
+_EXPORTS = {
+    "CatalogChat": ".app_catalog",
+    "EmailAnalyzer": ".app_email_analyzer",
+    "EmailAnalytics": ".app_email_reports",
+    "EmailSelfAnalyzer": ".app_email_self_log",
+    "GmailAPI": ".app_get_mail",
+    "fetch_emails": ".app_get_mail",
+    "process_email": ".app_get_mail",
+    "list_labels": ".app_get_mail",
+    "APIClient": ".app_api_client",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import an exported name on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
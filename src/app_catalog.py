@@ -7,20 +7,26 @@ import logging
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import selectinload, sessionmaker
 
 from models.base import Base
 from models.catalog import CatalogItem, CatalogTag, Tag
-from shared_lib.anthropic_client_lib import get_anthropic_client
-from shared_lib.anthropic_lib import parse_claude_response
+from services.catalog_registry import CatalogRegistry
+from services.tag_canonicalizer import TagCanonicalizer
+from shared_lib.anthropic_lib import extract_json, parse_claude_response
+from shared_lib.cache_util import TTLCache
 from shared_lib.chat_log_util import ChatLogger
 from shared_lib.constants import API_CONFIG, CATALOG_CONFIG
 from shared_lib.file_constants import DATA_DIR
 from shared_lib.logging_util import setup_logging
+from shared_lib.schema_cache_util import ensure_schema
+from shared_lib.text_digest_util import build_digest, format_digest, local_relevance
 
 
 class CatalogChat:
@@ -32,14 +38,19 @@ class CatalogChat:
         mode="cli",
         chat_log=CATALOG_CONFIG["CHAT_LOG"],
         enable_semantic=None,
+        lazy=True,
     ):
-        """Initialize the catalog chat interface"""
+        """Initialize the catalog chat interface.
+
+        With ``lazy`` (the default) the Anthropic client, chat logger and
+        schema check are deferred until first use so the interface starts
+        immediately. Pass ``lazy=False`` to fail fast on misconfiguration.
+        """
         self.mode = mode
         self.db_path = db_path
         self.chat_log = chat_log
         self.test_logger = setup_logging("test_catalog")
         self.interactive = mode == "interactive"
-        self.client = get_anthropic_client()
 
         # Set semantic checking based on parameter or config
         self.enable_semantic = (
@@ -48,23 +59,55 @@ class CatalogChat:
             else CATALOG_CONFIG["ENABLE_SEMANTIC"]
         )
 
-        # Initialize chat logger
+        # Creating an engine does not open the database
+        self.engine = create_engine(f"sqlite:///{db_path}")
+
+        # Query analyses keyed by normalized query text
+        self.analysis_cache = TTLCache(
+            max_size=CATALOG_CONFIG["ANALYSIS_CACHE_SIZE"],
+            ttl=CATALOG_CONFIG["ANALYSIS_CACHE_TTL"],
+        )
+
+        if not lazy:
+            # Touch the deferred attributes so errors surface immediately
+            _ = self.client, self.chat_logger, self.Session
+        self.test_logger.info(
+            f"System State: mode={mode}, db_path={db_path}, chat_log={chat_log}"
+        )
+
+    @cached_property
+    def client(self):
+        """Anthropic client, created on first use."""
+        # Imported here: the client library pulls in anthropic and dotenv
+        from shared_lib.anthropic_client_lib import get_anthropic_client
+
+        return get_anthropic_client()
+
+    @cached_property
+    def chat_logger(self) -> ChatLogger:
+        """Chat logger, created on first use."""
         try:
-            self.chat_logger = ChatLogger(str(Path(DATA_DIR) / chat_log))
+            return ChatLogger(str(Path(DATA_DIR) / self.chat_log))
         except Exception as e:
             self.test_logger.error(f"Failed to initialize chat logger: {str(e)}")
             raise RuntimeError("Chat logging is required but unavailable")
 
-        # Initialize database
-        self.engine = create_engine(f"sqlite:///{db_path}")
-        self.Session = sessionmaker(bind=self.engine)
+    @cached_property
+    def Session(self) -> sessionmaker:
+        """Session factory; the schema is checked before it is first returned."""
+        if ensure_schema(self.engine, Base.metadata):
+            self.test_logger.info("Database tables created successfully")
+        return sessionmaker(bind=self.engine)
 
-        # Create tables
-        Base.metadata.create_all(self.engine)
-        self.test_logger.info("Database tables created successfully")
-        self.test_logger.info(
-            f"System State: mode={mode}, db_path={db_path}, chat_log={chat_log}"
-        )
+    @cached_property
+    def registry(self) -> CatalogRegistry:
+        """Lightweight title/name index used for duplicate checks."""
+        return CatalogRegistry(self.Session)
+
+    @cached_property
+    def tag_canonicalizer(self) -> TagCanonicalizer:
+        """Deterministic tag matching and learned tag synonyms."""
+        return TagCanonicalizer(self.Session)
 
     def get_session(self):
         """Get a new database session"""
@@ -110,6 +153,51 @@ class CatalogChat:
             self.test_logger.error(f"Error in semantic duplicate detection: {str(e)}")
             return False, [], []
 
+    def check_tag_duplicates(self, session, tag_name: str, existing_tags: list) -> tuple:
+        """Check if a tag duplicates existing tags, consulting Claude last.
+
+        Local folding, abbreviations, learned synonyms and edit distance are
+        tried first. Duplicates Claude confirms are recorded in the synonym
+        graph so the same question is not asked twice; its potential matches
+        are left for the user to decide (see record_tag_choice).
+
+        Args:
+            session: Database session
+            tag_name: Tag name to check
+            existing_tags: List of tags to check against
+
+        Returns:
+            Same tuple as check_semantic_duplicates
+        """
+        resolution = self.tag_canonicalizer.resolve(tag_name, existing_tags)
+        if resolution.tag is not None:
+            self.test_logger.info(
+                f"Tag '{tag_name}' resolved locally to '{resolution.tag.name}' "
+                f"({resolution.source})"
+            )
+            return True, [(resolution.tag, 1.0, resolution.source)], []
+        if resolution.candidates:
+            return (
+                False,
+                [],
+                [(tag, score, "similar spelling") for tag, score in resolution.candidates],
+            )
+
+        has_duplicates, duplicates, potential_matches = self.check_semantic_duplicates(
+            session, tag_name, existing_tags
+        )
+        for tag, score, _ in duplicates:
+            self.tag_canonicalizer.record(tag_name, tag.name, True, "llm", score)
+        return has_duplicates, duplicates, potential_matches
+
+    def record_tag_choice(self, tag_name: str, matches: list, choice: str) -> None:
+        """Record a user's answer to a tag duplicate prompt in the synonym graph."""
+        if choice == "2" and matches:
+            self.tag_canonicalizer.record(tag_name, matches[0][0].name, True, "user")
+        elif choice == "1":
+            for tag, _, _ in matches:
+                self.tag_canonicalizer.record(tag_name, tag.name, False, "user")
+
     def get_semantic_matches(
         self, text: str, items: list, threshold: float = None
     ) -> list:
@@ -283,9 +371,7 @@ Example: For a query about "python class tutorial":
         session = self.get_session()
         try:
             # Check for semantic duplicates
-            existing_items = (
-                session.query(CatalogItem).filter(CatalogItem.deleted == False).all()
-            )
+            existing_items = self.registry.items(include_deleted=False)
 
             if not force:
                 has_dups, duplicates, potential_matches = (
@@ -541,7 +627,7 @@ Example: For a query about "python class tutorial":
                 title, content = parts
 
                 # Get all existing items for semantic check
-                all_items = session.query(CatalogItem).all()
+                all_items = self.registry.items()
 
                 # Check for semantic duplicates
                 has_duplicates, duplicates, potential_matches = (
@@ -550,7 +636,7 @@ Example: For a query about "python class tutorial":
                 if has_duplicates:
                     if self.interactive:
                         print("\nFound semantically similar items:")
-                        for item, score in duplicates:
+                        for item, score, _ in duplicates:
                             status = "(archived)" if item.deleted else "(active)"
                             print(f"- {item.title} {status} (similarity: {score:.2f})")
                         print("\nWould you like to:")
@@ -563,7 +649,7 @@ Example: For a query about "python class tutorial":
                         if choice == "2":
                             return "Operation cancelled"
                         elif choice == "3" and item.deleted:
-                            item.deleted = False
+                            session.get(CatalogItem, item.id).deleted = False
                             session.commit()
                             return f"Restored similar item: {item.title}"
                     else:
@@ -596,20 +682,12 @@ Example: For a query about "python class tutorial":
                         return f"Found potentially similar items:\n{match_info}\nUse --force to add anyway"
 
                 # Check for exact title match
-                existing_item = (
-                    session.query(CatalogItem)
-                    .filter(CatalogItem.title.ilike(title))
-                    .first()
-                )
-                if existing_item:
+                existing_item = self.registry.find_item(title)
+                if existing_item and not existing_item.deleted:
                     return f"Error: An item with title '{title}' already exists"
 
                 # Check for archived item
-                archived_item = (
-                    session.query(CatalogItem)
-                    .filter(CatalogItem.title.ilike(title), CatalogItem.deleted == True)
-                    .first()
-                )
+                archived_item = existing_item
                 if archived_item:
                     if self.interactive:
                         print(
@@ -617,7 +695,7 @@ Example: For a query about "python class tutorial":
                             end="",
                         )
                         if input().strip().lower() == "y":
-                            archived_item.deleted = False
+                            session.get(CatalogItem, archived_item.id).deleted = False
                             session.commit()
                             return f"Restored and updated catalog item: {title}"
                     else:
@@ -653,16 +731,16 @@ Example: For a query about "python class tutorial":
                     return f"Item '{title}' is archived. Restore it first."
 
                 # Get all existing tags for semantic check
-                all_tags = session.query(Tag).all()
+                all_tags = self.registry.tags()
 
                 # Check for semantic duplicates
                 has_duplicates, duplicates, potential_matches = (
-                    self.check_semantic_duplicates(session, tag_name, all_tags)
+                    self.check_tag_duplicates(session, tag_name, all_tags)
                 )
                 if has_duplicates:
                     if self.interactive:
                         print("\nFound semantically similar tags:")
-                        for tag, score in duplicates:
+                        for tag, score, _ in duplicates:
                             status = "(archived)" if tag.deleted else "(active)"
                             print(f"- {tag.name} {status} (similarity: {score:.2f})")
                         print("\nWould you like to:")
@@ -670,11 +748,12 @@ Example: For a query about "python class tutorial":
                         print("2. Use existing tag")
                         print("3. Cancel")
                         choice = input("Enter choice (1-3): ").strip()
+                        self.record_tag_choice(tag_name, duplicates, choice)
 
                         if choice == "2" and duplicates:
                             tag = duplicates[0][0]  # Use the most similar tag
                             if tag.deleted:
-                                tag.deleted = False
+                                session.get(Tag, tag.id).deleted = False
                                 session.commit()
                             tag_name = tag.name
                         elif choice == "3":
@@ -703,11 +782,12 @@ Example: For a query about "python class tutorial":
                         print("2. Use existing tag")
                         print("3. Cancel")
                         choice = input("Enter choice (1-3): ").strip()
+                        self.record_tag_choice(tag_name, potential_matches, choice)
 
                         if choice == "2" and potential_matches:
                             tag = potential_matches[0][0]  # Use the most similar tag
                             if tag.deleted:
-                                tag.deleted = False
+                                session.get(Tag, tag.id).deleted = False
                                 session.commit()
                             tag_name = tag.name
                         elif choice == "3":
@@ -716,12 +796,8 @@ Example: For a query about "python class tutorial":
                         return f"Found potentially similar tags:\n{match_info}\nUse --force to add anyway"
 
                 # Check for existing active tag
-                existing_tag = (
-                    session.query(Tag)
-                    .filter(Tag.name.ilike(tag_name), Tag.deleted == False)
-                    .first()
-                )
-                if existing_tag:
+                existing_tag = self.registry.find_tag(tag_name)
+                if existing_tag and not existing_tag.deleted:
                     return f"Error: Tag '{tag_name}' already exists"
 
                 # Create new tag
@@ -757,16 +833,16 @@ Example: For a query about "python class tutorial":
                 tag_name = args.strip()
 
                 # Get all existing tags for semantic check
-                all_tags = session.query(Tag).all()
+                all_tags = self.registry.tags()
 
                 # Check for semantic duplicates
                 has_duplicates, duplicates, potential_matches = (
-                    self.check_semantic_duplicates(session, tag_name, all_tags)
+                    self.check_tag_duplicates(session, tag_name, all_tags)
                 )
                 if has_duplicates:
                     if self.interactive:
                         print("\nFound semantically similar tags:")
-                        for tag, score in duplicates:
+                        for tag, score, _ in duplicates:
                             status = "(archived)" if tag.deleted else "(active)"
                             print(f"- {tag.name} {status} (similarity: {score:.2f})")
                         print("\nWould you like to:")
@@ -774,11 +850,12 @@ Example: For a query about "python class tutorial":
                         print("2. Use existing tag")
                         print("3. Cancel")
                         choice = input("Enter choice (1-3): ").strip()
+                        self.record_tag_choice(tag_name, duplicates, choice)
 
                         if choice == "2" and duplicates:
                             tag = duplicates[0][0]  # Use the most similar tag
                             if tag.deleted:
-                                tag.deleted = False
+                                session.get(Tag, tag.id).deleted = False
                                 session.commit()
                             tag_name = tag.name
                         elif choice == "3":
@@ -807,11 +884,12 @@ Example: For a query about "python class tutorial":
                         print("2. Use existing tag")
                         print("3. Cancel")
                         choice = input("Enter choice (1-3): ").strip()
+                        self.record_tag_choice(tag_name, potential_matches, choice)
 
                         if choice == "2" and potential_matches:
                             tag = potential_matches[0][0]  # Use the most similar tag
                             if tag.deleted:
-                                tag.deleted = False
+                                session.get(Tag, tag.id).deleted = False
                                 session.commit()
                             tag_name = tag.name
                         elif choice == "3":
@@ -820,12 +898,8 @@ Example: For a query about "python class tutorial":
                         return f"Found potentially similar tags:\n{match_info}\nUse --force to add anyway"
 
                 # Check for existing active tag
-                existing_tag = (
-                    session.query(Tag)
-                    .filter(Tag.name.ilike(tag_name), Tag.deleted == False)
-                    .first()
-                )
-                if existing_tag:
+                existing_tag = self.registry.find_tag(tag_name)
+                if existing_tag and not existing_tag.deleted:
                     return f"Error: Tag '{tag_name}' already exists"
 
                 # Create new tag
@@ -883,37 +957,50 @@ Example: For a query about "python class tutorial":
         finally:
             session.close()
 
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize query text for use as an analysis cache key."""
+        return " ".join(query.split()).casefold()
+
     def process_natural_language_query(self, query: str) -> dict:
         """Process a natural language query using Claude AI.
 
+        Successful analyses are cached by normalized query text, so repeated
+        or re-issued queries do not cost another API round-trip.
+
         Args:
             query: The natural language query from the user
 
         Returns:
             dict: Processed query with extracted intents and entities
         """
-        system_prompt = CATALOG_CONFIG["PROMPTS"]["QUERY_ANALYSIS"]
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": query},
-        ]
+        cache_key = self.normalize_query(query)
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             response = self.client.messages.create(
                 model=API_CONFIG["MODEL"],
                 max_tokens=API_CONFIG["MAX_TOKENS"],
                 temperature=API_CONFIG["TEMPERATURE"],
-                messages=messages,
+                system=CATALOG_CONFIG["PROMPTS"]["QUERY_ANALYSIS"],
+                messages=[{"role": "user", "content": query}],
             )
 
             # Parse the structured response
-            analysis = json.loads(response.content)
-            return {
+            json_str, error = extract_json(response.content[0].text)
+            if error:
+                raise ValueError(error)
+            analysis = json.loads(json_str)
+            result = {
                 "intent": analysis.get("intent"),
                 "entities": analysis.get("entities", {}),
                 "filters": analysis.get("filters", {}),
                 "search_terms": analysis.get("search_terms", []),
             }
+            self.analysis_cache.set(cache_key, result)
+            return result
         except Exception as e:
             self.test_logger.error(f"Error processing query with Claude: {str(e)}")
             return {
@@ -923,98 +1010,146 @@ Example: For a query about "python class tutorial":
                 "search_terms": [],
             }
 
-    def semantic_search(self, query: str) -> List[CatalogItem]:
+    def semantic_search(
+        self, query: str, analysis: Optional[dict] = None
+    ) -> List[CatalogItem]:
         """Perform semantic search using Claude AI.
 
         Args:
             query: Natural language search query
+            analysis: Result of process_natural_language_query for this query,
+                if the caller already has it
 
         Returns:
             List[CatalogItem]: Matching catalog items
         """
+        items = []
+        for _, items in self.semantic_search_stages(query, analysis):
+            pass
+        return items
+
+    def semantic_search_stages(
+        self, query: str, analysis: Optional[dict] = None
+    ) -> Iterator[Tuple[str, List[CatalogItem]]]:
+        """Run semantic search, yielding results after each stage.
+
+        Stages:
+        1. Query analysis (skipped when ``analysis`` is provided or cached)
+        2. Local retrieval - yields ``("local", items)``
+        3. Relevance ranking - yields ``("ranked", items)`` when more than one
+           item was found
+
+        Callers can display local results as soon as they are available
+        instead of waiting for ranking to finish.
+
+        Args:
+            query: Natural language search query
+            analysis: Precomputed query analysis
+
+        Yields:
+            Tuples of (stage name, items)
+        """
         try:
-            # Process the query
-            analysis = self.process_natural_language_query(query)
+            if analysis is None:
+                analysis = self.process_natural_language_query(query)
+
+            items = self._find_local_matches(analysis)
+        except Exception as e:
+            self.test_logger.error(f"Error in semantic search: {str(e)}")
+            yield "local", []
+            return
 
-            session = self.get_session()
-            items = []
+        yield "local", items
 
-            # Use extracted search terms and filters
-            if analysis["search_terms"]:
-                base_query = session.query(CatalogItem)
+        # Sort by relevance if needed
+        if len(items) > 1:
+            yield "ranked", self.rank_results_by_relevance(items, query)
 
-                # Apply semantic filtering
-                for term in analysis["search_terms"]:
-                    base_query = base_query.filter(
-                        CatalogItem.title.ilike(f"%{term}%")
-                        | CatalogItem.content.ilike(f"%{term}%")
-                        | CatalogItem.description.ilike(f"%{term}%")
-                    )
+    def _find_local_matches(self, analysis: dict) -> List[CatalogItem]:
+        """Query the catalog for items matching an analyzed query."""
+        if not analysis["search_terms"]:
+            return []
 
-                # Apply entity-based filters
-                if "date" in analysis["filters"]:
-                    date_filter = analysis["filters"]["date"]
-                    if date_filter.get("start"):
-                        base_query = base_query.filter(
-                            CatalogItem.created_date
-                            >= int(
-                                datetime.strptime(
-                                    date_filter["start"], "%Y-%m-%d"
-                                ).timestamp()
-                            )
-                        )
-                    if date_filter.get("end"):
-                        base_query = base_query.filter(
-                            CatalogItem.created_date
-                            <= int(
-                                datetime.strptime(
-                                    date_filter["end"], "%Y-%m-%d"
-                                ).timestamp()
-                            )
-                        )
+        session = self.get_session()
+        try:
+            base_query = session.query(CatalogItem).options(
+                selectinload(CatalogItem.tags)
+            )
 
-                # Filter out deleted items and respect status
+            # Apply semantic filtering
+            for term in analysis["search_terms"]:
                 base_query = base_query.filter(
-                    CatalogItem.deleted == False, CatalogItem.status != "archived"
+                    CatalogItem.title.ilike(f"%{term}%")
+                    | CatalogItem.content.ilike(f"%{term}%")
+                    | CatalogItem.description.ilike(f"%{term}%")
                 )
 
-                if "status" in analysis["filters"]:
-                    status = analysis["filters"]["status"]
-                    if status in CATALOG_CONFIG["VALID_STATUSES"]:
-                        base_query = base_query.filter(CatalogItem.status == status)
-
-                if "tags" in analysis["filters"]:
-                    for tag in analysis["filters"]["tags"]:
-                        base_query = (
-                            base_query.join(CatalogTag)
-                            .join(Tag)
-                            .filter(Tag.name.ilike(f"%{tag}%"), Tag.deleted == False)
+            # Apply entity-based filters
+            if "date" in analysis["filters"]:
+                date_filter = analysis["filters"]["date"]
+                if date_filter.get("start"):
+                    base_query = base_query.filter(
+                        CatalogItem.created_date
+                        >= int(
+                            datetime.strptime(
+                                date_filter["start"], "%Y-%m-%d"
+                            ).timestamp()
                         )
-
-                # Apply metadata filters if present
-                if "metadata" in analysis["filters"]:
-                    metadata_filters = analysis["filters"]["metadata"]
-                    for key, value in metadata_filters.items():
-                        base_query = base_query.filter(
-                            CatalogItem.item_metadata[key].astext == str(value)
+                    )
+                if date_filter.get("end"):
+                    base_query = base_query.filter(
+                        CatalogItem.created_date
+                        <= int(
+                            datetime.strptime(date_filter["end"], "%Y-%m-%d").timestamp()
                         )
+                    )
 
-                items = base_query.all()
+            # Filter out deleted items and respect status
+            base_query = base_query.filter(
+                CatalogItem.deleted == False, CatalogItem.status != "archived"
+            )
 
-                # Sort by relevance if needed
-                if items and len(items) > 1:
-                    items = self.rank_results_by_relevance(items, query)
+            if "status" in analysis["filters"]:
+                status = analysis["filters"]["status"]
+                if status in CATALOG_CONFIG["VALID_STATUSES"]:
+                    base_query = base_query.filter(CatalogItem.status == status)
+
+            if "tags" in analysis["filters"]:
+                for tag in analysis["filters"]["tags"]:
+                    base_query = (
+                        base_query.join(CatalogTag)
+                        .join(Tag)
+                        .filter(Tag.name.ilike(f"%{tag}%"), Tag.deleted == False)
+                    )
+
+            # Apply metadata filters if present
+            if "metadata" in analysis["filters"]:
+                metadata_filters = analysis["filters"]["metadata"]
+                for key, value in metadata_filters.items():
+                    base_query = base_query.filter(
+                        CatalogItem.item_metadata[key].astext == str(value)
+                    )
 
+            return base_query.all()
+        finally:
             session.close()
-            return items
 
-        except Exception as e:
-            self.test_logger.error(f"Error in semantic search: {str(e)}")
-            return []
+    @staticmethod
+    def get_item_digest(item: CatalogItem) -> dict:
+        """Return the stored digest for an item, building one if missing."""
+        digest = (item.item_info or {}).get("digest")
+        if digest:
+            return digest
+        return build_digest(item.title, item.description, item.content)
 
     def rank_results_by_relevance(self, items: list, query: str) -> list:
         """Rank search results by relevance using Claude AI.
 
+        Items are sent as compact digests rather than full content. Only the
+        top RERANK_TOP_K candidates (ordered by local term overlap) are ranked;
+        the rest keep their local order after them. Candidates are scored in
+        chunks of RERANK_CHUNK_SIZE, in parallel when there is more than one.
+
         Args:
             items: List of catalog items to rank
             query: Original search query
@@ -1023,40 +1158,77 @@ Example: For a query about "python class tutorial":
             list: Ranked list of items
         """
         try:
-            # Prepare items for ranking
-            item_texts = [
-                f"Title: {item.title}\nContent: {item.content}" for item in items
-            ]
-
-            # Get relevance scores using Claude
-            system_prompt = CATALOG_CONFIG["PROMPTS"]["RELEVANCE_RANKING"]
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": f"Query: {query}\nItems: {json.dumps(item_texts)}",
-                },
-            ]
+            digests = [self.get_item_digest(item) for item in items]
 
-            response = self.client.messages.create(
-                model=API_CONFIG["MODEL"],
-                max_tokens=API_CONFIG["MAX_TOKENS"],
-                temperature=0.0,  # Use deterministic output for ranking
-                messages=messages,
+            # Stable sort keeps retrieval order for equally relevant items
+            order = sorted(
+                range(len(items)),
+                key=lambda index: local_relevance(digests[index], query),
+                reverse=True,
             )
+            top_k = CATALOG_CONFIG["RERANK_TOP_K"]
+            candidates, remainder = order[:top_k], order[top_k:]
 
-            # Parse relevance scores
-            scores = json.loads(response.content)
+            chunk_size = CATALOG_CONFIG["RERANK_CHUNK_SIZE"]
+            chunks = [
+                candidates[start : start + chunk_size]
+                for start in range(0, len(candidates), chunk_size)
+            ]
+            chunk_digests = [[digests[index] for index in chunk] for chunk in chunks]
 
-            # Sort items by relevance score
-            ranked_items = sorted(zip(items, scores), key=lambda x: x[1], reverse=True)
+            if len(chunks) == 1:
+                chunk_scores = [self._score_digests(query, chunk_digests[0])]
+            else:
+                workers = min(CATALOG_CONFIG["RERANK_WORKERS"], len(chunks))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    chunk_scores = list(
+                        executor.map(
+                            lambda chunk: self._score_digests(query, chunk),
+                            chunk_digests,
+                        )
+                    )
 
-            return [item for item, _ in ranked_items]
+            scores = {}
+            for chunk, chunk_result in zip(chunks, chunk_scores):
+                scores.update(zip(chunk, chunk_result))
+
+            ranked = sorted(candidates, key=lambda index: scores[index], reverse=True)
+            return [items[index] for index in ranked + remainder]
 
         except Exception as e:
             self.test_logger.error(f"Error ranking results: {str(e)}")
             return items
 
+    def _score_digests(self, query: str, digests: List[dict]) -> List[float]:
+        """Ask Claude for one relevance score per digest.
+
+        Raises:
+            ValueError: If the response is not a list with one score per digest
+        """
+        item_texts = [format_digest(digest) for digest in digests]
+        response = self.client.messages.create(
+            model=API_CONFIG["MODEL"],
+            max_tokens=API_CONFIG["MAX_TOKENS"],
+            temperature=0.0,  # Use deterministic output for ranking
+            system=CATALOG_CONFIG["PROMPTS"]["RELEVANCE_RANKING"],
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"Query: {query}\nItems: {json.dumps(item_texts)}",
+                }
+            ],
+        )
+
+        json_str, error = extract_json(response.content[0].text)
+        if error:
+            raise ValueError(error)
+        scores = json.loads(json_str)
+        if not isinstance(scores, list) or len(scores) != len(digests):
+            raise ValueError(
+                f"Expected {len(digests)} relevance scores, got {json_str[:100]}"
+            )
+        return [float(score) for score in scores]
+
     def process_input(self, user_input: str) -> dict:
         """Process user input and return response."""
         session = self.get_session()
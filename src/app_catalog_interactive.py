@@ -12,6 +12,7 @@ from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import (
     Completer,
     Completion,
+    DynamicCompleter,
     NestedCompleter,
     WordCompleter,
 )
@@ -21,7 +22,7 @@ from prompt_toolkit.keys import Keys
 from prompt_toolkit.shortcuts import clear
 from prompt_toolkit.styles import Style
 
-from models.catalog import CatalogItem, Tag
+from models.catalog import CatalogItem
 
 from .app_catalog import CatalogChat
 
@@ -166,6 +167,8 @@ class CatalogInteractive:
     def __init__(self, enable_semantic=True):
         """Initialize the interactive interface."""
         self.chat = CatalogChat(mode="interactive", enable_semantic=enable_semantic)
+        self._completer = None
+        self._completer_generation = None
         self.setup_prompt()
 
     def setup_prompt(self):
@@ -179,14 +182,9 @@ class CatalogInteractive:
             """Handle ESC key."""
             sys.exit(0)
 
-        # Create completers
-        command_completer = CommandCompleter(COMMANDS.keys())
-        nested_completer = self.create_command_completer()
-        multi_completer = MultiCompleter([command_completer, nested_completer])
-
-        # Initialize prompt session
+        # Completions are built on first use, not before the first prompt
         self.session = PromptSession(
-            completer=multi_completer,
+            completer=DynamicCompleter(self.get_completer),
             key_bindings=kb,
             style=style,
             history=self.load_history(),
@@ -194,19 +192,24 @@ class CatalogInteractive:
             enable_history_search=True,
         )
 
+    def get_completer(self) -> Completer:
+        """Return the completer, rebuilding it only when the catalog changed."""
+        registry = self.chat.registry
+        registry.ensure_loaded()
+        if self._completer is None or self._completer_generation != registry.generation:
+            self._completer = MultiCompleter(
+                [CommandCompleter(COMMANDS.keys()), self.create_command_completer()]
+            )
+            self._completer_generation = registry.generation
+        return self._completer
+
     def create_command_completer(self):
         """Create a nested completer for commands and their arguments."""
-        session = self.chat.get_session()
-
-        # Get active item titles for completion
-        active_items = (
-            session.query(CatalogItem.title).filter(CatalogItem.deleted == False).all()
-        )
-        item_titles = [item[0] for item in active_items]
-
-        # Get all tags for completion
-        tags = session.query(Tag.name).filter(Tag.deleted == False).all()
-        tag_names = [tag[0] for tag in tags]
+        # Titles and names come from the in-memory registry, not the database
+        item_titles = [
+            item.title for item in self.chat.registry.items(include_deleted=False)
+        ]
+        tag_names = [tag.name for tag in self.chat.registry.tags(include_deleted=False)]
 
         # Create completers for different argument types
         tag_completer = WordCompleter(tag_names, sentence=True)
@@ -279,9 +282,6 @@ class CatalogInteractive:
         )
         while True:
             try:
-                # Refresh completer before each command to ensure up-to-date completions
-                self.session.completer = self.create_command_completer()
-
                 # Get command with prompt_toolkit
                 command = self.session.prompt("\n> ")
 
@@ -349,18 +349,20 @@ class CatalogInteractive:
                 analysis = self.chat.process_natural_language_query(user_input)
 
                 if analysis["intent"] == "search":
-                    # Perform semantic search
-                    items = self.chat.semantic_search(user_input)
-                    if items:
-                        print("\nFound these relevant items:")
-                        for i, item in enumerate(items, 1):
-                            print(f"\n{i}. {item.title}")
-                            print(f"   {item.content[:200]}...")
-                            if item.tags:
-                                tags = [tag.name for tag in item.tags]
-                                print(f"   Tags: {', '.join(tags)}")
-                    else:
-                        print("\nNo matching items found.")
+                    # Reuse the analysis and show local matches before ranking
+                    stages = self.chat.semantic_search_stages(user_input, analysis)
+                    shown = []
+                    for stage, items in stages:
+                        if stage == "local":
+                            if not items:
+                                print("\nNo matching items found.")
+                                break
+                            print("\nFound these relevant items:")
+                            self.print_items(items)
+                        elif stage == "ranked" and items != shown:
+                            print("\nRanked by relevance:")
+                            self.print_items(items)
+                        shown = items
 
                 elif analysis["intent"] == "add":
                     # Extract title and content from entities
@@ -423,6 +425,15 @@ class CatalogInteractive:
                 print(f"\nError: {str(e)}")
                 continue
 
+    def print_items(self, items: List[CatalogItem]):
+        """Print catalog items with a content preview and tags."""
+        for i, item in enumerate(items, 1):
+            print(f"\n{i}. {item.title}")
+            print(f"   {(item.content or '')[:200]}...")
+            if item.tags:
+                tags = [tag.name for tag in item.tags]
+                print(f"   Tags: {', '.join(tags)}")
+
     def run(self):
         """Run the interactive interface."""
         print("\nWelcome to the Marian Catalog System")
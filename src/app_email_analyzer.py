@@ -3,6 +3,7 @@ import json
 import logging
 import re
 from datetime import datetime, timezone
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 import anthropic
@@ -11,6 +12,7 @@ from dotenv import load_dotenv
 from structlog import get_logger
 
 from models.email_analysis import EmailAnalysis
+from services import email_labels
 from shared_lib.anthropic_client_lib import get_anthropic_client, test_anthropic_connection
 from shared_lib.chat_log_util import ChatLogger
 from shared_lib.constants import API_CONFIG, EMAIL_CONFIG
@@ -21,7 +23,6 @@ from shared_lib.utils import normalize_response, extract_urls, sanitize_email_co
 
 # Set up structured logging
 logger = get_logger()
-chat_logger = ChatLogger(str(LOGS_PATH / DEFAULT_CHAT_LOG))
 
 
 def start_metrics_server(port: int = 8000) -> None:
@@ -85,6 +86,11 @@ class EmailAnalyzer:
 
         logger.info("analyzer_initialized", test_mode=test_mode)
 
+    @cached_property
+    def chat_logger(self) -> ChatLogger:
+        """Chat logger, created on first use so importing this module writes nothing."""
+        return ChatLogger(str(LOGS_PATH / DEFAULT_CHAT_LOG))
+
     def analyze_email(self, email_data: Dict[str, str]) -> EmailAnalysisResponse:
         """Analyze an email using the Claude API.
 
@@ -237,6 +243,9 @@ class EmailAnalyzer:
                 )
 
                 emails = result.fetchall()
+                labels = email_labels.labels_for_emails(
+                    session, [email.id for email in emails]
+                )
 
                 for email in emails:
                     email_dict = {
@@ -245,7 +254,7 @@ class EmailAnalyzer:
                         "subject": email.subject,
                         "body": email.body,
                         "date": email.received_date.isoformat(),
-                        "labels": email.labels.split(",") if email.labels else [],
+                        "labels": labels.get(email.id, []),
                     }
 
                     analysis = self.analyze_email(email_dict)
@@ -3,7 +3,8 @@ import argparse
 import json
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from sqlalchemy import and_, desc, func, text
@@ -12,6 +13,9 @@ from tabulate import tabulate
 
 from models.email import Email
 from models.email_analysis import EmailAnalysis
+from services import analytics_snapshot, email_labels, report_cache, report_rollups
+from services.analysis_join import AnalysisEmailJoin, EmailFields
+from services.report_engine import ReportEngine, ReportResult
 from shared_lib import constants
 from shared_lib.database_session_util import (
     AnalysisSession,
@@ -30,6 +34,7 @@ class EmailAnalytics:
         email_session: Optional[EmailSession] = None,
         analysis_session: Optional[AnalysisSession] = None,
         testing: bool = False,
+        cache: Optional[report_cache.ReportCache] = None,
     ):
         """Initialize analytics.
 
@@ -37,10 +42,15 @@ class EmailAnalytics:
             email_session: Optional SQLAlchemy session for email database
             analysis_session: Optional SQLAlchemy session for analysis database
             testing: If True, use in-memory SQLite database for testing
+            cache: Optional disk cache for computed reports
         """
         self.email_session = email_session
         self.analysis_session = analysis_session
+        for session in (email_session, analysis_session):
+            if session is not None:
+                report_rollups.track(session)
         self.testing = testing
+        self.cache = cache
 
     def _get_email_session(self) -> EmailSession:
         """Get email database session."""
@@ -58,411 +68,215 @@ class EmailAnalytics:
             constants.DATABASE_CONFIG["analysis"], testing=self.testing
         )
 
+    def data_watermark(self) -> Dict[str, Any]:
+        """State of the data reports are computed from."""
+        with self._get_analysis_session() as analysis_session:
+            with self._get_email_session() as email_session:
+                return report_cache.data_watermark(email_session, analysis_session)
+
+    def cached(self, report: str, compute: Callable[[], Any], **params) -> Any:
+        """Return a report from the cache unless its data has changed.
+
+        Args:
+            report: Report type
+            compute: Computes the report
+            params: Parameters the report depends on
+        """
+        if self.cache is None:
+            return compute()
+        params["backend"] = type(self).__name__
+        return self.cache.get_or_compute(report, params, self.data_watermark(), compute)
+
     def get_total_emails(self) -> int:
         """Get total number of emails in the database"""
         with self._get_email_session() as session:
             return session.query(Email).count()
 
+    def _iter_joined(
+        self,
+        *criteria,
+        order_by: Tuple = (),
+        email_ids: Optional[List[str]] = None,
+        require_email: bool = True,
+    ) -> Iterator[Dict]:
+        """Stream formatted analyses joined with their emails.
+
+        Args:
+            criteria: Filters on EmailAnalysis columns
+            order_by: Ordering on EmailAnalysis columns
+            email_ids: Restrict to these email ids
+            require_email: Skip analyses whose email is missing
+        """
+        with self._get_analysis_session() as analysis_session:
+            with self._get_email_session() as email_session:
+                join = AnalysisEmailJoin(analysis_session, email_session)
+                for analysis, email in join.iter_rows(
+                    *criteria,
+                    order_by=order_by,
+                    email_ids=email_ids,
+                    require_email=require_email,
+                ):
+                    yield self._format_joined(analysis, email)
+
+    def _format_joined(
+        self, analysis: EmailAnalysis, email: Optional[EmailFields]
+    ) -> Dict:
+        """Format an analysis, adding its email's subject, sender and date."""
+        analysis_dict = self._format_analysis(analysis)
+        if email is not None:
+            analysis_dict.update(
+                {
+                    "subject": email.subject,
+                    "from": email.from_address,
+                    "date": email.received_at.isoformat() if email.received_at else None,
+                }
+            )
+        return analysis_dict
+
     def _get_analyses_from_ids(self, email_ids: List[str]) -> List[Dict]:
         """Helper method to get formatted analyses from a list of email IDs."""
-        analyses = []
-        for email_id in email_ids:
-            analysis = self.get_detailed_analysis(email_id)
-            if analysis:
-                analyses.append(analysis)
-        return analyses
+        by_id = {
+            analysis["email_id"]: analysis
+            for analysis in self._iter_joined(email_ids=email_ids)
+        }
+        return [by_id[email_id] for email_id in email_ids if email_id in by_id]
 
     def get_top_senders(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Get top email senders by volume"""
         with self._get_email_session() as session:
-            results = (
-                session.query(Email.from_, func.count(Email.id).label("count"))
-                .group_by(Email.from_)
-                .order_by(desc("count"))
-                .limit(limit)
-                .all()
-            )
-            return [(sender, count) for sender, count in results]
+            return report_rollups.distribution(session, "emails", "sender", limit)
 
     def get_email_by_date(self) -> List[Tuple[str, int]]:
         """Get email distribution by date"""
         with self._get_email_session() as session:
-            results = (
-                session.query(
-                    func.date(Email.received_date).label("date"),
-                    func.count(Email.id).label("count"),
-                )
-                .group_by("date")
-                .order_by(desc("date"))
-                .limit(10)
-                .all()
-            )
-            return [(str(date), count) for date, count in results]
+            return report_rollups.daily_counts(session, "emails", limit=10)
 
     def get_label_distribution(self) -> Dict[str, int]:
         """Get distribution of email labels."""
         with self._get_email_session() as session:
-            labels = session.query(Email.labels).all()
-
-        # Process labels
-        label_counts = Counter()
-        for label_list in labels:
-            if label_list[0]:
-                current_labels = (
-                    label_list[0].split(",")
-                    if isinstance(label_list[0], str)
-                    else label_list[0]
-                )
-                label_counts.update(current_labels)
+            return dict(email_labels.label_distribution(session))
 
-        return dict(label_counts)
+    def get_label_time_series(
+        self, label: str, limit: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """Get daily email counts for a label id or name, newest first."""
+        with self._get_email_session() as session:
+            return email_labels.label_time_series(session, label, limit)
 
     def get_anthropic_analysis(self) -> List[Dict]:
         """Get all Anthropic analysis results."""
-        analyses = []
+        return list(self._iter_joined(order_by=(EmailAnalysis.created_at.desc(),)))
 
-        with self._get_analysis_session() as analysis_session:
-            results = (
-                analysis_session.query(EmailAnalysis)
-                .order_by(EmailAnalysis.analysis_date.desc())
-                .all()
-            )
-
-            with self._get_email_session() as email_session:
-                for analysis in results:
-                    email = (
-                        email_session.query(Email)
-                        .filter_by(id=analysis.email_id)
-                        .first()
-                    )
-                    if email:
-                        analysis_dict = self._format_analysis(analysis)
-                        analysis_dict.update(
-                            {
-                                "subject": email.subject,
-                                "from": email.from_,
-                                "date": (
-                                    email.received_date.isoformat()
-                                    if email.received_date
-                                    else None
-                                ),
-                            }
-                        )
-                        analyses.append(analysis_dict)
-
-        return analyses
-
-    def get_priority_distribution(self) -> List[Tuple[int, int]]:
-        """Get distribution of priority scores."""
+    def get_priority_distribution(self) -> List[Tuple[str, int]]:
+        """Get distribution of priorities."""
         with self._get_analysis_session() as session:
-            results = (
-                session.query(
-                    EmailAnalysis.priority_score,
-                    func.count(EmailAnalysis.email_id).label("count"),
-                )
-                .group_by(EmailAnalysis.priority_score)
-                .order_by(EmailAnalysis.priority_score)
-                .all()
-            )
-            priorities = []
-            for score, count in results:
-                if score >= 3:
-                    priorities.append(("High (3)", count))
-                elif score >= 2:
-                    priorities.append(("Medium (2)", count))
-                else:
-                    priorities.append(("Low (1)", count))
-            return priorities
+            return report_rollups.distribution(session, "email_analysis", "priority")
 
     def get_sentiment_distribution(self) -> List[Tuple[str, int]]:
         """Get distribution of sentiment analysis."""
         with self._get_analysis_session() as session:
-            results = (
-                session.query(
-                    EmailAnalysis.sentiment,
-                    func.count(EmailAnalysis.email_id).label("count"),
-                )
-                .group_by(EmailAnalysis.sentiment)
-                .all()
-            )
-            return [(sentiment, count) for sentiment, count in results]
+            return report_rollups.distribution(session, "email_analysis", "sentiment")
 
     def get_action_needed_distribution(self) -> List[Tuple[bool, int]]:
-        """Get distribution of emails needing action."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(
-                    EmailAnalysis.action_needed,
-                    func.count(EmailAnalysis.email_id).label("count"),
-                )
-                .group_by(EmailAnalysis.action_needed)
-                .all()
-            )
-            return [(bool(action), count) for action, count in results]
+        """Get distribution of emails needing action.
+
+        EmailAnalysis stores no action fields, so this is always empty.
+        """
+        return []
 
     def get_project_distribution(self) -> List[Tuple[str, int]]:
-        """Get distribution of projects."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(
-                    EmailAnalysis.project,
-                    func.count(EmailAnalysis.email_id).label("count"),
-                )
-                .filter(EmailAnalysis.project != None, EmailAnalysis.project != "")
-                .group_by(EmailAnalysis.project)
-                .all()
-            )
-            return [(project, count) for project, count in results]
+        """Get distribution of projects (always empty: none are stored)."""
+        return []
 
     def get_topic_distribution(self) -> List[Tuple[str, int]]:
-        """Get distribution of topics."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(
-                    EmailAnalysis.topic,
-                    func.count(EmailAnalysis.email_id).label("count"),
-                )
-                .filter(EmailAnalysis.topic != None, EmailAnalysis.topic != "")
-                .group_by(EmailAnalysis.topic)
-                .all()
-            )
-            return [(topic, count) for topic, count in results]
+        """Get distribution of topics (always empty: none are stored)."""
+        return []
 
     def get_category_distribution(self) -> Dict[str, int]:
         """Get distribution of categories."""
         with self._get_analysis_session() as session:
-            results = session.query(EmailAnalysis.category).all()
-
-        category_counts = Counter()
-        for result in results:
-            categories = result[0]
-            if categories:
-                if isinstance(categories, list):
-                    category_counts.update(categories)
-                else:
-                    try:
-                        category_counts.update(json.loads(categories))
-                    except json.JSONDecodeError:
-                        continue
-
-        return dict(category_counts)
+            return dict(
+                report_rollups.distribution(session, "email_analysis", "category")
+            )
 
     def get_confidence_distribution(self) -> List[Tuple[str, int]]:
-        """Get distribution of confidence scores."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(
-                    EmailAnalysis.confidence_score,
-                    func.count(EmailAnalysis.email_id).label("count"),
-                )
-                .group_by(EmailAnalysis.confidence_score)
-                .all()
-            )
-            confidence_dist = []
-            for score, count in results:
-                if score >= 0.9:
-                    confidence_dist.append(("0.9-1.0", count))
-                elif score >= 0.8:
-                    confidence_dist.append(("0.8-0.89", count))
-                elif score >= 0.7:
-                    confidence_dist.append(("0.7-0.79", count))
-                elif score >= 0.6:
-                    confidence_dist.append(("0.6-0.69", count))
-                else:
-                    confidence_dist.append(("<0.6", count))
+        """Get distribution of confidence scores.
 
-            return confidence_dist
+        EmailAnalysis stores no confidence score, so this is always empty.
+        """
+        return []
 
-    def get_analysis_by_date(self) -> List[Tuple[datetime, int]]:
-        """Get analysis distribution by date."""
+    def get_analysis_by_date(self) -> List[Tuple[str, int]]:
+        """Get analysis distribution by date, newest first."""
         with self._get_analysis_session() as session:
-            results = (
-                session.query(
-                    EmailAnalysis.analysis_date,
-                    func.count(EmailAnalysis.email_id).label("count"),
-                )
-                .group_by(EmailAnalysis.analysis_date)
-                .order_by(EmailAnalysis.analysis_date.desc())
-                .all()
-            )
-            return [(date, count) for date, count in results]
+            return report_rollups.daily_counts(session, "email_analysis")
 
     def get_detailed_analysis(self, email_id: str) -> Dict:
         """Get detailed analysis for a specific email."""
-        with self._get_analysis_session() as analysis_session:
-            analysis = (
-                analysis_session.query(EmailAnalysis)
-                .filter_by(email_id=email_id)
-                .first()
-            )
-            if not analysis:
-                return None
-
-            with self._get_email_session() as email_session:
-                email = email_session.query(Email).filter_by(id=email_id).first()
-                if not email:
-                    return None
-
-                analysis_dict = self._format_analysis(analysis)
-                analysis_dict.update(
-                    {
-                        "subject": email.subject,
-                        "from": email.from_,
-                        "date": (
-                            email.received_date.isoformat()
-                            if email.received_date
-                            else None
-                        ),
-                    }
-                )
-                return analysis_dict
-
-    def get_analysis_by_category(self, category: str) -> List[Dict]:
-        """Get all analyses with a specific category."""
-        with self._get_analysis_session() as session:
-            results = session.query(EmailAnalysis).all()
-            matching_ids = []
-            for result in results:
-                categories = (
-                    result.category
-                    if isinstance(result.category, list)
-                    else json.loads(result.category) if result.category else []
-                )
-                if category in categories:
-                    matching_ids.append(result.email_id)
-            return self._get_analyses_from_ids(matching_ids)
+        analyses = self._get_analyses_from_ids([email_id])
+        return analyses[0] if analyses else None
 
     def get_analysis_stats(self) -> Dict[str, Any]:
-        """Get overall analysis statistics."""
+        """Get overall analysis statistics.
+
+        Scores, actions, projects and topics are not stored by EmailAnalysis
+        and are reported as 0.
+        """
         with self._get_analysis_session() as session:
-            total_analyzed = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.confidence_score.isnot(None))
-                .count()
-            )
-            avg_confidence = (
-                session.query(
-                    func.round(func.avg(EmailAnalysis.confidence_score), 2)
-                ).scalar()
-                or 0
-            )
-            avg_priority = (
-                session.query(
-                    func.round(func.avg(EmailAnalysis.priority_score), 2)
-                ).scalar()
-                or 0
-            )
-            action_needed_count = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.action_needed == True)
-                .count()
-            )
-            high_priority_count = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.priority_score >= 3)
-                .count()
-            )
-            positive_count = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.sentiment == "positive")
-                .count()
-            )
-            negative_count = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.sentiment == "negative")
-                .count()
-            )
-            neutral_count = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.sentiment == "neutral")
-                .count()
+            sentiments = dict(
+                session.query(EmailAnalysis.sentiment, func.count())
+                .group_by(EmailAnalysis.sentiment)
+                .all()
             )
-            total_projects = session.query(
-                func.count(func.distinct(EmailAnalysis.project))
-            ).scalar()
-            total_topics = session.query(
-                func.count(func.distinct(EmailAnalysis.topic))
-            ).scalar()
-
-            stats = {
-                "total_analyzed": total_analyzed,
-                "avg_confidence": float(avg_confidence),
-                "avg_priority": float(avg_priority),
-                "action_needed_count": action_needed_count,
-                "high_priority_count": high_priority_count,
-                "total_projects": total_projects,
-                "total_topics": total_topics,
+            return {
+                "total_analyzed": session.query(EmailAnalysis).count(),
+                "avg_confidence": 0.0,
+                "avg_priority": 0.0,
+                "action_needed_count": 0,
+                "high_priority_count": (
+                    session.query(EmailAnalysis)
+                    .filter(EmailAnalysis.priority == "high")
+                    .count()
+                ),
+                "total_projects": 0,
+                "total_topics": 0,
                 "sentiment_counts": {
-                    "positive": positive_count,
-                    "negative": negative_count,
-                    "neutral": neutral_count,
+                    sentiment: sentiments.get(sentiment, 0)
+                    for sentiment in ("positive", "negative", "neutral")
                 },
             }
 
-            return stats
-
     def get_analysis_with_action_needed(self) -> List[Dict]:
-        """Get analyses that require action."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.action_needed == True)
-                .all()
-            )
-            return [self._format_analysis(analysis) for analysis in results]
+        """Get analyses that require action (always empty: none are stored)."""
+        return []
 
     def get_high_priority_analysis(self) -> List[Dict]:
-        """Get high priority analyses (priority_score >= 3)."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.priority_score >= 3)
-                .all()
-            )
-            return [self._format_analysis(analysis) for analysis in results]
+        """Get high priority analyses."""
+        return list(
+            self._iter_joined(EmailAnalysis.priority == "high", require_email=False)
+        )
 
     def get_analysis_by_sentiment(self, sentiment: str) -> List[Dict]:
         """Get analyses by sentiment (positive/negative/neutral)."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.sentiment == sentiment)
-                .all()
-            )
-            return [self._format_analysis(analysis) for analysis in results]
+        return list(
+            self._iter_joined(EmailAnalysis.sentiment == sentiment, require_email=False)
+        )
 
     def get_analysis_by_project(self, project: str) -> List[Dict]:
-        """Get analyses by project."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(EmailAnalysis)
-                .filter(EmailAnalysis.project == project)
-                .all()
-            )
-            return [self._format_analysis(analysis) for analysis in results]
+        """Get analyses by project (always empty: none are stored)."""
+        return []
 
     def get_analysis_by_topic(self, topic: str) -> List[Dict]:
-        """Get analyses by topic."""
-        with self._get_analysis_session() as session:
-            results = (
-                session.query(EmailAnalysis).filter(EmailAnalysis.topic == topic).all()
-            )
-            return [self._format_analysis(analysis) for analysis in results]
+        """Get analyses by topic (always empty: none are stored)."""
+        return []
 
     def get_analysis_by_category(self, category: str) -> List[Dict]:
         """Get all analyses with a specific category."""
-        with self._get_analysis_session() as session:
-            results = session.query(EmailAnalysis).all()
-            matching_ids = []
-            for result in results:
-                categories = (
-                    result.category
-                    if isinstance(result.category, list)
-                    else json.loads(result.category) if result.category else []
-                )
-                if category in categories:
-                    matching_ids.append(result.email_id)
-            return self._get_analyses_from_ids(matching_ids)
+        return [
+            analysis
+            for analysis in self._iter_joined()
+            if category in analysis["category"]
+        ]
 
     def _format_analysis(self, analysis: EmailAnalysis) -> Dict:
         """Format an EmailAnalysis object into a dictionary.
@@ -475,70 +289,11 @@ class EmailAnalytics:
         """
         return {
             "email_id": analysis.email_id,
-            "threadId": analysis.threadId,
-            "date": analysis.analysis_date.isoformat(),
+            "date": analysis.created_at.isoformat() if analysis.created_at else None,
             "summary": analysis.summary,
-            "category": (
-                analysis.category
-                if isinstance(analysis.category, list)
-                else json.loads(analysis.category) if analysis.category else []
-            ),
-            "priority": {
-                "score": analysis.priority_score,
-                "reason": analysis.priority_reason,
-            },
-            "action": {
-                "needed": bool(analysis.action_needed),
-                "type": (
-                    analysis.action_type
-                    if isinstance(analysis.action_type, list)
-                    else (
-                        json.loads(analysis.action_type) if analysis.action_type else []
-                    )
-                ),
-                "deadline": (
-                    analysis.action_deadline.isoformat()
-                    if analysis.action_deadline
-                    else None
-                ),
-            },
-            "key_points": (
-                analysis.key_points
-                if isinstance(analysis.key_points, list)
-                else json.loads(analysis.key_points) if analysis.key_points else []
-            ),
-            "people_mentioned": (
-                analysis.people_mentioned
-                if isinstance(analysis.people_mentioned, list)
-                else (
-                    json.loads(analysis.people_mentioned)
-                    if analysis.people_mentioned
-                    else []
-                )
-            ),
-            "links": {
-                "found": (
-                    analysis.links_found
-                    if isinstance(analysis.links_found, list)
-                    else (
-                        json.loads(analysis.links_found) if analysis.links_found else []
-                    )
-                ),
-                "display": (
-                    analysis.links_display
-                    if isinstance(analysis.links_display, list)
-                    else (
-                        json.loads(analysis.links_display)
-                        if analysis.links_display
-                        else []
-                    )
-                ),
-            },
-            "project": analysis.project or "",
-            "topic": analysis.topic or "",
+            "category": analytics_snapshot.split_category(analysis.category),
+            "priority": analysis.priority,
             "sentiment": analysis.sentiment,
-            "confidence_score": analysis.confidence_score,
-            "full_api_response": analysis.full_api_response,
         }
 
     def generate_report(self) -> Dict:
@@ -589,92 +344,60 @@ class EmailAnalytics:
 
             return report
 
-    def print_analysis_report(self) -> None:
-        """Print a comprehensive analysis report."""
+    def build_report(self) -> ReportResult:
+        """Compute every section of the analysis report in one pass."""
+        with self._get_analysis_session() as analysis_session:
+            with self._get_email_session() as email_session:
+                return ReportEngine(email_session, analysis_session).run()
+
+    def print_analysis_report(self, result: Optional[ReportResult] = None) -> None:
+        """Print a comprehensive analysis report.
+
+        Args:
+            result: Precomputed report, built with build_report() if omitted
+        """
+        result = result or self.build_report()
         print("\n=== Email Analysis Report ===\n")
 
-        # Get total analyzed emails
-        total = self.get_total_emails()
+        total = result.total_analyzed
+        print(f"Total Emails: {result.total_emails}")
         print(f"Total Analyzed Emails: {total}\n")
 
         # Priority Distribution
         print("\nPriority Distribution:")
-        priorities = self.get_priority_distribution()
-        for score, count in priorities:
+        for score, count in result.priorities:
             print(f"  {score}: {count} emails ({count/total*100:.1f}%)")
 
-        # Action Types
-        print("\nAction Type Distribution:")
-        actions = self.get_action_needed_distribution()
-        for action, count in actions:
-            print(f"  {action}: {count} emails")
-
         # Categories
         print("\nTop Categories:")
-        categories = self.get_category_distribution()
-        for category, count in categories.items():
+        for category, count in result.categories.items():
             print(f"  {category}: {count} emails")
 
         # Sentiment
         print("\nSentiment Distribution:")
-        sentiments = self.get_sentiment_distribution()
-        for sentiment, count in sentiments:
+        for sentiment, count in result.sentiments:
             print(f"  {sentiment}: {count} emails ({count/total*100:.1f}%)")
 
-        # Topic Distribution
-        print("\nTop Email Topics (AI Analysis):")
-        topics = self.get_topic_distribution()
-        if topics:
-            print(
-                tabulate(
-                    [[topic, count] for topic, count in topics],
-                    headers=["Topic", "Count"],
-                    tablefmt="pipe",
-                )
-            )
-        print()
-
-        # Project Distribution
-        print("Project Distribution (AI Analysis):")
-        projects = self.get_project_distribution()
-        if projects:
+        # Analyses per day
+        print("\nAnalyses by Date:")
+        if result.analyses_by_date:
             print(
                 tabulate(
-                    [[project, count] for project, count in projects],
-                    headers=["Project", "Count"],
-                    tablefmt="pipe",
+                    result.analyses_by_date, headers=["Date", "Count"], tablefmt="pipe"
                 )
             )
         print()
 
-        # Confidence Distribution
-        print("\nConfidence Distribution:")
-        confidence_dist = self.get_confidence_distribution()
-        print(
-            tabulate(
-                confidence_dist, headers=["Confidence Level", "Count"], tablefmt="psql"
-            )
-        )
-        print()
-
         # Recent Analysis
         print("Recent Email Analysis:\n")
-        analysis = self.get_anthropic_analysis()
-        if analysis:
-            for email in analysis:
-                print(f"Email: {email['subject']}")
-                print(f"From: {email['from']}")
-                print(f"Summary: {email['summary']}")
-                if email.get("topics"):
-                    print(f"Topics: {', '.join(email['topics'])}")
-                if email.get("project"):
-                    print(f"Project: {email['project']}")
-                print(f"Sentiment: {email['sentiment']}")
-                if email.get("action_items"):
-                    action_items = email["action_items"]
-                    if action_items:
-                        print(f"Action Items: {', '.join(action_items)}")
-                print("-" * 80 + "\n")
+        for email in result.recent:
+            print(f"Email: {email['subject']}")
+            print(f"From: {email['from']}")
+            print(f"Summary: {email['summary']}")
+            print(f"Category: {email['category']}")
+            print(f"Sentiment: {email['sentiment']}")
+            print(f"Priority: {email['priority']}")
+            print("-" * 80 + "\n")
 
     def show_basic_stats(self) -> None:
         """Show basic email statistics."""
@@ -705,28 +428,130 @@ class EmailAnalytics:
     def show_ai_analysis_summary(self) -> None:
         """Show AI analysis summary."""
         print("\nAI Analysis Summary:")
-        analysis_data = self.get_anthropic_analysis()
-        if analysis_data:
-            for analysis in analysis_data[:5]:
-                print(f"\nEmail: {analysis['subject']}")
-                print(f"From: {analysis['from']}")
-                print(f"Summary: {analysis['summary']}")
-                print(f"Topics: {', '.join(analysis['topic'])}")
-                print(f"Sentiment: {analysis['sentiment']}")
-                if analysis["action"]["needed"]:
-                    print(f"Action Needed: {analysis['action']['needed']}")
-                    print(f"Action Type: {', '.join(analysis['action']['type'])}")
-                    print(f"Action Deadline: {analysis['action']['deadline']}")
-                print("-" * 80)
+        print_analysis_summary(self.get_anthropic_analysis())
 
     def show_confidence_distribution(self) -> None:
         """Show confidence distribution."""
         print("\nConfidence Distribution:")
-        confidence_dist = self.get_confidence_distribution()
-        print(
-            tabulate(
-                confidence_dist, headers=["Confidence Level", "Count"], tablefmt="psql"
-            )
+        print_confidence_distribution(self.get_confidence_distribution())
+
+
+class SnapshotEmailAnalytics(EmailAnalytics):
+    """Analytics computed from the columnar snapshot instead of the databases.
+
+    The snapshot is loaded once and every distribution is a vectorized
+    count over it, so reports never query the stores ingestion writes to.
+    Methods the snapshot has no columns for fall back to the databases.
+    """
+
+    def __init__(self, snapshot_dir: Optional[str] = None, **kwargs):
+        """Initialize analytics.
+
+        Args:
+            snapshot_dir: Snapshot directory, defaults to ANALYTICS_SNAPSHOT_DIR
+            kwargs: Passed to EmailAnalytics for the database fallbacks
+        """
+        super().__init__(**kwargs)
+        self.snapshot_dir = snapshot_dir
+
+    @cached_property
+    def frame(self) -> pd.DataFrame:
+        """The latest snapshot row of every email."""
+        return analytics_snapshot.load(self.snapshot_dir)
+
+    @property
+    def analyzed(self) -> pd.DataFrame:
+        """Snapshot rows that have an analysis."""
+        return self.frame[self.frame["analyzed_at"].notna()]
+
+    @staticmethod
+    def _counts(values: pd.Series, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        counts = values.value_counts()
+        counts = counts[counts > 0]
+        if limit is not None:
+            counts = counts.head(limit)
+        return [(value, int(count)) for value, count in counts.items()]
+
+    @staticmethod
+    def _daily(timestamps: pd.Series, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        days = timestamps.dropna().dt.strftime("%Y-%m-%d")
+        counts = days.value_counts().sort_index(ascending=False)
+        if limit is not None:
+            counts = counts.head(limit)
+        return [(day, int(count)) for day, count in counts.items()]
+
+    def get_total_emails(self) -> int:
+        """Get total number of emails in the snapshot."""
+        return len(self.frame)
+
+    def get_top_senders(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get top email senders by volume."""
+        return self._counts(self.frame["sender"], limit)
+
+    def get_email_by_date(self) -> List[Tuple[str, int]]:
+        """Get email distribution by date."""
+        return self._daily(self.frame["received_at"], limit=10)
+
+    def get_priority_distribution(self) -> List[Tuple[str, int]]:
+        """Get distribution of priorities."""
+        return self._counts(self.analyzed["priority"])
+
+    def get_sentiment_distribution(self) -> List[Tuple[str, int]]:
+        """Get distribution of sentiment analysis."""
+        return self._counts(self.analyzed["sentiment"])
+
+    def get_category_distribution(self) -> Dict[str, int]:
+        """Get distribution of categories.
+
+        Counts are taken per distinct category value and then split, so JSON
+        list values are parsed once per value rather than once per row.
+        """
+        category_counts = Counter()
+        for value, count in self._counts(self.analyzed["category"]):
+            for category in analytics_snapshot.split_category(value):
+                category_counts[category] += count
+        return dict(category_counts)
+
+    def get_analysis_by_date(self) -> List[Tuple[str, int]]:
+        """Get analysis distribution by date, newest first."""
+        return self._daily(self.analyzed["analyzed_at"])
+
+    def data_watermark(self) -> Dict[str, Any]:
+        """State of the snapshot, and of the labels read from the database."""
+        watermark = super().data_watermark()
+        watermark["snapshot"] = analytics_snapshot.state(self.snapshot_dir)
+        return watermark
+
+    def cached(self, report: str, compute: Callable[[], Any], **params) -> Any:
+        """Return a report from the cache unless the snapshot has changed."""
+        params.setdefault("snapshot_dir", self.snapshot_dir)
+        return super().cached(report, compute, **params)
+
+    def build_report(self, recent: int = 10) -> ReportResult:
+        """Compute the analysis report from the snapshot."""
+        newest = self.analyzed.sort_values("analyzed_at", ascending=False).head(recent)
+        return ReportResult(
+            total_emails=self.get_total_emails(),
+            total_analyzed=len(self.analyzed),
+            top_senders=self.get_top_senders(),
+            emails_by_date=self.get_email_by_date(),
+            labels=self.get_label_distribution(),
+            priorities=self.get_priority_distribution(),
+            sentiments=self.get_sentiment_distribution(),
+            categories=self.get_category_distribution(),
+            analyses_by_date=self.get_analysis_by_date(),
+            recent=[
+                {
+                    "email_id": row.email_id,
+                    "subject": row.subject,
+                    "from": row.sender,
+                    "summary": row.summary,
+                    "sentiment": row.sentiment,
+                    "priority": row.priority,
+                    "category": row.category,
+                }
+                for row in newest.itertuples()
+            ],
         )
 
 
@@ -739,6 +564,30 @@ def sync_gmail_labels() -> None:
     gmail.sync_labels()
 
 
+def print_analysis_summary(analyses: List[Dict], limit: int = 5) -> None:
+    """Print the newest formatted analyses."""
+    for analysis in analyses[:limit]:
+        print(f"\nEmail: {analysis['subject']}")
+        print(f"From: {analysis['from']}")
+        print(f"Summary: {analysis['summary']}")
+        print(f"Category: {', '.join(analysis['category'])}")
+        print(f"Sentiment: {analysis['sentiment']}")
+        print(f"Priority: {analysis['priority']}")
+        print("-" * 80)
+
+
+def print_confidence_distribution(confidence_dist: List[Tuple[str, int]]) -> None:
+    """Print a confidence distribution, or why there is none."""
+    if not confidence_dist:
+        print("No confidence scores are stored with analyses.")
+        return
+    print(
+        tabulate(
+            confidence_dist, headers=["Confidence Level", "Count"], tablefmt="psql"
+        )
+    )
+
+
 def print_menu() -> None:
     print("\n=== Email Analytics Menu ===")
     print("1. Show Basic Stats")
@@ -751,58 +600,59 @@ def print_menu() -> None:
     print("8. Exit")
 
 
-def run_report(analytics: EmailAnalytics, report_type: str) -> None:
-    """Run a specific report."""
+REPORT_SECTIONS = ("basic", "senders", "dates", "labels", "full")
+
+
+def run_report(
+    analytics: EmailAnalytics,
+    report_type: str,
+    result: Optional[ReportResult] = None,
+) -> None:
+    """Run a specific report.
+
+    Args:
+        analytics: Analytics backend
+        report_type: Report to run
+        result: Precomputed report shared by the sections in REPORT_SECTIONS
+    """
+    if report_type in REPORT_SECTIONS and result is None:
+        result = analytics.cached("report", analytics.build_report)
+
     if report_type == "basic":
-        print(f"\nTotal Emails: {analytics.get_total_emails()}")
+        print(f"\nTotal Emails: {result.total_emails}")
 
     elif report_type == "senders":
         print("\nTop Email Senders:")
-        top_senders = analytics.get_top_senders()
-        print(tabulate(top_senders, headers=["Sender", "Count"], tablefmt="psql"))
+        print(tabulate(result.top_senders, headers=["Sender", "Count"], tablefmt="psql"))
 
     elif report_type == "dates":
         print("\nEmail Distribution by Date:")
-        date_dist = analytics.get_email_by_date()
-        print(tabulate(date_dist, headers=["Date", "Count"], tablefmt="psql"))
+        print(tabulate(result.emails_by_date, headers=["Date", "Count"], tablefmt="psql"))
 
     elif report_type == "labels":
         print("\nTop Email Labels:")
-        label_dist = analytics.get_label_distribution()
-        print(tabulate(label_dist.items(), headers=["Label", "Count"], tablefmt="psql"))
+        print(tabulate(result.labels.items(), headers=["Label", "Count"], tablefmt="psql"))
 
     elif report_type == "analysis":
         print("\nAI Analysis Summary:")
-        analysis_data = analytics.get_anthropic_analysis()
-        if analysis_data:
-            for analysis in analysis_data[:5]:
-                print(f"\nEmail: {analysis['subject']}")
-                print(f"From: {analysis['from']}")
-                print(f"Summary: {analysis['summary']}")
-                print(f"Topics: {', '.join(analysis['topic'])}")
-                print(f"Sentiment: {analysis['sentiment']}")
-                if analysis["action"]["needed"]:
-                    print(f"Action Needed: {analysis['action']['needed']}")
-                    print(f"Action Type: {', '.join(analysis['action']['type'])}")
-                    print(f"Action Deadline: {analysis['action']['deadline']}")
-                print("-" * 80)
+        print_analysis_summary(
+            analytics.cached("analysis", analytics.get_anthropic_analysis)
+        )
 
     elif report_type == "full":
-        analytics.print_analysis_report()
+        analytics.print_analysis_report(result)
 
     elif report_type == "confidence":
         print("\nConfidence Distribution:")
-        confidence_dist = analytics.get_confidence_distribution()
-        print(
-            tabulate(
-                confidence_dist, headers=["Confidence Level", "Count"], tablefmt="psql"
-            )
+        print_confidence_distribution(
+            analytics.cached("confidence", analytics.get_confidence_distribution)
         )
 
     elif report_type == "all":
-        # Run all reports in sequence
+        # Run all reports in sequence over one computed result
+        result = analytics.cached("report", analytics.build_report)
         for report in ["basic", "senders", "dates", "labels", "analysis", "confidence"]:
-            run_report(analytics, report)
+            run_report(analytics, report, result)
             print("\n" + "=" * 80 + "\n")
 
 
@@ -828,12 +678,27 @@ def main() -> None:
         action="store_true",
         help="Use in-memory SQLite database for testing",
     )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Read from the columnar snapshot (see scripts/export_analytics_snapshot.py)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute reports even if the data has not changed",
+    )
     args = parser.parse_args()
 
     # Sync labels first
     sync_gmail_labels()
 
-    analytics = EmailAnalytics(testing=args.testing)
+    # In-memory test databases do not outlive the process, so never cache them
+    cache = None if args.no_cache or args.testing else report_cache.ReportCache()
+    if args.snapshot:
+        analytics = SnapshotEmailAnalytics(testing=args.testing, cache=cache)
+    else:
+        analytics = EmailAnalytics(testing=args.testing, cache=cache)
 
     try:
         if args.report:
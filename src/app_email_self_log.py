@@ -12,8 +12,8 @@ personal documentation.
 
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -26,6 +26,7 @@ from textblob import TextBlob
 
 from models.email import Email
 from models.email_analysis import EmailAnalysis
+from services import self_log
 from shared_lib.constants import DATABASE_CONFIG, EMAIL_CONFIG
 from shared_lib.database_session_util import get_analysis_session, get_email_session
 from shared_lib.gmail_lib import GmailAPI
@@ -50,82 +51,60 @@ class EmailSelfAnalyzer:
         profile = self.gmail.service.users().getProfile(userId="me").execute()
         return profile["emailAddress"]
 
-    def get_self_emails(self, days: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get self-emails from the database."""
-        with get_email_session() as session:
-            # Print debug info
-            print(f"Looking for emails from/to: {self.user_email}")
+    def _since(self, days: Optional[int]) -> Optional[datetime]:
+        return datetime.now(timezone.utc) - timedelta(days=days) if days else None
 
-            query = session.query(Email).filter(
-                Email.from_address == self.user_email,
-                Email.to_address == self.user_email,
+    def iter_self_emails(
+        self, days: Optional[int] = None, chunk_size: int = self_log.DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Stream self-emails, newest first, in DataFrame chunks."""
+        logger.debug(f"Looking for emails from/to: {self.user_email}")
+        with get_email_session() as session:
+            yield from self_log.iter_self_emails(
+                session, self.user_email, self._since(days), chunk_size
             )
 
-            if days:
-                cutoff = datetime.now() - timedelta(days=days)
-                query = query.filter(Email.received_date >= cutoff)
-
-            # Print debug info
-            print(f"Total emails in database: {session.query(Email).count()}")
-            print(f"Self-emails found: {query.count()}")
-
-            emails = query.all()
-            return [email.__dict__ for email in emails]
+    def get_self_emails(self, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get self-emails from the database."""
+        frames = list(self.iter_self_emails(days))
+        if not frames:
+            return []
+        return pd.concat(frames, ignore_index=True).to_dict("records")
 
     def analyze_emails(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Analyze the content of each email."""
-        results = []
+        """Analyze emails, reusing stored analyses and storing new ones.
 
+        Only emails without a row in email_analysis are sent to the
+        analyzer, EMAIL_CONFIG["ANALYSIS_WORKERS"] at a time.
+        """
         with get_analysis_session() as session:
-            for email in emails:
-                analysis = self.analyzer.analyze_email(email)
-                if analysis:
-                    if isinstance(analysis, dict):
-                        results.append(analysis)
-                    else:
-                        results.append(analysis.__dict__)
-
-            return results
+            return self_log.reuse_or_analyze(
+                session,
+                emails,
+                self.analyzer.analyze_email,
+                EMAIL_CONFIG["ANALYSIS_WORKERS"],
+            )
 
     def run_analysis(self, days: Optional[int] = None) -> List[Dict[str, Any]]:
         """Run complete analysis on self-emails."""
         emails = self.get_self_emails(days)
         return self.analyze_emails(emails)
 
-    def cluster_by_time(self, emails: List[Dict[str, Any]]) -> Dict[str, Dict]:
-        """Group emails by time periods."""
-        clusters = {
-            "today": {"emails": [], "topics": {}},
-            "this_week": {"emails": [], "topics": {}},
-            "this_month": {"emails": [], "topics": {}},
-            "older": {"emails": [], "topics": {}},
-        }
-
-        now = datetime.now()
-
-        for email in emails:
-            email_date = datetime.strptime(email["date"], "%Y-%m-%d %H:%M:%S")
-
-            # Determine time period
-            if email_date.date() == now.date():
-                period = "today"
-            elif email_date > now - timedelta(days=7):
-                period = "this_week"
-            elif email_date > now - timedelta(days=30):
-                period = "this_month"
-            else:
-                period = "older"
-
-            clusters[period]["emails"].append(email)
-
-            # Update topic counts
-            if "topics" in email:
-                for topic in email["topics"]:
-                    clusters[period]["topics"][topic] = (
-                        clusters[period]["topics"].get(topic, 0) + 1
-                    )
-
-        return clusters
+    def cluster_by_time(
+        self, emails: Union[List[Dict[str, Any]], pd.DataFrame]
+    ) -> Dict[str, Dict]:
+        """Group emails by time periods.
+
+        Emails are dated by their received_at, or by a "date" string in
+        "%Y-%m-%d %H:%M:%S" format. Each period holds its email count,
+        newest emails and topic counts.
+        """
+        frame = pd.DataFrame(emails)
+        clusters = self_log.TimeClusters()
+        if not frame.empty:
+            date_column = "received_at" if "received_at" in frame else "date"
+            clusters.add(frame, date_column)
+        return clusters.as_dict()
 
     def generate_html_report(
         self, analyzed_emails: List[Dict[str, Any]], time_clusters: Dict[str, Dict]
@@ -205,23 +184,26 @@ def main():
     try:
         analyzer = EmailSelfAnalyzer()
 
-        # Get and analyze emails from the last 30 days
-        logger.info("Fetching self-emails from the last 30 days")
-        emails = analyzer.get_self_emails(days=30)
+        # Stream, analyze and cluster emails from the last 30 days
+        logger.info("Analyzing self-emails from the last 30 days")
+        clusters = self_log.TimeClusters()
+        analyzed_emails = []
+        for frame in analyzer.iter_self_emails(days=30):
+            analyzed = analyzer.analyze_emails(frame.to_dict("records"))
+            topics = pd.DataFrame(analyzed, columns=["email_id", "topics"])
+            clusters.add(
+                frame.merge(
+                    topics.rename(columns={"email_id": "id"}), on="id", how="left"
+                )
+            )
+            analyzed_emails.extend(analyzed)
 
-        if not emails:
+        if not clusters.counts.sum():
             logger.warning("No self-emails found in the specified time period")
             return
 
-        logger.info(f"Found {len(emails)} self-emails")
-
-        # Analyze emails
-        logger.info("Analyzing emails")
-        analyzed_emails = analyzer.analyze_emails(emails)
-
-        # Cluster by time
-        logger.info("Clustering emails by time period")
-        time_clusters = analyzer.cluster_by_time(analyzed_emails)
+        logger.info(f"Found {clusters.counts.sum()} self-emails")
+        time_clusters = clusters.as_dict()
 
         # Generate report
         logger.info("Generating HTML report")
@@ -16,7 +16,6 @@ python get_mail.py [--newer] [--older] [--clear] [--label] [--list-labels]
 """
 
 import argparse
-import json
 import logging
 import os
 import sys
@@ -33,6 +32,7 @@ from models.base import Base
 from models.db_init import init_db
 from models.email import Email
 from models.gmail_label import GmailLabel
+from services import email_labels
 from shared_lib.constants import DATABASE_CONFIG, EMAIL_CONFIG
 from shared_lib.database_session_util import (
     get_analysis_session,
@@ -254,31 +254,36 @@ def process_email(service, msg_id, session):
             headers_lookup[header["name"].lower()] = header["value"]
 
         # Get email data
+        label_ids = message.get("labelIds", [])
         email_data = {
             "id": message["id"],
             "threadId": message["threadId"],
+            "messageId": headers_lookup.get("message-id", message["id"]),
             "subject": headers_lookup.get("subject", EMAIL_CONFIG["DEFAULT_SUBJECT"]),
-            "from_": headers_lookup.get("from", EMAIL_CONFIG["EMPTY_STRING"]),
+            "from": headers_lookup.get("from", EMAIL_CONFIG["EMPTY_STRING"]),
             "to": headers_lookup.get("to", EMAIL_CONFIG["EMPTY_STRING"]),
             "cc": headers_lookup.get("cc", EMAIL_CONFIG["EMPTY_STRING"]),
             "bcc": headers_lookup.get("bcc", EMAIL_CONFIG["EMPTY_STRING"]),
-            "date": parse_email_date(headers_lookup.get("date")),
+            "receivedAt": parse_email_date(headers_lookup.get("date")).isoformat(),
             "body": get_message_body(message),
-            "labelIds": ",".join(message.get("labelIds", [])),
-            "has_attachments": bool(message.get("payload", {}).get("parts", [])),
-            "full_api_response": json.dumps(message),
+            "snippet": message.get("snippet"),
+            "hasAttachments": bool(message.get("payload", {}).get("parts", [])),
+            "isRead": "UNREAD" not in label_ids,
+            "isImportant": "IMPORTANT" in label_ids,
+            "labelIds": label_ids,
         }
 
         # Validate required fields
         if not email_data["id"]:
             raise ValueError("Email ID is required")
 
-        email = Email(**email_data)
-        session.merge(email)
+        session.merge(Email.from_api_response(email_data))
+        # Labels are stored as links to interned gmail_labels rows
+        email_labels.set_email_labels(session, email_data["id"], label_ids)
         session.commit()
 
         logging.info(
-            f"Processed email {msg_id}: subject='{email_data['subject']}' from='{email_data['from_']}'"
+            f"Processed email {msg_id}: subject='{email_data['subject']}' from='{email_data['from']}'"
         )
 
     except Exception as e:
@@ -4,7 +4,7 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Generator
+from typing import Dict, Generator, Tuple
 
 import pytest
 import pytz
@@ -15,6 +15,7 @@ from config import CATALOG_CONFIG, EMAIL_CONFIG
 from models.base import Base
 from models.email import Email
 from models.gmail_label import GmailLabel
+from shared_lib import chat_log_util
 from shared_lib.constants import DATABASE_CONFIG
 from shared_lib.gmail_lib import GmailAPI
 from src.app_catalog import CatalogChat
@@ -108,6 +109,30 @@ def analysis_session(test_db_factory) -> Generator[Session, None, None]:
     session.close()
 
 
+@pytest.fixture(scope="function")
+def committed_sessions(tmp_path) -> Generator[Tuple[Session, Session], None, None]:
+    """Create (email, analysis) sessions on fresh database files for each test.
+
+    Unlike email_session and analysis_session nothing is rolled back, so
+    tests can commit and open further sessions on the same engines.
+    """
+    engines = [
+        create_engine(f"sqlite:///{tmp_path / name}")
+        for name in ("email.db", "analysis.db")
+    ]
+    sessions = []
+    for engine in engines:
+        Base.metadata.create_all(engine)
+        sessions.append(sessionmaker(bind=engine)())
+
+    yield tuple(sessions)
+
+    for session in sessions:
+        session.close()
+    for engine in engines:
+        engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def catalog_session(test_db_factory) -> Generator[Session, None, None]:
     """Create a new catalog database session for each test."""
@@ -155,9 +180,20 @@ def gmail_api():
 
 
 @pytest.fixture(scope="session")
-def catalog_chat():
+def catalog_chat(tmp_path_factory):
     """Create CatalogChat client for tests."""
-    return CatalogChat()
+    catalog_db = tmp_path_factory.mktemp("catalog") / "catalog.db"
+    return CatalogChat(db_path=str(catalog_db))
+
+
+@pytest.fixture
+def catalog_paths(tmp_path, monkeypatch) -> Dict[str, str]:
+    """CatalogChat paths that keep its database and chat log in tmp_path."""
+    monkeypatch.setattr(chat_log_util, "LOG_DIR", str(tmp_path))
+    return {
+        "db_path": str(tmp_path / "catalog.db"),
+        "chat_log": str(tmp_path / "chat_logs.jsonl"),
+    }
 
 
 @pytest.fixture
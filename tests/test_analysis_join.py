@@ -0,0 +1,110 @@
+"""Tests for joined reads across the email and analysis databases."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services.analysis_join import AnalysisEmailJoin
+from src.app_email_reports import EmailAnalytics, run_report
+
+
+@pytest.fixture
+def sessions(committed_sessions):
+    """Email and analysis databases; analysis m3 has no email row."""
+    email_session, analysis_session = committed_sessions
+    for i in range(3):
+        email_session.add(
+            Email(
+                id=f"m{i}",
+                message_id=f"<m{i}>",
+                subject=f"Subject {i}",
+                from_address=f"sender{i}@example.com",
+                received_at=datetime(2024, 1, i + 1, tzinfo=timezone.utc),
+            )
+        )
+    for i in range(4):
+        analysis_session.add(
+            EmailAnalysis(email_id=f"m{i}", summary=f"Summary {i}", sentiment="neutral")
+        )
+    email_session.commit()
+    analysis_session.commit()
+    return analysis_session, email_session
+
+
+def count_queries(session):
+    """Count statements executed through a session's engine."""
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_in_memory_email_database_is_not_attached(sessions):
+    """Test that only an email database with a file is attached."""
+    analysis_session, email_session = sessions
+    assert AnalysisEmailJoin(analysis_session, email_session).strategy == "attach"
+    in_memory = Session(create_engine("sqlite://"))
+    assert AnalysisEmailJoin(analysis_session, in_memory).strategy == "batched"
+
+
+@pytest.mark.parametrize("strategy", ["attach", "batched"])
+def test_strategies_return_the_same_rows(sessions, strategy, monkeypatch):
+    """Test ATTACH and batched lookups, with and without missing emails."""
+    analysis_session, email_session = sessions
+    monkeypatch.setattr(AnalysisEmailJoin, "strategy", strategy)
+    join = AnalysisEmailJoin(analysis_session, email_session, batch_size=2)
+
+    rows = list(join.iter_rows(order_by=(EmailAnalysis.email_id,)))
+    assert [(analysis.email_id, email.subject) for analysis, email in rows] == [
+        ("m0", "Subject 0"),
+        ("m1", "Subject 1"),
+        ("m2", "Subject 2"),
+    ]
+    outer = list(
+        join.iter_rows(order_by=(EmailAnalysis.email_id,), require_email=False)
+    )
+    assert outer[-1][0].email_id == "m3" and outer[-1][1] is None
+
+    selected = join.iter_rows(email_ids=["m2", "m0", "m2"])
+    assert sorted(analysis.email_id for analysis, _ in selected) == ["m0", "m2"]
+
+
+def test_attach_joins_in_one_statement(sessions):
+    """Test that the attached join never queries the email database."""
+    analysis_session, email_session = sessions
+    email_statements = count_queries(email_session)
+    analysis_statements = count_queries(analysis_session)
+
+    rows = list(AnalysisEmailJoin(analysis_session, email_session).iter_rows())
+
+    assert len(rows) == 3
+    assert email_statements == []
+    assert sum("JOIN email_store.emails" in s for s in analysis_statements) == 1
+    # The email database is detached again afterwards
+    databases = analysis_session.connection().exec_driver_sql("PRAGMA database_list")
+    assert "email_store" not in {row[1] for row in databases}
+
+
+def test_email_reports_list_joined_analyses(sessions, capsys):
+    """Test the analysis report sections against the current analysis model."""
+    analysis_session, email_session = sessions
+    analytics = EmailAnalytics(email_session, analysis_session)
+
+    analyses = analytics.get_anthropic_analysis()
+    assert sorted(analysis["email_id"] for analysis in analyses) == ["m0", "m1", "m2"]
+    assert analyses[0]["sentiment"] == "neutral"
+    assert analytics.get_confidence_distribution() == []
+    assert analytics.get_action_needed_distribution() == []
+
+    run_report(analytics, "analysis")
+    run_report(analytics, "confidence")
+    output = capsys.readouterr().out
+    assert "Summary: Summary 0" in output
+    assert "No confidence scores are stored" in output
@@ -0,0 +1,129 @@
+"""Tests for the keyset-paginated analysis viewer."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event, text
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from scripts.analysis_viewer import (
+    fetch_page,
+    follow_analyses,
+    iter_pages,
+    latest_rowid,
+    print_page,
+    view_analyses,
+)
+
+
+@pytest.fixture
+def sessions(committed_sessions):
+    """Email and analysis databases; five analyses, two sharing a timestamp."""
+    email_session, analysis_session = committed_sessions
+    for i, day in enumerate([1, 2, 2, 3, 4]):
+        email_session.add(
+            Email(
+                id=f"m{i}",
+                message_id=f"<m{i}>",
+                subject=f"Subject {i}",
+                received_at=datetime(2024, 1, day, tzinfo=timezone.utc),
+            )
+        )
+        analysis_session.add(
+            EmailAnalysis(
+                email_id=f"m{i}",
+                summary=f"Summary {i}",
+                category='["Work", "Ops"]',
+                created_at=datetime(2024, 1, day),
+            )
+        )
+    email_session.commit()
+    analysis_session.commit()
+    yield email_session, analysis_session
+
+
+def _ids(page):
+    return [analysis.email_id for analysis, _ in page]
+
+
+def test_keyset_pages_cover_every_row_once(sessions):
+    """Test that pages split ties on created_at by email_id."""
+    _, analysis_session = sessions
+    pages = [_ids(page) for page in iter_pages(analysis_session, "2024-01-01", 2)]
+    assert pages == [["m4", "m3"], ["m2", "m1"], ["m0"]]
+    later = [_ids(page) for page in iter_pages(analysis_session, "2024-01-02", 10)]
+    assert later == [["m4", "m3", "m2", "m1"]]
+
+
+def test_page_emails_are_fetched_in_one_query(sessions, capsys):
+    """Test the batched email lookup in detailed mode."""
+    email_session, analysis_session = sessions
+    statements = []
+    event.listen(
+        email_session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    page = fetch_page(analysis_session, page_size=3)
+    print_page(page, email_session, "detailed", validate=True)
+    assert len(statements) == 1
+    output = capsys.readouterr().out
+    assert output.count("Subject: Subject") == 3
+    assert "Categories: Work, Ops" in output
+    assert "✓ Email stored" in output
+
+
+def insert_analysis(analysis_session, email_id, created_at):
+    """Insert an analysis the way another process would, committed at once."""
+    with analysis_session.get_bind().begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO email_analysis (email_id, summary, created_at) "
+                "VALUES (:email_id, :summary, :created_at)"
+            ),
+            {
+                "email_id": email_id,
+                "summary": f"Summary {email_id}",
+                "created_at": created_at,
+            },
+        )
+
+
+def test_follow_shows_only_new_analyses(sessions, capsys):
+    """Test that polling resumes after the last analysis shown."""
+    email_session, analysis_session = sessions
+    cursor = latest_rowid(analysis_session)
+    assert cursor == 5
+
+    insert_analysis(analysis_session, "m5", "2024-01-05 00:00:00")
+    cursor = follow_analyses(
+        analysis_session, email_session, cursor, "basic", interval=0, polls=2
+    )
+    assert cursor == 6
+    output = capsys.readouterr().out
+    assert "Summary m5" in output
+    assert "Summary 4" not in output
+
+
+def test_follow_shows_late_rows_from_the_same_second(sessions, capsys):
+    """Test that an analysis sorting before the last one shown still appears."""
+    email_session, analysis_session = sessions
+    insert_analysis(analysis_session, "m5", "2024-01-05 00:00:00")
+    cursor = follow_analyses(
+        analysis_session, email_session, 5, "basic", interval=0, polls=1
+    )
+    assert cursor == 6
+
+    # Same created_at second, lower email_id, committed after m5 was shown
+    insert_analysis(analysis_session, "a6", "2024-01-05 00:00:00")
+    follow_analyses(analysis_session, email_session, cursor, "basic", interval=0, polls=1)
+    output = capsys.readouterr().out
+    assert output.count("Summary m5") == 1
+    assert "Summary a6" in output
+
+
+def test_page_size_must_be_positive():
+    """Test that a page size of 0 is rejected instead of polling without pause."""
+    with pytest.raises(ValueError):
+        view_analyses(page_size=0)
@@ -0,0 +1,118 @@
+"""Tests for the columnar reporting snapshot."""
+
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services import analytics_snapshot
+from src.app_email_reports import EmailAnalytics, SnapshotEmailAnalytics
+
+
+@pytest.fixture
+def sessions(committed_sessions):
+    """Separate email and analysis databases with three emails, two analysed."""
+    email_session, analysis_session = committed_sessions
+    for i, (sender, month) in enumerate([("a@x", 1), ("a@x", 2), ("b@x", 2)]):
+        email_session.add(
+            Email(
+                id=f"m{i}",
+                message_id=f"<m{i}>",
+                from_address=sender,
+                received_at=datetime(2024, month, 1, tzinfo=timezone.utc),
+            )
+        )
+    analysis_session.add_all(
+        [
+            EmailAnalysis(email_id="m0", sentiment="positive", category='["Work", "Ops"]'),
+            EmailAnalysis(email_id="m1", sentiment="negative", category="Work"),
+        ]
+    )
+    email_session.commit()
+    analysis_session.commit()
+    yield email_session, analysis_session
+
+
+def test_export_partitions_by_month(sessions, tmp_path):
+    """Test the partition layout, dtypes and joined columns."""
+    directory = str(tmp_path / "snapshot")
+    assert analytics_snapshot.export(*sessions, directory) == 3
+    assert sorted(
+        entry for entry in os.listdir(directory) if entry.startswith("month=")
+    ) == ["month=2024-01", "month=2024-02"]
+
+    frame = analytics_snapshot.load(directory)
+    assert sorted(frame["email_id"]) == ["m0", "m1", "m2"]
+    for name in analytics_snapshot.CATEGORICAL_COLUMNS:
+        assert frame[name].dtype == "category"
+    by_id = frame.set_index("email_id")
+    assert by_id.loc["m1", "sentiment"] == "negative"
+    assert by_id["sentiment"].isna()["m2"]
+
+    january = analytics_snapshot.load(directory, columns=["sender"], months=["2024-01"])
+    assert list(january["email_id"]) == ["m0"]
+
+
+def test_export_appends_changes(sessions, tmp_path):
+    """Test that re-exported rows replace their earlier versions."""
+    email_session, analysis_session = sessions
+    directory = str(tmp_path / "snapshot")
+    analytics_snapshot.export(*sessions, directory)
+
+    # Push the watermark into the past so the next export sees the changes
+    state_path = os.path.join(directory, analytics_snapshot.STATE_FILE)
+    with open(state_path, "w") as f:
+        f.write('{"updated_through": "2024-01-01T00:00:00", "export_seq": 1}')
+    analysis_session.execute(
+        text("UPDATE email_analysis SET updated_at = '2030-01-01 00:00:00'")
+    )
+    analysis_session.get(EmailAnalysis, "m1").sentiment = "positive"
+    analysis_session.commit()
+
+    analytics_snapshot.export(*sessions, directory)
+    frame = analytics_snapshot.load(directory).set_index("email_id")
+    assert len(frame) == 3
+    assert frame.loc["m1", "sentiment"] == "positive"
+
+    assert analytics_snapshot.compact(directory) == 3
+    assert len(os.listdir(os.path.join(directory, "month=2024-02"))) == 1
+    assert analytics_snapshot.load(directory).set_index("email_id").loc[
+        "m1", "sentiment"
+    ] == "positive"
+
+
+def test_snapshot_backend_matches_databases(sessions, tmp_path):
+    """Test that the snapshot backend reports what the databases report."""
+    email_session, analysis_session = sessions
+    directory = str(tmp_path / "snapshot")
+    analytics_snapshot.export(email_session, analysis_session, directory)
+
+    sessionmakers = {
+        "email_session": sessionmaker(bind=email_session.get_bind())(),
+        "analysis_session": sessionmaker(bind=analysis_session.get_bind())(),
+    }
+    databases = EmailAnalytics(**sessionmakers)
+    snapshot = SnapshotEmailAnalytics(directory)
+
+    assert snapshot.get_total_emails() == 3
+    assert snapshot.get_top_senders() == [("a@x", 2), ("b@x", 1)]
+    assert snapshot.get_email_by_date() == [("2024-02-01", 2), ("2024-01-01", 1)]
+    assert snapshot.get_category_distribution() == {"Work": 2, "Ops": 1}
+    assert sorted(snapshot.get_sentiment_distribution()) == sorted(
+        databases.get_sentiment_distribution()
+    )
+    assert sorted(snapshot.get_priority_distribution()) == sorted(
+        databases.get_priority_distribution()
+    )
+    assert snapshot.get_analysis_by_date() == databases.get_analysis_by_date()
+
+
+def test_load_empty_snapshot(tmp_path):
+    """Test that a missing snapshot loads as an empty frame."""
+    frame = analytics_snapshot.load(str(tmp_path / "missing"))
+    assert frame.empty
+    assert SnapshotEmailAnalytics(str(tmp_path / "missing")).get_top_senders() == []
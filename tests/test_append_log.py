@@ -0,0 +1,131 @@
+"""Tests for the durable append-only log writer and ChatLogger on top of it."""
+
+import json
+import threading
+
+import pytest
+
+from shared_lib import append_log_util, chat_log_util
+from shared_lib.append_log_util import AppendLog, recover_tail
+
+
+@pytest.fixture
+def syncs(monkeypatch):
+    """Count syncs instead of hitting the disk."""
+    calls = []
+    monkeypatch.setattr(append_log_util, "_sync", lambda fd: calls.append(fd))
+    return calls
+
+
+def test_appends_whole_lines_and_returns_offsets(tmp_path):
+    """Test that records are newline-terminated and offsets point at them."""
+    path = tmp_path / "chat.jsonl"
+    with AppendLog(path, durability="none") as log:
+        first = log.append('{"n": 1}')
+        second = log.append(b'{"n": 2}\n')
+        with pytest.raises(ValueError):
+            log.append("two\nlines")
+    data = path.read_bytes()
+    assert data == b'{"n": 1}\n{"n": 2}\n'
+    assert (first, second) == (0, 9)
+    with pytest.raises(ValueError):
+        log.append("closed")
+
+
+def test_partial_last_line_is_truncated(tmp_path):
+    """Test crash recovery when the writer is reopened."""
+    path = tmp_path / "chat.jsonl"
+    path.write_bytes(b'{"n": 1}\n{"n": 2}\n{"n": 3, "cut')
+    with AppendLog(path, durability="none") as log:
+        log.append('{"n": 4}')
+    assert path.read_bytes() == b'{"n": 1}\n{"n": 2}\n{"n": 4}\n'
+
+    path.write_bytes(b"no newline at all")
+    assert recover_tail(path) == 17
+    assert path.read_bytes() == b""
+    assert recover_tail(path) == 0
+
+
+def test_durability_levels(tmp_path, syncs):
+    """Test when each durability level syncs."""
+    with AppendLog(tmp_path / "none.jsonl", durability="none") as log:
+        log.append("a")
+    assert len(syncs) == 0
+
+    with AppendLog(tmp_path / "record.jsonl", durability="record") as log:
+        log.append("a")
+        log.append("b")
+        assert len(syncs) == 2
+    assert len(syncs) == 2  # Nothing left to sync on close
+
+    log = AppendLog(tmp_path / "batch.jsonl", durability="batch", flush_interval=60)
+    log.append("a")
+    log.append("b")
+    assert len(syncs) == 2
+    log.close()
+    assert len(syncs) == 3
+
+    with pytest.raises(ValueError):
+        AppendLog(tmp_path / "x.jsonl", durability="sometimes")
+
+
+def test_batch_flusher_syncs_in_background(tmp_path, syncs):
+    """Test that the flusher thread syncs without any further appends."""
+    log = AppendLog(tmp_path / "chat.jsonl", flush_interval=0.01)
+    log.append("a")
+    for _ in range(200):
+        if log.syncs:
+            break
+        threading.Event().wait(0.01)
+    assert log.syncs == 1
+    log.close()
+    assert log.syncs == 1
+
+
+def test_concurrent_record_appends_share_syncs(tmp_path, monkeypatch):
+    """Test group commit: concurrent writers never need more syncs than records."""
+    gate = threading.Event()
+
+    def slow_sync(fd):
+        gate.wait(0.005)
+
+    monkeypatch.setattr(append_log_util, "_sync", slow_sync)
+    path = tmp_path / "chat.jsonl"
+    log = AppendLog(path, durability="record")
+
+    def write(n):
+        for i in range(20):
+            log.append(json.dumps({"thread": n, "i": i}))
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.close()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 160
+    assert all(json.loads(line)["i"] < 20 for line in lines)
+    assert log.syncs < log.appends
+
+
+def test_chat_logger_appends_entries(tmp_path, monkeypatch):
+    """Test that ChatLogger writes one JSON line per interaction."""
+    monkeypatch.setattr(chat_log_util, "LOG_DIR", str(tmp_path))
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    path = log_dir / "chat.jsonl"
+    path.write_text('{"complete": true}\n{"partial": ')
+    logger = chat_log_util.ChatLogger(str(path), durability="record")
+    logger.log_interaction("hello\nthere", {"answer": 42}, "test-model")
+    logger.log_interaction("again", "ok", "test-model", role="assistant")
+    logger.close()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 3
+    entry = json.loads(lines[1])
+    assert entry["user_input"] == "hello\nthere"
+    assert entry["session_id"] == logger.session_id
+    assert json.loads(lines[2])["role"] == "assistant"
+    assert not path.with_suffix(".tmp").exists()
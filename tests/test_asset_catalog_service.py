@@ -0,0 +1,194 @@
+"""Tests for asset dependency traversal and closure maintenance."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.asset_catalog import AssetCatalogItem, AssetClosure, AssetDependency
+from models.base import Base
+from services.asset_catalog_service import AssetCatalogService
+
+
+@pytest.fixture
+def session():
+    """Create an in-memory catalog database session."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def make_graph(session, edges, deleted=()):
+    """Create assets named a..z and the given (source, target[, type]) edges."""
+    now = int(datetime.now().timestamp())
+    names = sorted({name for edge in edges for name in edge[:2]})
+    assets = {
+        name: AssetCatalogItem(
+            title=name, created_date=now, modified_date=now, deleted=name in deleted
+        )
+        for name in names
+    }
+    session.add_all(assets.values())
+    session.flush()
+    for edge in edges:
+        source, target = edge[:2]
+        dependency_type = edge[2] if len(edge) > 2 else "import"
+        session.add(
+            AssetDependency(
+                source_id=assets[source].id,
+                target_id=assets[target].id,
+                dependency_type=dependency_type,
+            )
+        )
+    session.commit()
+    return {name: asset.id for name, asset in assets.items()}
+
+
+def titles(pairs):
+    return [(asset.title, dependency_type) for asset, dependency_type in pairs]
+
+
+def test_direct_and_indirect_dependencies(session):
+    """Test that transitive dependencies come back nearest first."""
+    ids = make_graph(session, [("a", "b"), ("b", "c"), ("c", "d"), ("a", "c")])
+    service = AssetCatalogService(session)
+
+    assert titles(service.get_asset_dependencies(ids["a"])) == [
+        ("b", "import"),
+        ("c", "import"),
+    ]
+    assert titles(service.get_asset_dependencies(ids["a"], include_indirect=True)) == [
+        ("b", "import"),
+        ("c", "import"),
+        ("d", "import"),
+    ]
+    assert titles(service.get_asset_dependents(ids["d"], include_indirect=True)) == [
+        ("c", "import"),
+        ("a", "import"),
+        ("b", "import"),
+    ]
+
+
+def test_traversal_filters(session):
+    """Test max depth, dependency type and deleted asset filtering."""
+    ids = make_graph(
+        session,
+        [("a", "b"), ("b", "c"), ("c", "d"), ("a", "e", "test"), ("b", "x")],
+        deleted={"x"},
+    )
+    service = AssetCatalogService(session)
+
+    assert titles(
+        service.get_asset_dependencies(ids["a"], include_indirect=True, max_depth=2)
+    ) == [("b", "import"), ("e", "test"), ("c", "import")]
+    assert titles(
+        service.get_asset_dependencies(
+            ids["a"], include_indirect=True, dependency_types=["test"]
+        )
+    ) == [("e", "test")]
+
+
+def test_cycles_terminate_and_are_reported(session):
+    """Test that cycles are detected instead of followed forever."""
+    ids = make_graph(session, [("a", "b"), ("b", "c"), ("c", "a")])
+    service = AssetCatalogService(session)
+
+    assert titles(service.get_asset_dependencies(ids["a"], include_indirect=True)) == [
+        ("b", "import"),
+        ("c", "import"),
+    ]
+    paths = service.get_dependency_paths(ids["a"])
+    cycles = [path for path in paths if path.is_cycle]
+    assert [path.path for path in cycles] == [(ids["a"], ids["b"], ids["c"], ids["a"])]
+    assert cycles[0].depth == 3
+
+
+def test_indirect_traversal_is_not_exponential(session):
+    """Test that layered diamonds are walked per asset, not per path."""
+    layers = [[f"n{layer:02d}{column}" for column in "abc"] for layer in range(12)]
+    edges = [("root", name) for name in layers[0]] + [
+        (source, target)
+        for upper, lower in zip(layers, layers[1:])
+        for source in upper
+        for target in lower
+    ]
+    ids = make_graph(session, edges)
+    service = AssetCatalogService(session)
+
+    # 3 ** 11 paths lead to the last layer
+    reached = titles(service.get_asset_dependencies(ids["root"], include_indirect=True))
+    assert [title for title, _ in reached] == [name for layer in layers for name in layer]
+
+    paths = service.get_dependency_paths(ids["root"], limit=50)
+    assert len(paths) == 50
+    assert [path.depth for path in paths] == sorted(path.depth for path in paths)
+
+
+def closure_snapshot(session):
+    """Return the closure table as {(ancestor, descendant): (depth, count)}."""
+    return {
+        (row.ancestor_id, row.descendant_id): (row.min_depth, row.path_count)
+        for row in session.query(AssetClosure).all()
+    }
+
+
+def test_closure_tracks_added_dependencies(session):
+    """Test incremental closure maintenance when edges are added."""
+    ids = make_graph(session, [("a", "b"), ("c", "d")])
+    service = AssetCatalogService(session)
+    service.rebuild_dependency_closure()
+
+    service.add_dependency(ids["b"], ids["c"], "import")
+    service.add_dependency(ids["a"], ids["c"], "import")
+    service.add_dependency(ids["a"], ids["c"], "test")  # Same pair, new type
+
+    incremental = closure_snapshot(session)
+    assert incremental[(ids["a"], ids["d"])] == (2, 1)
+    assert incremental[(ids["a"], ids["c"])] == (1, 1)
+    assert incremental[(ids["b"], ids["d"])] == (2, 1)
+
+    service.rebuild_dependency_closure()
+    assert closure_snapshot(session) == incremental
+
+    impacted = service.get_impacted_assets(ids["d"])
+    assert [(asset.title, depth) for asset, depth, _ in impacted] == [
+        ("c", 1),
+        ("a", 2),
+        ("b", 2),
+    ]
+
+
+def test_closure_counts_paths_and_cycles(session):
+    """Test shortest path counts and self rows for cycles."""
+    ids = make_graph(session, [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+    service = AssetCatalogService(session)
+    service.rebuild_dependency_closure()
+    assert closure_snapshot(session)[(ids["a"], ids["d"])] == (2, 2)
+
+    service.add_dependency(ids["d"], ids["a"], "import")
+    incremental = closure_snapshot(session)
+    assert incremental[(ids["a"], ids["a"])] == (3, 2)
+    assert incremental[(ids["d"], ids["b"])] == (2, 1)
+
+    service.rebuild_dependency_closure()
+    assert closure_snapshot(session) == incremental
+
+
+def test_closure_repairs_after_removals(session):
+    """Test closure repair after dependency updates and asset deletion."""
+    ids = make_graph(session, [("a", "b"), ("b", "c"), ("a", "c"), ("c", "d")])
+    service = AssetCatalogService(session)
+    service.rebuild_dependency_closure()
+
+    service.update_asset(ids["a"], dependencies=[ids["b"]])
+    assert closure_snapshot(session)[(ids["a"], ids["d"])] == (3, 1)
+
+    service.delete_asset(ids["c"])
+    snapshot = closure_snapshot(session)
+    assert snapshot == {(ids["a"], ids["b"]): (1, 1)}
+
+    service.rebuild_dependency_closure()
+    assert closure_snapshot(session) == snapshot
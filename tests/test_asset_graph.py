@@ -0,0 +1,129 @@
+"""Tests for dependency graph analytics."""
+
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.asset_catalog import AssetCatalogItem, AssetDependency
+from models.base import Base
+from services import asset_graph
+from services.asset_catalog_service import AssetCatalogService
+from services.asset_graph import AssetGraph
+
+# 1 -> 2 -> 3 -> 1 is a cycle; 4 depends on the cycle; 5 -> 5 is a self-import
+EDGES = {1: {2}, 2: {3}, 3: {1, 6}, 4: {1, 6}, 5: {5}, 7: {4}}
+
+
+def test_cycles_and_components():
+    """Test cyclic component detection and shortest representative cycles."""
+    graph = AssetGraph(EDGES)
+    assert len(graph) == 7
+    assert graph.edge_count == 8
+    assert graph.strongly_connected_components() == [[1, 2, 3], [5]]
+    assert graph.cycles() == [[1, 2, 3, 1], [5, 5]]
+
+
+def test_layers_and_rankings():
+    """Test topological layers and fan-in/fan-out rankings."""
+    graph = AssetGraph(EDGES)
+    assert graph.layers == [[5, 6], [1, 2, 3], [4], [7]]
+    assert graph.fan_in(2) == [(1, 2), (6, 2)]
+    assert graph.fan_out(2) == [(3, 2), (4, 2)]
+    assert graph.betweenness(1)[0][0] in (1, 4)
+
+
+def test_blast_radius():
+    """Test that the blast radius walks dependents with distances."""
+    graph = AssetGraph(EDGES)
+    assert graph.blast_radius([6]) == {3: 1, 4: 1, 2: 2, 7: 2, 1: 3}
+    assert graph.blast_radius([6], max_depth=1) == {3: 1, 4: 1}
+    assert graph.blast_radius([99]) == {}
+
+
+def test_service_caches_graph_until_change():
+    """Test that the cached graph is reused and dropped on changes."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    now = int(datetime.now().timestamp())
+    assets = [
+        AssetCatalogItem(title=name, created_date=now, modified_date=now)
+        for name in "abc"
+    ]
+    session.add_all(assets)
+    session.flush()
+    session.add(
+        AssetDependency(
+            source_id=assets[0].id, target_id=assets[1].id, dependency_type="imports"
+        )
+    )
+    session.commit()
+    service = AssetCatalogService(session)
+
+    graph = service.get_dependency_graph()
+    assert graph.edge_count == 1
+    assert service.get_dependency_graph() is graph
+
+    service.add_dependency(assets[1].id, assets[2].id, "imports")
+    assert service.get_dependency_graph() is not graph
+    assert service.get_blast_radius([assets[2].id]) == {assets[1].id: 1, assets[0].id: 2}
+
+    service.delete_asset(assets[1].id)
+    assert service.get_dependency_graph().edge_count == 0
+    session.close()
+
+
+def test_report_lists_cycles_and_blast_radius():
+    """Test the CLI report against a small catalog."""
+    from scripts.asset_graph_report import build_report
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    service = AssetCatalogService(session)
+    ids = {
+        path: service.add_asset(path, path, "code").id
+        for path in ("a.py", "b.py", "c.py")
+    }
+    service.add_dependency(ids["a.py"], ids["b.py"], "imports")
+    service.add_dependency(ids["b.py"], ids["a.py"], "imports")
+    service.add_dependency(ids["c.py"], ids["a.py"], "imports")
+
+    report = build_report(service, changed=["b.py", "gone.py"])
+
+    assert "Dependency graph: 3 assets, 3 edges" in report
+    assert "2 assets: a.py -> b.py -> a.py" in report
+    assert "Blast radius of 2 changed files: 2 assets" in report
+    assert "not catalogued: gone.py" in report
+    session.close()
+
+
+def test_cached_graph_follows_commits(tmp_path):
+    """Test that only committed changes replace the shared cached graph."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    writer, reader = AssetCatalogService(Session()), AssetCatalogService(Session())
+    ids = [writer.add_asset(path, path, "code").id for path in ("a.py", "b.py")]
+    graph = reader.get_dependency_graph()
+    assert graph.edge_count == 0
+
+    writer.session.add(
+        AssetDependency(source_id=ids[0], target_id=ids[1], dependency_type="imports")
+    )
+    writer.session.flush()
+    # The writer sees its own change; other sessions keep the cached graph
+    assert writer.get_dependency_graph().edge_count == 1
+    assert reader.get_dependency_graph() is graph
+
+    writer.session.rollback()
+    assert writer.get_dependency_graph() is graph
+
+    writer.add_dependency(ids[0], ids[1], "imports")
+    assert reader.get_dependency_graph().edge_count == 1
+
+    # Sessions the service never used are not hooked
+    assert asset_graph._after_flush not in Session().dispatch.after_flush
+    writer.session.close()
+    reader.session.close()
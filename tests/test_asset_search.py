@@ -0,0 +1,104 @@
+"""Tests for full-text asset search."""
+
+import pytest
+from sqlalchemy import text
+
+from models.asset_catalog import AssetCatalogTag
+from models.catalog import Tag
+from services.asset_catalog_service import AssetCatalogService
+from services.asset_search import match_expression, path_tokens
+
+
+@pytest.fixture
+def service(committed_sessions):
+    """Create a service over a fresh database with every table."""
+    session, _ = committed_sessions
+    return AssetCatalogService(session)
+
+
+def add(service, path, description="", docstring=None, asset_type="code"):
+    metadata = {"docstring": docstring} if docstring else {}
+    return service.add_asset(
+        path.rsplit("/", 1)[-1], path, asset_type, description, metadata=metadata
+    )
+
+
+def test_tokenizing_helpers():
+    """Test path tokenization and query escaping."""
+    assert path_tokens("src/AppCatalog_util.py") == "src App Catalog util py"
+    assert match_expression('graph "cycles" OR') == '"graph"* "cycles"* "OR"*'
+    assert match_expression("-- !!") is None
+
+
+def test_ranked_search_covers_all_fields(service):
+    """Test that title matches outrank description, docstring and path matches."""
+    add(service, "services/closure.py", description="Maintains the closure table")
+    add(service, "docs/notes.md", docstring="Notes on closure maintenance")
+    add(service, "closure/README.md")
+    add(service, "util.py", description="Unrelated helpers")
+
+    paths = [asset.file_path for asset in service.search_assets("closure")]
+    assert paths[0] == "services/closure.py"
+    assert set(paths) == {"services/closure.py", "docs/notes.md", "closure/README.md"}
+    # Prefix matching and updates flow into the index
+    assert [a.file_path for a in service.search_assets("maint")] == [
+        "services/closure.py",
+        "docs/notes.md",
+    ]
+    service.update_asset(service.search_assets("helpers")[0].id, description="Graph code")
+    assert [a.file_path for a in service.search_assets("graph")] == ["util.py"]
+
+
+def test_filters_tags_and_deleted(service):
+    """Test type filters, all-tags matching and soft-deleted exclusion."""
+    first = add(service, "a.py", "search code")
+    second = add(service, "b.py", "search code")
+    doc = add(service, "c.md", "search docs", asset_type="document")
+    session = service.session
+    tags = [Tag(name=name, created_date=0, modified_date=0) for name in ("x", "y")]
+    session.add_all(tags)
+    session.flush()
+    session.add_all(
+        [
+            AssetCatalogTag(first.id, tags[0].id),
+            AssetCatalogTag(first.id, tags[1].id),
+            AssetCatalogTag(second.id, tags[0].id),
+        ]
+    )
+    session.commit()
+
+    assert [a.id for a in service.search_assets(tags=["x", "y"])] == [first.id]
+    assert [a.id for a in service.search_assets(tags=["x"])] == [first.id, second.id]
+    assert [a.id for a in service.search_assets("search", asset_type="document")] == [
+        doc.id
+    ]
+
+    service.delete_asset(second.id)
+    assert second.id not in [a.id for a in service.search_assets("search")]
+    assert second.id in [a.id for a in service.search_assets(include_deleted=True)]
+
+
+def test_keyset_pagination(service):
+    """Test that pages cover every match exactly once, in rank order."""
+    for i in range(7):
+        add(service, f"mod{i}.py", "widget " * (i % 3 + 1))
+    expected = [a.id for a in service.search_assets("widget")]
+
+    seen, cursor = [], None
+    while True:
+        page = service.search_assets_page("widget", limit=3, cursor=cursor)
+        seen.extend(asset.id for asset in page.assets)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert seen == expected
+
+
+def test_index_built_for_existing_database(service):
+    """Test that a database without the search table gets it on first search."""
+    add(service, "legacy.py", "old module")
+    service.session.execute(text("DROP TABLE asset_search"))
+    from services import asset_search
+
+    asset_search._ready.clear()
+    assert [a.file_path for a in service.search_assets("legacy")] == ["legacy.py"]
@@ -0,0 +1,59 @@
+"""Tests for the TTL/LRU cache utility."""
+
+import pytest
+
+from shared_lib.cache_util import TTLCache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    """Test basic get/set with hit and miss counters."""
+    cache = TTLCache(max_size=2, ttl=10)
+    assert cache.get("query") is None
+    cache.set("query", {"intent": "search"})
+    assert cache.get("query") == {"intent": "search"}
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_entries_expire():
+    """Test that entries older than the TTL are dropped."""
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set("query", "value")
+
+    clock.now = 9.9
+    assert "query" in cache
+    clock.now = 10.0
+    assert cache.get("query", "expired") == "expired"
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """Test LRU eviction when the cache is full."""
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.get("first")
+    cache.set("third", 3)
+
+    assert "first" in cache
+    assert "second" not in cache
+    assert "third" in cache
+
+
+def test_cache_rejects_invalid_limits():
+    """Test validation of size and TTL."""
+    with pytest.raises(ValueError):
+        TTLCache(max_size=0)
+    with pytest.raises(ValueError):
+        TTLCache(ttl=0)
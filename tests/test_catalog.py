@@ -38,9 +38,11 @@ def db_session():
 
 
 @pytest.fixture
-def catalog_chat():
+def catalog_chat(catalog_paths):
     """Create a test CatalogChat instance"""
-    return CatalogChat(db_path=":memory:", mode="test")
+    return CatalogChat(
+        db_path=":memory:", chat_log=catalog_paths["chat_log"], mode="test"
+    )
 
 
 @pytest.fixture
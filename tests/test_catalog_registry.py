@@ -0,0 +1,104 @@
+"""Tests for the in-memory catalog registry."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.catalog import CatalogItem, Tag
+from services.catalog_registry import CatalogRegistry, ItemEntry, TagEntry
+
+
+@pytest.fixture
+def session_factory():
+    """Create an in-memory catalog database."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def make_item(title: str, **kwargs) -> CatalogItem:
+    """Build a catalog item with required timestamps."""
+    now = int(datetime.now().timestamp())
+    return CatalogItem(
+        title=title, created_date=now, modified_date=now, status="draft", **kwargs
+    )
+
+
+def make_tag(name: str) -> Tag:
+    """Build a tag with required timestamps."""
+    now = int(datetime.now().timestamp())
+    return Tag(name=name, created_date=now, modified_date=now)
+
+
+def test_registry_loads_existing_rows(session_factory):
+    """Test that existing rows are loaded as compact entries."""
+    session = session_factory()
+    session.add_all([make_item("Python Tutorial", content="x" * 1000), make_tag("python")])
+    session.commit()
+    session.close()
+
+    registry = CatalogRegistry(session_factory)
+    items = registry.items()
+    assert items == [ItemEntry(items[0].id, "Python Tutorial", "draft", False)]
+    assert registry.tags()[0].name == "python"
+    assert registry.tags()[0].title == "python"
+
+
+def test_registry_tracks_commits(session_factory):
+    """Test that committed inserts and updates are reflected."""
+    registry = CatalogRegistry(session_factory)
+    assert registry.items() == []
+
+    session = session_factory()
+    item = make_item("Data Science")
+    session.add(item)
+    session.add(make_tag("ml"))
+    session.commit()
+
+    assert registry.find_item("data science").title == "Data Science"
+    assert isinstance(registry.find_tag("ML"), TagEntry)
+
+    item.deleted = True
+    item.title = "Data Science Guide"
+    session.commit()
+    session.close()
+
+    assert registry.find_item("Data Science") is None
+    assert registry.find_item("data science guide").deleted is True
+    assert registry.items(include_deleted=False) == []
+
+
+def test_registry_ignores_rollback(session_factory):
+    """Test that rolled back changes never reach the registry."""
+    registry = CatalogRegistry(session_factory)
+    registry.load()
+
+    session = session_factory()
+    session.add(make_item("Draft Item"))
+    session.flush()
+    session.rollback()
+    session.close()
+
+    assert registry.find_item("Draft Item") is None
+
+
+def test_registry_reloads_after_bulk_update(session_factory):
+    """Test that bulk query updates invalidate the registry."""
+    session = session_factory()
+    session.add(make_tag("old"))
+    session.commit()
+
+    registry = CatalogRegistry(session_factory)
+    assert not registry.find_tag("old").deleted
+    generation = registry.generation
+
+    session.query(Tag).filter(Tag.name == "old").update({"deleted": True})
+    session.commit()
+    session.close()
+
+    registry.ensure_loaded()
+    assert registry.generation > generation
+    assert registry.find_tag("old").deleted
@@ -0,0 +1,155 @@
+"""Tests for chat log indexes and indexed queries across rotations."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from shared_lib import chat_log_util
+from shared_lib.chat_log_index_util import (
+    ChatLogReader,
+    format_index_record,
+    index_path,
+    index_record,
+    rebuild_index,
+    repair_index,
+)
+from shared_lib.append_log_util import AppendLog
+from shared_lib.log_rotation_util import LogRotator, read_manifest
+
+
+@pytest.fixture
+def chat_log(tmp_path, monkeypatch):
+    """Path for a chat log inside a permitted log directory."""
+    monkeypatch.setattr(chat_log_util, "LOG_DIR", str(tmp_path))
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    return log_dir / "chat.jsonl"
+
+
+def _entry(session_id, minute, role="user", text="hi"):
+    return {
+        "timestamp": datetime(2024, 1, 1, 12, minute, tzinfo=timezone.utc).isoformat(),
+        "session_id": session_id,
+        "role": role,
+        "user_input": text,
+    }
+
+
+def test_logger_maintains_index_across_rotation(chat_log, monkeypatch):
+    """Test that logged and rotated entries are found through their indexes."""
+    first = chat_log_util.ChatLogger(str(chat_log))
+    first.log_interaction("one", "ok", "test-model")
+    first.log_interaction("[TEST] two", "ok", "test-model", role="assistant")
+    monkeypatch.setattr(chat_log_util, "LOG_ROTATION_SIZE_MB", 1)
+    first.writer.append(json.dumps({"padding": "x" * (1024 * 1024)}))
+    first.rotate_logs()
+    first.close()
+
+    second = chat_log_util.ChatLogger(str(chat_log))
+    second.log_interaction("three", "ok", "test-model")
+    second.close()
+
+    [segment] = read_manifest(chat_log)
+    assert segment["name"].endswith(".gz")
+    assert index_path(chat_log.with_name(segment["name"])).exists()
+
+    reader = ChatLogReader(chat_log)
+    assert reader.session_ids() == [first.session_id, second.session_id]
+    entries = list(reader.query(session_id=first.session_id))
+    assert [entry["user_input"] for entry in entries] == ["one", "[TEST] two"]
+    assert reader.lines_decoded == 2
+
+    no_tests = list(reader.query(session_id=first.session_id, include_tests=False))
+    assert [entry["user_input"] for entry in no_tests] == ["one"]
+    assistant = list(reader.query(role="assistant"))
+    assert [entry["user_input"] for entry in assistant] == ["[TEST] two"]
+
+
+def test_two_loggers_on_one_log(chat_log):
+    """Test that index lines written out of log order are read in log order."""
+    first = chat_log_util.ChatLogger(str(chat_log))
+    second = chat_log_util.ChatLogger(str(chat_log))
+    first.log_interaction("first", "ok", "test-model")
+
+    # first writes its entry, second logs one, then first indexes its entry
+    data = (json.dumps(_entry(first.session_id, 1, text="second")) + "\n").encode()
+    offset, _, _ = first.writer.write(data)
+    second.log_interaction("third", "ok", "test-model")
+    first.index_writer.write(format_index_record(index_record(offset, data)))
+    # A third logger starting meanwhile must not cut the others off the index
+    third = chat_log_util.ChatLogger(str(chat_log))
+    second.log_interaction("fourth", "ok", "test-model")
+    for logger in (first, second, third):
+        logger.close()
+
+    reader = ChatLogReader(chat_log)
+    entries = [entry["user_input"] for entry in reader.query()]
+    assert entries == ["first", "second", "third", "fourth"]
+    assert reader.lines_decoded == 4
+    assert len(index_path(chat_log).read_text().splitlines()) == 4
+
+
+def test_time_range_query_decodes_only_matches(tmp_path):
+    """Test time bounds given as datetimes or ISO strings."""
+    log = tmp_path / "chat.jsonl"
+    log.write_text("".join(json.dumps(_entry("s", m)) + "\n" for m in range(10)))
+    assert rebuild_index(log) == 10
+
+    reader = ChatLogReader(log)
+    entries = list(
+        reader.query(
+            start=datetime(2024, 1, 1, 12, 3),
+            end=_entry("s", 6)["timestamp"],
+        )
+    )
+    assert [entry["timestamp"][14:16] for entry in entries] == ["03", "04", "05"]
+    assert reader.lines_decoded == 3
+
+
+def test_index_catches_up_with_log(tmp_path):
+    """Test that lines the index lost, or the log lost, are handled."""
+    log = tmp_path / "chat.jsonl"
+    log.write_text(json.dumps(_entry("a", 0)) + "\n")
+    rebuild_index(log)
+    # Logged, but the process died before indexing it
+    with log.open("a") as f:
+        f.write(json.dumps(_entry("b", 1)) + "\n")
+
+    reader = ChatLogReader(log)
+    assert [entry["session_id"] for entry in reader.query()] == ["a", "b"]
+    assert repair_index(log)
+    assert not repair_index(log)
+    assert len(index_path(log).read_text().splitlines()) == 2
+
+    # The log's last line was truncated by crash recovery
+    log.write_text(json.dumps(_entry("a", 0)) + "\n")
+    assert reader.session_ids() == ["a"]
+    index_path(log).write_text("corrupt\n")
+    assert repair_index(log)
+    assert reader.session_ids() == ["a"]
+
+
+def test_reader_follows_segments_compressed_after_listing(tmp_path, monkeypatch):
+    """Test that segments compressed or deleted mid-query are re-resolved."""
+    log = tmp_path / "chat.jsonl"
+    with AppendLog(log, durability="none") as writer:
+        rotator = LogRotator(log, compression="none", sidecar_suffixes=[".idx"])
+        for session_id in ("a", "b"):
+            writer.append(json.dumps(_entry(session_id, 0)))
+            rotator.rotate(writer)
+        rotator.close()
+    reader = ChatLogReader(log)
+    assert reader.rebuild_indexes() == 2
+
+    # The reader listed the segments just before they were compressed
+    stale = reader.segments()
+    monkeypatch.setattr(reader, "segments", lambda: stale)
+    rotator = LogRotator(log, max_segments=1, sidecar_suffixes=[".idx"])
+    rotator.wait()
+    rotator.close()
+
+    [segment] = read_manifest(log)
+    assert segment["name"].endswith(".gz")
+    assert reader.session_ids() == ["b"]
+    assert [entry["session_id"] for entry in reader.query()] == ["b"]
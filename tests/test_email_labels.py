@@ -0,0 +1,100 @@
+"""Tests for normalized email label storage."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event, select
+
+from models.email import Email
+from models.gmail_label import GmailLabel
+from services import email_labels
+
+
+@pytest.fixture
+def session(committed_sessions):
+    """Email database session with three labelled emails."""
+    session, _ = committed_sessions
+    session.add(GmailLabel(id="Label_1", name="Receipts"))
+    for i, day in enumerate([1, 1, 2]):
+        session.add(
+            Email(
+                id=f"m{i}",
+                message_id=f"<m{i}>",
+                received_at=datetime(2024, 1, day, tzinfo=timezone.utc),
+            )
+        )
+    session.flush()
+    email_labels.set_labels_bulk(
+        session,
+        {"m0": ["INBOX", "Label_1"], "m1": ["INBOX"], "m2": ["INBOX", "UNREAD"]},
+    )
+    session.commit()
+    yield session
+    email_labels.forget()
+
+
+def test_split_labels():
+    """Test parsing of legacy comma-separated and JSON label lists."""
+    assert email_labels.split_labels("INBOX, UNREAD,,INBOX") == ["INBOX", "UNREAD"]
+    assert email_labels.split_labels('["INBOX", "Work"]') == ["INBOX", "Work"]
+    assert email_labels.split_labels(None) == []
+
+
+def test_labels_are_interned(session):
+    """Test that unseen label ids get a gmail_labels row, named after the id."""
+    names = dict(session.execute(select(GmailLabel.id, GmailLabel.name)).all())
+    assert names == {"Label_1": "Receipts", "INBOX": "INBOX", "UNREAD": "UNREAD"}
+    assert {label.id for label in session.get(Email, "m0").labels} == {"INBOX", "Label_1"}
+
+
+def test_set_labels_replaces_links(session):
+    """Test that re-ingesting an email replaces its label links."""
+    email_labels.set_email_labels(session, "m0", ["UNREAD"])
+    assert email_labels.labels_for_emails(session, ["m0", "m1"]) == {
+        "m0": ["UNREAD"],
+        "m1": ["INBOX"],
+    }
+
+
+def test_distribution_filter_and_time_series(session):
+    """Test the SQL-side label aggregates."""
+    assert email_labels.label_distribution(session) == [
+        ("INBOX", 3),
+        ("Receipts", 1),
+        ("UNREAD", 1),
+    ]
+    unread = session.scalars(
+        select(Email.id).where(email_labels.has_label("UNREAD"))
+    ).all()
+    assert unread == ["m2"]
+    assert email_labels.label_time_series(session, "INBOX") == [
+        ("2024-01-02", 1),
+        ("2024-01-01", 2),
+    ]
+    # Labels can be named by id or display name
+    assert email_labels.label_time_series(session, "Receipts") == [("2024-01-01", 1)]
+    assert email_labels.label_time_series(session, "missing") == []
+
+
+def test_known_labels_skip_the_lookup(session):
+    """Test that interned ids are remembered per database."""
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    email_labels.intern_labels(session, ["INBOX", "UNREAD"])
+    assert not statements
+
+
+def test_rolled_back_labels_are_not_remembered(session):
+    """Test that ids interned in a rolled back transaction are interned again."""
+    email_labels.intern_labels(session, ["Label_new"])
+    session.rollback()
+
+    email_labels.set_email_labels(session, "m1", ["Label_new"])
+    session.commit()
+    assert session.get(GmailLabel, "Label_new") is not None
+    assert email_labels.labels_for_emails(session, ["m1"]) == {"m1": ["Label_new"]}
+    assert email_labels.resolve_labels(session, ["Label_new"]) == ["Label_new"]
@@ -0,0 +1,121 @@
+"""Tests for the streaming HTML report generator."""
+
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from scripts.generate_report import (
+    Pager,
+    iter_analysis_rows,
+    iter_sent_rows,
+    write_report,
+)
+
+
+def _sent_rows(count):
+    for i in range(count):
+        yield {"subject": f"Subject {i}", "to": "b@x", "date": "", "body": "<b>hi</b>"}
+
+
+def test_pager_reads_one_row_ahead():
+    """Test that pages are cut from the iterator without buffering it."""
+    consumed = []
+
+    def rows():
+        for i in range(5):
+            consumed.append(i)
+            yield i
+
+    pager = Pager(rows(), 2)
+    assert consumed == [0]
+    assert list(pager.page()) == [0, 1]
+    assert consumed == [0, 1, 2]
+    assert list(pager.page()) == [2, 3]
+    assert list(pager.page()) == [4]
+    assert not pager.has_more()
+
+
+def test_single_page_report(tmp_path):
+    """Test that a report within the page size is one file."""
+    output = str(tmp_path / "sent.html")
+    assert write_report("sent.html", _sent_rows(3), output, "Sent", page_size=10) == 3
+    assert os.listdir(tmp_path) == ["sent.html"]
+    html = open(output).read()
+    assert html.count("<td>Subject") == 3
+    assert "&lt;b&gt;hi&lt;/b&gt;" in html
+    assert "Next" not in html
+
+
+def test_paginated_report_has_index(tmp_path):
+    """Test that larger reports are split into pages behind an index."""
+    output = str(tmp_path / "sent.html")
+    # Left over from an earlier, longer report
+    (tmp_path / "sent-page-0009.html").write_text("stale")
+
+    assert write_report("sent.html", _sent_rows(5), output, "Sent", page_size=2) == 5
+    assert sorted(os.listdir(tmp_path)) == [
+        "sent-page-0001.html",
+        "sent-page-0002.html",
+        "sent-page-0003.html",
+        "sent.html",
+    ]
+    index = open(output).read()
+    assert "5 rows in 3 pages" in index
+    assert 'href="sent-page-0003.html"' in index
+
+    middle = open(tmp_path / "sent-page-0002.html").read()
+    assert middle.count("<td>Subject") == 2
+    assert 'href="sent-page-0001.html">Previous' in middle
+    assert 'href="sent-page-0003.html">Next' in middle
+    assert "Next" not in open(tmp_path / "sent-page-0003.html").read()
+
+
+def test_empty_report(tmp_path):
+    """Test that a report without rows is still written."""
+    output = str(tmp_path / "report.html")
+    assert write_report("analysis.html", iter([]), output, "Analysis") == 0
+    assert "<table>" in open(output).read()
+
+
+def test_page_size_must_be_positive(tmp_path):
+    """Test that a page size of 0 is rejected instead of writing empty pages."""
+    output = str(tmp_path / "report.html")
+    with pytest.raises(ValueError):
+        write_report("sent.html", _sent_rows(1), output, "Sent", page_size=0)
+    assert not os.path.exists(output)
+
+
+def test_database_rows(committed_sessions):
+    """Test the rows streamed from the email and analysis databases."""
+    email_session, analysis_session = committed_sessions
+    for i, sender in enumerate(["me@gmail.com", "other@x"]):
+        email_session.add(
+            Email(
+                id=f"m{i}",
+                message_id=f"<m{i}>",
+                subject=f"Subject {i}",
+                from_address=sender,
+                to_address="b@x",
+                body="x" * 300,
+                received_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+        analysis_session.add(
+            EmailAnalysis(
+                email_id=f"m{i}", priority="high", created_at=datetime(2024, 1, 2 + i)
+            )
+        )
+    email_session.commit()
+    analysis_session.commit()
+
+    sent = list(iter_sent_rows(email_session, chunk_size=1))
+    assert [row["subject"] for row in sent] == ["Subject 0"]
+    assert sent[0]["body"] == "x" * 200 + "..."
+
+    analysed = list(iter_analysis_rows(analysis_session, email_session, chunk_size=1))
+    assert [row["subject"] for row in analysed] == ["Subject 1", "Subject 0"]
+    assert analysed[0]["analysis_date"] == "2024-01-03 00:00:00"
+    assert analysed[0]["priority"] == "high"
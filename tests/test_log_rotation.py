@@ -0,0 +1,150 @@
+"""Tests for rename-based log rotation, compression and retention."""
+
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from shared_lib import chat_log_util
+from shared_lib.append_log_util import AppendLog
+from shared_lib.log_rotation_util import (
+    LogRotator,
+    iter_lines,
+    manifest_path,
+    read_manifest,
+    segment_paths,
+)
+
+
+@pytest.fixture
+def log(tmp_path):
+    """Append log with a rotator that compresses with gzip."""
+    path = tmp_path / "chat.jsonl"
+    writer = AppendLog(path, durability="none")
+    rotator = LogRotator(path)
+    yield path, writer, rotator
+    writer.close()
+    rotator.close()
+
+
+def test_rotation_renames_and_compresses(log):
+    """Test that entries survive rotation and segments end up compressed."""
+    path, writer, rotator = log
+    writer.append("one")
+    writer.append("two")
+    rotator.wait()
+    # Nothing is written beside a log that has not rotated
+    assert not manifest_path(path).exists()
+    segment = rotator.rotate(writer)
+    writer.append("three")
+
+    assert segment.name.startswith("chat.jsonl.")
+    assert path.read_bytes() == b"three\n"
+    rotator.wait()
+    assert not segment.exists()
+
+    [entry] = read_manifest(path)
+    assert entry["compression"] == "gzip"
+    assert entry["size"] == 8
+    compressed = path.with_name(entry["name"])
+    assert gzip.decompress(compressed.read_bytes()) == b"one\ntwo\n"
+    assert segment_paths(path) == [compressed, path]
+    assert list(iter_lines(path)) == [b"one\n", b"two\n", b"three\n"]
+
+
+def test_rotations_in_the_same_second_get_distinct_names(log):
+    """Test that a quick second rotation does not overwrite the first."""
+    path, writer, rotator = log
+    for line in ("a", "b", "c"):
+        writer.append(line)
+        rotator.rotate(writer)
+    rotator.wait()
+    names = [segment["name"] for segment in read_manifest(path)]
+    assert len(set(names)) == 3
+    assert list(iter_lines(path)) == [b"a\n", b"b\n", b"c\n"]
+
+
+def test_retention_by_count_and_age(tmp_path):
+    """Test that the oldest segments are deleted beyond the limits."""
+    path = tmp_path / "chat.jsonl"
+    with AppendLog(path, durability="none") as writer:
+        rotator = LogRotator(path, compression="none", max_segments=2)
+        for line in ("a", "b", "c"):
+            writer.append(line)
+            rotator.rotate(writer)
+        rotator.wait()
+        assert list(iter_lines(path)) == [b"b\n", b"c\n"]
+        assert len(list(tmp_path.glob("chat.jsonl.*[0-9]"))) == 2
+        rotator.close()
+
+    # Backdate one segment; a new rotator enforces the age limit on startup
+    segments = read_manifest(path)
+    segments[0]["rotated_at"] = (
+        datetime.now(timezone.utc) - timedelta(days=10)
+    ).isoformat()
+    manifest_path(path).write_text(json.dumps({"segments": segments}))
+    rotator = LogRotator(path, compression="none", max_age_days=7)
+    rotator.wait()
+    assert list(iter_lines(path)) == [b"c\n"]
+    rotator.close()
+
+
+def test_interrupted_compression_resumes(tmp_path):
+    """Test that an uncompressed segment in the manifest is compressed later."""
+    path = tmp_path / "chat.jsonl"
+    with AppendLog(path, durability="none") as writer:
+        writer.append("old")
+        rotator = LogRotator(path, compression="none")
+        rotator.rotate(writer)
+        rotator.close()
+
+    rotator = LogRotator(path)
+    rotator.wait()
+    [entry] = read_manifest(path)
+    assert entry["name"].endswith(".gz")
+    assert list(iter_lines(path)) == [b"old\n"]
+    rotator.close()
+
+
+def test_reader_follows_segments_compressed_while_reading(tmp_path):
+    """Test that a segment compressed after the manifest was read is not skipped."""
+    path = tmp_path / "chat.jsonl"
+    with AppendLog(path, durability="none") as writer:
+        rotator = LogRotator(path, compression="none")
+        for line in ("a", "b"):
+            writer.append(line)
+            rotator.rotate(writer)
+        rotator.close()
+        writer.append("c")
+
+        lines = iter_lines(path)
+        assert next(lines) == b"a\n"
+        # Compresses both segments while the reader holds the old manifest
+        rotator = LogRotator(path)
+        rotator.wait()
+        assert all(segment["compression"] == "gzip" for segment in read_manifest(path))
+        assert list(lines) == [b"b\n", b"c\n"]
+        rotator.close()
+
+
+def test_chat_logger_rotates_by_rename(tmp_path, monkeypatch):
+    """Test ChatLogger.rotate_logs and logging after a rotation."""
+    monkeypatch.setattr(chat_log_util, "LOG_DIR", str(tmp_path))
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    path = log_dir / "chat.jsonl"
+    logger = chat_log_util.ChatLogger(str(path))
+    logger.log_interaction("before", "ok", "test-model")
+    assert logger.rotate_logs(max_size_mb=1)
+    assert read_manifest(path) == []
+
+    monkeypatch.setattr(chat_log_util, "LOG_ROTATION_SIZE_MB", 1)
+    logger.writer.append(json.dumps({"padding": "x" * (1024 * 1024)}))
+    assert logger.rotate_logs()
+    logger.log_interaction("after", "ok", "test-model")
+    logger.close()
+
+    lines = [json.loads(line) for line in iter_lines(path)]
+    assert [line.get("user_input") for line in lines] == ["before", None, "after"]
+    assert read_manifest(path)[0]["compression"] == "gzip"
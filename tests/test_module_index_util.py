@@ -0,0 +1,49 @@
+"""Tests for resolving imports to catalogued files."""
+
+from shared_lib.module_index_util import ModuleIndex, module_name
+
+PATHS = {
+    "app.py": 1,
+    "pkg/__init__.py": 2,
+    "pkg/core.py": 3,
+    "pkg/sub/__init__.py": 4,
+    "pkg/sub/helpers.py": 5,
+    "src/tools/__init__.py": 6,
+    "src/tools/cli.py": 7,
+    "src/app.py": 8,
+    "README.md": 9,
+}
+
+
+def test_module_name():
+    """Test that file paths map to dotted module names."""
+    assert module_name("pkg/core.py") == "pkg.core"
+    assert module_name("pkg/__init__.py") == "pkg"
+    assert module_name("README.md") is None
+    assert module_name("my-scripts/run.py") is None
+
+
+def test_absolute_imports():
+    """Test packages, submodules and imported names."""
+    index = ModuleIndex(PATHS)
+    assert index.resolve("app.py", ["pkg"]) == [2]
+    assert index.resolve("app.py", ["pkg.sub.helpers.format_row"]) == [5]
+    assert index.resolve("app.py", ["pkg.missing", "os.path", "json"]) == [2]
+
+
+def test_relative_imports():
+    """Test relative imports from modules and from package __init__ files."""
+    index = ModuleIndex(PATHS)
+    assert index.resolve("pkg/sub/helpers.py", ["..core.run", ".__init__"]) == [3, 4]
+    assert index.resolve("pkg/sub/__init__.py", [".helpers", "..core"]) == [3, 5]
+    # Importing a name from the file's own package __init__ is not a self-edge
+    assert index.resolve("pkg/__init__.py", [".VERSION"]) == []
+    assert index.absolute_name("app.py", "...too_far") is None
+
+
+def test_source_root_aliases():
+    """Test that src/ files resolve without the prefix unless shadowed."""
+    index = ModuleIndex(PATHS)
+    assert index.resolve("src/tools/cli.py", ["tools", "src.tools"]) == [6]
+    # Top-level app.py wins over the src/app.py alias
+    assert index.resolve("src/tools/cli.py", ["app", "src.app"]) == [1, 8]
@@ -0,0 +1,134 @@
+"""Tests for incremental asset catalog scanning."""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.asset_catalog import AssetCatalogItem, AssetDependency, AssetScanManifest
+from models.base import Base
+from scripts.populate_asset_catalog import scan_directory
+from services.asset_catalog_service import AssetCatalogService
+
+
+@pytest.fixture
+def service():
+    """Create a service over an in-memory catalog database."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield AssetCatalogService(session)
+    session.close()
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def live_assets(service):
+    return {
+        asset.file_path: asset
+        for asset in service.session.query(AssetCatalogItem).filter_by(deleted=False)
+    }
+
+
+def test_first_scan_adds_everything(service, tmp_path):
+    """Test that a first scan catalogs files and links imports."""
+    write(tmp_path / "util.py", '"""Utilities."""\n')
+    write(tmp_path / "app.py", "import util\n")
+    write(tmp_path / "README.md", "# Readme\n")
+
+    summary = scan_directory(str(tmp_path), service)
+
+    assert summary.added == ["README.md", "app.py", "util.py"]
+    assets = live_assets(service)
+    assert assets["util.py"].description == "Utilities."
+    assert assets["README.md"].asset_type == "document"
+    edges = service.session.query(AssetDependency).all()
+    assert [(edge.source_id, edge.target_id) for edge in edges] == [
+        (assets["app.py"].id, assets["util.py"].id)
+    ]
+
+
+def test_rescan_only_processes_changes(service, tmp_path):
+    """Test that unchanged files are skipped and deletions tombstoned."""
+    write(tmp_path / "app.py", "import util\n")
+    write(tmp_path / "old.py", "x = 1\n")
+    scan_directory(str(tmp_path), service)
+
+    summary = scan_directory(str(tmp_path), service)
+    assert (summary.added, summary.updated, summary.deleted) == ([], [], [])
+    assert summary.unchanged == 2
+
+    # Touching without modifying falls back to the content hash
+    os.utime(tmp_path / "app.py", ns=(1, 1))
+    write(tmp_path / "util.py", "")
+    (tmp_path / "old.py").unlink()
+    summary = scan_directory(str(tmp_path), service)
+
+    assert summary.added == ["util.py"]
+    assert summary.deleted == ["old.py"]
+    assert summary.unchanged == 1
+    assert summary.relinked == 1
+    assert set(live_assets(service)) == {"app.py", "util.py"}
+    tombstone = service.session.get(AssetScanManifest, "old.py")
+    assert tombstone.deleted
+
+
+def test_parallel_scan_matches_serial(tmp_path, capsys):
+    """Test that worker processes produce the same catalog and output."""
+    project = tmp_path / "project"
+    write(project / "util.py", '"""Utilities."""\n')
+    write(project / "broken.py", "def (\n")
+    write(project / "docs" / "guide.md", "# Guide\n")
+    for i in range(6):
+        write(project / f"mod{i}.py", f'"""Module {i}."""\nimport util\n')
+
+    results = []
+    for jobs in (1, 2):
+        engine = create_engine(f"sqlite:///{tmp_path / f'catalog{jobs}.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine, expire_on_commit=False)()
+        service = AssetCatalogService(session)
+        summary = scan_directory(str(project), service, jobs=jobs)
+        assets = {
+            path: (asset.asset_type, asset.description, asset.asset_metadata)
+            for path, asset in live_assets(service).items()
+        }
+        edges = sorted(
+            (edge.source_item.file_path, edge.target_item.file_path)
+            for edge in session.query(AssetDependency)
+        )
+        results.append((summary, assets, edges, capsys.readouterr().out))
+        session.close()
+
+    assert results[0] == results[1]
+    summary, assets, edges, output = results[0]
+    assert len(summary.added) == 9
+    assert ("mod3.py", "util.py") in edges
+    assert "Warning: Could not parse broken.py" in output
+
+
+def test_package_imports_resolve(service, tmp_path):
+    """Test package and relative imports, keeping non-import edges."""
+    write(tmp_path / "pkg" / "__init__.py", "from .core import run\n")
+    write(tmp_path / "pkg" / "core.py", "")
+    write(tmp_path / "main.py", "from pkg import core\n")
+    scan_directory(str(tmp_path), service)
+    assets = live_assets(service)
+    service.add_dependency(assets["main.py"].id, assets["pkg/core.py"].id, "uses")
+
+    write(tmp_path / "main.py", "import pkg\n")
+    scan_directory(str(tmp_path), service)
+
+    edges = sorted(
+        (edge.source_item.file_path, edge.target_item.file_path, edge.dependency_type)
+        for edge in service.session.query(AssetDependency)
+    )
+    assert edges == [
+        ("main.py", "pkg/__init__.py", "imports"),
+        ("main.py", "pkg/core.py", "uses"),
+        ("pkg/__init__.py", "pkg/core.py", "imports"),
+    ]
@@ -0,0 +1,121 @@
+"""Tests for the watermark-invalidated report cache."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services import email_labels
+from services.report_cache import ReportCache, data_watermark
+from src.app_email_reports import EmailAnalytics, run_report
+
+
+@pytest.fixture
+def sessions(committed_sessions):
+    """Separate email and analysis databases with one analysed email."""
+    email_session, analysis_session = committed_sessions
+    email_session.add(
+        Email(
+            id="m0",
+            message_id="<m0>",
+            from_address="a@x",
+            received_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+    )
+    analysis_session.add(EmailAnalysis(email_id="m0", sentiment="positive"))
+    email_session.commit()
+    analysis_session.commit()
+    yield email_session, analysis_session
+    email_labels.forget()
+
+
+def test_watermark_tracks_changes(sessions):
+    """Test that inserts, updates and label changes move the watermark."""
+    email_session, analysis_session = sessions
+    first = data_watermark(*sessions)
+    assert first == data_watermark(*sessions)
+    assert first["emails"][0] == 1
+
+    email_labels.set_email_labels(email_session, "m0", ["INBOX"])
+    email_session.commit()
+    labelled = data_watermark(*sessions)
+    assert labelled != first
+
+    # Relabeling keeps the link count, and may reuse the deleted link's rowid
+    email_labels.set_email_labels(email_session, "m0", ["UNREAD"])
+    email_session.commit()
+    assert data_watermark(*sessions) != labelled
+
+    analysis_session.add(EmailAnalysis(email_id="m1"))
+    analysis_session.commit()
+    assert data_watermark(*sessions)["email_analysis"][0] == 2
+
+
+def test_cache_persists_until_watermark_changes(tmp_path):
+    """Test hits across cache instances and recomputation on a new watermark."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"total": len(calls)}
+
+    cache = ReportCache(str(tmp_path / "cache"))
+    assert cache.get_or_compute("basic", {"limit": 10}, [1], compute) == {"total": 1}
+    # A new instance stands in for a later CLI run
+    reopened = ReportCache(str(tmp_path / "cache"))
+    assert reopened.get_or_compute("basic", {"limit": 10}, [1], compute) == {"total": 1}
+    assert reopened.hits == 1
+    assert reopened.get_or_compute("basic", {"limit": 5}, [1], compute) == {"total": 2}
+    assert reopened.get_or_compute("basic", {"limit": 10}, [2], compute) == {"total": 3}
+    assert reopened.clear() == 2
+
+
+def test_corrupt_entry_is_recomputed(tmp_path):
+    """Test that an unreadable cache file is replaced."""
+    cache = ReportCache(str(tmp_path))
+    cache.get_or_compute("basic", {}, [1], lambda: 1)
+    for path in tmp_path.iterdir():
+        path.write_bytes(b"not a pickle")
+    assert cache.get_or_compute("basic", {}, [1], lambda: 2) == 2
+
+
+def test_reports_reuse_cached_result(sessions, tmp_path, capsys):
+    """Test that run_report recomputes only after the data changes."""
+    email_session, analysis_session = sessions
+    cache = ReportCache(str(tmp_path / "cache"))
+    analytics = EmailAnalytics(email_session, analysis_session, cache=cache)
+
+    run_report(analytics, "basic")
+    run_report(analytics, "senders")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    email_session.add(
+        Email(
+            id="m1",
+            message_id="<m1>",
+            from_address="b@x",
+            received_at=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        )
+    )
+    email_session.commit()
+    run_report(analytics, "basic")
+    assert cache.misses == 2
+    assert "Total Emails: 2" in capsys.readouterr().out
+
+
+def test_all_reports_are_cached(sessions, tmp_path, capsys):
+    """Test that every section of the "all" report is served from the cache."""
+    cache = ReportCache(str(tmp_path / "cache"))
+    analytics = EmailAnalytics(*sessions, cache=cache)
+
+    run_report(analytics, "all")
+    first = capsys.readouterr().out
+    assert "Total Emails: 1" in first
+    assert "Sentiment: positive" in first
+    misses = cache.misses
+
+    run_report(analytics, "all")
+    assert cache.misses == misses
+    assert cache.hits == misses
+    assert capsys.readouterr().out == first
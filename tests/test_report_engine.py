@@ -0,0 +1,112 @@
+"""Tests for the single-pass report engine."""
+
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services import email_labels
+from services.report_engine import EMAIL_DTYPES, ReportEngine, split_categories
+from src.app_email_reports import EmailAnalytics, run_report
+
+
+@pytest.fixture
+def sessions(committed_sessions):
+    """Separate email and analysis databases with three emails, two analysed."""
+    email_session, analysis_session = committed_sessions
+    for i, (sender, day) in enumerate([("a@x", 1), ("a@x", 2), ("b@x", 2)]):
+        email_session.add(
+            Email(
+                id=f"m{i}",
+                message_id=f"<m{i}>",
+                subject=f"Subject {i}",
+                from_address=sender,
+                received_at=datetime(2024, 1, day, tzinfo=timezone.utc),
+            )
+        )
+    email_session.flush()
+    email_labels.set_labels_bulk(email_session, {"m0": ["INBOX"], "m1": ["INBOX", "Work"]})
+    analysis_session.add_all(
+        [
+            EmailAnalysis(
+                email_id="m0",
+                sentiment="positive",
+                priority="high",
+                category='["Work", "Ops"]',
+                created_at=datetime(2024, 1, 3),
+            ),
+            EmailAnalysis(
+                email_id="m1",
+                sentiment="negative",
+                category="Work",
+                created_at=datetime(2024, 1, 4),
+            ),
+        ]
+    )
+    email_session.commit()
+    analysis_session.commit()
+    yield email_session, analysis_session
+    email_labels.forget()
+
+
+def test_split_categories():
+    """Test that plain and JSON list categories explode to one row each."""
+    values = pd.Series(['["Work", "Ops"]', "Work", None, "[]"], dtype="string")
+    assert sorted(split_categories(values).dropna()) == ["Ops", "Work", "Work"]
+
+
+def test_chunks_keep_selected_column_order(sessions):
+    """Test that columns are labelled in select order, whatever the dtype order."""
+    statement = select(
+        Email.received_at.label("received_at"),
+        Email.from_address.label("sender"),
+        Email.id.label("email_id"),
+    ).order_by(Email.id)
+    [chunk] = ReportEngine(*sessions)._chunks(sessions[0], statement, EMAIL_DTYPES)
+    assert list(chunk.columns) == ["received_at", "sender", "email_id"]
+    assert list(chunk["email_id"]) == ["m0", "m1", "m2"]
+    assert list(chunk["sender"]) == ["a@x", "a@x", "b@x"]
+    assert chunk["sender"].dtype == "category"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_engine_matches_per_section_methods(sessions, chunk_size):
+    """Test that one pass reports what the per-section queries report."""
+    result = ReportEngine(*sessions, chunk_size=chunk_size).run()
+    analytics = EmailAnalytics(*sessions)
+
+    assert result.total_emails == analytics.get_total_emails() == 3
+    assert result.total_analyzed == 2
+    assert result.top_senders == analytics.get_top_senders() == [("a@x", 2), ("b@x", 1)]
+    assert result.emails_by_date == analytics.get_email_by_date()
+    assert result.labels == analytics.get_label_distribution()
+    assert sorted(result.priorities) == sorted(analytics.get_priority_distribution())
+    assert sorted(result.sentiments) == sorted(analytics.get_sentiment_distribution())
+    assert result.categories == analytics.get_category_distribution() == {
+        "Work": 2,
+        "Ops": 1,
+    }
+    assert result.analyses_by_date == analytics.get_analysis_by_date()
+    assert [row["email_id"] for row in result.recent] == ["m1", "m0"]
+    assert result.recent[0]["subject"] == "Subject 1"
+
+
+def test_run_report_queries_once(sessions, capsys, monkeypatch):
+    """Test that the report sections share one computed result."""
+    analytics = EmailAnalytics(*sessions)
+    result = ReportEngine(*sessions).run()
+    calls = []
+    monkeypatch.setattr(analytics, "build_report", lambda: calls.append(1) or result)
+
+    for report in ["basic", "senders", "dates", "labels", "full"]:
+        run_report(analytics, report, result)
+    assert not calls
+
+    run_report(analytics, "full")
+    assert calls == [1]
+    output = capsys.readouterr().out
+    assert "Total Emails: 3" in output
+    assert "Subject 1" in output
@@ -0,0 +1,184 @@
+"""Tests for the incrementally maintained report rollups."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete, event, insert, select, update
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from models.report_rollup import ReportRollup
+from services import report_rollups
+
+
+@pytest.fixture
+def sessions(committed_sessions):
+    """Tracked sessions on separate email and analysis databases."""
+    for session in committed_sessions:
+        report_rollups.track(session)
+    return committed_sessions
+
+
+@pytest.fixture
+def session(sessions):
+    """Tracked session on the email database."""
+    return sessions[0]
+
+
+def add_emails(session, count, sender="a@example.com", day=1):
+    for i in range(count):
+        session.add(
+            Email(
+                id=f"{sender}-{day}-{i}",
+                message_id=f"<{sender}-{day}-{i}>",
+                from_address=sender,
+                received_at=datetime(2024, 1, day, 12, tzinfo=timezone.utc),
+            )
+        )
+
+
+def snapshot(session):
+    """All rollup rows, for comparing incremental results with a rebuild."""
+    return sorted(
+        session.execute(
+            select(
+                ReportRollup.source,
+                ReportRollup.dimension,
+                ReportRollup.day,
+                ReportRollup.value,
+                ReportRollup.count,
+            )
+        ).all()
+    )
+
+
+def assert_matches_rebuild(sessions):
+    for session, name in zip(sessions, ("emails", "email_analysis")):
+        incremental = snapshot(session)
+        report_rollups.rebuild(session.connection(), name)
+        assert snapshot(session) == incremental
+
+
+def test_reports_read_rollups(sessions):
+    """Test distributions and daily counts after inserts."""
+    session, analysis_session = sessions
+    add_emails(session, 3, "a@example.com", day=1)
+    add_emails(session, 1, "b@example.com", day=2)
+    session.commit()
+    analysis_session.add_all(
+        [
+            EmailAnalysis(email_id="e1", sentiment="positive", category='["Work", "Ops"]'),
+            EmailAnalysis(email_id="e2", sentiment="positive", category="Work"),
+            EmailAnalysis(email_id="e3", sentiment="negative", priority="high"),
+        ]
+    )
+    analysis_session.commit()
+
+    assert report_rollups.distribution(session, "emails", "sender") == [
+        ("a@example.com", 3),
+        ("b@example.com", 1),
+    ]
+    assert report_rollups.distribution(session, "emails", "sender", limit=1) == [
+        ("a@example.com", 3)
+    ]
+    assert report_rollups.daily_counts(session, "emails") == [
+        ("2024-01-02", 1),
+        ("2024-01-01", 3),
+    ]
+    assert report_rollups.distribution(
+        analysis_session, "email_analysis", "sentiment"
+    ) == [("positive", 2), ("negative", 1)]
+    assert dict(
+        report_rollups.distribution(analysis_session, "email_analysis", "category")
+    ) == {"Work": 2, "Ops": 1, "uncategorized": 1}
+    assert_matches_rebuild(sessions)
+
+
+def test_updates_and_deletes_are_incremental(sessions):
+    """Test that ORM updates and deletes adjust the counts in place."""
+    session, analysis_session = sessions
+    add_emails(session, 2, "a@example.com")
+    session.commit()
+    analysis_session.add(EmailAnalysis(email_id="e1", sentiment="neutral"))
+    analysis_session.commit()
+    report_rollups.distribution(session, "emails", "sender")
+    report_rollups.distribution(analysis_session, "email_analysis", "sentiment")
+
+    email = session.get(Email, "a@example.com-1-0")
+    email.from_address = "c@example.com"
+    session.delete(session.get(Email, "a@example.com-1-1"))
+    session.commit()
+    analysis_session.get(EmailAnalysis, "e1").sentiment = "positive"
+    analysis_session.commit()
+
+    assert report_rollups.distribution(session, "emails", "sender") == [
+        ("c@example.com", 1)
+    ]
+    assert report_rollups.distribution(
+        analysis_session, "email_analysis", "sentiment"
+    ) == [("positive", 1)]
+    assert_matches_rebuild(sessions)
+
+
+def test_reused_rowid_is_counted(session):
+    """Test that a row reusing a deleted highest rowid is still counted."""
+    add_emails(session, 2)
+    session.commit()
+    session.delete(session.get(Email, "a@example.com-1-1"))
+    session.commit()
+    add_emails(session, 1, "b@example.com")
+    session.commit()
+
+    assert dict(report_rollups.distribution(session, "emails", "sender")) == {
+        "a@example.com": 1,
+        "b@example.com": 1,
+    }
+
+
+def test_bulk_writes(session):
+    """Test that bulk inserts are caught up and bulk updates force a rebuild."""
+    add_emails(session, 1)
+    session.commit()
+    session.execute(
+        insert(Email),
+        [
+            {
+                "id": f"bulk{i}",
+                "message_id": f"<bulk{i}>",
+                "from_address": "bulk@x",
+                "received_at": datetime(2024, 1, 2, tzinfo=timezone.utc),
+            }
+            for i in range(3)
+        ],
+    )
+    session.commit()
+    assert dict(report_rollups.distribution(session, "emails", "sender")) == {
+        "bulk@x": 3,
+        "a@example.com": 1,
+    }
+
+    session.execute(update(Email).values(from_address="all@x"))
+    session.execute(delete(Email).where(Email.id == "bulk0"))
+    session.commit()
+    assert report_rollups.distribution(session, "emails", "sender") == [("all@x", 3)]
+    assert report_rollups.daily_counts(session, "emails") == [
+        ("2024-01-02", 2),
+        ("2024-01-01", 1),
+    ]
+
+
+def test_rollups_are_read_not_recounted(session):
+    """Test that a read on an up-to-date source does not scan the source table."""
+    add_emails(session, 5)
+    session.commit()
+    report_rollups.distribution(session, "emails", "sender")
+
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    report_rollups.distribution(session, "emails", "sender")
+    scans = [s for s in statements if "FROM emails" in s]
+    assert len(scans) == 1 and "emails.rowid >" in scans[0]
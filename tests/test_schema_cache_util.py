@@ -0,0 +1,42 @@
+"""Tests for cached schema checks."""
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, inspect
+
+from shared_lib.schema_cache_util import ensure_schema, schema_hash
+
+
+def make_metadata(*extra_columns) -> MetaData:
+    metadata = MetaData()
+    Table("notes", metadata, Column("id", Integer, primary_key=True), *extra_columns)
+    return metadata
+
+
+def test_schema_check_runs_once_per_database(tmp_path):
+    """Test that a stamped database skips create_all."""
+    metadata = make_metadata()
+    engine = create_engine(f"sqlite:///{tmp_path / 'notes.db'}")
+    assert ensure_schema(engine, metadata) is True
+    assert "notes" in inspect(engine).get_table_names()
+    assert ensure_schema(engine, metadata) is False
+
+    # A fresh engine on the same file sees the stamp in the database
+    assert ensure_schema(create_engine(f"sqlite:///{tmp_path / 'notes.db'}"), metadata) is False
+
+
+def test_schema_change_triggers_check(tmp_path):
+    """Test that changed models are checked again."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'notes.db'}")
+    old, new = make_metadata(), make_metadata(Column("body", String(50)))
+    assert schema_hash(old, engine) != schema_hash(new, engine)
+
+    ensure_schema(engine, old)
+    assert ensure_schema(engine, new) is True
+
+
+def test_in_memory_databases_are_not_cached():
+    """Test that every in-memory engine gets its tables."""
+    metadata = make_metadata()
+    for _ in range(2):
+        engine = create_engine("sqlite:///:memory:")
+        assert ensure_schema(engine, metadata) is True
+        assert "notes" in inspect(engine).get_table_names()
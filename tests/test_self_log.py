@@ -0,0 +1,151 @@
+"""Tests for streaming self-email reads and time clustering."""
+
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from models.email import Email
+from models.email_analysis import EmailAnalysis
+from services import self_log
+
+NOW = pd.Timestamp("2024-03-31 12:00", tz="UTC")
+
+
+@pytest.fixture
+def session(committed_sessions):
+    """Email session with four self-emails and one email from someone else."""
+    session, _ = committed_sessions
+    dates = [(3, 31), (3, 28), (3, 10), (1, 1)]
+    for i, (month, day) in enumerate(dates):
+        session.add(
+            Email(
+                id=f"m{i}",
+                message_id=f"<m{i}>",
+                subject=f"Note {i}",
+                from_address="me@x",
+                to_address="me@x",
+                received_at=datetime(2024, month, day, 9, tzinfo=timezone.utc),
+            )
+        )
+    session.add(
+        Email(
+            id="other",
+            message_id="<other>",
+            from_address="you@x",
+            to_address="me@x",
+            received_at=datetime(2024, 3, 31, tzinfo=timezone.utc),
+        )
+    )
+    session.commit()
+    return session
+
+
+def test_streams_self_emails_newest_first(session):
+    """Test chunked reads of only the self-email columns."""
+    frames = list(self_log.iter_self_emails(session, "me@x", chunk_size=3))
+    assert [len(frame) for frame in frames] == [3, 1]
+    frame = pd.concat(frames)
+    assert list(frame["id"]) == ["m0", "m1", "m2", "m3"]
+    assert list(frame.columns) == list(self_log.SELF_EMAIL_COLUMNS)
+    assert frame["body"].tolist() == ["", "", "", ""]
+
+    since = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert self_log.count_self_emails(session, "me@x", since) == 3
+
+
+def test_self_email_query_uses_index(session):
+    """Test that the self-email filter is answered from idx_emails_self."""
+    plan = session.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN SELECT id FROM emails WHERE from_address = 'a' "
+        "AND to_address = 'a' AND received_at >= '2024' ORDER BY received_at DESC"
+    ).all()
+    assert "idx_emails_self" in plan[0][-1]
+
+
+def test_assign_periods():
+    """Test vectorized bucketing of datetimes and date strings."""
+    dates = pd.Series(
+        ["2024-03-31 08:00:00", "2024-03-28 08:00:00", "2024-03-10 08:00:00", None]
+    )
+    assert list(self_log.assign_periods(dates, NOW)) == [
+        "today",
+        "this_week",
+        "this_month",
+        "older",
+    ]
+
+
+def test_clusters_accumulate_across_chunks(session):
+    """Test that chunked clustering matches clustering everything at once."""
+    chunked = self_log.TimeClusters(now=NOW, summary_limit=1)
+    for frame in self_log.iter_self_emails(session, "me@x", chunk_size=1):
+        frame["topics"] = [["work", "ideas"]] * len(frame)
+        chunked.add(frame)
+
+    clusters = chunked.as_dict()
+    assert {period: data["count"] for period, data in clusters.items()} == {
+        "today": 1,
+        "this_week": 1,
+        "this_month": 1,
+        "older": 1,
+    }
+    assert clusters["today"]["topics"] == {"ideas": 1, "work": 1}
+    assert clusters["older"]["emails"][0]["subject"] == "Note 3"
+    assert clusters["older"]["emails"][0]["date"] == "2024-01-01 09:00:00"
+
+    rows = [
+        {"subject": "a", "date": "2024-03-31 10:00:00", "topic": "work"},
+        {"subject": "b", "date": "2024-03-31 11:00:00", "topic": "work"},
+    ]
+    whole = self_log.TimeClusters(now=NOW)
+    whole.add(pd.DataFrame(rows), date_column="date")
+    today = whole.as_dict()["today"]
+    assert today["topics"] == {"work": 2}
+    assert [email["subject"] for email in today["emails"]] == ["b", "a"]
+    assert today["emails"][0]["topics"] == ["work"]
+
+
+def test_stored_analyses_are_reused(session, committed_sessions):
+    """Test that only unanalysed emails reach the analyzer, and are stored."""
+    _, analysis_session = committed_sessions
+    analysis_session.add(
+        EmailAnalysis(email_id="m0", summary="Stored", category="Work")
+    )
+    analysis_session.commit()
+    emails = pd.concat(self_log.iter_self_emails(session, "me@x")).to_dict("records")
+    calls = []
+
+    def analyze(email):
+        calls.append(email["id"])
+        if email["id"] == "m3":
+            raise RuntimeError("API error")
+        return {"summary": f"New {email['id']}", "category": ["Ideas", "Work"],
+                "priority_score": 4}
+
+    records = self_log.reuse_or_analyze(analysis_session, emails, analyze, workers=2)
+    analysis_session.commit()
+    assert sorted(calls) == ["m1", "m2", "m3"]
+    assert [record["email_id"] for record in records] == ["m0", "m1", "m2"]
+    assert records[0]["summary"] == "Stored"
+    assert records[1]["topics"] == ["Ideas", "Work"]
+    assert records[1]["subject"] == "Note 1"
+
+    stored = analysis_session.get(EmailAnalysis, "m1")
+    assert (stored.summary, stored.priority) == ("New m1", "high")
+    assert stored.category == '["Ideas", "Work"]'
+
+    # The next run only retries the failed email
+    calls.clear()
+    self_log.reuse_or_analyze(analysis_session, emails, analyze)
+    assert calls == ["m3"]
+
+
+def test_priority_label():
+    """Test the mapping of analyzer priority scores."""
+    assert [self_log.priority_label(score) for score in (1, 3, 5, None)] == [
+        "low",
+        "medium",
+        "high",
+        "low",
+    ]
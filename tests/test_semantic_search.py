@@ -9,10 +9,11 @@ from tests.test_data.semantic_test_data import get_similar_titles, get_test_item
 
 
 @pytest.fixture(scope="session", autouse=True)
-def verify_claude_api():
+def verify_claude_api(tmp_path_factory):
     """Verify Claude API is working before running any semantic tests.
     This fixture runs automatically before any test in this module."""
-    chat = CatalogChat(mode="test")
+    catalog_db = tmp_path_factory.mktemp("catalog") / "catalog.db"
+    chat = CatalogChat(db_path=str(catalog_db), mode="test")
     try:
         response = chat.client.messages.create(
             model=API_CONFIG["TEST_MODEL"],
@@ -139,9 +140,9 @@ def test_semantic_matches_variations(verify_claude_api):
 
 
 @pytest.mark.usefixtures("verify_claude_api")
-def test_semantic_matches_disabled(verify_claude_api):
+def test_semantic_matches_disabled(verify_claude_api, catalog_paths):
     """Test behavior when semantic matching is disabled."""
-    chat = CatalogChat(mode="test", enable_semantic=False)
+    chat = CatalogChat(**catalog_paths, mode="test", enable_semantic=False)
     items = get_test_items("programming")
 
     matches = chat.get_semantic_matches(
@@ -364,9 +365,9 @@ def test_semantic_matches_short_form(verify_claude_api):
     assert any(item.title == "api" for item, score, _ in matches)
 
 
-def test_claude_api_echo():
+def test_claude_api_echo(catalog_paths):
     """Test basic Claude API communication with a simple echo."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
 
     try:
         # Simple echo test
@@ -8,14 +8,14 @@ from src.app_catalog import CatalogChat
 
 
 @pytest.fixture
-def chat():
+def chat(catalog_paths):
     """Create a CatalogChat instance for testing."""
-    return CatalogChat(mode="production")
+    return CatalogChat(**catalog_paths, mode="production")
 
 
-def test_semantic_search_real():
+def test_semantic_search_real(catalog_paths):
     """Test semantic search with real API calls."""
-    chat = CatalogChat(mode="production")
+    chat = CatalogChat(**catalog_paths, mode="production")
     items = [
         CatalogItem(title="Python Tutorial for Beginners"),
         CatalogItem(title="Advanced JavaScript Guide"),
@@ -37,9 +37,9 @@ def test_semantic_search_real():
     assert len(matches) == 0
 
 
-def test_semantic_search_with_tags():
+def test_semantic_search_with_tags(catalog_paths):
     """Test semantic search with items containing tags."""
-    chat = CatalogChat(mode="production")
+    chat = CatalogChat(**catalog_paths, mode="production")
     items = [
         CatalogItem(
             title="Python Tutorial",
@@ -61,9 +61,9 @@ def test_semantic_search_with_tags():
     assert matches[0].index == 0  # Python Tutorial should be first
 
 
-def test_semantic_search_multilingual():
+def test_semantic_search_multilingual(catalog_paths):
     """Test semantic search with multilingual content."""
-    chat = CatalogChat(mode="production")
+    chat = CatalogChat(**catalog_paths, mode="production")
     items = [
         CatalogItem(title="Python Tutorial"),
         CatalogItem(title="Guía de Python"),  # Spanish
@@ -1,5 +1,7 @@
 """Unit tests for semantic search functionality that don't require API calls."""
 
+import json
+
 import pytest
 
 from models.catalog import CatalogItem, Tag
@@ -7,9 +9,9 @@ from shared_lib.constants import CATALOG_CONFIG
 from src.app_catalog import CatalogChat
 
 
-def test_semantic_search_disabled():
+def test_semantic_search_disabled(catalog_paths):
     """Test that semantic search returns empty list when disabled."""
-    chat = CatalogChat(mode="test", enable_semantic=False)
+    chat = CatalogChat(**catalog_paths, mode="test", enable_semantic=False)
     items = [
         CatalogItem(title="Python Tutorial"),
         CatalogItem(title="JavaScript Guide"),
@@ -19,9 +21,9 @@ def test_semantic_search_disabled():
     assert len(matches) == 0
 
 
-def test_semantic_search_empty_query():
+def test_semantic_search_empty_query(catalog_paths):
     """Test handling of empty or whitespace queries."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     # Empty string
@@ -33,9 +35,9 @@ def test_semantic_search_empty_query():
     assert len(matches) == 0
 
 
-def test_semantic_search_threshold_adjustment():
+def test_semantic_search_threshold_adjustment(catalog_paths):
     """Test threshold adjustment based on query length."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     # Keep track of the threshold used
@@ -75,9 +77,9 @@ def test_semantic_search_threshold_adjustment():
     assert used_threshold == CATALOG_CONFIG["POTENTIAL_MATCH_THRESHOLD"]
 
 
-def test_semantic_search_item_conversion():
+def test_semantic_search_item_conversion(catalog_paths):
     """Test conversion of different item types to title strings."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
 
     # Create mixed list of items
     items = [
@@ -107,9 +109,9 @@ def test_semantic_search_item_conversion():
     chat.get_semantic_matches("test query", items)
 
 
-def test_semantic_search_error_handling():
+def test_semantic_search_error_handling(catalog_paths):
     """Test error handling in semantic search."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     # Mock API error
@@ -123,9 +125,9 @@ def test_semantic_search_error_handling():
     assert matches == []
 
 
-def test_semantic_search_prompt_construction():
+def test_semantic_search_prompt_construction(catalog_paths):
     """Test construction of semantic search prompt."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     # Mock to capture the constructed prompt
@@ -148,9 +150,9 @@ def test_semantic_search_prompt_construction():
     chat.get_semantic_matches("test query", items)
 
 
-def test_semantic_search_json_parsing():
+def test_semantic_search_json_parsing(catalog_paths):
     """Test parsing of semantic search JSON responses."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     # Mock different JSON response formats
@@ -183,9 +185,9 @@ def test_semantic_search_json_parsing():
         assert validator(matches)
 
 
-def test_semantic_search_response_validation():
+def test_semantic_search_response_validation(catalog_paths):
     """Test validation of semantic search response format."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     # Test invalid JSON
@@ -223,9 +225,9 @@ def test_semantic_search_response_validation():
     assert matches == []
 
 
-def test_semantic_search_score_filtering():
+def test_semantic_search_score_filtering(catalog_paths):
     """Test filtering of matches based on threshold."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [
         CatalogItem(title="Item 1"),
         CatalogItem(title="Item 2"),
@@ -264,9 +266,9 @@ def test_semantic_search_score_filtering():
     assert matches[1][1] == 0.7
 
 
-def test_semantic_search_index_validation():
+def test_semantic_search_index_validation(catalog_paths):
     """Test validation of match indices."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     def mock_invalid_indices(*args, **kwargs):
@@ -300,9 +302,9 @@ def test_semantic_search_index_validation():
     assert matches[0][0] == items[0]
 
 
-def test_semantic_search_prompt_variations():
+def test_semantic_search_prompt_variations(catalog_paths):
     """Test prompt construction with different query types."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
     items = [CatalogItem(title="Test Item")]
 
     # Keep track of prompts used
@@ -337,9 +339,9 @@ def test_semantic_search_prompt_variations():
     assert len(set(prompts)) == len(queries)
 
 
-def test_semantic_search_item_types():
+def test_semantic_search_item_types(catalog_paths):
     """Test handling of different item types in search."""
-    chat = CatalogChat(mode="test")
+    chat = CatalogChat(**catalog_paths, mode="test")
 
     # Create items with different properties
     items = [
@@ -368,3 +370,82 @@ def test_semantic_search_item_types():
 
     chat.client.messages.create = mock_check_items
     chat.get_semantic_matches("test query", items)
+
+
+def test_semantic_search_reuses_analysis(catalog_paths):
+    """Test that a precomputed analysis skips the query analysis call."""
+    chat = CatalogChat(**catalog_paths, mode="test")
+
+    def fail_analysis(query):
+        raise AssertionError("query should not be re-analyzed")
+
+    chat.process_natural_language_query = fail_analysis
+    analysis = {"intent": "search", "entities": {}, "filters": {}, "search_terms": []}
+
+    assert chat.semantic_search("python", analysis=analysis) == []
+    assert list(chat.semantic_search_stages("python", analysis)) == [("local", [])]
+
+
+def test_query_normalization():
+    """Test that cache keys ignore case and whitespace differences."""
+    assert CatalogChat.normalize_query("  Find  PYTHON\tguides ") == (
+        "find python guides"
+    )
+
+
+def test_rank_results_uses_digests_and_chunks(catalog_paths):
+    """Test that ranking sends digests in chunks and merges the scores."""
+    chat = CatalogChat(**catalog_paths, mode="test")
+    items = [
+        CatalogItem(title=f"Item {index}", content="long content " * 1000)
+        for index in range(CATALOG_CONFIG["RERANK_CHUNK_SIZE"] + 2)
+    ]
+    prompts = []
+
+    def mock_messages_create(*args, **kwargs):
+        content = kwargs["messages"][0]["content"]
+        prompts.append(content)
+        count = content.count("Title: ")
+        # Reverse the order within each chunk
+        scores = [index / 100 for index in range(count)]
+        return type(
+            "Response",
+            (),
+            {"content": [type("Content", (), {"text": json.dumps(scores)})]},
+        )
+
+    chat.client.messages.create = mock_messages_create
+    ranked = chat.rank_results_by_relevance(items, "item")
+
+    assert len(prompts) == 2
+    assert all(len(prompt) < len(items[0].content) for prompt in prompts)
+    assert sorted(item.title for item in ranked) == sorted(i.title for i in items)
+    assert ranked[0].title == f"Item {CATALOG_CONFIG['RERANK_CHUNK_SIZE'] - 1}"
+
+
+def test_query_analysis_is_cached(catalog_paths):
+    """Test that a repeated query is answered from the analysis cache."""
+    chat = CatalogChat(**catalog_paths, mode="test")
+    calls = []
+
+    def mock_messages_create(*args, **kwargs):
+        calls.append(kwargs)
+        analysis = {
+            "intent": "search",
+            "entities": {"language": "python"},
+            "filters": {},
+            "search_terms": ["python", "guides"],
+        }
+        text = f"Here is the analysis: {json.dumps(analysis)}"
+        return type(
+            "Response", (), {"content": [type("Content", (), {"text": text})]}
+        )
+
+    chat.client.messages.create = mock_messages_create
+    first = chat.process_natural_language_query("Find python guides")
+    second = chat.process_natural_language_query("  find PYTHON guides ")
+
+    assert len(calls) == 1
+    assert calls[0]["system"] == CATALOG_CONFIG["PROMPTS"]["QUERY_ANALYSIS"]
+    assert first == second
+    assert first["search_terms"] == ["python", "guides"]
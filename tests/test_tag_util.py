@@ -0,0 +1,84 @@
+"""Tests for tag normalization and the tag synonym graph."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from services.catalog_registry import TagEntry
+from services.tag_canonicalizer import TagCanonicalizer
+from shared_lib.tag_util import BKTree, canonical_key, fold_tag, levenshtein
+
+
+@pytest.fixture
+def canonicalizer():
+    """Create a canonicalizer over an in-memory catalog database."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return TagCanonicalizer(sessionmaker(bind=engine))
+
+
+def make_tags(*names: str) -> list:
+    return [TagEntry(i, name, False) for i, name in enumerate(names, 1)]
+
+
+def test_fold_tag():
+    """Test case, separator and plural folding."""
+    assert fold_tag("Design-Patterns") == "design pattern"
+    assert fold_tag("  Libraries ") == "library"
+    assert fold_tag("Analysis") == "analysis"
+    assert fold_tag("class_names") == "class name"
+
+
+def test_canonical_key_expands_abbreviations():
+    """Test that short forms share a key with their long form."""
+    assert canonical_key("ML") == canonical_key("Machine Learning")
+    assert canonical_key("K8s") == canonical_key("kubernetes")
+    assert canonical_key("python") != canonical_key("pytest")
+
+
+def test_bk_tree_search():
+    """Test that the BK-tree finds words within the edit distance."""
+    assert levenshtein("kitten", "sitting") == 3
+    tree = BKTree(["python", "pytorch", "pandas", "typescript", "python"])
+    assert len(tree) == 4
+    assert tree.search("pyhton", 2) == [(2, "python")]
+    assert tree.search("rust", 1) == []
+
+
+def test_resolve_local_layers(canonicalizer):
+    """Test folding, abbreviation and spelling resolution."""
+    tags = make_tags("Machine Learning", "Database", "javascript")
+
+    resolution = canonicalizer.resolve("machine-learning", tags)
+    assert resolution.tag.name == "Machine Learning"
+    assert resolution.source == "fold"
+
+    resolution = canonicalizer.resolve("db", tags)
+    assert resolution.tag.name == "Database"
+    assert resolution.source == "abbreviation"
+
+    resolution = canonicalizer.resolve("javscript", tags)
+    assert resolution.tag is None
+    assert [tag.name for tag, _ in resolution.candidates] == ["javascript"]
+
+    assert not canonicalizer.resolve("cooking", tags).answered
+
+
+def test_recorded_decisions(canonicalizer):
+    """Test that recorded decisions answer later lookups."""
+    tags = make_tags("python", "deep learning")
+
+    canonicalizer.record("neural networks", "deep learning", True, "llm", 0.9)
+    resolution = canonicalizer.resolve("Neural Network", tags)
+    assert resolution.tag.name == "deep learning"
+    assert resolution.source == "synonym"
+
+    canonicalizer.record("pythons", "python", False, "user")
+    canonicalizer.record("cython", "python", False, "user")
+    assert not canonicalizer.resolve("cython", tags).answered
+
+    # A user can overrule an earlier decision
+    canonicalizer.record("neural networks", "deep learning", False, "user")
+    assert canonicalizer.resolve("neural networks", tags).tag is None
+    assert canonicalizer.is_different("neural network", "deep learning")
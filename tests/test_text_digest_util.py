@@ -0,0 +1,52 @@
+"""Tests for catalog item digests."""
+
+from shared_lib.constants import CATALOG_CONFIG
+from shared_lib.text_digest_util import (
+    build_digest,
+    digest_source_hash,
+    format_digest,
+    local_relevance,
+    summarize,
+    tokenize,
+)
+
+
+def test_tokenize_drops_stopwords_and_short_words():
+    """Test term extraction."""
+    assert tokenize("The Python API is used for C++ and SQL") == [
+        "python",
+        "api",
+        "c++",
+        "sql",
+    ]
+    assert tokenize(None) == []
+
+
+def test_summarize_keeps_whole_sentences():
+    """Test that summaries stop at a sentence boundary."""
+    text = "First sentence here. Second sentence is longer than the limit allows."
+    assert summarize(text, 30) == "First sentence here."
+    assert summarize("x" * 50, 20) == "x" * 17 + "..."
+    assert summarize("short", 20) == "short"
+
+
+def test_build_digest_is_compact():
+    """Test that digests cap key terms and summary length."""
+    content = "Python decorators wrap functions. " * 500
+    digest = build_digest("Python Decorators", "", content)
+
+    assert digest["title"] == "Python Decorators"
+    assert digest["key_terms"][:2] == ["python", "decorators"]
+    assert len(digest["key_terms"]) <= CATALOG_CONFIG["DIGEST_KEY_TERMS"]
+    assert len(digest["summary"]) <= CATALOG_CONFIG["DIGEST_SUMMARY_CHARS"]
+    assert digest["source_hash"] == digest_source_hash(
+        "Python Decorators", "", content
+    )
+    assert len(format_digest(digest)) < len(content)
+
+
+def test_local_relevance_counts_query_terms():
+    """Test local pre-ranking score."""
+    digest = build_digest("Python Decorators", "Wrapping functions in Python")
+    assert local_relevance(digest, "python decorators guide") == 2
+    assert local_relevance(digest, "javascript") == 0